@@ -5,6 +5,14 @@ const API_BASE_URL = import.meta.env.DEV
   ? '/api'  // Proxy to backend in development
   : (import.meta.env.VITE_BACKEND_URL || 'http://localhost:8000') + '/api';  // Direct backend in production
 
+// Workspace (separate server-side database) from the ?workspace= URL parameter;
+// requests without one use the default database
+const WORKSPACE = new URLSearchParams(window.location.search).get('workspace');
+
+export function workspaceHeaders(): Record<string, string> {
+  return WORKSPACE ? { 'X-Workspace': WORKSPACE } : {};
+}
+
 // Generic API request function
 async function apiRequest<T>(
   endpoint: string,
@@ -16,6 +24,7 @@ async function apiRequest<T>(
     const response = await fetch(url, {
       ...options,
       headers: {
+        ...workspaceHeaders(),
         ...options.headers,
       }
     });
@@ -45,6 +54,17 @@ export const api = {
     });
   },
   
+  // Upload several files and/or .zip/.tar archives, converted in parallel on the server
+  async uploadFiles(files: File[]): Promise<BulkUploadResponse> {
+    const formData = new FormData();
+    files.forEach(file => formData.append('files', file));
+
+    return apiRequest<BulkUploadResponse>('/upload/bulk', {
+      method: 'POST',
+      body: formData
+    });
+  },
+  
   // Process query
   async processQuery(request: QueryRequest): Promise<QueryResponse> {
     return apiRequest<QueryResponse>('/query', {
@@ -87,6 +107,7 @@ export const api = {
     const response = await fetch(`${API_BASE_URL}/export/table`, {
       method: 'POST',
       headers: {
+        ...workspaceHeaders(),
         'Content-Type': 'application/json'
       },
       body: JSON.stringify({ table_name: tableName })
@@ -113,26 +134,32 @@ export const api = {
     window.URL.revokeObjectURL(url);
   },
   
-  // Export query results as CSV
-  async exportQueryResults(data: any[], columns: string[]): Promise<void> {
+  // Export query results as CSV (the server re-executes the SQL and streams the file)
+  async exportQueryResults(sql: string): Promise<void> {
     const response = await fetch(`${API_BASE_URL}/export/query`, {
       method: 'POST',
       headers: {
+        ...workspaceHeaders(),
         'Content-Type': 'application/json'
       },
-      body: JSON.stringify({ data, columns })
+      body: JSON.stringify({ sql })
     });
 
     if (!response.ok) {
       throw new Error(`Export failed: ${response.status}`);
     }
 
+    // Get the filename from Content-Disposition header
+    const contentDisposition = response.headers.get('Content-Disposition');
+    const filenameMatch = contentDisposition?.match(/filename="(.+)"/);
+    const filename = filenameMatch ? filenameMatch[1] : 'query_results.csv';
+
     // Download the file
     const blob = await response.blob();
     const url = window.URL.createObjectURL(blob);
     const a = document.createElement('a');
     a.href = url;
-    a.download = 'query_results.csv';
+    a.download = filename;
     document.body.appendChild(a);
     a.click();
     document.body.removeChild(a);
@@ -140,13 +167,56 @@ export const api = {
   },
 
   // Generate synthetic data for a table
-  async generateTableData(tableName: string): Promise<GenerateDataResponse> {
+  async generateTableData(
+    tableName: string,
+    rows: number = 10,
+    provider: GenerateDataProvider = 'llm'
+  ): Promise<GenerateDataResponse> {
     return apiRequest<GenerateDataResponse>('/generate-data', {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json'
       },
-      body: JSON.stringify({ table_name: tableName })
+      body: JSON.stringify({ table_name: tableName, rows, provider })
+    });
+  },
+
+  // Build an FTS5 index over a table's text columns (all of them unless columns are given)
+  async createFullTextIndex(tableName: string, columns?: string[]): Promise<FullTextIndexResponse> {
+    return apiRequest<FullTextIndexResponse>(`/table/${encodeURIComponent(tableName)}/full-text-index`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json'
+      },
+      body: JSON.stringify({ columns: columns ?? null })
+    });
+  },
+
+  // Save a query as a named view whose result is materialized on the server
+  async saveView(request: SaveViewRequest): Promise<SavedViewResponse> {
+    return apiRequest<SavedViewResponse>('/views', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json'
+      },
+      body: JSON.stringify(request)
+    });
+  },
+
+  // List saved views
+  async listViews(): Promise<SavedViewListResponse> {
+    return apiRequest<SavedViewListResponse>('/views');
+  },
+
+  // Read a view's rows (refreshed on the server only if its source tables changed)
+  async readView(name: string): Promise<SavedViewResultResponse> {
+    return apiRequest<SavedViewResultResponse>(`/views/${encodeURIComponent(name)}`);
+  },
+
+  // Delete a saved view
+  async deleteView(name: string): Promise<{ message: string }> {
+    return apiRequest<{ message: string }>(`/views/${encodeURIComponent(name)}`, {
+      method: 'DELETE'
     });
   }
 };
\ No newline at end of file
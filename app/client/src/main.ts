@@ -1,5 +1,5 @@
 import './style.css'
-import { api } from './api/client'
+import { api, workspaceHeaders } from './api/client'
 
 // Global state
 
@@ -161,7 +161,7 @@ function initializeFileUpload() {
   fileInput.addEventListener('change', (e) => {
     const files = (e.target as HTMLInputElement).files;
     if (files && files.length > 0) {
-      handleFileUpload(files[0]);
+      handleFileUploads(Array.from(files));
     }
   });
   
@@ -181,7 +181,7 @@ function initializeFileUpload() {
     
     const files = e.dataTransfer?.files;
     if (files && files.length > 0) {
-      handleFileUpload(files[0]);
+      handleFileUploads(Array.from(files));
     }
   });
 }
@@ -202,6 +202,34 @@ async function handleFileUpload(file: File) {
   }
 }
 
+// Upload one data file directly, or several files/archives through the bulk endpoint
+async function handleFileUploads(files: File[]) {
+  if (files.length === 1 && !isArchive(files[0])) {
+    await handleFileUpload(files[0]);
+    return;
+  }
+
+  try {
+    const response = await api.uploadFiles(files);
+
+    if (response.error) {
+      displayError(response.error);
+      return;
+    }
+    const failed = response.files.filter(file => file.error);
+    displaySuccessMessage(
+      `Created ${response.tables_created} tables with ${response.total_rows} rows ` +
+      `in ${response.elapsed_seconds.toFixed(1)}s (${Math.round(response.rows_per_second)} rows/s)`
+    );
+    if (failed.length > 0) {
+      displayError(failed.map(file => `${file.filename}: ${file.error}`).join('; '));
+    }
+    await loadDatabaseSchema();
+  } catch (error) {
+    displayError(error instanceof Error ? error.message : 'Upload failed');
+  }
+}
+
 // Enhanced Drop Zones - Helper Functions
 function showDropOverlay(element: HTMLElement): HTMLElement {
   const overlay = document.createElement('div');
@@ -224,10 +252,17 @@ function hideDropOverlay(element: HTMLElement): void {
   }
 }
 
+function isArchive(file: File): boolean {
+  const archiveExtensions = ['.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz'];
+  const fileName = file.name.toLowerCase();
+  return archiveExtensions.some(ext => fileName.endsWith(ext));
+}
+
 function isValidFileType(file: File): boolean {
   const validExtensions = ['.csv', '.json', '.jsonl', '.parquet'];
-  const fileName = file.name.toLowerCase();
-  return validExtensions.some(ext => fileName.endsWith(ext));
+  // Compressed single files (orders.csv.gz) are decompressed by the server
+  const fileName = file.name.toLowerCase().replace(/\.(gz|zst|bz2)$/, '');
+  return validExtensions.some(ext => fileName.endsWith(ext)) || isArchive(file);
 }
 
 function hasFiles(dataTransfer: DataTransfer | null): boolean {
@@ -297,14 +332,14 @@ function initializeEnhancedDropZones() {
       const files = dataTransfer?.files;
 
       if (files && files.length > 0) {
-        const file = files[0];
+        const selected = Array.from(files);
 
-        if (!isValidFileType(file)) {
-          displayError('Invalid file type. Please upload a .csv, .json, .jsonl, or .parquet file.');
+        if (!selected.every(isValidFileType)) {
+          displayError('Invalid file type. Please upload .csv, .json, .jsonl, or .parquet files (optionally .gz/.zst/.bz2), or a .zip/.tar archive.');
           return;
         }
 
-        await handleFileUpload(file);
+        await handleFileUploads(selected);
       }
     });
   }
@@ -380,7 +415,7 @@ function displayResults(response: QueryResponse, query: string) {
     exportButton.title = 'Export results as CSV';
     exportButton.onclick = async () => {
       try {
-        await api.exportQueryResults(response.results, response.columns);
+        await api.exportQueryResults(response.sql);
       } catch (error) {
         displayError('Failed to export results');
       }
@@ -565,6 +600,11 @@ function displayTables(tables: TableSchema[]) {
 
 // Display upload success
 function displayUploadSuccess(response: FileUploadResponse) {
+  displaySuccessMessage(`Table "${response.table_name}" created successfully with ${response.row_count} rows!`);
+}
+
+// Close the upload modal and show a temporary success message above the tables
+function displaySuccessMessage(message: string) {
   // Close modal
   const modal = document.getElementById('upload-modal') as HTMLElement;
   modal.style.display = 'none';
@@ -572,7 +612,7 @@ function displayUploadSuccess(response: FileUploadResponse) {
   // Show success message
   const successDiv = document.createElement('div');
   successDiv.className = 'success-message';
-  successDiv.textContent = `Table "${response.table_name}" created successfully with ${response.row_count} rows!`;
+  successDiv.textContent = message;
   successDiv.style.cssText = `
     background: rgba(40, 167, 69, 0.1);
     border: 1px solid var(--success-color);
@@ -669,7 +709,8 @@ async function removeTable(tableName: string) {
   
   try {
     const response = await fetch(`/api/table/${tableName}`, {
-      method: 'DELETE'
+      method: 'DELETE',
+      headers: workspaceHeaders()
     });
     
     if (!response.ok) {
@@ -5,7 +5,34 @@ interface FileUploadResponse {
   table_name: string;
   table_schema: Record<string, string>;
   row_count: number;
+  rows_loaded: number;
   sample_data: Record<string, any>[];
+  child_tables: string[];
+  content_hash?: string;
+  unchanged: boolean;
+  changed_blocks?: number;
+  full_text_index?: string;
+  error?: string;
+}
+
+interface BulkUploadFileResult {
+  filename: string;
+  table_name: string;
+  table_schema: Record<string, string>;
+  row_count: number;
+  bytes: number;
+  seconds: number;
+  error?: string;
+}
+
+interface BulkUploadResponse {
+  files: BulkUploadFileResult[];
+  tables_created: number;
+  total_rows: number;
+  total_bytes: number;
+  elapsed_seconds: number;
+  rows_per_second: number;
+  megabytes_per_second: number;
   error?: string;
 }
 
@@ -14,6 +41,20 @@ interface QueryRequest {
   query: string;
   llm_provider: "openai" | "anthropic";
   table_name?: string;
+  include_timings?: boolean;
+}
+
+interface QueryTimings {
+  schema_ms: number;
+  prompt_build_ms: number;
+  llm_ms: number;
+  validate_ms: number;
+  sql_ms: number;
+  serialize_ms: number;
+  total_ms: number;
+  rows: number;
+  prompt_tokens?: number;
+  completion_tokens?: number;
 }
 
 interface QueryResponse {
@@ -22,6 +63,7 @@ interface QueryResponse {
   columns: string[];
   row_count: number;
   execution_time_ms: number;
+  timings?: QueryTimings;
   error?: string;
 }
 
@@ -38,6 +80,7 @@ interface TableSchema {
   columns: ColumnInfo[];
   row_count: number;
   created_at: string;
+  full_text_columns: string[];
 }
 
 interface DatabaseSchemaResponse {
@@ -61,6 +104,7 @@ interface ColumnInsight {
   max_value?: any;
   avg_value?: number;
   most_common?: Record<string, any>[];
+  sample_values?: any[];
 }
 
 interface InsightsResponse {
@@ -73,6 +117,9 @@ interface InsightsResponse {
 // Random Query Generation Types
 interface RandomQueryResponse {
   query: string;
+  sql?: string;
+  row_count?: number;
+  pooled: boolean;
   error?: string;
 }
 
@@ -86,13 +133,67 @@ interface HealthCheckResponse {
 }
 
 // Data Generation Types
+type GenerateDataProvider = 'llm' | 'statistical';
+
 interface GenerateDataRequest {
   table_name: string;
+  rows?: number;
+  provider?: GenerateDataProvider;
 }
 
 interface GenerateDataResponse {
   rows_added: number;
   new_row_count: number;
   table_name: string;
+  rows_per_second?: number;
   error?: string;
-}
\ No newline at end of file
+}
+
+// Saved View Types
+interface SaveViewRequest {
+  name: string;
+  query?: string;
+  sql?: string;
+  llm_provider?: "openai" | "anthropic";
+}
+
+interface SavedViewInfo {
+  name: string;
+  query?: string;
+  sql: string;
+  source_tables: string[];
+  row_count: number;
+  refreshed_at: string;
+  refresh_ms: number;
+  stale: boolean;
+}
+
+interface SavedViewResponse {
+  view?: SavedViewInfo;
+  error?: string;
+}
+
+interface SavedViewListResponse {
+  views: SavedViewInfo[];
+  error?: string;
+}
+
+interface SavedViewResultResponse {
+  view?: SavedViewInfo;
+  columns: string[];
+  results: Record<string, any>[];
+  row_count: number;
+  refreshed: boolean;
+  execution_time_ms: number;
+  error?: string;
+}
+
+// Full-Text Index Types
+interface FullTextIndexResponse {
+  table_name: string;
+  index_table: string;
+  columns: string[];
+  rows_indexed: number;
+  elapsed_ms: number;
+  error?: string;
+}
@@ -0,0 +1 @@
+# Performance benchmarks for the Natural Language SQL Interface backend
@@ -0,0 +1,121 @@
+"""
+Benchmark word search with LIKE '%word%' against an FTS5 index (core.full_text).
+
+Builds a table of --rows short generated reviews, times the same word
+searches (a common word and a rare one, each as a first-100-rows search
+and a count) as a LIKE scan and as a MATCH on the table's full-text index,
+and reports the one-off index build time.
+
+Usage (from app/server):
+    uv run python -m benchmarks.bench_full_text
+    uv run python -m benchmarks.bench_full_text --rows 100000 --json results.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from typing import Any, Dict
+
+from core.full_text import create_full_text_index
+
+ROWS = 1_000_000
+REPEATS = 5
+WORDS = (
+    "quiet loud fast slow sturdy fragile cheap pricey kettle fan lid handle cable battery screen "
+    "charger water coffee noise warranty refund delivery box colour size fit smell"
+).split()
+# One common word, and one in every RARE_EVERY rows
+RARE_WORD = "defective"
+RARE_EVERY = 1000
+TERMS = ("kettle", RARE_WORD)
+
+
+def _build(db_path: str, rows: int) -> None:
+    rng = random.Random(0)
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE reviews (id INTEGER, title TEXT, body TEXT)")
+    conn.executemany(
+        "INSERT INTO reviews VALUES (?, ?, ?)",
+        (
+            (
+                i,
+                " ".join(rng.choices(WORDS, k=3)),
+                " ".join(rng.choices(WORDS, k=20)) + (f" {RARE_WORD}" if i % RARE_EVERY == 0 else "")
+            )
+            for i in range(rows)
+        )
+    )
+    conn.commit()
+    conn.close()
+
+
+def _time_query(conn: sqlite3.Connection, sql: str) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        conn.execute(sql).fetchall()
+    return (time.perf_counter() - start) / REPEATS
+
+
+def run(rows: int = ROWS) -> Dict[str, Any]:
+    results: Dict[str, Any] = {"rows": rows, "searches": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        _build(db_path, rows)
+        conn = sqlite3.connect(db_path)
+        try:
+            start = time.perf_counter()
+            create_full_text_index(conn, "reviews")
+            conn.commit()
+            results["index_seconds"] = time.perf_counter() - start
+
+            for term in TERMS:
+                like = _time_query(
+                    conn, f"SELECT id FROM reviews WHERE title LIKE '%{term}%' OR body LIKE '%{term}%' LIMIT 100"
+                )
+                match = _time_query(
+                    conn,
+                    "SELECT reviews.id FROM reviews JOIN reviews_fts ON reviews_fts.rowid = reviews.rowid "
+                    f"WHERE reviews_fts MATCH '{term}' LIMIT 100"
+                )
+                count_like = _time_query(
+                    conn, f"SELECT COUNT(*) FROM reviews WHERE title LIKE '%{term}%' OR body LIKE '%{term}%'"
+                )
+                count_match = _time_query(conn, f"SELECT COUNT(*) FROM reviews_fts WHERE reviews_fts MATCH '{term}'")
+                results["searches"][term] = {
+                    "like_limit_ms": like * 1000,
+                    "match_limit_ms": match * 1000,
+                    "like_count_ms": count_like * 1000,
+                    "match_count_ms": count_match * 1000
+                }
+        finally:
+            conn.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=ROWS)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(rows=args.rows)
+
+    print(f"{results['rows']} rows, index built in {results['index_seconds']:.1f} s")
+    print(f"{'term':>10} {'LIKE':>10} {'MATCH':>10} {'LIKE count':>12} {'MATCH count':>12}  (ms)")
+    for term, timings in results["searches"].items():
+        print(
+            f"{term:>10} {timings['like_limit_ms']:10.1f} {timings['match_limit_ms']:10.1f} "
+            f"{timings['like_count_ms']:12.1f} {timings['match_count_ms']:12.1f}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark JSONL parsing and flattening in core.file_processor.
+
+Scales tests/assets/complex_data.jsonl (nested objects and arrays) to
+--lines lines and times three stages over the same file:
+
+- recursive: json.loads plus the original recursive flattener, for reference
+- iterative: the line parser in use (orjson when installed) plus
+  flatten_json_object
+- convert: convert_jsonl_stream_to_sqlite, i.e. both passes plus the
+  SQLite writes
+
+Usage (from app/server):
+    uv run python -m benchmarks.bench_jsonl
+    uv run python -m benchmarks.bench_jsonl --lines 100000 --json results.json
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict
+
+from core.constants import LIST_INDEX_DELIMITER, NESTED_DELIMITER
+from core.file_processor import (
+    ORJSON_AVAILABLE,
+    _iter_jsonl_objects,
+    convert_jsonl_stream_to_sqlite,
+    flatten_json_object
+)
+
+ASSET = os.path.join(os.path.dirname(__file__), "..", "tests", "assets", "complex_data.jsonl")
+LINES = 1_000_000
+
+
+def _flatten_recursive(obj: Any, prefix: str = "") -> Dict[str, Any]:
+    """The flattener before it was made iterative."""
+    result = {}
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            new_key = f"{prefix}{NESTED_DELIMITER}{key}" if prefix else key
+            result.update(_flatten_recursive(value, new_key))
+    elif isinstance(obj, list):
+        for i, value in enumerate(obj):
+            new_key = f"{prefix}{LIST_INDEX_DELIMITER}{i}"
+            result.update(_flatten_recursive(value, new_key))
+    else:
+        result[prefix] = obj
+    return result
+
+
+def _write_file(path: str, lines: int) -> None:
+    with open(ASSET, "rb") as f:
+        templates = [json.loads(line) for line in f if line.strip()]
+    with open(path, "w") as f:
+        for i in range(lines):
+            record = templates[i % len(templates)]
+            record["event_id"] = f"evt_{i:07d}"
+            f.write(json.dumps(record) + "\n")
+
+
+def _time_recursive(path: str) -> float:
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                _flatten_recursive(json.loads(line))
+    return time.perf_counter() - start
+
+
+def _time_iterative(path: str) -> float:
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        for obj in _iter_jsonl_objects(f):
+            flatten_json_object(obj)
+    return time.perf_counter() - start
+
+
+def _time_convert(path: str, db_path: str) -> float:
+    files = []
+
+    def open_stream():
+        files.append(open(path, "rb"))
+        return files[-1]
+
+    start = time.perf_counter()
+    try:
+        convert_jsonl_stream_to_sqlite(open_stream, "events", db_path)
+    finally:
+        for f in files:
+            f.close()
+    return time.perf_counter() - start
+
+
+def run(lines: int = LINES, convert: bool = True) -> Dict[str, Any]:
+    results: Dict[str, Any] = {"lines": lines, "orjson": ORJSON_AVAILABLE}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "events.jsonl")
+        _write_file(path, lines)
+        results["megabytes"] = os.path.getsize(path) / 1_000_000
+        results["recursive_seconds"] = _time_recursive(path)
+        results["iterative_seconds"] = _time_iterative(path)
+        if convert:
+            results["convert_seconds"] = _time_convert(path, os.path.join(tmp, "bench.db"))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=LINES)
+    parser.add_argument("--no-convert", action="store_true", help="Skip the full SQLite conversion")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(lines=args.lines, convert=not args.no_convert)
+
+    print(f"{results['lines']} lines, {results['megabytes']:.1f} MB, orjson={'yes' if results['orjson'] else 'no'}")
+    for stage in ("recursive", "iterative", "convert"):
+        seconds = results.get(f"{stage}_seconds")
+        if seconds is not None:
+            print(f"{stage:>10} {seconds:8.2f} s {results['lines'] / seconds:12.0f} lines/s")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
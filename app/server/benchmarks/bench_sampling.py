@@ -0,0 +1,84 @@
+"""
+Benchmark random row sampling in core.sampling.
+
+Builds temporary tables of increasing size and times sample_rows() against the
+`ORDER BY RANDOM() LIMIT k` query it replaced. ORDER BY RANDOM() sorts every
+row, so its time grows with the table; rowid probing should stay roughly flat.
+
+Usage (from app/server):
+    uv run python -m benchmarks.bench_sampling
+    uv run python -m benchmarks.bench_sampling --json results.json
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from core.sampling import sample_rows
+
+SIZES = [10_000, 100_000, 1_000_000]
+SAMPLE_SIZE = 10
+
+
+def _build_table(conn: sqlite3.Connection, rows: int) -> None:
+    conn.execute("DROP TABLE IF EXISTS bench")
+    conn.execute("CREATE TABLE bench (id INTEGER, name TEXT, amount REAL, category TEXT)")
+    conn.executemany(
+        "INSERT INTO bench VALUES (?, ?, ?, ?)",
+        ((i, f"name {i}", i * 0.5, f"category {i % 20}") for i in range(rows))
+    )
+    conn.commit()
+
+
+def _time(fn: Callable[[], object], repeats: int) -> float:
+    """Return the best wall time of `repeats` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(repeats: int = 5, sizes: List[int] = SIZES) -> Dict[str, List]:
+    results: Dict[str, List] = {"sizes": [], "sample_rows_ms": [], "order_by_random_ms": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "bench.db"))
+        for size in sizes:
+            _build_table(conn, size)
+            results["sizes"].append(size)
+            results["sample_rows_ms"].append(
+                _time(lambda: sample_rows(conn, "bench", SAMPLE_SIZE), repeats)
+            )
+            results["order_by_random_ms"].append(
+                _time(lambda: conn.execute(
+                    f"SELECT * FROM bench ORDER BY RANDOM() LIMIT {SAMPLE_SIZE}"
+                ).fetchall(), repeats)
+            )
+        conn.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run(repeats=args.repeats)
+
+    print(f"{'rows':>10} {'sample_rows ms':>16} {'ORDER BY RANDOM() ms':>22}")
+    for size, sampled, ordered in zip(results["sizes"], results["sample_rows_ms"], results["order_by_random_ms"]):
+        print(f"{size:>10} {sampled:16.3f} {ordered:22.3f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+Load-test the FastAPI server in-process with a deterministic stub LLM.
+
+The app runs in a temporary working directory with its own db/database.db.
+A synthetic dataset of --rows rows is uploaded first. Then each scenario
+(query, schema, insights, export, upload) is driven through httpx's ASGI
+transport at each --concurrency level. The report gives throughput and
+latency percentiles per scenario and concurrency.
+
+The OpenAI client is replaced by a stub that returns one of a few SQL
+templates, picked by hashing the question. Prompt building, validation and
+SQL execution still run. Only the network round trip is skipped, with an
+optional fixed --llm-latency-ms per call.
+
+Results are written as JSON. Pass --compare with an earlier results file to
+print per-scenario changes between commits.
+
+Usage (from app/server):
+    uv run python -m benchmarks.bench_server
+    uv run python -m benchmarks.bench_server --rows 100000 --concurrency 1 8 32 --json results.json
+    uv run python -m benchmarks.bench_server --compare baseline.json
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+from unittest.mock import patch
+
+import httpx
+
+# Upload runs last: each upload adds a table, which would slow the schema scenario
+SCENARIOS = ["query", "schema", "insights", "export", "upload"]
+DATASET_TABLE = "bench_orders"
+
+# Questions sent to /api/query; the stub maps each to a fixed SQL template
+QUESTIONS = [
+    "How many orders are there?",
+    "What is the total amount per region?",
+    "Show the 20 most expensive orders",
+    "Average quantity per product",
+    "Orders from the north region",
+]
+
+SQL_TEMPLATES = [
+    f"SELECT COUNT(*) AS order_count FROM {DATASET_TABLE}",
+    f"SELECT region, SUM(amount) AS total FROM {DATASET_TABLE} GROUP BY region",
+    f"SELECT * FROM {DATASET_TABLE} ORDER BY amount DESC LIMIT 20",
+    f"SELECT product, AVG(quantity) AS avg_quantity FROM {DATASET_TABLE} GROUP BY product",
+    f"SELECT * FROM {DATASET_TABLE} WHERE region = 'north' LIMIT 100",
+]
+
+_QUESTION_PATTERN = re.compile(r'query to SQL: "(.*)"')
+
+
+class StubOpenAI:
+    """Drop-in for openai.OpenAI returning deterministic SQL with token usage."""
+
+    latency_seconds = 0.0
+
+    def __init__(self, api_key: Optional[str] = None, **kwargs: Any):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, messages: List[Dict[str, str]], **kwargs: Any) -> SimpleNamespace:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        prompt = messages[-1]["content"]
+        # Key on the question only; the schema part of the prompt includes random sample rows
+        match = _QUESTION_PATTERN.search(prompt)
+        question = match.group(1) if match else prompt
+        sql = SQL_TEMPLATES[zlib.crc32(question.encode("utf-8")) % len(SQL_TEMPLATES)]
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=sql))],
+            usage=SimpleNamespace(prompt_tokens=len(prompt) // 4, completion_tokens=len(sql) // 4)
+        )
+
+
+def make_dataset(rows: int, seed: int = 0) -> bytes:
+    """Build a deterministic orders CSV with mixed column types."""
+    rng = random.Random(seed)
+    regions = ["north", "south", "east", "west"]
+    products = [f"product_{i}" for i in range(50)]
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["order_id", "region", "product", "quantity", "amount", "order_date", "email"])
+    for i in range(rows):
+        writer.writerow([
+            i + 1,
+            rng.choice(regions),
+            rng.choice(products),
+            rng.randint(1, 20),
+            round(rng.uniform(1, 500), 2),
+            f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            f"customer{rng.randint(1, 10_000)}@example.com",
+        ])
+    return out.getvalue().encode("utf-8")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies_ms: List[float], errors: int, wall_seconds: float) -> Dict[str, float]:
+    ordered = sorted(latencies_ms)
+    count = len(ordered)
+    return {
+        "requests": count,
+        "errors": errors,
+        "throughput_rps": count / wall_seconds if wall_seconds > 0 else 0.0,
+        "mean_ms": sum(ordered) / count if count else 0.0,
+        "p50_ms": percentile(ordered, 50),
+        "p90_ms": percentile(ordered, 90),
+        "p95_ms": percentile(ordered, 95),
+        "p99_ms": percentile(ordered, 99),
+        "max_ms": ordered[-1] if ordered else 0.0,
+    }
+
+
+def _scenario_request(name: str, dataset: bytes) -> Callable[[httpx.AsyncClient, int], Any]:
+    """Return a coroutine factory issuing one request for the scenario."""
+    if name == "upload":
+        def upload(client: httpx.AsyncClient, i: int):
+            files = {"file": (f"bench_upload_{i}.csv", dataset, "text/csv")}
+            return client.post("/api/upload", files=files)
+        return upload
+    if name == "query":
+        def query(client: httpx.AsyncClient, i: int):
+            return client.post("/api/query", json={"query": QUESTIONS[i % len(QUESTIONS)]})
+        return query
+    if name == "schema":
+        return lambda client, i: client.get("/api/schema")
+    if name == "insights":
+        return lambda client, i: client.post("/api/insights", json={"table_name": DATASET_TABLE})
+    if name == "export":
+        return lambda client, i: client.post("/api/export/table", json={"table_name": DATASET_TABLE})
+    raise ValueError(f"Unknown scenario: {name}")
+
+
+def _is_error(response: httpx.Response) -> bool:
+    if response.status_code >= 400:
+        return True
+    if response.headers.get("content-type", "").startswith("application/json"):
+        body = response.json()
+        return isinstance(body, dict) and bool(body.get("error"))
+    return False
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    name: str,
+    dataset: bytes,
+    concurrency: int,
+    requests: int
+) -> Dict[str, float]:
+    """Issue `requests` requests with at most `concurrency` in flight."""
+    send = _scenario_request(name, dataset)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await send(client, i)
+                failed = _is_error(response)
+            except Exception:
+                failed = True
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def run_benchmarks(
+    rows: int,
+    concurrency_levels: List[int],
+    requests: int,
+    scenarios: List[str],
+    upload_requests: int
+) -> Dict[str, Any]:
+    from server import app
+
+    # Per-request success logging would dominate the measurements
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    dataset = make_dataset(rows)
+    transport = httpx.ASGITransport(app=app)
+    results: Dict[str, Any] = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        response = await client.post(
+            "/api/upload", files={"file": (f"{DATASET_TABLE}.csv", dataset, "text/csv")}
+        )
+        if _is_error(response):
+            raise RuntimeError(f"Dataset upload failed: {response.text}")
+
+        for name in scenarios:
+            results[name] = {}
+            count = upload_requests if name == "upload" else requests
+            for concurrency in concurrency_levels:
+                results[name][str(concurrency)] = await run_scenario(
+                    client, name, dataset, concurrency, count
+                )
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _change(stats: Dict[str, Any], old: Dict[str, Any], key: str) -> str:
+    """Percentage change of stats[key] against the baseline, formatted for the compare table."""
+    return f"{(stats[key] / old[key] - 1) * 100:+9.1f}" if old[key] else f"{'-':>9}"
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print p50/p95 latency and throughput changes against a baseline run."""
+    print(f"\n{'scenario':<10} {'conc':>5} {'p50 Δ%':>9} {'p95 Δ%':>9} {'rps Δ%':>9}")
+    for name, levels in current["results"].items():
+        for concurrency, stats in levels.items():
+            old = baseline.get("results", {}).get(name, {}).get(concurrency)
+            if not old:
+                continue
+            print(
+                f"{name:<10} {concurrency:>5} {_change(stats, old, 'p50_ms')} "
+                f"{_change(stats, old, 'p95_ms')} {_change(stats, old, 'throughput_rps')}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000, help="Rows in the synthetic dataset")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario and concurrency level")
+    parser.add_argument("--upload-requests", type=int, default=20, help="Requests for the (slower) upload scenario")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Simulated latency per stub LLM call")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    args = parser.parse_args()
+
+    server_dir = os.getcwd()
+    StubOpenAI.latency_seconds = args.llm_latency_ms / 1000
+    with tempfile.TemporaryDirectory() as workdir:
+        # The server uses relative db/ paths; keep benchmark data out of the real database
+        os.chdir(workdir)
+        os.makedirs("db", exist_ok=True)
+        sys.path.insert(0, server_dir)
+        try:
+            with patch.dict(os.environ, {"OPENAI_API_KEY": "stub", "ANTHROPIC_API_KEY": ""}), \
+                    patch("core.llm_processor.OpenAI", StubOpenAI):
+                results = asyncio.run(run_benchmarks(
+                    args.rows, args.concurrency, args.requests, args.scenarios, args.upload_requests
+                ))
+        finally:
+            os.chdir(server_dir)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rows": args.rows,
+            "requests": args.requests,
+            "upload_requests": args.upload_requests,
+            "llm_latency_ms": args.llm_latency_ms,
+        },
+        "results": results,
+    }
+
+    print(f"{'scenario':<10} {'conc':>5} {'req':>5} {'err':>4} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, levels in results.items():
+        for concurrency, stats in levels.items():
+            print(
+                f"{name:<10} {concurrency:>5} {stats['requests']:>5} {stats['errors']:>4} "
+                f"{stats['throughput_rps']:9.1f} {stats['p50_ms']:9.2f} {stats['p95_ms']:9.2f} {stats['p99_ms']:9.2f}"
+            )
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Micro-benchmarks for SQL validation in core.sql_security.
+
+Times validate_sql_query on realistic, long and adversarial queries at
+increasing sizes, comparing the current lexer-based validator (memo disabled)
+against the legacy regex implementation it replaced. Linear-time behaviour shows up as a
+per-size ratio close to the size ratio; the legacy `.*` patterns grow
+quadratically on the adversarial inputs.
+
+Usage (from app/server):
+    uv run python -m benchmarks.bench_sql_security
+    uv run python -m benchmarks.bench_sql_security --json results.json
+"""
+
+import argparse
+import json
+import re
+import time
+from typing import Callable, Dict, List
+
+from core.sql_security import SQLSecurityError, _find_sql_violation, validate_sql_query
+
+SIZES = [1_000, 4_000, 16_000]
+
+
+def legacy_validate_sql_query(query: str) -> bool:
+    """The regex blacklist validator as it was before the single-pass engine."""
+    normalized_query = query.upper().strip()
+
+    dangerous_patterns = [
+        r"\bDROP\s+(?:TABLE|DATABASE|INDEX|VIEW)\b",
+        r"\bDELETE\s+FROM\b",
+        r"\bTRUNCATE\s+TABLE\b",
+        r"\bEXEC(?:UTE)?\s*\(",
+        r"\bCREATE\s+(?:TABLE|DATABASE|INDEX|VIEW)\b",
+        r"\bALTER\s+TABLE\b",
+        r"\bGRANT\b",
+        r"\bREVOKE\b",
+        r"\bINSERT\s+INTO\b.*\bSELECT\b",
+        r"\bUPDATE\b.*\bSET\b",
+        r";\s*(?:SELECT|DROP|DELETE|UPDATE|INSERT)",
+    ]
+    for pattern in dangerous_patterns:
+        if re.search(pattern, normalized_query):
+            raise SQLSecurityError(f"Query contains potentially dangerous operation: {pattern}")
+
+    if "--" in query or "/*" in query or "*/" in query:
+        raise SQLSecurityError("Query contains SQL comments which are not allowed")
+
+    injection_patterns = [
+        r"'\s*OR\s*'?1'?\s*=\s*'?1",
+        r'"\s*OR\s*"?1"?\s*=\s*"?1',
+        r"'[^']*\s*;\s*(?:SELECT|DROP|DELETE|UPDATE|INSERT|CREATE|ALTER|EXEC)",
+        r'"[^"]*\s*;\s*(?:SELECT|DROP|DELETE|UPDATE|INSERT|CREATE|ALTER|EXEC)',
+    ]
+    for pattern in injection_patterns:
+        if re.search(pattern, normalized_query, re.IGNORECASE):
+            raise SQLSecurityError("Query contains potential SQL injection pattern")
+
+    return True
+
+
+def _long_select(size: int) -> str:
+    """A wide, safe SELECT with many predicates."""
+    parts = ["SELECT id, name, email FROM users WHERE age > 18"]
+    i = 0
+    while sum(len(p) for p in parts) < size:
+        parts.append(f" AND (score_{i} BETWEEN {i} AND {i + 10} OR label_{i} = 'v{i}')")
+        i += 1
+    return "".join(parts)
+
+
+def _many_updates(size: int) -> str:
+    """Repeated UPDATE tokens with no SET: worst case for UPDATE.*SET."""
+    return "SELECT " + "UPDATE " * (size // 7)
+
+
+def _many_inserts(size: int) -> str:
+    """Repeated INSERT INTO with no SELECT: worst case for INSERT INTO.*SELECT."""
+    return "SELECT " + "INSERT INTO t " * (size // 14)
+
+
+def _quote_whitespace(size: int) -> str:
+    """A quote followed by a long whitespace run: stresses [^']*\\s* backtracking."""
+    return "SELECT * FROM t WHERE name = '" + " " * size + "x'"
+
+
+CASES: Dict[str, Callable[[int], str]] = {
+    "long_select": _long_select,
+    "many_updates": _many_updates,
+    "many_inserts": _many_inserts,
+    "quote_whitespace": _quote_whitespace,
+}
+
+
+def _time_call(func: Callable[[str], object], query: str, repeats: int) -> float:
+    """Return the best wall time in milliseconds over `repeats` runs."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        try:
+            func(query)
+        except SQLSecurityError:
+            pass
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _uncached_validate(query: str) -> bool:
+    # Bypass the LRU memo so every call measures the scan itself
+    error = _find_sql_violation.__wrapped__(query)
+    if error:
+        raise SQLSecurityError(error)
+    return True
+
+
+def run(sizes: List[int] = SIZES, repeats: int = 5) -> Dict[str, Dict[str, List[float]]]:
+    results: Dict[str, Dict[str, List[float]]] = {}
+    for name, build in CASES.items():
+        queries = [build(size) for size in sizes]
+        results[name] = {
+            "sizes": [len(q) for q in queries],
+            "current_ms": [_time_call(_uncached_validate, q, repeats) for q in queries],
+            "legacy_ms": [_time_call(legacy_validate_sql_query, q, repeats) for q in queries],
+        }
+
+    # Memoized path: identical query text served from the LRU cache
+    query = _long_select(sizes[-1])
+    validate_sql_query(query)
+    results["memoized_long_select"] = {
+        "sizes": [len(query)],
+        "current_ms": [_time_call(validate_sql_query, query, repeats)],
+        "legacy_ms": [],
+    }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run(repeats=args.repeats)
+
+    print(f"{'case':<22} {'chars':>8} {'current ms':>12} {'legacy ms':>12}")
+    for name, result in results.items():
+        legacy = result["legacy_ms"] or [None] * len(result["sizes"])
+        for size, current, old in zip(result["sizes"], result["current_ms"], legacy):
+            old_text = f"{old:12.3f}" if old is not None else f"{'-':>12}"
+            print(f"{name:<22} {size:>8} {current:12.3f} {old_text}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Measure server cold-start (import) time against a startup budget.
+
+Imports `server` in fresh interpreters, the work every uvicorn worker repeats
+on spawn. Reports the median wall time and the slowest modules from a
+`python -X importtime` profile, ranked by cumulative time. It also checks
+that the heavy optional dependencies (pandas, pyarrow, numpy, openai,
+anthropic) are deferred until first use. Exits non-zero when the median
+exceeds the budget or a deferred dependency is imported eagerly.
+
+Usage (from app/server):
+    uv run python -m benchmarks.bench_startup
+    uv run python -m benchmarks.bench_startup --budget-ms 800 --json startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List, Tuple
+
+# Target import time for one worker. FastAPI and pydantic alone take most of it.
+STARTUP_BUDGET_MS = 1000
+
+# Modules that must not be imported by `import server`
+DEFERRED_MODULES = ("pandas", "pyarrow", "numpy", "openai", "anthropic", "zstandard")
+
+_IMPORT_SCRIPT = (
+    "import sys, time, json\n"
+    "start = time.perf_counter()\n"
+    "import server\n"
+    "elapsed = (time.perf_counter() - start) * 1000\n"
+    f"loaded = [m for m in {DEFERRED_MODULES!r} if m in sys.modules]\n"
+    "print(json.dumps({'ms': elapsed, 'loaded': loaded}))\n"
+)
+
+
+def _run_python(args: List[str], server_dir: str, workdir: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=server_dir)
+    # Run outside app/server so importing the app doesn't touch its db/ directory
+    return subprocess.run(
+        [sys.executable, *args], cwd=workdir, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def measure_import(server_dir: str, workdir: str) -> Dict[str, Any]:
+    """Import the server once in a fresh interpreter."""
+    output = _run_python(["-c", _IMPORT_SCRIPT], server_dir, workdir).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def import_profile(server_dir: str, workdir: str, top: int) -> List[Tuple[str, float, float]]:
+    """Return the `top` modules by cumulative import time as (module, self_ms, cumulative_ms)."""
+    stderr = _run_python(["-X", "importtime", "-c", "import server"], server_dir, workdir).stderr
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        entries.append((module.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    entries.sort(key=lambda entry: entry[2], reverse=True)
+    return entries[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time")
+    parser.add_argument("--top", type=int, default=15, help="Modules to show from the import profile")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    server_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        runs = [measure_import(server_dir, workdir) for _ in range(args.runs)]
+        profile = import_profile(server_dir, workdir, args.top)
+
+    timings = [run["ms"] for run in runs]
+    eager = sorted({module for run in runs for module in run["loaded"]})
+    median_ms = statistics.median(timings)
+
+    print(f"import server: median {median_ms:.1f} ms over {len(timings)} runs "
+          f"(min {min(timings):.1f}, max {max(timings):.1f}; budget {args.budget_ms:.0f} ms)")
+    print(f"\n{'module':<50} {'self ms':>9} {'cumulative ms':>14}")
+    for module, self_ms, cumulative_ms in profile:
+        print(f"{module:<50} {self_ms:9.1f} {cumulative_ms:14.1f}")
+
+    failures = []
+    if median_ms > args.budget_ms:
+        failures.append(f"median import time {median_ms:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+    if eager:
+        failures.append(f"deferred modules imported at startup: {', '.join(eager)}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "budget_ms": args.budget_ms,
+                "median_ms": median_ms,
+                "runs_ms": timings,
+                "eager_modules": eager,
+                "profile": [
+                    {"module": module, "self_ms": self_ms, "cumulative_ms": cumulative_ms}
+                    for module, self_ms, cumulative_ms in profile
+                ],
+            }, f, indent=2)
+
+    if failures:
+        print("\nFAILED: " + "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Measure throughput with 1..N uvicorn worker processes sharing one side-car cache.
+
+For each --workers count, uvicorn serves benchmarks.stub_app (the real app
+with a stub LLM) from a temporary directory. SHARED_CACHE_PATH points every
+worker at the same side-car file. The dataset is uploaded once. Each
+scenario then runs over real HTTP at --concurrency, and the report gives
+throughput per worker count, per worker and per CPU core.
+
+Worker processes only add throughput up to the number of cores. Past that
+they compete for the same CPUs. Run this on the target machine: the numbers
+depend on core count and on --llm-latency-ms. A cached /api/query never
+calls the LLM, so this also shows what the shared NL→SQL cache saves.
+
+Usage (from app/server):
+    uv run python -m benchmarks.bench_workers
+    uv run python -m benchmarks.bench_workers --workers 1 2 4 8 --concurrency 64 --json workers.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import httpx
+
+from benchmarks.bench_server import DATASET_TABLE, _is_error, make_dataset, run_scenario
+
+SCENARIOS = ["query", "schema", "insights", "export"]
+
+# Seconds to wait for the workers to accept requests
+STARTUP_TIMEOUT = 30
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int, server_dir: str, workdir: str, llm_latency_ms: float) -> subprocess.Popen:
+    os.makedirs(os.path.join(workdir, "db"), exist_ok=True)
+    env = dict(
+        os.environ,
+        PYTHONPATH=server_dir,
+        OPENAI_API_KEY="stub",
+        ANTHROPIC_API_KEY="",
+        SHARED_CACHE_PATH=os.path.join(workdir, "db", "shared_cache.db"),
+        BENCH_LLM_LATENCY_MS=str(llm_latency_ms),
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.stub_app:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL
+    )
+
+
+async def wait_until_ready(base_url: str) -> None:
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/api/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start within {STARTUP_TIMEOUT}s")
+
+
+async def run_worker_count(
+    base_url: str,
+    dataset: bytes,
+    scenarios: List[str],
+    concurrency: int,
+    requests: int
+) -> Dict[str, Dict[str, float]]:
+    await wait_until_ready(base_url)
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=None, limits=limits) as client:
+        response = await client.post(
+            "/api/upload", files={"file": (f"{DATASET_TABLE}.csv", dataset, "text/csv")}
+        )
+        if _is_error(response):
+            raise RuntimeError(f"Dataset upload failed: {response.text}")
+        return {
+            name: await run_scenario(client, name, dataset, concurrency, requests)
+            for name in scenarios
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--rows", type=int, default=10_000, help="Rows in the synthetic dataset")
+    parser.add_argument("--concurrency", type=int, default=32, help="Requests in flight")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario and worker count")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Simulated latency per stub LLM call")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    server_dir = os.getcwd()
+    cores = os.cpu_count() or 1
+    dataset = make_dataset(args.rows)
+    results: Dict[str, Any] = {}
+    for workers in args.workers:
+        port = _free_port()
+        with tempfile.TemporaryDirectory() as workdir:
+            process = start_server(workers, port, server_dir, workdir, args.llm_latency_ms)
+            try:
+                results[str(workers)] = asyncio.run(run_worker_count(
+                    f"http://127.0.0.1:{port}", dataset, args.scenarios, args.concurrency, args.requests
+                ))
+            finally:
+                process.terminate()
+                process.wait()
+
+    print(f"cores={cores} concurrency={args.concurrency} llm_latency_ms={args.llm_latency_ms}")
+    print(f"{'scenario':<10} {'workers':>7} {'err':>4} {'rps':>9} {'rps/worker':>11} {'rps/core':>9} {'p95 ms':>9}")
+    for workers, scenarios in results.items():
+        for name, stats in scenarios.items():
+            rps = stats["throughput_rps"]
+            print(
+                f"{name:<10} {workers:>7} {stats['errors']:>4} {rps:9.1f} {rps / int(workers):11.1f} "
+                f"{rps / min(int(workers), cores):9.1f} {stats['p95_ms']:9.2f}"
+            )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"cores": cores, "concurrency": args.concurrency,
+                       "llm_latency_ms": args.llm_latency_ms, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
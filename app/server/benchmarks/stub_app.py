@@ -0,0 +1,18 @@
+"""
+The real server app with bench_server's stub LLM, for benchmarks that run uvicorn workers.
+
+Simulated LLM latency per call is read from BENCH_LLM_LATENCY_MS.
+"""
+
+import os
+
+from benchmarks.bench_server import StubOpenAI
+from core import llm_processor
+
+StubOpenAI.latency_seconds = float(os.environ.get("BENCH_LLM_LATENCY_MS", "0")) / 1000
+llm_processor.OpenAI = StubOpenAI
+
+from server import app  # noqa: E402
+
+# Re-exported for uvicorn (benchmarks.stub_app:app)
+__all__ = ["app"]
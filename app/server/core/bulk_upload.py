@@ -0,0 +1,246 @@
+"""
+Multi-file and archive uploads converted in parallel.
+
+Each file is converted on a thread pool into its own temporary SQLite
+database, so conversions never wait on each other's write lock. Finished
+tables are copied into the target database one at a time with
+ATTACH + INSERT ... SELECT. The copy runs inside SQLite and is much faster
+than the parse. A .zip or .tar (optionally compressed) upload is expanded
+first and each supported member becomes its own table.
+"""
+
+import io
+import os
+import sqlite3
+import tarfile
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .full_text import sync_full_text_index
+from .file_processor import check_upload_table_name, convert_file_to_sqlite, is_supported_upload, table_name_for_file
+from .ingest import drop_duplicate_keys, ensure_key_index, merge_into_table, refresh_statistics, table_exists
+from .sql_security import execute_query_safely
+from .table_metadata import mark_tables_modified
+
+ARCHIVE_EXTENSIONS = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz')
+
+# Files converted concurrently
+BULK_UPLOAD_WORKERS = min(4, os.cpu_count() or 1)
+
+# Files accepted per request, after expanding archives
+MAX_BULK_FILES = 500
+
+# Total uncompressed size read out of archives (guards against zip bombs)
+MAX_ARCHIVE_BYTES = 1 << 30
+
+
+def is_archive(filename: str) -> bool:
+    return filename.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+def _is_data_member(name: str) -> bool:
+    # Skip directories, hidden files and macOS resource forks
+    parts = name.replace('\\', '/').split('/')
+    if any(part.startswith('.') or part == '__MACOSX' for part in parts):
+        return False
+    return is_supported_upload(name)
+
+
+def _read_archive(filename: str, content: bytes) -> List[Tuple[str, bytes]]:
+    members: List[Tuple[str, bytes]] = []
+    total = 0
+
+    def check_size(size: int) -> None:
+        nonlocal total
+        total += size
+        if total > MAX_ARCHIVE_BYTES:
+            raise ValueError(f"Archive {filename} expands to more than {MAX_ARCHIVE_BYTES} bytes")
+
+    if filename.lower().endswith('.zip'):
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not _is_data_member(info.filename):
+                    continue
+                check_size(info.file_size)
+                members.append((f"{filename}/{info.filename}", archive.read(info)))
+    else:
+        with tarfile.open(fileobj=io.BytesIO(content), mode="r:*") as archive:
+            for info in archive:
+                if not info.isfile() or not _is_data_member(info.name):
+                    continue
+                check_size(info.size)
+                members.append((f"{filename}/{info.name}", archive.extractfile(info).read()))
+    return members
+
+
+def expand_uploads(uploads: List[Tuple[str, bytes]]) -> List[Tuple[str, bytes]]:
+    """
+    Replace archives with their supported members.
+
+    Raises:
+        ValueError: If an archive is unreadable or too large, or there are too many files
+    """
+    files: List[Tuple[str, bytes]] = []
+    for filename, content in uploads:
+        if is_archive(filename):
+            try:
+                files.extend(_read_archive(filename, content))
+            except (zipfile.BadZipFile, tarfile.TarError) as e:
+                raise ValueError(f"Could not read archive {filename}: {str(e)}")
+        else:
+            files.append((filename, content))
+        if len(files) > MAX_BULK_FILES:
+            raise ValueError(f"Too many files: at most {MAX_BULK_FILES} per upload")
+    return files
+
+
+def copy_table(
+    conn: sqlite3.Connection,
+    source_db: str,
+    table_name: str,
+    mode: str = 'replace',
+    key_columns: Sequence[str] = ()
+) -> int:
+    """
+    Load the table of the same name in source_db into table_name in conn's database.
+
+    In replace mode (or when table_name does not exist yet) the table is
+    dropped and recreated; in append and upsert mode the rows are merged into
+    it (see core.ingest). conn must be in autocommit mode
+    (isolation_level=None); the whole load runs in one transaction.
+
+    Returns:
+        int: Number of rows written
+    """
+    conn.execute("ATTACH DATABASE ? AS bulk_source", (source_db,))
+    try:
+        definitions = conn.execute(
+            "SELECT type, sql FROM bulk_source.sqlite_master WHERE tbl_name = ? AND sql IS NOT NULL "
+            "ORDER BY type = 'index'",
+            (table_name,)
+        ).fetchall()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if mode == 'upsert':
+                drop_duplicate_keys(conn, 'bulk_source', table_name, key_columns)
+            if mode != 'replace' and table_exists(conn, table_name):
+                rows_loaded = merge_into_table(conn, 'bulk_source', table_name, table_name, mode, key_columns)
+            else:
+                execute_query_safely(
+                    conn, "DROP TABLE IF EXISTS main.{table}", identifier_params={'table': table_name}, allow_ddl=True
+                )
+                for object_type, sql in definitions:
+                    # Indexes are created after the copy so rows are inserted unindexed
+                    if object_type == 'table':
+                        conn.execute(sql)
+                        rows_loaded = execute_query_safely(
+                            conn,
+                            "INSERT INTO main.{table} SELECT * FROM bulk_source.{table}",
+                            identifier_params={'table': table_name}
+                        ).rowcount
+                    else:
+                        conn.execute(sql)
+                sync_full_text_index(conn, table_name)
+                if mode == 'upsert':
+                    ensure_key_index(conn, table_name, key_columns)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.execute("DETACH DATABASE bulk_source")
+    if mode != 'replace':
+        refresh_statistics(conn, table_name)
+    return rows_loaded
+
+
+def _convert_to_temp_db(filename: str, content: bytes, temp_dir: str, index: int) -> Tuple[Dict[str, Any], str, float]:
+    start = time.perf_counter()
+    temp_db = os.path.join(temp_dir, f"upload_{index}.db")
+    result = convert_file_to_sqlite(filename, content, temp_db)
+    return result, temp_db, time.perf_counter() - start
+
+
+def bulk_convert(
+    uploads: List[Tuple[str, bytes]],
+    db_path: str,
+    workers: int = BULK_UPLOAD_WORKERS,
+    mode: str = 'replace',
+    key_columns: Sequence[str] = ()
+) -> Dict[str, Any]:
+    """
+    Convert many files (archives expanded) into tables of db_path in parallel.
+
+    A failed file does not stop the others; its entry carries the error. When
+    several files map to the same table name, only the first is loaded. mode
+    and key_columns apply to every table, as in convert_file_to_sqlite.
+
+    Returns:
+        Dict with 'files' (per-file results in upload order), 'total_rows',
+        'total_bytes' and 'elapsed_seconds'
+    """
+    start = time.perf_counter()
+    files = expand_uploads(uploads)
+    results: List[Dict[str, Any]] = [
+        {'filename': filename, 'table_name': '', 'table_schema': {}, 'row_count': 0,
+         'bytes': len(content), 'seconds': 0.0, 'error': None}
+        for filename, content in files
+    ]
+
+    # Resolve table names up front so duplicates never race on one table
+    pending = []
+    seen: Dict[str, str] = {}
+    for index, (filename, content) in enumerate(files):
+        entry = results[index]
+        try:
+            if not is_supported_upload(filename):
+                raise ValueError("Only .csv, .json, .jsonl, and .parquet files are supported")
+            table_name = table_name_for_file(filename)
+            check_upload_table_name(db_path, table_name)
+        except Exception as e:
+            entry['error'] = str(e)
+            continue
+        if table_name in seen:
+            entry['error'] = f"Table '{table_name}' is already loaded from {seen[table_name]}"
+            continue
+        seen[table_name] = filename
+        entry['table_name'] = table_name
+        pending.append(index)
+
+    with tempfile.TemporaryDirectory(prefix="bulk_upload_") as temp_dir, \
+            ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {
+            executor.submit(_convert_to_temp_db, files[index][0], files[index][1], temp_dir, index): index
+            for index in pending
+        }
+        conn = sqlite3.connect(db_path, isolation_level=None, timeout=30.0)
+        try:
+            # Copy each table as soon as its conversion finishes
+            for future in as_completed(futures):
+                entry = results[futures[future]]
+                try:
+                    result, temp_db, seconds = future.result()
+                    copy_table(conn, temp_db, result['table_name'], mode, key_columns)
+                    mark_tables_modified(conn, [result['table_name']])
+                    os.remove(temp_db)
+                except Exception as e:
+                    entry['error'] = str(e)
+                    continue
+                entry.update(
+                    table_name=result['table_name'],
+                    table_schema=result['schema'],
+                    row_count=result['row_count'],
+                    seconds=seconds
+                )
+        finally:
+            conn.close()
+
+    return {
+        'files': results,
+        'total_rows': sum(entry['row_count'] for entry in results),
+        'total_bytes': sum(entry['bytes'] for entry in results if entry['error'] is None),
+        'elapsed_seconds': time.perf_counter() - start
+    }
@@ -0,0 +1,84 @@
+"""
+Streaming decompression for compressed uploads (.gz, .zst, .bz2).
+
+open_decompressed() wraps the compressed bytes in a buffered, line-iterable
+reader that decompresses as the converter reads. CSV and JSONL files are
+then loaded chunk by chunk and never exist decompressed in memory. The
+reader stops with an error after MAX_DECOMPRESSED_BYTES, so a small
+compression bomb cannot fill the disk through the database.
+"""
+
+import bz2
+import gzip
+import io
+from typing import BinaryIO, Optional, Tuple
+
+# Compressed file suffix -> codec name
+COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.zst': 'zstd', '.bz2': 'bz2'}
+
+# Upper bound on the decompressed size of one upload
+MAX_DECOMPRESSED_BYTES = 16 << 30
+
+# Read size between the decompressor and the converter
+DECOMPRESS_BUFFER_SIZE = 1 << 16
+
+
+def split_compression(filename: str) -> Tuple[str, Optional[str]]:
+    """Return (filename without the compression suffix, codec), e.g. ('a.csv', 'gzip') for 'a.csv.gz'."""
+    lower = filename.lower()
+    for extension, codec in COMPRESSION_EXTENSIONS.items():
+        if lower.endswith(extension):
+            return filename[:-len(extension)], codec
+    return filename, None
+
+
+class _SizeLimitedReader(io.RawIOBase):
+    """Raw reader over a decompressor that fails once `limit` bytes have been produced."""
+
+    def __init__(self, source: BinaryIO, limit: int):
+        self._source = source
+        self._limit = limit
+        self._total = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = self._source.readinto(buffer)
+        self._total += count or 0
+        if self._total > self._limit:
+            raise ValueError(f"Decompressed upload exceeds {self._limit} bytes")
+        return count
+
+    def close(self) -> None:
+        self._source.close()
+        super().close()
+
+
+def open_decompressed(source: BinaryIO, codec: Optional[str]) -> BinaryIO:
+    """
+    Return a buffered reader yielding the decompressed content of `source`.
+
+    With codec None, `source` is returned unchanged. Decompression happens
+    incrementally as the reader is consumed.
+
+    Raises:
+        ValueError: If the codec is unknown or its library is not installed
+    """
+    if codec is None:
+        return source
+    if codec == 'gzip':
+        decompressor = gzip.GzipFile(fileobj=source, mode='rb')
+    elif codec == 'bz2':
+        decompressor = bz2.BZ2File(source, mode='rb')
+    elif codec == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError("zstandard is required for .zst uploads. Install it with: pip install zstandard")
+        decompressor = zstandard.ZstdDecompressor().stream_reader(source, closefd=False)
+    else:
+        raise ValueError(f"Unsupported compression: {codec}")
+    return io.BufferedReader(
+        _SizeLimitedReader(decompressor, MAX_DECOMPRESSED_BYTES), buffer_size=DECOMPRESS_BUFFER_SIZE
+    )
@@ -0,0 +1,248 @@
+"""
+Bulk synthetic data generation.
+
+Large row counts are split into batches of LLM_BATCH_SIZE rows, generated by
+concurrent LLM requests with a concurrency limit, then deduplicated,
+validated against the table schema and inserted with a single executemany
+in one transaction.
+"""
+
+import logging
+import math
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .llm_processor import generate_synthetic_data
+from .type_inference import BOOLEAN_VALUES
+
+logger = logging.getLogger(__name__)
+
+# Rows produced by one generate_synthetic_data call
+LLM_BATCH_SIZE = 10
+
+# Maximum number of LLM requests in flight at once
+GENERATION_CONCURRENCY = 8
+
+# Largest row count accepted for LLM generation (the statistical provider has no such limit)
+MAX_LLM_ROWS = 100_000
+
+# Extra rounds allowed to top up rows lost to duplicates, invalid values or failed batches
+MAX_TOP_UP_ROUNDS = 3
+
+
+def _type_affinity(declared_type: str) -> str:
+    """Return the SQLite type affinity for a declared column type."""
+    declared_type = (declared_type or "").upper()
+    if "INT" in declared_type:
+        return "INTEGER"
+    if any(t in declared_type for t in ("CHAR", "CLOB", "TEXT")):
+        return "TEXT"
+    if "BLOB" in declared_type or not declared_type:
+        return "BLOB"
+    if any(t in declared_type for t in ("REAL", "FLOA", "DOUB")):
+        return "REAL"
+    # Uploads store dates as ISO text and booleans as 0/1 (see core.type_inference)
+    if "DATE" in declared_type or "TIME" in declared_type:
+        return "TEXT"
+    if "BOOL" in declared_type:
+        return "INTEGER"
+    return "NUMERIC"
+
+
+def _boolean_flag(value: Any) -> Any:
+    """Map true/false, yes/no and t/f (as uploads accept them) to 1/0; other values are left as they are."""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, str):
+        flag = BOOLEAN_VALUES.get(value.strip().lower())
+        return value if flag is None else flag
+    return value
+
+
+def _coerce_value(value: Any, affinity: str) -> Any:
+    """
+    Convert a generated value to match a column's affinity.
+
+    Raises:
+        ValueError: If the value cannot be stored sensibly in the column
+    """
+    if value is None:
+        return None
+    if isinstance(value, (dict, list)):
+        raise ValueError(f"Nested value {value!r} cannot be stored in a column")
+
+    if affinity == "TEXT":
+        return value if isinstance(value, str) else str(value)
+
+    if affinity == "INTEGER":
+        if isinstance(value, bool):
+            return int(value)
+        if isinstance(value, int):
+            return value
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, str):
+            text = value.strip()
+            if text.lower() in ("true", "false"):
+                return int(text.lower() == "true")
+            return int(text)
+        raise ValueError(f"Value {value!r} is not an integer")
+
+    if affinity in ("REAL", "NUMERIC"):
+        if isinstance(value, bool):
+            return int(value)
+        if isinstance(value, (int, float)):
+            return float(value) if affinity == "REAL" else value
+        if isinstance(value, str):
+            number = float(value.strip())
+            if affinity == "NUMERIC" and number.is_integer() and "." not in value:
+                return int(number)
+            return number
+        raise ValueError(f"Value {value!r} is not numeric")
+
+    # BLOB / untyped columns accept any scalar
+    return value
+
+
+def validate_generated_rows(
+    rows: List[Dict[str, Any]],
+    schema_info: Dict[str, str]
+) -> Tuple[List[Tuple[Any, ...]], int]:
+    """
+    Validate generated rows against a table schema.
+
+    Each row must have exactly the schema's columns; values are coerced to the
+    column affinity. Rows are returned as tuples in schema column order.
+
+    Args:
+        rows: Generated rows as dictionaries
+        schema_info: Mapping of column name to declared type
+
+    Returns:
+        Tuple of (valid row tuples, number of rejected rows)
+    """
+    columns = list(schema_info.keys())
+    expected = set(columns)
+    affinities = [_type_affinity(schema_info[col]) for col in columns]
+    # BOOLEAN columns have INTEGER affinity; map their text values to 0/1 first
+    booleans = ["BOOL" in (schema_info[col] or "").upper() for col in columns]
+
+    valid = []
+    rejected = 0
+    for row in rows:
+        if not isinstance(row, dict) or set(row.keys()) != expected:
+            rejected += 1
+            continue
+        try:
+            valid.append(tuple(
+                _coerce_value(_boolean_flag(row[col]) if boolean else row[col], affinity)
+                for col, affinity, boolean in zip(columns, affinities, booleans)
+            ))
+        except (TypeError, ValueError):
+            rejected += 1
+    return valid, rejected
+
+
+def generate_synthetic_rows(
+    table_name: str,
+    schema_info: Dict[str, str],
+    sample_rows: List[Dict[str, Any]],
+    rows: int,
+    concurrency: int = GENERATION_CONCURRENCY
+) -> List[Tuple[Any, ...]]:
+    """
+    Generate `rows` unique, schema-valid rows with concurrent batched LLM calls.
+
+    Work is split into batches of LLM_BATCH_SIZE rows run on a thread pool of at
+    most `concurrency` workers. Duplicates (of each other or of the sample rows)
+    and invalid rows are dropped, and further rounds top up the shortfall.
+
+    Args:
+        table_name: Name of the table being extended
+        schema_info: Mapping of column name to declared type
+        sample_rows: Existing rows shown to the LLM for pattern analysis
+        rows: Number of rows wanted
+        concurrency: Maximum number of concurrent LLM requests
+
+    Returns:
+        List of row tuples in schema column order (at most `rows`)
+
+    Raises:
+        Exception: If every LLM batch fails
+    """
+    sample_tuples, _ = validate_generated_rows(sample_rows, schema_info)
+    seen = set(sample_tuples)
+    unique_rows: List[Tuple[Any, ...]] = []
+    batches_succeeded = 0
+    last_error: Optional[Exception] = None
+
+    for _ in range(1 + MAX_TOP_UP_ROUNDS):
+        needed = rows - len(unique_rows)
+        if needed <= 0:
+            break
+
+        batch_count = math.ceil(needed / LLM_BATCH_SIZE)
+        workers = max(1, min(concurrency, batch_count))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(generate_synthetic_data, table_name, schema_info, sample_rows)
+                for _ in range(batch_count)
+            ]
+            for future in as_completed(futures):
+                try:
+                    batch = future.result()
+                except Exception as e:
+                    last_error = e
+                    logger.warning(f"[WARNING] Synthetic data batch failed: {str(e)}")
+                    continue
+
+                batches_succeeded += 1
+                valid, rejected = validate_generated_rows(batch, schema_info)
+                if rejected:
+                    logger.warning(f"[WARNING] Dropped {rejected} generated rows that did not match the schema")
+                for row in valid:
+                    if row not in seen:
+                        seen.add(row)
+                        unique_rows.append(row)
+
+        if batches_succeeded == 0:
+            break
+
+    if batches_succeeded == 0:
+        raise Exception(f"All synthetic data batches failed: {str(last_error)}")
+
+    return unique_rows[:rows]
+
+
+def insert_rows(
+    conn: sqlite3.Connection,
+    table_name: str,
+    columns: List[str],
+    rows: Iterable[Tuple[Any, ...]]
+) -> int:
+    """
+    Insert rows with a single executemany in one transaction.
+
+    The table name and columns must already be validated identifiers. `rows`
+    may be a generator, so very large inserts need not be held in memory.
+
+    Returns:
+        int: Number of rows inserted
+    """
+    placeholders = ", ".join(["?" for _ in columns])
+    column_names_str = ", ".join([f'"{col}"' for col in columns])
+    insert_sql = f'INSERT INTO "{table_name}" ({column_names_str}) VALUES ({placeholders})'
+
+    inserted = 0
+
+    def counted() -> Iterator[Tuple[Any, ...]]:
+        # Count rows as executemany consumes them; cursor.rowcount can be -1
+        nonlocal inserted
+        for row in rows:
+            inserted += 1
+            yield row
+
+    with conn:
+        conn.executemany(insert_sql, counted())
+    return inserted
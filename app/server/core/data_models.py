@@ -11,7 +11,32 @@ class FileUploadResponse(BaseModel):
     table_name: str
     table_schema: Dict[str, str]  # column_name: data_type
     row_count: int
+    rows_loaded: int = Field(0, description="Rows written from this file (row_count is the whole table)")
     sample_data: List[Dict[str, Any]]
+    child_tables: List[str] = Field(default_factory=list, description="Tables holding the file's arrays (array_tables uploads)")
+    content_hash: Optional[str] = Field(None, description="BLAKE2b hash of the uploaded file")
+    unchanged: bool = Field(False, description="The file repeats the table's last upload, so nothing was loaded")
+    changed_blocks: Optional[int] = Field(None, description="1 MiB blocks that differ from the table's previous upload")
+    full_text_index: Optional[str] = Field(None, description="FTS5 index built over the table's text columns (full_text uploads)")
+    error: Optional[str] = None
+
+class BulkUploadFileResult(BaseModel):
+    filename: str  # Archive members are reported as "archive.zip/member.csv"
+    table_name: str
+    table_schema: Dict[str, str]
+    row_count: int
+    bytes: int
+    seconds: float = Field(0.0, description="Conversion time for this file")
+    error: Optional[str] = None
+
+class BulkUploadResponse(BaseModel):
+    files: List[BulkUploadFileResult]
+    tables_created: int
+    total_rows: int
+    total_bytes: int
+    elapsed_seconds: float
+    rows_per_second: float
+    megabytes_per_second: float
     error: Optional[str] = None
 
 # Query Models  
@@ -19,6 +44,19 @@ class QueryRequest(BaseModel):
     query: str = Field(..., description="Natural language query")
     llm_provider: Literal["openai", "anthropic"] = "openai"
     table_name: Optional[str] = None  # If querying specific table
+    include_timings: bool = Field(False, description="Return a per-phase timing breakdown")
+
+class QueryTimings(BaseModel):
+    schema_ms: float = 0.0
+    prompt_build_ms: float = 0.0
+    llm_ms: float = 0.0
+    validate_ms: float = 0.0
+    sql_ms: float = 0.0
+    serialize_ms: float = 0.0
+    total_ms: float = 0.0
+    rows: int = 0
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
 
 class QueryResponse(BaseModel):
     sql: str
@@ -26,6 +64,7 @@ class QueryResponse(BaseModel):
     columns: List[str]
     row_count: int
     execution_time_ms: float
+    timings: Optional[QueryTimings] = None  # Only when include_timings is set
     error: Optional[str] = None
 
 # Database Schema Models
@@ -40,6 +79,7 @@ class TableSchema(BaseModel):
     columns: List[ColumnInfo]
     row_count: int
     created_at: datetime
+    full_text_columns: List[str] = Field(default_factory=list, description="Columns searchable through the table's FTS5 index")
 
 class DatabaseSchemaRequest(BaseModel):
     pass  # No input needed
@@ -63,6 +103,7 @@ class ColumnInsight(BaseModel):
     max_value: Optional[Any] = None
     avg_value: Optional[float] = None
     most_common: Optional[List[Dict[str, Any]]] = None
+    sample_values: Optional[List[Any]] = None  # Distinct values from a random sample of rows
 
 class InsightsResponse(BaseModel):
     table_name: str
@@ -73,6 +114,9 @@ class InsightsResponse(BaseModel):
 # Random Query Generation Models
 class RandomQueryResponse(BaseModel):
     query: str
+    sql: Optional[str] = None  # Set when served from the suggestion pool
+    row_count: Optional[int] = None  # Rows the SQL returned when it was validated
+    pooled: bool = False
     error: Optional[str] = None
 
 # Health Check Models
@@ -87,19 +131,79 @@ class HealthCheckResponse(BaseModel):
     uptime_seconds: float
 
 # Export Models
+ExportFormat = Literal["csv", "parquet", "arrow", "ndjson"]
+ExportCompression = Literal["gzip", "zstd"]
+
 class ExportRequest(BaseModel):
     table_name: str = Field(..., description="Name of the table to export")
+    format: ExportFormat = Field("csv", description="Export file format")
+    compression: Optional[ExportCompression] = Field(None, description="Compression for csv/ndjson exports")
 
 class QueryExportRequest(BaseModel):
-    data: List[Dict[str, Any]] = Field(..., description="Query result data to export")
-    columns: List[str] = Field(..., description="Column names for the export")
+    sql: Optional[str] = Field(None, description="SQL query to re-execute and stream server-side")
+    data: Optional[List[Dict[str, Any]]] = Field(None, description="Query result data to export (legacy, used when sql is not provided)")
+    columns: List[str] = Field(default_factory=list, description="Column names for the export")
+    format: ExportFormat = Field("csv", description="Export file format")
+    compression: Optional[ExportCompression] = Field(None, description="Compression for csv/ndjson exports")
 
 # Data Generation Models
 class GenerateDataRequest(BaseModel):
     table_name: str = Field(..., description="Name of the table to generate data for")
+    rows: int = Field(10, ge=1, le=5_000_000, description="Number of rows to generate")
+    provider: Literal["llm", "statistical"] = Field(
+        "llm",
+        description="'llm' asks the configured LLM; 'statistical' samples locally fitted column distributions"
+    )
 
 class GenerateDataResponse(BaseModel):
     rows_added: int = Field(..., description="Number of rows successfully added")
     new_row_count: int = Field(..., description="Total number of rows in table after generation")
     table_name: str = Field(..., description="Name of the table that was modified")
-    error: Optional[str] = None
\ No newline at end of file
+    rows_per_second: Optional[float] = Field(None, description="Generation and insert throughput")
+    error: Optional[str] = None
+
+# Saved View Models
+class SaveViewRequest(BaseModel):
+    name: str = Field(..., description="View name (letters, digits and underscores)")
+    query: Optional[str] = Field(None, description="Natural language question; turned into SQL when sql is omitted")
+    sql: Optional[str] = Field(None, description="Read-only SQL to materialize")
+    llm_provider: Literal["openai", "anthropic"] = "openai"
+
+class SavedViewInfo(BaseModel):
+    name: str
+    query: Optional[str] = None
+    sql: str
+    source_tables: List[str]
+    row_count: int
+    refreshed_at: str
+    refresh_ms: float = Field(..., description="Time the last refresh took to run the query")
+    stale: bool = Field(False, description="A source table changed; the next read refreshes the view")
+
+class SavedViewResponse(BaseModel):
+    view: Optional[SavedViewInfo] = None
+    error: Optional[str] = None
+
+class SavedViewListResponse(BaseModel):
+    views: List[SavedViewInfo]
+    error: Optional[str] = None
+
+class SavedViewResultResponse(BaseModel):
+    view: Optional[SavedViewInfo] = None
+    columns: List[str]
+    results: List[Dict[str, Any]]
+    row_count: int
+    refreshed: bool = Field(False, description="The query was re-run for this read because a source table changed")
+    execution_time_ms: float
+    error: Optional[str] = None
+
+# Full-Text Index Models
+class FullTextIndexRequest(BaseModel):
+    columns: Optional[List[str]] = Field(None, description="Text columns to index (default: all)")
+
+class FullTextIndexResponse(BaseModel):
+    table_name: str
+    index_table: str = ""
+    columns: List[str] = Field(default_factory=list)
+    rows_indexed: int = 0
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
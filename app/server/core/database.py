@@ -0,0 +1,184 @@
+"""
+Pooled SQLite connections.
+
+Connections are reused across requests instead of reconnecting for every
+query, and each one keeps a prepared-statement cache (sqlite3's
+cached_statements) so repeated SQL text is not recompiled. A dedicated probe
+connection per database reads PRAGMA data_version, which changes whenever any
+other connection (in this or another process) commits a write.
+
+Pools are kept per database file. With one database per workspace (see
+core.workspaces) at most MAX_OPEN_DATABASES pools stay open; the least
+recently used one is closed when another database is opened.
+
+data_version is only comparable on one connection, so versions are returned
+with the probe's id: a new probe (after its pool was evicted and reopened)
+restarts data_version at 1, and must not match values cached under the old
+one. file_version() gives a version string that every process computes the
+same way, for caches shared between workers.
+"""
+
+import itertools
+import os
+import queue
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+# Ids for probe connections; never reused, so versions from different probes never compare equal
+_probe_ids = itertools.count(1)
+
+# Database used when a request names no workspace; DATABASE_PATH overrides it
+DEFAULT_DB_PATH = os.environ.get("DATABASE_PATH", "db/database.db")
+
+# Databases with an open connection pool; older ones are closed LRU-first
+MAX_OPEN_DATABASES = 32
+
+# Idle connections kept open per database
+POOL_SIZE = 8
+
+# Prepared statements cached per connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+
+def _stat_version(path: str) -> Tuple[int, int]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return (0, 0)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def file_version(db_path: str) -> str:
+    """
+    Return a version string for a database file that changes on every commit.
+
+    Combines the header's file change counter (bumped by each commit in
+    rollback-journal mode) with the size and mtime of the file and its WAL.
+    Reads 100 bytes and two stats; no connection is opened.
+    """
+    try:
+        with open(db_path, "rb") as f:
+            header = f.read(100)
+    except FileNotFoundError:
+        return "missing"
+    change_counter = int.from_bytes(header[24:28], "big") if len(header) == 100 else 0
+    db_stat = _stat_version(db_path)
+    wal_stat = _stat_version(db_path + "-wal")
+    return f"{change_counter}:{db_stat[0]}:{db_stat[1]}:{wal_stat[0]}:{wal_stat[1]}"
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    # Pooled connections are handed to whichever thread serves the request
+    return sqlite3.connect(
+        db_path,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE
+    )
+
+
+class ConnectionPool:
+    """A bounded pool of reusable connections to one SQLite database."""
+
+    def __init__(self, db_path: str, size: int = POOL_SIZE):
+        self.db_path = db_path
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=size)
+        self._probe = None
+        self._probe_id = 0
+        self._probe_lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a connection for the duration of the block.
+
+        The most recently returned connection is reused first so its statement
+        cache stays warm. Connections beyond the pool size, or returned after
+        the pool was closed, are closed on return.
+        """
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = _connect(self.db_path)
+
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            if self._closed:
+                conn.close()
+            else:
+                try:
+                    self._idle.put_nowait(conn)
+                except queue.Full:
+                    conn.close()
+
+    def data_version(self) -> Tuple[int, int]:
+        """
+        Return (probe id, PRAGMA data_version) as seen by this pool's probe connection.
+
+        data_version values are only comparable on the same connection, so a
+        single probe connection that never writes is used for every read. Its
+        value changes after any other connection commits. The probe id makes
+        versions read through a different probe connection unequal.
+        """
+        with self._probe_lock:
+            if self._probe is None:
+                if self._closed:
+                    # Evicted while in use; a one-off id, so the caller won't hit the result cache
+                    conn = _connect(self.db_path)
+                    try:
+                        return next(_probe_ids), conn.execute("PRAGMA data_version").fetchone()[0]
+                    finally:
+                        conn.close()
+                self._probe = _connect(self.db_path)
+                self._probe_id = next(_probe_ids)
+            return self._probe_id, self._probe.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self) -> None:
+        """Close all idle connections and the probe connection."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._probe_lock:
+            if self._probe is not None:
+                self._probe.close()
+                self._probe = None
+
+
+_pools: "OrderedDict[str, ConnectionPool]" = OrderedDict()
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(db_path: str = DEFAULT_DB_PATH) -> ConnectionPool:
+    """Return the shared connection pool for a database path, opening it on demand."""
+    evicted = []
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = ConnectionPool(db_path)
+            _pools[db_path] = pool
+            while len(_pools) > MAX_OPEN_DATABASES:
+                evicted.append(_pools.popitem(last=False)[1])
+        else:
+            _pools.move_to_end(db_path)
+    # Borrowed connections of an evicted pool are closed when returned
+    for old_pool in evicted:
+        old_pool.close()
+    return pool
+
+
+def close_all_pools() -> None:
+    """Close every pooled connection (used on shutdown and in tests)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
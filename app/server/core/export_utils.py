@@ -1,8 +1,57 @@
+import csv
+import gzip
+import json
 import sqlite3
-from typing import List, Dict
-import pandas as pd
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, List, Dict, Iterator, Optional, Any, Sequence, Set
 import io
 
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# pandas, pyarrow and zstandard are imported on first use to keep server
+# startup fast; only their availability is checked at import time
+PYARROW_AVAILABLE = find_spec("pyarrow") is not None
+ZSTD_AVAILABLE = find_spec("zstandard") is not None
+
+# Number of rows fetched from the cursor per streamed chunk
+# (also the Parquet row group / Arrow record batch size)
+EXPORT_BATCH_SIZE = 1000
+
+# Supported export formats and compressions
+EXPORT_FORMATS = ("csv", "parquet", "arrow", "ndjson")
+EXPORT_COMPRESSIONS = ("gzip", "zstd")
+
+# Formats whose output is plain text and can be wrapped in a compressor
+TEXT_EXPORT_FORMATS = ("csv", "ndjson")
+
+# Formats with a typed schema written before the first row (see scan_storage_classes)
+ARROW_EXPORT_FORMATS = ("parquet", "arrow")
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "ndjson": "application/x-ndjson",
+}
+
+EXPORT_EXTENSIONS = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "arrow": ".arrows",
+    "ndjson": ".ndjson",
+}
+
+COMPRESSION_MEDIA_TYPES = {
+    "gzip": "application/gzip",
+    "zstd": "application/zstd",
+}
+
+COMPRESSION_EXTENSIONS = {
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
 
 def generate_csv_from_data(data: List[Dict], columns: List[str]) -> bytes:
     """
@@ -15,6 +64,8 @@ def generate_csv_from_data(data: List[Dict], columns: List[str]) -> bytes:
     Returns:
         bytes: CSV file content as bytes
     """
+    import pandas as pd
+
     if not data and not columns:
         return b""
     
@@ -45,6 +96,8 @@ def generate_csv_from_table(conn: sqlite3.Connection, table_name: str) -> bytes:
     Raises:
         ValueError: If table doesn't exist
     """
+    import pandas as pd
+
     cursor = conn.cursor()
     
     cursor.execute("""
@@ -63,4 +116,400 @@ def generate_csv_from_table(conn: sqlite3.Connection, table_name: str) -> bytes:
     csv_content = csv_buffer.getvalue()
     csv_buffer.close()
     
-    return csv_content.encode('utf-8')
\ No newline at end of file
+    return csv_content.encode('utf-8')
+
+
+class _ChunkSink:
+    """
+    Write-only file object that collects written bytes until drained.
+
+    tell() reports the total number of bytes written so far, so writers that
+    record absolute offsets (e.g. the Parquet footer) stay correct even though
+    the buffered bytes are handed off and discarded after every batch.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def validate_export_options(export_format: str, compression: Optional[str] = None) -> None:
+    """
+    Check that an export format / compression combination can be produced.
+
+    Raises:
+        ValueError: If the format or compression is unknown, the combination is
+            unsupported, or the required optional dependency is not installed
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: '{export_format}'")
+
+    if compression is not None:
+        if compression not in EXPORT_COMPRESSIONS:
+            raise ValueError(f"Unsupported compression: '{compression}'")
+        if export_format not in TEXT_EXPORT_FORMATS:
+            raise ValueError(f"Compression is only supported for {', '.join(TEXT_EXPORT_FORMATS)} exports")
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            raise ValueError(
+                "zstandard is required for zstd compressed exports. "
+                "Install it with: pip install zstandard"
+            )
+
+    if export_format in ARROW_EXPORT_FORMATS and not PYARROW_AVAILABLE:
+        raise ValueError(
+            "PyArrow is required for Parquet and Arrow exports. "
+            "Install it with: pip install pyarrow"
+        )
+
+
+def get_export_media_type(export_format: str, compression: Optional[str] = None) -> str:
+    """Return the HTTP media type for an export."""
+    if compression:
+        return COMPRESSION_MEDIA_TYPES[compression]
+    return EXPORT_MEDIA_TYPES[export_format]
+
+
+def get_export_filename(base_name: str, export_format: str, compression: Optional[str] = None) -> str:
+    """Return the download filename for an export, e.g. users_export.ndjson.gz"""
+    filename = f"{base_name}{EXPORT_EXTENSIONS[export_format]}"
+    if compression:
+        filename += COMPRESSION_EXTENSIONS[compression]
+    return filename
+
+
+def open_table_cursor(conn: sqlite3.Connection, table_name: str) -> sqlite3.Cursor:
+    """
+    Execute a full-table SELECT and return the cursor for streaming.
+
+    Raises:
+        ValueError: If table doesn't exist
+    """
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT name FROM sqlite_master 
+        WHERE type='table' AND name=?
+    """, (table_name,))
+
+    if not cursor.fetchone():
+        raise ValueError(f"Table '{table_name}' does not exist")
+
+    cursor.execute(table_export_sql(table_name))
+    return cursor
+
+
+def _iter_cursor_batches(cursor: sqlite3.Cursor, batch_size: int) -> Iterator[List[tuple]]:
+    """Yield row batches from a cursor until it is exhausted."""
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield rows
+
+
+def _iter_csv_chunks(cursor: sqlite3.Cursor, batch_size: int) -> Iterator[bytes]:
+    columns = [description[0] for description in cursor.description or []]
+    if not columns:
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(columns)
+    yield buffer.getvalue().encode('utf-8')
+
+    for rows in _iter_cursor_batches(cursor, batch_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue().encode('utf-8')
+
+
+def _iter_ndjson_chunks(cursor: sqlite3.Cursor, batch_size: int) -> Iterator[bytes]:
+    columns = [description[0] for description in cursor.description or []]
+
+    for rows in _iter_cursor_batches(cursor, batch_size):
+        lines = [
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str)
+            for row in rows
+        ]
+        yield ("\n".join(lines) + "\n").encode('utf-8')
+
+
+# SQLite storage class of each Python value type sqlite3 returns
+_STORAGE_CLASSES = {int: "integer", float: "real", str: "text", bytes: "blob"}
+
+
+def _storage_classes(values: List[Any]) -> Set[str]:
+    """Storage classes (as named by SQLite's typeof()) of a batch of values, ignoring NULLs."""
+    return {_STORAGE_CLASSES.get(type(value), "text") for value in values if value is not None}
+
+
+def _arrow_type_for(storage_classes: Set[str]) -> "pa.DataType":
+    """Pick the narrowest Arrow type that holds every value of the given storage classes."""
+    import pyarrow as pa
+
+    storage_classes = set(storage_classes) - {"null"}
+    if not storage_classes:
+        return pa.string()
+    if storage_classes == {"integer"}:
+        return pa.int64()
+    if storage_classes <= {"integer", "real"}:
+        return pa.float64()
+    if storage_classes == {"blob"}:
+        return pa.binary()
+    return pa.string()
+
+
+def table_export_sql(table_name: str) -> str:
+    """The SELECT that exports a whole table."""
+    return f'SELECT * FROM "{table_name}"'
+
+
+def scan_storage_classes(cursor: sqlite3.Cursor, sql: str) -> List[Set[str]]:
+    """
+    Find the storage classes present in each result column of sql.
+
+    SQLite columns are dynamically typed, so the first batch of rows does not
+    fix a column's type: an integer column can hold 2.75 or 'abc' further
+    down. Arrow and Parquet exports need the type before the first batch is
+    written, so the query is run once more in SQLite as a single aggregate
+    over typeof() of every column. Run it before the response starts, so a
+    failure is an HTTP error rather than a truncated file.
+
+    Args:
+        cursor: Cursor on which sql has been executed; its connection is reused
+        sql: The query the cursor is streaming
+
+    Returns:
+        One set of storage class names ('integer', 'real', 'text', 'blob')
+        per result column
+    """
+    column_count = len(cursor.description or [])
+    if not column_count:
+        return []
+    # The CTE's column list renames result columns positionally, so duplicate
+    # or unusual column names need no quoting
+    names = ", ".join(f"c{i}" for i in range(column_count))
+    aggregates = ", ".join(f"group_concat(DISTINCT typeof(c{i}))" for i in range(column_count))
+    row = cursor.connection.execute(
+        f"WITH _export_columns({names}) AS ({sql.strip().rstrip(';')}) SELECT {aggregates} FROM _export_columns"
+    ).fetchone()
+    return [set(value.split(",")) if value else set() for value in row]
+
+
+def _storage_classes_for(arrow_type: "pa.DataType") -> Set[str]:
+    import pyarrow as pa
+
+    if pa.types.is_int64(arrow_type):
+        return {"integer"}
+    if pa.types.is_float64(arrow_type):
+        return {"integer", "real"}
+    return {"blob"}
+
+
+def _to_arrow_array(values: List[Any], arrow_type: "pa.DataType", column: str) -> "pa.Array":
+    """
+    Build an Arrow array with a fixed type.
+
+    Values of string columns are stringified. Numeric and binary columns are
+    never converted lossily: a value that does not fit raises ValueError.
+
+    Raises:
+        ValueError: If a value does not fit the column's type, which can only
+            happen when the type was inferred from the first batch
+    """
+    import pyarrow as pa
+
+    if pa.types.is_string(arrow_type):
+        return pa.array([value if value is None or isinstance(value, str) else str(value) for value in values],
+                        type=arrow_type)
+
+    # pa.array would silently truncate 2.75 to 2 in an int64 column
+    extra = _storage_classes(values) - _storage_classes_for(arrow_type)
+    if extra:
+        raise ValueError(
+            f"Column '{column}' has {', '.join(sorted(extra))} values that do not fit its {arrow_type} type"
+        )
+    return pa.array(values, type=arrow_type)
+
+
+def _iter_arrow_chunks(
+    cursor: sqlite3.Cursor,
+    batch_size: int,
+    export_format: str,
+    storage_classes: Optional[Sequence[Set[str]]] = None
+) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    columns = [description[0] for description in cursor.description or []]
+    sink = _ChunkSink()
+    schema = None
+    writer = None
+    if storage_classes is not None:
+        schema = pa.schema([pa.field(name, _arrow_type_for(classes)) for name, classes in zip(columns, storage_classes)])
+
+    for rows in _iter_cursor_batches(cursor, batch_size):
+        column_values = [list(values) for values in zip(*rows)]
+
+        if schema is None:
+            # Without a scan, fall back to the types of the first batch
+            schema = pa.schema([
+                pa.field(name, _arrow_type_for(_storage_classes(values)))
+                for name, values in zip(columns, column_values)
+            ])
+        if writer is None:
+            writer = pq.ParquetWriter(sink, schema) if export_format == "parquet" else pa.ipc.new_stream(sink, schema)
+
+        batch = pa.RecordBatch.from_arrays(
+            [_to_arrow_array(values, field.type, field.name) for values, field in zip(column_values, schema)],
+            schema=schema
+        )
+        if export_format == "parquet":
+            # One row group per fetched batch
+            writer.write_batch(batch, row_group_size=len(rows))
+        else:
+            writer.write_batch(batch)
+
+        chunk = sink.drain()
+        if chunk:
+            yield chunk
+
+    if writer is None:
+        # Empty result: still produce a valid file (all-string unless scanned)
+        if schema is None:
+            schema = pa.schema([pa.field(name, pa.string()) for name in columns])
+        writer = pq.ParquetWriter(sink, schema) if export_format == "parquet" else pa.ipc.new_stream(sink, schema)
+
+    writer.close()
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
+
+
+def _compress_chunks(chunks: Iterator[bytes], compression: str) -> Iterator[bytes]:
+    """Incrementally compress a stream of byte chunks."""
+    sink = _ChunkSink()
+    if compression == "gzip":
+        compressor = gzip.GzipFile(fileobj=sink, mode='wb')
+    else:
+        import zstandard
+
+        compressor = zstandard.ZstdCompressor().stream_writer(sink, closefd=False)
+
+    for chunk in chunks:
+        compressor.write(chunk)
+        compressed = sink.drain()
+        if compressed:
+            yield compressed
+
+    compressor.close()
+    compressed = sink.drain()
+    if compressed:
+        yield compressed
+
+
+def stream_export_from_cursor(
+    cursor: sqlite3.Cursor,
+    export_format: str = "csv",
+    compression: Optional[str] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    storage_classes: Optional[Sequence[Set[str]]] = None
+) -> Iterator[bytes]:
+    """
+    Stream the rows of an executed cursor in the requested export format.
+
+    Rows are fetched in batches and written incrementally, so the full result
+    set is never held in memory. Parquet output gets one row group per batch;
+    Arrow output is an IPC stream with one record batch per batch. The
+    cursor's connection is closed once the stream is exhausted or closed.
+
+    Args:
+        cursor: Cursor on which a SELECT has already been executed
+        export_format: One of EXPORT_FORMATS
+        compression: Optional compression for text formats ("gzip" or "zstd")
+        batch_size: Number of rows fetched per chunk
+        storage_classes: Column storage classes from scan_storage_classes, used
+            to type Arrow and Parquet columns. Without them the types come from
+            the first batch, and a later value that does not fit raises
+            ValueError mid-stream
+
+    Yields:
+        bytes: Encoded export chunks
+    """
+    try:
+        if export_format == "csv":
+            chunks = _iter_csv_chunks(cursor, batch_size)
+        elif export_format == "ndjson":
+            chunks = _iter_ndjson_chunks(cursor, batch_size)
+        else:
+            chunks = _iter_arrow_chunks(cursor, batch_size, export_format, storage_classes)
+
+        if compression:
+            chunks = _compress_chunks(chunks, compression)
+
+        yield from chunks
+    finally:
+        cursor.connection.close()
+
+
+def stream_csv_from_cursor(cursor: sqlite3.Cursor, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """
+    Stream the rows of an executed cursor as CSV chunks.
+
+    Rows are fetched in batches so the full result set is never held in memory.
+    The cursor's connection is closed once the stream is exhausted or closed.
+
+    Args:
+        cursor: Cursor on which a SELECT has already been executed
+        batch_size: Number of rows fetched per chunk
+
+    Yields:
+        bytes: UTF-8 encoded CSV chunks, starting with the header row
+    """
+    return stream_export_from_cursor(cursor, "csv", batch_size=batch_size)
+
+
+def stream_csv_from_table(conn: sqlite3.Connection, table_name: str, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """
+    Stream a database table as CSV chunks.
+
+    Args:
+        conn: SQLite database connection, closed when the stream finishes
+        table_name: Name of the table to export
+        batch_size: Number of rows fetched per chunk
+
+    Returns:
+        Iterator[bytes]: UTF-8 encoded CSV chunks
+
+    Raises:
+        ValueError: If table doesn't exist
+    """
+    return stream_csv_from_cursor(open_table_cursor(conn, table_name), batch_size)
@@ -1,21 +1,58 @@
 import json
-import pandas as pd
+import mmap
+import os
 import sqlite3
 import io
+import posixpath
 import re
-from typing import Dict, Any, Set
+from contextlib import contextmanager
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Dict, Any, BinaryIO, Callable, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
 from .sql_security import (
     execute_query_safely,
+    quote_identifier,
     validate_identifier,
     SQLSecurityError
 )
 from .constants import NESTED_DELIMITER, LIST_INDEX_DELIMITER
+from .database import DEFAULT_DB_PATH
+from .compression import open_decompressed, split_compression
+from .full_text import full_text_tables, sync_full_text_index
+from .ingest import drop_duplicate_keys, ensure_key_index, merge_into_table, refresh_statistics, table_exists
+from .table_metadata import (
+    INTERNAL_TABLE_PREFIX,
+    changed_blocks,
+    get_upload_record,
+    hash_upload,
+    is_internal_table,
+    is_repeat_upload,
+    mark_tables_modified,
+    record_upload
+)
+from .type_inference import convert_chunk, infer_column_types
 
-try:
-    import pyarrow.parquet as pq
-    PYARROW_AVAILABLE = True
-except ImportError:
-    PYARROW_AVAILABLE = False
+# pandas and pyarrow are imported on first use to keep server startup fast
+PYARROW_AVAILABLE = find_spec("pyarrow") is not None
+
+# orjson, when installed, parses JSON and JSONL several times faster than json
+ORJSON_AVAILABLE = find_spec("orjson") is not None
+
+SUPPORTED_EXTENSIONS = ('.csv', '.json', '.jsonl', '.parquet')
+
+# Rows parsed and written at a time when streaming CSV and JSONL uploads
+UPLOAD_CHUNK_ROWS = 100_000
+
+# Distinct (prefix, keys) shapes whose flattened key paths are cached
+FLATTEN_KEY_CACHE_SIZE = 4096
+
+# Columns linking JSONL array child tables to their parent rows
+PARENT_ROW_ID_COLUMN = '_row_id'
+CHILD_PARENT_COLUMN = '_parent_id'
+CHILD_INDEX_COLUMN = '_index'
+
+# Child table column holding array items that are not objects
+ARRAY_VALUE_COLUMN = 'value'
 
 def sanitize_table_name(table_name: str) -> str:
     """
@@ -46,78 +83,236 @@ def sanitize_table_name(table_name: str) -> str:
     
     return sanitized
 
-def convert_csv_to_sqlite(csv_content: bytes, table_name: str, db_path: str = "db/database.db") -> Dict[str, Any]:
+class _StagedTable:
     """
-    Convert CSV file content to SQLite table
+    An upload table written chunk by chunk into a staging table, then moved into place.
+
+    Column types are inferred from the first chunk (see core.type_inference)
+    and every chunk is converted to them. finish() runs inside the caller's
+    transaction and replaces the target table with the staging table or, in
+    append and upsert mode, merges the rows into it (see core.ingest).
     """
-    try:
-        # Sanitize table name
-        table_name = sanitize_table_name(table_name)
-        
-        # Read CSV into pandas DataFrame
-        df = pd.read_csv(io.BytesIO(csv_content))
-        
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        table_name: str,
+        mode: str = 'replace',
+        key_columns: Sequence[str] = (),
+        foreign_key: Optional[Tuple[str, str, str]] = None
+    ):
+        self.conn = conn
+        self.table_name = table_name
+        self.mode = mode
+        self.key_columns = key_columns
+        # (column, parent table, parent column) declared as a FOREIGN KEY
+        self.foreign_key = foreign_key
+        self.staging_table = f"{table_name}__upload"
+        self.column_types: Optional[Dict[str, str]] = None
+
+    def _create_staging(self) -> None:
+        definitions = [f"{quote_identifier(name)} {declared}" for name, declared in self.column_types.items()]
+        if self.foreign_key:
+            column, parent_table, parent_column = self.foreign_key
+            definitions.append(
+                f"FOREIGN KEY ({quote_identifier(column)}) "
+                f"REFERENCES {quote_identifier(parent_table)} ({quote_identifier(parent_column)})"
+            )
+        self.discard()
+        self.conn.execute(f"CREATE TABLE {quote_identifier(self.staging_table)} ({', '.join(definitions)})")
+
+    def write(self, chunk: Any) -> None:
         # Clean column names
-        df.columns = [col.lower().replace(' ', '_').replace('-', '_') for col in df.columns]
-        
-        # Connect to SQLite database
-        conn = sqlite3.connect(db_path)
-        
-        # Write DataFrame to SQLite
-        df.to_sql(table_name, conn, if_exists='replace', index=False)
-        
-        # Get schema information using safe query execution
-        cursor_info = execute_query_safely(
-            conn,
-            "PRAGMA table_info({table})",
-            identifier_params={'table': table_name}
+        chunk.columns = [col.lower().replace(' ', '_').replace('-', '_') for col in chunk.columns]
+        if self.column_types is None:
+            self.column_types = infer_column_types(chunk)
+            self._create_staging()
+        chunk = convert_chunk(chunk, self.column_types)
+        chunk.to_sql(self.staging_table, self.conn, if_exists='append', index=False)
+
+    def finish(self) -> int:
+        """Move the staged rows into table_name and return how many were written."""
+        conn = self.conn
+        if self.mode == 'upsert':
+            drop_duplicate_keys(conn, 'main', self.staging_table, self.key_columns)
+        if self.mode != 'replace' and table_exists(conn, self.table_name):
+            rows_loaded = merge_into_table(
+                conn, 'main', self.staging_table, self.table_name, self.mode, self.key_columns
+            )
+            self.discard()
+            return rows_loaded
+
+        rows_loaded = execute_query_safely(
+            conn, "SELECT COUNT(*) FROM {table}", identifier_params={'table': self.staging_table}
+        ).fetchone()[0]
+        execute_query_safely(
+            conn, "DROP TABLE IF EXISTS {table}", identifier_params={'table': self.table_name}, allow_ddl=True
         )
-        columns_info = cursor_info.fetchall()
-        
-        schema = {}
-        for col in columns_info:
-            schema[col[1]] = col[2]  # column_name: data_type
-        
-        # Get sample data using safe query execution
-        cursor_sample = execute_query_safely(
+        execute_query_safely(
             conn,
-            "SELECT * FROM {table} LIMIT 5",
-            identifier_params={'table': table_name}
+            "ALTER TABLE {staging} RENAME TO {table}",
+            identifier_params={'staging': self.staging_table, 'table': self.table_name},
+            allow_ddl=True
         )
-        sample_rows = cursor_sample.fetchall()
-        column_names = [col[1] for col in columns_info]
-        sample_data = [dict(zip(column_names, row)) for row in sample_rows]
-        
-        # Get row count using safe query execution
-        cursor_count = execute_query_safely(
-            conn,
-            "SELECT COUNT(*) FROM {table}",
-            identifier_params={'table': table_name}
+        # The new table has no index triggers and the index holds the old rows
+        sync_full_text_index(conn, self.table_name)
+        if self.mode == 'upsert':
+            ensure_key_index(conn, self.table_name, self.key_columns)
+        return rows_loaded
+
+    def refresh_statistics(self) -> None:
+        if self.mode != 'replace':
+            refresh_statistics(self.conn, self.table_name)
+
+    def discard(self) -> None:
+        execute_query_safely(
+            self.conn, "DROP TABLE IF EXISTS {table}", identifier_params={'table': self.staging_table}, allow_ddl=True
         )
-        row_count = cursor_count.fetchone()[0]
-        
+
+def _describe_table(conn: sqlite3.Connection, table_name: str) -> Dict[str, Any]:
+    """Return the table's name, schema, row count and first rows as a converter result."""
+    # Get schema information using safe query execution
+    cursor_info = execute_query_safely(
+        conn,
+        "PRAGMA table_info({table})",
+        identifier_params={'table': table_name}
+    )
+    columns_info = cursor_info.fetchall()
+
+    schema = {}
+    for col in columns_info:
+        schema[col[1]] = col[2]  # column_name: data_type
+
+    # Get sample data using safe query execution
+    cursor_sample = execute_query_safely(
+        conn,
+        "SELECT * FROM {table} LIMIT 5",
+        identifier_params={'table': table_name}
+    )
+    sample_rows = cursor_sample.fetchall()
+    column_names = [col[1] for col in columns_info]
+    sample_data = [dict(zip(column_names, row)) for row in sample_rows]
+
+    # Get row count using safe query execution
+    cursor_count = execute_query_safely(
+        conn,
+        "SELECT COUNT(*) FROM {table}",
+        identifier_params={'table': table_name}
+    )
+    row_count = cursor_count.fetchone()[0]
+
+    return {
+        'table_name': table_name,
+        'schema': schema,
+        'row_count': row_count,
+        'sample_data': sample_data
+    }
+
+def _load_chunks(
+    chunks: Iterable[Any],
+    table_name: str,
+    db_path: str,
+    mode: str = 'replace',
+    key_columns: Sequence[str] = ()
+) -> Dict[str, Any]:
+    """
+    Write DataFrame chunks to table_name and return its schema, row count and sample.
+
+    The previous table is only replaced (or, in append and upsert mode,
+    merged into) after the last chunk is staged, so a file that fails
+    halfway leaves it untouched.
+    """
+    conn = sqlite3.connect(db_path)
+    table = _StagedTable(conn, table_name, mode, key_columns)
+    try:
+        for chunk in chunks:
+            table.write(chunk)
+        if table.column_types is None:
+            raise ValueError("File contains no data")
+
+        conn.execute("BEGIN")
+        rows_loaded = table.finish()
+        conn.commit()
+        table.refresh_statistics()
+
+        result = _describe_table(conn, table_name)
+        result['rows_loaded'] = rows_loaded
+        return result
+    except Exception:
+        conn.rollback()
+        table.discard()
+        raise
+    finally:
         conn.close()
-        
-        return {
-            'table_name': table_name,
-            'schema': schema,
-            'row_count': row_count,
-            'sample_data': sample_data
-        }
-        
+
+def convert_csv_to_sqlite(
+    csv_content: bytes,
+    table_name: str,
+    db_path: str = DEFAULT_DB_PATH,
+    mode: str = 'replace',
+    key_columns: Sequence[str] = ()
+) -> Dict[str, Any]:
+    """
+    Convert CSV file content to SQLite table
+    """
+    return convert_csv_stream_to_sqlite(io.BytesIO(csv_content), table_name, db_path, mode, key_columns)
+
+def convert_csv_stream_to_sqlite(
+    stream: BinaryIO,
+    table_name: str,
+    db_path: str = DEFAULT_DB_PATH,
+    mode: str = 'replace',
+    key_columns: Sequence[str] = ()
+) -> Dict[str, Any]:
+    """
+    Convert a CSV stream to SQLite table, reading UPLOAD_CHUNK_ROWS rows at a time.
+
+    Only one chunk is held in memory, so the stream can be a decompressing
+    reader over a file far larger than RAM.
+    """
+    import pandas as pd
+
+    try:
+        # Sanitize table name
+        table_name = sanitize_table_name(table_name)
+
+        # Read CSV into pandas DataFrames chunk by chunk
+        with pd.read_csv(stream, chunksize=UPLOAD_CHUNK_ROWS) as chunks:
+            return _load_chunks(chunks, table_name, db_path, mode, key_columns)
+
     except Exception as e:
         raise Exception(f"Error converting CSV to SQLite: {str(e)}")
 
-def convert_json_to_sqlite(json_content: bytes, table_name: str, db_path: str = "db/database.db") -> Dict[str, Any]:
+def _parse_json_document(content: Union[bytes, memoryview, mmap.mmap]) -> Any:
+    """Parse a whole JSON document from a bytes-like buffer without decoding it to str first."""
+    if ORJSON_AVAILABLE:
+        import orjson
+        try:
+            with memoryview(content) as view:
+                return orjson.loads(view)
+        except ValueError:
+            # Let json decide on input orjson rejects (NaN, huge integers)
+            pass
+    return json.loads(bytes(content).decode('utf-8'))
+
+def convert_json_to_sqlite(
+    json_content: Union[bytes, memoryview, mmap.mmap],
+    table_name: str,
+    db_path: str = DEFAULT_DB_PATH,
+    mode: str = 'replace',
+    key_columns: Sequence[str] = ()
+) -> Dict[str, Any]:
     """
-    Convert JSON file content to SQLite table
+    Convert JSON file content (bytes or a mapped buffer) to SQLite table
     """
+    import pandas as pd
+
     try:
         # Sanitize table name
         table_name = sanitize_table_name(table_name)
         
         # Parse JSON
-        data = json.loads(json_content.decode('utf-8'))
+        data = _parse_json_document(json_content)
         
         # Ensure it's a list of objects
         if not isinstance(data, list):
@@ -129,225 +324,380 @@ def convert_json_to_sqlite(json_content: bytes, table_name: str, db_path: str =
         # Convert to pandas DataFrame
         df = pd.DataFrame(data)
         
-        # Clean column names
-        df.columns = [col.lower().replace(' ', '_').replace('-', '_') for col in df.columns]
-        
-        # Connect to SQLite database
-        conn = sqlite3.connect(db_path)
-        
-        # Write DataFrame to SQLite
-        df.to_sql(table_name, conn, if_exists='replace', index=False)
-        
-        # Get schema information using safe query execution
-        cursor_info = execute_query_safely(
-            conn,
-            "PRAGMA table_info({table})",
-            identifier_params={'table': table_name}
-        )
-        columns_info = cursor_info.fetchall()
-        
-        schema = {}
-        for col in columns_info:
-            schema[col[1]] = col[2]  # column_name: data_type
-        
-        # Get sample data using safe query execution
-        cursor_sample = execute_query_safely(
-            conn,
-            "SELECT * FROM {table} LIMIT 5",
-            identifier_params={'table': table_name}
-        )
-        sample_rows = cursor_sample.fetchall()
-        column_names = [col[1] for col in columns_info]
-        sample_data = [dict(zip(column_names, row)) for row in sample_rows]
-        
-        # Get row count using safe query execution
-        cursor_count = execute_query_safely(
-            conn,
-            "SELECT COUNT(*) FROM {table}",
-            identifier_params={'table': table_name}
-        )
-        row_count = cursor_count.fetchone()[0]
-        
-        conn.close()
-        
-        return {
-            'table_name': table_name,
-            'schema': schema,
-            'row_count': row_count,
-            'sample_data': sample_data
-        }
-        
+        return _load_chunks([df], table_name, db_path, mode, key_columns)
+
     except Exception as e:
         raise Exception(f"Error converting JSON to SQLite: {str(e)}")
 
+@lru_cache(maxsize=FLATTEN_KEY_CACHE_SIZE)
+def _object_key_paths(prefix: str, keys: Tuple[str, ...]) -> Tuple[str, ...]:
+    # Records of one shape share their key paths, so each is joined once
+    if not prefix:
+        return keys
+    return tuple(f"{prefix}{NESTED_DELIMITER}{key}" for key in keys)
+
+@lru_cache(maxsize=FLATTEN_KEY_CACHE_SIZE)
+def _list_key_paths(prefix: str, length: int) -> Tuple[str, ...]:
+    return tuple(f"{prefix}{LIST_INDEX_DELIMITER}{i}" for i in range(length))
+
+def _flatten_into(
+    result: Dict[str, Any],
+    obj: Any,
+    prefix: str,
+    arrays: Optional[Dict[str, List[Any]]] = None
+) -> None:
+    # With `arrays`, lists are collected there by path instead of being flattened
+    stack = [(prefix, obj)]
+
+    while stack:
+        path, value = stack.pop()
+        if type(value) is dict:
+            items = zip(_object_key_paths(path, tuple(value)), value.values())
+        elif type(value) is list:
+            if arrays is not None:
+                if value:
+                    arrays[path] = value
+                continue
+            items = zip(_list_key_paths(path, len(value)), value)
+        else:
+            # Primitive value (string, number, boolean, null)
+            result[path] = value
+            continue
+
+        for item_path, item in items:
+            item_type = type(item)
+            if item_type is dict or item_type is list:
+                stack.append((item_path, item))
+            else:
+                result[item_path] = item
+
 def flatten_json_object(obj: Any, prefix: str = "") -> Dict[str, Any]:
     """
     Flatten a nested JSON object using delimiter constants.
-    
+
+    Walks the object with an explicit stack instead of recursion and writes
+    every leaf straight into one result dict; only nested containers are
+    pushed. Key paths are cached per (prefix, keys) shape, so records of the
+    same shape never rebuild them.
+
     Args:
         obj: The object to flatten (can be dict, list, or primitive)
         prefix: The current prefix for nested keys
-        
+
     Returns:
         Dict with flattened key-value pairs
     """
     result = {}
-    
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            new_key = f"{prefix}{NESTED_DELIMITER}{key}" if prefix else key
-            result.update(flatten_json_object(value, new_key))
-    elif isinstance(obj, list):
-        for i, value in enumerate(obj):
-            new_key = f"{prefix}{LIST_INDEX_DELIMITER}{i}"
-            result.update(flatten_json_object(value, new_key))
-    else:
-        # Primitive value (string, number, boolean, null)
-        result[prefix] = obj
-    
+    _flatten_into(result, obj, prefix)
     return result
 
+def split_json_arrays(obj: Any) -> Tuple[Dict[str, Any], Dict[str, List[Any]]]:
+    """
+    Flatten a JSON object except for its arrays, which are returned by key path.
+
+    Returns:
+        Tuple of (flattened non-array fields, {key path: non-empty array})
+    """
+    result: Dict[str, Any] = {}
+    arrays: Dict[str, List[Any]] = {}
+    _flatten_into(result, obj, "", arrays)
+    return result, arrays
+
+def _flatten_array_item(item: Any) -> Dict[str, Any]:
+    # Objects flatten as usual; scalars (and nested arrays) go under "value"
+    return flatten_json_object(item) if type(item) is dict else flatten_json_object(item, ARRAY_VALUE_COLUMN)
+
+def _iter_jsonl_objects(stream: BinaryIO) -> Iterator[Any]:
+    """Yield the parsed object on each non-blank line of a JSONL stream."""
+    if ORJSON_AVAILABLE:
+        import orjson
+        loads = orjson.loads
+    else:
+        loads = json.loads
+
+    for line_num, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            json_obj = loads(line)
+        except ValueError:
+            # orjson rejects some input the json module accepts (NaN, huge
+            # integers) and reports bad UTF-8 as bad JSON; json decides
+            try:
+                json_obj = json.loads(line.decode('utf-8'))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_num}: {str(e)}")
+        yield json_obj
+
 def discover_jsonl_fields(jsonl_content: bytes) -> Set[str]:
     """
     Discover all possible field names by scanning the entire JSONL file.
-    
+
     Args:
         jsonl_content: The raw JSONL file content
-        
+
     Returns:
         Set of all flattened field names found in the file
     """
+    return discover_jsonl_stream_fields(io.BytesIO(jsonl_content))
+
+def discover_jsonl_stream_fields(stream: BinaryIO) -> Set[str]:
+    """
+    Discover all flattened field names in a JSONL stream, one line at a time.
+    """
     all_fields = set()
-    
+
     try:
-        content = jsonl_content.decode('utf-8')
-        lines = content.strip().split('\n')
-        
-        for line_num, line in enumerate(lines, 1):
-            line = line.strip()
-            if not line:
-                continue
-                
-            try:
-                json_obj = json.loads(line)
-                flattened = flatten_json_object(json_obj)
-                all_fields.update(flattened.keys())
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Invalid JSON on line {line_num}: {str(e)}")
+        for json_obj in _iter_jsonl_objects(stream):
+            all_fields.update(flatten_json_object(json_obj).keys())
     except UnicodeDecodeError:
         raise ValueError("File is not valid UTF-8 encoded text")
-    
+
     return all_fields
 
-def convert_jsonl_to_sqlite(jsonl_content: bytes, table_name: str, db_path: str = "db/database.db") -> Dict[str, Any]:
+def _discover_jsonl_tables(stream: BinaryIO) -> Tuple[Set[str], Dict[str, Set[str]]]:
+    # Fields of the parent rows, and of the items of each array path
+    parent_fields: Set[str] = set()
+    array_fields: Dict[str, Set[str]] = {}
+
+    try:
+        for json_obj in _iter_jsonl_objects(stream):
+            flattened, arrays = split_json_arrays(json_obj)
+            parent_fields.update(flattened.keys())
+            for path, items in arrays.items():
+                fields = array_fields.setdefault(path, set())
+                for item in items:
+                    fields.update(_flatten_array_item(item).keys())
+    except UnicodeDecodeError:
+        raise ValueError("File is not valid UTF-8 encoded text")
+
+    return parent_fields, array_fields
+
+def _load_jsonl_array_tables(
+    open_stream: Callable[[], BinaryIO],
+    table_name: str,
+    db_path: str,
+    mode: str
+) -> Dict[str, Any]:
+    """
+    Load JSONL with each array path in its own child table.
+
+    Parent rows get a PARENT_ROW_ID_COLUMN (unique index). Each item of an
+    array at path p becomes a row of {table_name}__p holding the parent's
+    id (indexed, declared as a FOREIGN KEY), its position in the array and
+    its flattened fields. Arrays nested inside array items stay flattened
+    into indexed columns of the child table.
+    """
+    import pandas as pd
+
+    if mode == 'upsert':
+        raise ValueError("Array child tables support replace and append modes, not upsert")
+
+    # First pass: discover the fields of the parent and of every array
+    parent_fields, array_fields = _discover_jsonl_tables(open_stream())
+    if not parent_fields and not array_fields:
+        raise ValueError("No valid JSON objects found in JSONL file")
+
+    parent_columns = [PARENT_ROW_ID_COLUMN] + sorted(parent_fields)
+    child_columns = {
+        path: [CHILD_PARENT_COLUMN, CHILD_INDEX_COLUMN] + sorted(fields)
+        for path, fields in array_fields.items()
+    }
+    child_names = {
+        path: sanitize_table_name(f"{table_name}{NESTED_DELIMITER}{path}") for path in array_fields
+    }
+
+    conn = sqlite3.connect(db_path)
+    parent = _StagedTable(conn, table_name, mode)
+    children = {
+        path: _StagedTable(
+            conn, child_name, mode, foreign_key=(CHILD_PARENT_COLUMN, table_name, PARENT_ROW_ID_COLUMN)
+        )
+        for path, child_name in child_names.items()
+    }
+    tables = [parent] + list(children.values())
+    try:
+        # Appended rows continue the parent's ids
+        first_row_id = 1
+        if mode == 'append' and table_exists(conn, table_name):
+            columns = [row[1] for row in execute_query_safely(
+                conn, "PRAGMA table_info({table})", identifier_params={'table': table_name}
+            ).fetchall()]
+            if PARENT_ROW_ID_COLUMN in columns:
+                first_row_id += execute_query_safely(
+                    conn,
+                    "SELECT COALESCE(MAX({column}), 0) FROM {table}",
+                    identifier_params={'column': PARENT_ROW_ID_COLUMN, 'table': table_name}
+                ).fetchone()[0]
+
+        # Second pass: write parent and child rows, each in chunks of UPLOAD_CHUNK_ROWS
+        parent_rows: List[List[Any]] = []
+        child_rows: Dict[str, List[List[Any]]] = {path: [] for path in children}
+        for row_id, json_obj in enumerate(_iter_jsonl_objects(open_stream()), first_row_id):
+            flattened, arrays = split_json_arrays(json_obj)
+            parent_rows.append([row_id] + [flattened.get(field) for field in parent_columns[1:]])
+            if len(parent_rows) >= UPLOAD_CHUNK_ROWS:
+                parent.write(pd.DataFrame(parent_rows, columns=parent_columns))
+                parent_rows = []
+
+            for path, items in arrays.items():
+                rows = child_rows[path]
+                fields = child_columns[path][2:]
+                for index, item in enumerate(items):
+                    flattened_item = _flatten_array_item(item)
+                    rows.append([row_id, index] + [flattened_item.get(field) for field in fields])
+                if len(rows) >= UPLOAD_CHUNK_ROWS:
+                    children[path].write(pd.DataFrame(rows, columns=child_columns[path]))
+                    child_rows[path] = []
+
+        if parent_rows or parent.column_types is None:
+            parent.write(pd.DataFrame(parent_rows, columns=parent_columns))
+        for path, rows in child_rows.items():
+            if rows:
+                children[path].write(pd.DataFrame(rows, columns=child_columns[path]))
+
+        conn.execute("BEGIN")
+        rows_loaded = parent.finish()
+        execute_query_safely(
+            conn,
+            "CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {table} ({column})",
+            identifier_params={
+                'index': f"idx_{table_name}_{PARENT_ROW_ID_COLUMN}",
+                'table': table_name,
+                'column': PARENT_ROW_ID_COLUMN
+            },
+            allow_ddl=True
+        )
+        for child in children.values():
+            child.finish()
+            execute_query_safely(
+                conn,
+                "CREATE INDEX IF NOT EXISTS {index} ON {table} ({column})",
+                identifier_params={
+                    'index': f"idx_{child.table_name}_{CHILD_PARENT_COLUMN}",
+                    'table': child.table_name,
+                    'column': CHILD_PARENT_COLUMN
+                },
+                allow_ddl=True
+            )
+        conn.commit()
+        for table in tables:
+            table.refresh_statistics()
+
+        result = _describe_table(conn, table_name)
+        result['rows_loaded'] = rows_loaded
+        result['child_tables'] = sorted(child_names.values())
+        return result
+    except Exception:
+        conn.rollback()
+        for table in tables:
+            table.discard()
+        raise
+    finally:
+        conn.close()
+
+def convert_jsonl_to_sqlite(
+    jsonl_content: bytes,
+    table_name: str,
+    db_path: str = DEFAULT_DB_PATH,
+    mode: str = 'replace',
+    key_columns: Sequence[str] = (),
+    array_tables: bool = False
+) -> Dict[str, Any]:
     """
     Convert JSONL file content to SQLite table with flattened structure.
-    
+
     Args:
         jsonl_content: The raw JSONL file content
         table_name: Name for the SQLite table
-        
+
     Returns:
         Dict containing table info, schema, row count, and sample data
     """
+    stream = io.BytesIO(jsonl_content)
+
+    def open_stream() -> BinaryIO:
+        stream.seek(0)
+        return stream
+
+    return convert_jsonl_stream_to_sqlite(open_stream, table_name, db_path, mode, key_columns, array_tables)
+
+def convert_jsonl_stream_to_sqlite(
+    open_stream: Callable[[], BinaryIO],
+    table_name: str,
+    db_path: str = DEFAULT_DB_PATH,
+    mode: str = 'replace',
+    key_columns: Sequence[str] = (),
+    array_tables: bool = False
+) -> Dict[str, Any]:
+    """
+    Convert a JSONL stream to SQLite table with flattened structure.
+
+    The file is read twice, so open_stream must return a fresh reader from
+    the start on each call. Records are written UPLOAD_CHUNK_ROWS at a time.
+
+    Args:
+        open_stream: Returns a binary reader positioned at the start of the file
+        table_name: Name for the SQLite table
+        db_path: Path to SQLite database
+        mode: 'replace', 'append' or 'upsert' (see core.ingest)
+        key_columns: Columns identifying a row in upsert mode
+        array_tables: Load arrays into child tables instead of indexed columns
+
+    Returns:
+        Dict containing table info, schema, row count, and sample data
+        (plus 'child_tables' with array_tables)
+    """
+    import pandas as pd
+
     try:
         # Sanitize table name
         table_name = sanitize_table_name(table_name)
-        
+
+        if array_tables:
+            return _load_jsonl_array_tables(open_stream, table_name, db_path, mode)
+
         # First pass: discover all possible fields
-        all_fields = discover_jsonl_fields(jsonl_content)
-        
+        all_fields = list(discover_jsonl_stream_fields(open_stream()))
+
         if not all_fields:
             raise ValueError("No valid JSON objects found in JSONL file")
-        
-        # Second pass: process each line and create consistent records
-        content = jsonl_content.decode('utf-8')
-        lines = content.strip().split('\n')
-        
-        records = []
-        for line_num, line in enumerate(lines, 1):
-            line = line.strip()
-            if not line:
-                continue
-                
-            try:
-                json_obj = json.loads(line)
+
+        # Second pass: create consistent records, filling missing fields with None
+        def record_chunks():
+            records = []
+            for json_obj in _iter_jsonl_objects(open_stream()):
                 flattened = flatten_json_object(json_obj)
-                
-                # Create record with all fields, filling missing ones with None
-                record = {}
-                for field in all_fields:
-                    record[field] = flattened.get(field, None)
-                
-                records.append(record)
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Invalid JSON on line {line_num}: {str(e)}")
-        
-        if not records:
-            raise ValueError("No valid records found in JSONL file")
-        
-        # Convert to pandas DataFrame
-        df = pd.DataFrame(records)
-        
-        # Clean column names for SQLite compatibility
-        df.columns = [col.lower().replace(' ', '_').replace('-', '_') for col in df.columns]
-        
-        # Connect to SQLite database
-        conn = sqlite3.connect(db_path)
-        
-        # Write DataFrame to SQLite
-        df.to_sql(table_name, conn, if_exists='replace', index=False)
-        
-        # Get schema information using safe query execution
-        cursor_info = execute_query_safely(
-            conn,
-            "PRAGMA table_info({table})",
-            identifier_params={'table': table_name}
-        )
-        columns_info = cursor_info.fetchall()
-        
-        schema = {}
-        for col in columns_info:
-            schema[col[1]] = col[2]  # column_name: data_type
-        
-        # Get sample data using safe query execution
-        cursor_sample = execute_query_safely(
-            conn,
-            "SELECT * FROM {table} LIMIT 5",
-            identifier_params={'table': table_name}
-        )
-        sample_rows = cursor_sample.fetchall()
-        column_names = [col[1] for col in columns_info]
-        sample_data = [dict(zip(column_names, row)) for row in sample_rows]
-        
-        # Get row count using safe query execution
-        cursor_count = execute_query_safely(
-            conn,
-            "SELECT COUNT(*) FROM {table}",
-            identifier_params={'table': table_name}
-        )
-        row_count = cursor_count.fetchone()[0]
-        
-        conn.close()
-        
-        return {
-            'table_name': table_name,
-            'schema': schema,
-            'row_count': row_count,
-            'sample_data': sample_data
-        }
+                records.append([flattened.get(field) for field in all_fields])
+                if len(records) >= UPLOAD_CHUNK_ROWS:
+                    yield pd.DataFrame(records, columns=all_fields)
+                    records = []
+            if records:
+                yield pd.DataFrame(records, columns=all_fields)
+
+        return _load_chunks(record_chunks(), table_name, db_path, mode, key_columns)
 
     except Exception as e:
         raise Exception(f"Error converting JSONL to SQLite: {str(e)}")
 
-def convert_parquet_to_sqlite(parquet_content: bytes, table_name: str, db_path: str = "db/database.db") -> Dict[str, Any]:
+def convert_parquet_to_sqlite(
+    parquet_content: Union[bytes, BinaryIO],
+    table_name: str,
+    db_path: str = DEFAULT_DB_PATH,
+    mode: str = 'replace',
+    key_columns: Sequence[str] = ()
+) -> Dict[str, Any]:
     """
     Convert Parquet file (including Delta format) content to SQLite table.
 
     Args:
-        parquet_content: The raw Parquet file content
+        parquet_content: The raw Parquet file content, as bytes or a seekable binary file
         table_name: Name for the SQLite table
         db_path: Path to SQLite database
+        mode: 'replace', 'append' or 'upsert' (see core.ingest)
+        key_columns: Columns identifying a row in upsert mode
 
     Returns:
         Dict containing table info, schema, row count, and sample data
@@ -358,12 +708,16 @@ def convert_parquet_to_sqlite(parquet_content: bytes, table_name: str, db_path:
             "Install it with: pip install pyarrow"
         )
 
+    import pyarrow.parquet as pq
+
     try:
         # Sanitize table name
         table_name = sanitize_table_name(table_name)
 
         # Read Parquet file using PyArrow
-        parquet_file = pq.read_table(io.BytesIO(parquet_content))
+        if isinstance(parquet_content, bytes):
+            parquet_content = io.BytesIO(parquet_content)
+        parquet_file = pq.read_table(parquet_content)
 
         # Convert to pandas DataFrame
         df = parquet_file.to_pandas()
@@ -372,53 +726,179 @@ def convert_parquet_to_sqlite(parquet_content: bytes, table_name: str, db_path:
         if df.empty:
             raise ValueError("Parquet file contains no data")
 
-        # Clean column names for SQLite compatibility
-        df.columns = [col.lower().replace(' ', '_').replace('-', '_') for col in df.columns]
+        return _load_chunks([df], table_name, db_path, mode, key_columns)
 
-        # Connect to SQLite database
-        conn = sqlite3.connect(db_path)
+    except Exception as e:
+        raise Exception(f"Error converting Parquet to SQLite: {str(e)}")
 
-        # Write DataFrame to SQLite
-        df.to_sql(table_name, conn, if_exists='replace', index=False)
+@contextmanager
+def _mapped_upload(source: BinaryIO) -> Iterator[Union[bytes, memoryview, mmap.mmap]]:
+    """
+    Expose a whole uncompressed upload to a parser without copying it.
 
-        # Get schema information using safe query execution
-        cursor_info = execute_query_safely(
-            conn,
-            "PRAGMA table_info({table})",
-            identifier_params={'table': table_name}
-        )
-        columns_info = cursor_info.fetchall()
+    A file on disk (such as a spooled upload) is memory-mapped read-only, so
+    the page cache holds its only copy; an in-memory upload is exposed
+    through its buffer.
+    """
+    if isinstance(source, io.BytesIO):
+        with source.getbuffer() as view:
+            yield view
+        return
+    try:
+        fd = source.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        source.seek(0)
+        yield source.read()
+        return
+    source.flush()
+    if os.fstat(fd).st_size == 0:
+        # mmap cannot map an empty file
+        yield b""
+        return
+    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+        yield mapped
 
-        schema = {}
-        for col in columns_info:
-            schema[col[1]] = col[2]  # column_name: data_type
+def is_supported_upload(filename: str) -> bool:
+    """True for .csv, .json, .jsonl and .parquet files, optionally compressed (.gz, .zst, .bz2)."""
+    return split_compression(filename)[0].endswith(SUPPORTED_EXTENSIONS)
 
-        # Get sample data using safe query execution
-        cursor_sample = execute_query_safely(
-            conn,
-            "SELECT * FROM {table} LIMIT 5",
-            identifier_params={'table': table_name}
-        )
-        sample_rows = cursor_sample.fetchall()
-        column_names = [col[1] for col in columns_info]
-        sample_data = [dict(zip(column_names, row)) for row in sample_rows]
+def table_name_for_file(filename: str) -> str:
+    """Derive the table name for an uploaded file or archive member."""
+    base = posixpath.basename(split_compression(filename.replace('\\', '/'))[0])
+    return sanitize_table_name(base.rsplit('.', 1)[0].lower().replace(' ', '_'))
 
-        # Get row count using safe query execution
-        cursor_count = execute_query_safely(
-            conn,
-            "SELECT COUNT(*) FROM {table}",
-            identifier_params={'table': table_name}
-        )
-        row_count = cursor_count.fetchone()[0]
 
+def check_upload_table_name(db_path: str, table_name: str) -> None:
+    """
+    Refuse an upload onto an internal table or a full-text index table.
+
+    Raises:
+        ValueError: If table_name is reserved in db_path
+    """
+    if is_internal_table(table_name):
+        raise ValueError(f"Table names starting with {INTERNAL_TABLE_PREFIX} are reserved")
+    if not os.path.exists(db_path):
+        return
+    conn = sqlite3.connect(db_path)
+    try:
+        if table_name in full_text_tables(conn)[1]:
+            raise ValueError(f"Table name '{table_name}' is reserved for a full-text index")
+    finally:
         conn.close()
 
-        return {
-            'table_name': table_name,
-            'schema': schema,
-            'row_count': row_count,
-            'sample_data': sample_data
-        }
 
-    except Exception as e:
-        raise Exception(f"Error converting Parquet to SQLite: {str(e)}")
\ No newline at end of file
+def convert_file_to_sqlite(
+    filename: str,
+    content: Union[bytes, BinaryIO],
+    db_path: str = DEFAULT_DB_PATH,
+    mode: str = 'replace',
+    key_columns: Sequence[str] = (),
+    array_tables: bool = False,
+    skip_unchanged: bool = False
+) -> Dict[str, Any]:
+    """
+    Convert one uploaded file to a table in db_path, chosen by its extension.
+
+    Compressed files are decompressed as they are read. CSV and JSONL are
+    converted chunk by chunk. A JSON array or Parquet file has to be parsed
+    whole: uncompressed, it is parsed straight from the file (memory-mapped
+    for JSON); compressed, it is decompressed into memory first.
+
+    Args:
+        filename: Upload name, e.g. orders.csv or orders.csv.gz
+        content: The raw (possibly compressed) file, as bytes or a seekable binary file
+        db_path: Path to SQLite database
+        mode: 'replace', 'append' or 'upsert' (see core.ingest)
+        key_columns: Columns identifying a row in upsert mode
+        array_tables: For .jsonl, load arrays into child tables (see _load_jsonl_array_tables)
+        skip_unchanged: Hash the file and skip loading it if it repeats the
+            table's last upload (see core.table_metadata); the upload is
+            recorded either way
+
+    Returns:
+        Dict containing table info, schema, row count (of the whole table),
+        rows_loaded (from this file), and sample data. With skip_unchanged,
+        also content_hash, unchanged, and changed_blocks (blocks differing
+        from the table's previous upload, None without one)
+
+    Raises:
+        ValueError: If array_tables is set for a file other than .jsonl, or
+            the table name is reserved
+    """
+    inner_name, codec = split_compression(filename)
+    table_name = table_name_for_file(filename)
+    source = io.BytesIO(content) if isinstance(content, bytes) else content
+
+    if array_tables and not inner_name.endswith('.jsonl'):
+        raise ValueError("Array child tables are only supported for .jsonl files")
+    check_upload_table_name(db_path, table_name)
+    if not skip_unchanged:
+        return _convert_upload(inner_name, codec, source, table_name, db_path, mode, key_columns, array_tables)
+
+    digest = hash_upload(source)
+    conn = sqlite3.connect(db_path)
+    try:
+        previous = get_upload_record(conn, table_name)
+        if previous and table_exists(conn, table_name) and is_repeat_upload(previous, digest, mode, array_tables):
+            result = _describe_table(conn, table_name)
+            result.update(rows_loaded=0, child_tables=_child_tables(conn, table_name) if array_tables else [])
+            result.update(content_hash=digest.content_hash, unchanged=True, changed_blocks=0)
+            return result
+    finally:
+        conn.close()
+
+    result = _convert_upload(inner_name, codec, source, table_name, db_path, mode, key_columns, array_tables)
+    conn = sqlite3.connect(db_path)
+    try:
+        record_upload(conn, table_name, digest, mode, array_tables)
+        mark_tables_modified(conn, result.get('child_tables', []))
+        conn.commit()
+    finally:
+        conn.close()
+    result.update(
+        content_hash=digest.content_hash,
+        unchanged=False,
+        changed_blocks=changed_blocks(previous.digest, digest) if previous else None
+    )
+    return result
+
+def _child_tables(conn: sqlite3.Connection, table_name: str) -> List[str]:
+    """Names of the array child tables whose foreign key references table_name."""
+    names = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND substr(name, 1, ?) = ? ORDER BY name",
+        (len(table_name) + 2, f"{table_name}__")
+    ).fetchall()
+    return [
+        name for (name,) in names
+        if any(row[2] == table_name for row in conn.execute(f"PRAGMA foreign_key_list({quote_identifier(name)})"))
+    ]
+
+def _convert_upload(
+    inner_name: str,
+    codec: Optional[str],
+    source: BinaryIO,
+    table_name: str,
+    db_path: str,
+    mode: str,
+    key_columns: Sequence[str],
+    array_tables: bool
+) -> Dict[str, Any]:
+    def open_stream() -> BinaryIO:
+        source.seek(0)
+        return open_decompressed(source, codec)
+
+    if inner_name.endswith('.csv'):
+        return convert_csv_stream_to_sqlite(open_stream(), table_name, db_path, mode, key_columns)
+    elif inner_name.endswith('.jsonl'):
+        return convert_jsonl_stream_to_sqlite(open_stream, table_name, db_path, mode, key_columns, array_tables)
+    elif inner_name.endswith('.parquet'):
+        if codec is None:
+            source.seek(0)
+            return convert_parquet_to_sqlite(source, table_name, db_path, mode, key_columns)
+        return convert_parquet_to_sqlite(open_stream().read(), table_name, db_path, mode, key_columns)
+    elif inner_name.endswith('.json'):
+        if codec is None:
+            with _mapped_upload(source) as buffer:
+                return convert_json_to_sqlite(buffer, table_name, db_path, mode, key_columns)
+        return convert_json_to_sqlite(open_stream().read(), table_name, db_path, mode, key_columns)
+    raise ValueError("Only .csv, .json, .jsonl, and .parquet files are supported")
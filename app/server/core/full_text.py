@@ -0,0 +1,201 @@
+"""
+FTS5 full-text indexes over the text columns of uploaded tables.
+
+The index on table t is the FTS5 table t_fts. It is an external-content
+index (content='t'), so the text is not stored twice. Triggers keep it in
+step with inserts, updates and deletes on t, which covers append and
+upsert uploads and generated rows. A replace upload swaps in a new t, so
+the load paths call sync_full_text_index to rebuild the index over the new
+rows.
+
+The LLM is shown each index as part of its table's schema, with a MATCH
+example, rather than as a table of its own. FTS5's shadow tables
+(t_fts_data, t_fts_idx, ...) are hidden.
+"""
+
+import re
+import sqlite3
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from .sql_security import quote_identifier
+from .table_metadata import is_internal_table
+
+FTS_SUFFIX = '_fts'
+
+# Tables FTS5 creates alongside each index
+_SHADOW_SUFFIXES = ('_data', '_idx', '_content', '_docsize', '_config')
+
+_CONTENT_OPTION = re.compile(r"content\s*=\s*'((?:[^']|'')*)'", re.IGNORECASE)
+
+_FTS5_TABLE = re.compile(r"CREATE\s+VIRTUAL\s+TABLE\b.*\bUSING\s+fts5\b", re.IGNORECASE | re.DOTALL)
+
+# Declared column types that are indexed; DATE/TIMESTAMP text is not worth searching
+_TEXT_TYPES = ('TEXT', 'VARCHAR', 'CHAR', 'CLOB', 'STRING')
+
+
+def full_text_table(table_name: str) -> str:
+    return f"{table_name}{FTS_SUFFIX}"
+
+
+def _trigger_names(table_name: str) -> Tuple[str, str, str]:
+    index_table = full_text_table(table_name)
+    return f"{index_table}_ai", f"{index_table}_ad", f"{index_table}_au"
+
+
+def _is_shadow_table(name: str, sql: Optional[str]) -> bool:
+    # FTS5 creates its shadow tables as CREATE TABLE '<name>'(...), with the name single-quoted
+    quoted = name.replace("'", "''")
+    return sql is not None and sql.startswith(f"CREATE TABLE '{quoted}'(")
+
+
+def full_text_tables(conn: sqlite3.Connection) -> Tuple[Dict[str, Dict[str, Any]], Set[str]]:
+    """
+    Find the full-text indexes in a database.
+
+    Only this module's indexes (t_fts with content='t') are hidden, along
+    with the shadow tables of any FTS5 table. A shadow name counts only if
+    sqlite_master shows FTS5 created it, so a user table that happens to be
+    called t_fts_content stays visible.
+
+    Returns:
+        Tuple of ({indexed table: {'table': index table, 'columns': [...]}},
+        names of every index and shadow table, to hide from schema listings)
+    """
+    indexes: Dict[str, Dict[str, Any]] = {}
+    hidden: Set[str] = set()
+    tables = dict(conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table'").fetchall())
+    for name, sql in tables.items():
+        if not sql or not _FTS5_TABLE.match(sql):
+            continue
+        hidden.update(
+            shadow for shadow in (f"{name}{suffix}" for suffix in _SHADOW_SUFFIXES)
+            if _is_shadow_table(shadow, tables.get(shadow))
+        )
+        match = _CONTENT_OPTION.search(sql)
+        content = match.group(1).replace("''", "'") if match else ""
+        if content and name == full_text_table(content):
+            hidden.add(name)
+            columns = [row[1] for row in conn.execute(f"PRAGMA table_info({quote_identifier(name)})")]
+            indexes[content] = {'table': name, 'columns': columns}
+    return indexes, hidden
+
+
+def full_text_owners(conn: sqlite3.Connection) -> Dict[str, str]:
+    """
+    Map each hidden full-text table to the table whose writes it reflects.
+
+    An index t_fts and its shadow tables map to t. Shadow tables of any
+    other FTS5 table map to that FTS5 table.
+    """
+    indexes, hidden = full_text_tables(conn)
+    owners = {info['table']: table_name for table_name, info in indexes.items()}
+    for name in hidden - set(owners):
+        for suffix in _SHADOW_SUFFIXES:
+            if name.endswith(suffix):
+                fts_table = name[:-len(suffix)]
+                owners[name] = owners.get(fts_table, fts_table)
+                break
+    return owners
+
+
+def text_columns(conn: sqlite3.Connection, table_name: str) -> List[str]:
+    """Columns of table_name declared with a text type."""
+    return [
+        row[1] for row in conn.execute(f"PRAGMA table_info({quote_identifier(table_name)})")
+        if row[2].upper().startswith(_TEXT_TYPES)
+    ]
+
+
+def drop_full_text_index(conn: sqlite3.Connection, table_name: str) -> bool:
+    """Drop table_name's index and its triggers. Returns False if it had none."""
+    index_table = full_text_table(table_name)
+    for trigger in _trigger_names(table_name):
+        conn.execute(f"DROP TRIGGER IF EXISTS {quote_identifier(trigger)}")
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (index_table,)
+    ).fetchone() is not None
+    conn.execute(f"DROP TABLE IF EXISTS {quote_identifier(index_table)}")
+    return exists
+
+
+def create_full_text_index(
+    conn: sqlite3.Connection,
+    table_name: str,
+    columns: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """
+    Build (or rebuild) the full-text index on table_name. The caller commits.
+
+    Args:
+        conn: SQLite connection
+        table_name: Table to index
+        columns: Columns to index (default: every text column)
+
+    Returns:
+        Dict with 'table' (the index table), 'columns' and 'rows' indexed
+
+    Raises:
+        ValueError: If the table does not exist, is internal, has no text
+            columns, or its index name is taken by another table
+    """
+    if is_internal_table(table_name) or conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,)
+    ).fetchone() is None:
+        raise ValueError(f"Table '{table_name}' not found")
+    available = text_columns(conn, table_name)
+    columns = list(columns) if columns is not None else available
+    missing = [column for column in columns if column not in available]
+    if missing:
+        raise ValueError(f"Not text columns of '{table_name}': {', '.join(missing)}")
+    if not columns:
+        raise ValueError(f"Table '{table_name}' has no text columns to index")
+
+    index_table = full_text_table(table_name)
+    existing = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (index_table,)).fetchone()
+    if existing and 'fts5' not in existing[0].lower():
+        raise ValueError(f"Table '{index_table}' already exists and is not a full-text index")
+    drop_full_text_index(conn, table_name)
+
+    table = quote_identifier(table_name)
+    index = quote_identifier(index_table)
+    column_list = ", ".join(quote_identifier(column) for column in columns)
+    new_values = ", ".join(f"new.{quote_identifier(column)}" for column in columns)
+    old_values = ", ".join(f"old.{quote_identifier(column)}" for column in columns)
+    content = table_name.replace("'", "''")
+    insert_trigger, delete_trigger, update_trigger = (quote_identifier(name) for name in _trigger_names(table_name))
+
+    conn.execute(f"CREATE VIRTUAL TABLE {index} USING fts5({column_list}, content='{content}')")
+    conn.execute(
+        f"CREATE TRIGGER {insert_trigger} AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {index} (rowid, {column_list}) VALUES (new.rowid, {new_values}); END"
+    )
+    conn.execute(
+        f"CREATE TRIGGER {delete_trigger} AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {index} ({index}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values}); END"
+    )
+    conn.execute(
+        f"CREATE TRIGGER {update_trigger} AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {index} ({index}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values}); "
+        f"INSERT INTO {index} (rowid, {column_list}) VALUES (new.rowid, {new_values}); END"
+    )
+    conn.execute(f"INSERT INTO {index} ({index}) VALUES ('rebuild')")
+    rows = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    return {'table': index_table, 'columns': columns, 'rows': rows}
+
+
+def sync_full_text_index(conn: sqlite3.Connection, table_name: str) -> None:
+    """
+    Rebuild table_name's index, if it has one, after the table was replaced.
+
+    Columns that are no longer text columns of the table are dropped from
+    the index, and the index is dropped if none are left.
+    """
+    index = full_text_tables(conn)[0].get(table_name)
+    if index is None:
+        return
+    available = set(text_columns(conn, table_name))
+    columns = [column for column in index['columns'] if column in available]
+    if columns:
+        create_full_text_index(conn, table_name, columns)
+    else:
+        drop_full_text_index(conn, table_name)
@@ -0,0 +1,156 @@
+"""
+Ingest modes for uploads: replace, append and upsert.
+
+Converters first load a file into a staging table (or, for bulk uploads, a
+table in a temporary database). `replace` swaps that table in for the old
+one. `append` and `upsert` instead merge its rows into the existing table,
+which keeps the table's indexes and statistics and costs time in
+proportion to the upload, not the table:
+
+- Columns new in the upload are added to the table. Columns missing from
+  the upload are left NULL in the new rows.
+- `upsert` matches rows on the declared key columns. A unique index on those
+  columns is created on first use, and the last upload row wins for
+  duplicate keys.
+- Tables that already have planner statistics are re-analyzed with a
+  bounded sample (PRAGMA analysis_limit) rather than a full scan.
+"""
+
+import sqlite3
+from typing import List, Optional, Sequence, Tuple
+
+from .sql_security import quote_identifier
+
+INGEST_MODES = ('replace', 'append', 'upsert')
+
+# Rows examined per index when refreshing statistics after a merge
+ANALYSIS_LIMIT = 1000
+
+
+def _clean_column_name(name: str) -> str:
+    # Same cleaning the converters apply to uploaded column names
+    return name.strip().lower().replace(' ', '_').replace('-', '_')
+
+
+def parse_ingest_mode(mode: str, key_columns: Optional[str] = None) -> Tuple[str, List[str]]:
+    """
+    Validate an upload's ingest mode and comma-separated key columns.
+
+    Returns:
+        Tuple of (mode, key column names cleaned like uploaded column names)
+
+    Raises:
+        ValueError: If the mode is unknown or upsert has no key columns
+    """
+    mode = (mode or 'replace').lower()
+    if mode not in INGEST_MODES:
+        raise ValueError(f"Invalid ingest mode '{mode}': use one of {', '.join(INGEST_MODES)}")
+    keys = [_clean_column_name(name) for name in (key_columns or '').split(',') if name.strip()]
+    if mode == 'upsert' and not keys:
+        raise ValueError("Upsert mode requires key_columns")
+    return mode, keys
+
+
+def table_exists(conn: sqlite3.Connection, table_name: str, schema: str = 'main') -> bool:
+    row = conn.execute(
+        f"SELECT 1 FROM {quote_identifier(schema)}.sqlite_master WHERE type = 'table' AND name = ?", (table_name,)
+    ).fetchone()
+    return row is not None
+
+
+def _table_columns(conn: sqlite3.Connection, table_name: str, schema: str = 'main') -> List[Tuple[str, str]]:
+    rows = conn.execute(
+        f"PRAGMA {quote_identifier(schema)}.table_info({quote_identifier(table_name)})"
+    ).fetchall()
+    return [(row[1], row[2]) for row in rows]
+
+
+def drop_duplicate_keys(conn: sqlite3.Connection, schema: str, table_name: str, key_columns: Sequence[str]) -> None:
+    """
+    Keep only the last row for each key in an upload table.
+
+    Raises:
+        ValueError: If a key column is not in the upload
+    """
+    columns = {name for name, _ in _table_columns(conn, table_name, schema)}
+    missing = [key for key in key_columns if key not in columns]
+    if missing:
+        raise ValueError(f"Key columns not found in upload: {', '.join(missing)}")
+    keys = ", ".join(quote_identifier(key) for key in key_columns)
+    source = f"{quote_identifier(schema)}.{quote_identifier(table_name)}"
+    conn.execute(f"DELETE FROM {source} WHERE rowid NOT IN (SELECT MAX(rowid) FROM {source} GROUP BY {keys})")
+
+
+def ensure_key_index(conn: sqlite3.Connection, table_name: str, key_columns: Sequence[str]) -> None:
+    """
+    Create the unique index that upserts into table_name resolve conflicts on.
+
+    Raises:
+        ValueError: If the table's existing rows repeat a key
+    """
+    index_name = f"{table_name}__key__{'__'.join(key_columns)}"
+    keys = ", ".join(quote_identifier(key) for key in key_columns)
+    try:
+        conn.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {quote_identifier(index_name)} "
+            f"ON {quote_identifier(table_name)} ({keys})"
+        )
+    except sqlite3.IntegrityError:
+        raise ValueError(f"Existing rows of '{table_name}' are not unique on {', '.join(key_columns)}")
+
+
+def merge_into_table(
+    conn: sqlite3.Connection,
+    schema: str,
+    source_table: str,
+    table_name: str,
+    mode: str,
+    key_columns: Sequence[str] = ()
+) -> int:
+    """
+    Append or upsert the rows of schema.source_table into an existing main.table_name.
+
+    The caller owns the transaction. For upsert, call drop_duplicate_keys on
+    the source first.
+
+    Returns:
+        int: Number of upload rows written
+    """
+    target_columns = {name for name, _ in _table_columns(conn, table_name)}
+    source_columns = _table_columns(conn, source_table, schema)
+
+    # Schema reconciliation: new upload columns become new (nullable) table columns
+    for name, declared_type in source_columns:
+        if name not in target_columns:
+            conn.execute(
+                f"ALTER TABLE {quote_identifier(table_name)} ADD COLUMN {quote_identifier(name)} {declared_type}"
+            )
+
+    columns = ", ".join(quote_identifier(name) for name, _ in source_columns)
+    insert_sql = (
+        f"INSERT INTO main.{quote_identifier(table_name)} ({columns}) "
+        f"SELECT {columns} FROM {quote_identifier(schema)}.{quote_identifier(source_table)}"
+    )
+    if mode == 'upsert':
+        missing = [key for key in key_columns if key not in target_columns]
+        if missing:
+            raise ValueError(f"Key columns not found in table '{table_name}': {', '.join(missing)}")
+        ensure_key_index(conn, table_name, key_columns)
+        updates = ", ".join(
+            f"{quote_identifier(name)} = excluded.{quote_identifier(name)}"
+            for name, _ in source_columns if name not in key_columns
+        )
+        # WHERE true resolves the parsing ambiguity between a join and ON CONFLICT
+        insert_sql += f" WHERE true ON CONFLICT ({', '.join(quote_identifier(key) for key in key_columns)}) "
+        insert_sql += f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+    return conn.execute(insert_sql).rowcount
+
+
+def refresh_statistics(conn: sqlite3.Connection, table_name: str) -> None:
+    """Re-analyze table_name from a bounded sample if it already has planner statistics."""
+    if not table_exists(conn, 'sqlite_stat1'):
+        return
+    if conn.execute("SELECT 1 FROM sqlite_stat1 WHERE tbl = ? LIMIT 1", (table_name,)).fetchone() is None:
+        return
+    conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+    conn.execute(f"ANALYZE {quote_identifier(table_name)}")
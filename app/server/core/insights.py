@@ -1,21 +1,31 @@
 import sqlite3
 from typing import List, Optional
 from core.data_models import ColumnInsight
+from .database import DEFAULT_DB_PATH
+from .sampling import sample_rows
 from .sql_security import (
     execute_query_safely,
     validate_identifier,
     SQLSecurityError
 )
 
-def generate_insights(table_name: str, column_names: Optional[List[str]] = None) -> List[ColumnInsight]:
+# Random rows sampled per table, and example values reported per column
+INSIGHTS_SAMPLE_ROWS = 20
+INSIGHTS_SAMPLE_VALUES = 5
+
+def generate_insights(
+    table_name: str,
+    column_names: Optional[List[str]] = None,
+    db_path: Optional[str] = None
+) -> List[ColumnInsight]:
     """
-    Generate statistical insights for table columns
+    Generate statistical insights for table columns in db_path (default database if None)
     """
     try:
         # Validate table name
         validate_identifier(table_name, "table")
         
-        conn = sqlite3.connect("db/database.db")
+        conn = sqlite3.connect(db_path or DEFAULT_DB_PATH)
         
         # Get table schema using safe query execution
         cursor_info = execute_query_safely(
@@ -36,6 +46,9 @@ def generate_insights(table_name: str, column_names: Optional[List[str]] = None)
                 except SQLSecurityError:
                     raise Exception(f"Invalid column name: {col}")
         
+        # One random sample shared by all columns for example values
+        sample_columns, sampled = sample_rows(conn, table_name, INSIGHTS_SAMPLE_ROWS)
+        
         insights = []
         
         for col_info in columns_info:
@@ -74,6 +87,12 @@ def generate_insights(table_name: str, column_names: Optional[List[str]] = None)
                 null_count=null_count
             )
             
+            # Example values from the random sample
+            col_index = sample_columns.index(col_name)
+            insight.sample_values = list(dict.fromkeys(
+                row[col_index] for row in sampled if row[col_index] is not None
+            ))[:INSIGHTS_SAMPLE_VALUES]
+            
             # Type-specific insights
             if col_type in ['INTEGER', 'REAL', 'NUMERIC']:
                 # Numeric insights using safe query execution
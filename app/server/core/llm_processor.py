@@ -1,10 +1,47 @@
 import os
 import json
-from typing import Dict, Any, List
-from openai import OpenAI
-from anthropic import Anthropic
+from typing import Dict, Any, List, Optional
 from core.data_models import QueryRequest
 from core.sql_processor import execute_sql_safely
+from core.metrics import LLM_TOKENS, timed
+from core.tracing import record_llm_usage
+
+# The openai and anthropic SDKs take most of the server's import time, so the
+# client classes are imported on first use (see _openai_client/_anthropic_client).
+# Tests patch these module attributes directly.
+OpenAI = None
+Anthropic = None
+
+def _openai_client(api_key: str) -> Any:
+    """Create an OpenAI client, importing the SDK on first use."""
+    global OpenAI
+    if OpenAI is None:
+        from openai import OpenAI
+    return OpenAI(api_key=api_key)
+
+def _anthropic_client(api_key: str) -> Any:
+    """Create an Anthropic client, importing the SDK on first use."""
+    global Anthropic
+    if Anthropic is None:
+        from anthropic import Anthropic
+    return Anthropic(api_key=api_key)
+
+def _record_usage(response: Any) -> None:
+    """Record token usage from an OpenAI or Anthropic response, if reported."""
+    usage = getattr(response, "usage", None)
+    # OpenAI reports prompt/completion tokens, Anthropic input/output tokens
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    if not isinstance(prompt_tokens, int):
+        prompt_tokens = getattr(usage, "input_tokens", None)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+    if not isinstance(completion_tokens, int):
+        completion_tokens = getattr(usage, "output_tokens", None)
+
+    if isinstance(prompt_tokens, int):
+        LLM_TOKENS.inc("prompt", amount=prompt_tokens)
+    if isinstance(completion_tokens, int):
+        LLM_TOKENS.inc("completion", amount=completion_tokens)
+    record_llm_usage(prompt_tokens, completion_tokens)
 
 def generate_sql_with_openai(query_text: str, schema_info: Dict[str, Any]) -> str:
     """
@@ -16,10 +53,11 @@ def generate_sql_with_openai(query_text: str, schema_info: Dict[str, Any]) -> st
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
         
-        client = OpenAI(api_key=api_key)
+        client = _openai_client(api_key)
         
-        # Format schema for prompt
-        schema_description = format_schema_for_prompt(schema_info)
+        # Format schema for prompt (the bulk of prompt building)
+        with timed("prompt_build"):
+            schema_description = format_schema_for_prompt(schema_info)
         
         # Create prompt
         prompt = f"""Given the following database schema:
@@ -38,18 +76,21 @@ Rules:
 - Limit results to reasonable amounts (e.g., add LIMIT 100 for large result sets)
 - When joining tables, use meaningful relationships between tables
 - NEVER include SQL comments (-- or /* */) in the query
+- To search for words in columns covered by a full-text index, use MATCH on the index (as shown in the schema) instead of LIKE '%...%'
 
 SQL Query:"""
         
         # Call OpenAI API
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a SQL expert. Convert natural language to SQL queries."},
-                {"role": "user", "content": prompt}
-            ],
-            max_completion_tokens=500
-        )
+        with timed("llm"):
+            response = client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": "You are a SQL expert. Convert natural language to SQL queries."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_completion_tokens=500
+            )
+        _record_usage(response)
         
         sql = response.choices[0].message.content.strip()
         
@@ -76,10 +117,11 @@ def generate_sql_with_anthropic(query_text: str, schema_info: Dict[str, Any]) ->
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable not set")
         
-        client = Anthropic(api_key=api_key)
+        client = _anthropic_client(api_key)
         
-        # Format schema for prompt
-        schema_description = format_schema_for_prompt(schema_info)
+        # Format schema for prompt (the bulk of prompt building)
+        with timed("prompt_build"):
+            schema_description = format_schema_for_prompt(schema_info)
         
         # Create prompt
         prompt = f"""Given the following database schema:
@@ -98,18 +140,21 @@ Rules:
 - Limit results to reasonable amounts (e.g., add LIMIT 100 for large result sets)
 - When joining tables, use meaningful relationships between tables
 - NEVER include SQL comments (-- or /* */) in the query
+- To search for words in columns covered by a full-text index, use MATCH on the index (as shown in the schema) instead of LIKE '%...%'
 
 SQL Query:"""
         
         # Call Anthropic API
-        response = client.messages.create(
-            model="claude-sonnet-4-0",
-            max_tokens=500,
-            temperature=0.1,
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
-        )
+        with timed("llm"):
+            response = client.messages.create(
+                model="claude-sonnet-4-0",
+                max_tokens=500,
+                temperature=0.1,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ]
+            )
+        _record_usage(response)
         
         sql = response.content[0].text.strip()
         
@@ -126,6 +171,20 @@ SQL Query:"""
     except Exception as e:
         raise Exception(f"Error generating SQL with Anthropic: {str(e)}")
 
+# Longest sample value shown in prompts before truncation
+PROMPT_SAMPLE_VALUE_LENGTH = 50
+
+def _format_sample_row(row: Dict[str, Any]) -> str:
+    """Render a sample row as compact JSON, truncating long values."""
+    shown = {}
+    for key, value in row.items():
+        if isinstance(value, bytes):
+            value = f"<{len(value)} bytes>"
+        elif isinstance(value, str) and len(value) > PROMPT_SAMPLE_VALUE_LENGTH:
+            value = value[:PROMPT_SAMPLE_VALUE_LENGTH] + "..."
+        shown[key] = value
+    return json.dumps(shown, default=str)
+
 def format_schema_for_prompt(schema_info: Dict[str, Any]) -> str:
     """
     Format database schema for LLM prompt
@@ -140,6 +199,21 @@ def format_schema_for_prompt(schema_info: Dict[str, Any]) -> str:
             lines.append(f"  - {col_name} ({col_type})")
         
         lines.append(f"Row count: {table_info['row_count']}")
+
+        full_text_index = table_info.get('full_text_index')
+        if full_text_index:
+            index_table = full_text_index['table']
+            lines.append(f"Full-text index: {index_table} (columns: {', '.join(full_text_index['columns'])})")
+            lines.append(
+                f"  Search with: SELECT {table_name}.* FROM {table_name} JOIN {index_table} "
+                f"ON {index_table}.rowid = {table_name}.rowid WHERE {index_table} MATCH 'word'"
+            )
+
+        sample_rows = table_info.get('sample_rows')
+        if sample_rows:
+            lines.append("Sample rows:")
+            for row in sample_rows:
+                lines.append(f"  {_format_sample_row(row)}")
         lines.append("")
     
     return "\n".join(lines)
@@ -154,10 +228,11 @@ def generate_random_query_with_openai(schema_info: Dict[str, Any]) -> str:
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
 
-        client = OpenAI(api_key=api_key)
+        client = _openai_client(api_key)
 
-        # Format schema for prompt
-        schema_description = format_schema_for_prompt(schema_info)
+        # Format schema for prompt (the bulk of prompt building)
+        with timed("prompt_build"):
+            schema_description = format_schema_for_prompt(schema_info)
 
         # Create prompt
         prompt = f"""Given the following database schema:
@@ -181,14 +256,16 @@ Examples of good queries:
 Natural language query:"""
 
         # Call OpenAI API
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that generates interesting questions about data."},
-                {"role": "user", "content": prompt}
-            ],
-            max_completion_tokens=100
-        )
+        with timed("llm"):
+            response = client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": "You are a helpful assistant that generates interesting questions about data."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_completion_tokens=100
+            )
+        _record_usage(response)
 
         query = response.choices[0].message.content.strip()
 
@@ -211,10 +288,11 @@ def generate_random_query_with_anthropic(schema_info: Dict[str, Any]) -> str:
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable not set")
         
-        client = Anthropic(api_key=api_key)
+        client = _anthropic_client(api_key)
         
-        # Format schema for prompt
-        schema_description = format_schema_for_prompt(schema_info)
+        # Format schema for prompt (the bulk of prompt building)
+        with timed("prompt_build"):
+            schema_description = format_schema_for_prompt(schema_info)
         
         # Create prompt
         prompt = f"""Given the following database schema:
@@ -238,14 +316,16 @@ Examples of good queries:
 Natural language query:"""
         
         # Call Anthropic API
-        response = client.messages.create(
-            model="claude-sonnet-4-0",
-            max_tokens=100,
-            temperature=0.8,
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
-        )
+        with timed("llm"):
+            response = client.messages.create(
+                model="claude-sonnet-4-0",
+                max_tokens=100,
+                temperature=0.8,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ]
+            )
+        _record_usage(response)
 
         query = response.content[0].text.strip()
 
@@ -258,7 +338,43 @@ Natural language query:"""
     except Exception as e:
         raise Exception(f"Error generating random query with Anthropic: {str(e)}")
 
-def generate_validated_random_query(schema_info: Dict[str, Any], max_attempts: int = 5) -> str:
+def generate_random_query_candidate(schema_info: Dict[str, Any], db_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Generate one random natural language query and check that its SQL returns rows.
+
+    Args:
+        schema_info: Database schema information
+        db_path: Database to run the SQL against (default database if None)
+
+    Returns:
+        Dict with 'query', 'sql' and 'row_count', or None if the SQL failed or
+        returned no rows
+
+    Raises:
+        ValueError: If no LLM API key is set
+    """
+    if not os.environ.get("OPENAI_API_KEY") and not os.environ.get("ANTHROPIC_API_KEY"):
+        raise ValueError("No LLM API key found. Please set either OPENAI_API_KEY or ANTHROPIC_API_KEY")
+
+    # Generate a random natural language query
+    nl_query = generate_random_query_with_openai(schema_info) if os.environ.get("OPENAI_API_KEY") \
+               else generate_random_query_with_anthropic(schema_info)
+
+    # Convert natural language query to SQL
+    request = QueryRequest(query=nl_query, llm_provider="openai")
+    sql_query = generate_sql(request, schema_info)
+
+    # Execute the SQL query to validate it returns results
+    result = execute_sql_safely(sql_query, db_path=db_path)
+    if result.get('error') or not result.get('results'):
+        return None
+    return {'query': nl_query, 'sql': sql_query, 'row_count': len(result['results'])}
+
+def generate_validated_random_query(
+    schema_info: Dict[str, Any],
+    max_attempts: int = 5,
+    db_path: Optional[str] = None
+) -> str:
     """
     Generate a validated random natural language query that returns data.
 
@@ -269,6 +385,7 @@ def generate_validated_random_query(schema_info: Dict[str, Any], max_attempts: i
     Args:
         schema_info: Database schema information
         max_attempts: Maximum number of attempts to generate a valid query (default: 5)
+        db_path: Database to validate against (default database if None)
 
     Returns:
         A natural language query string that is validated to return results
@@ -278,28 +395,12 @@ def generate_validated_random_query(schema_info: Dict[str, Any], max_attempts: i
     """
     for attempt in range(max_attempts):
         try:
-            # Generate a random natural language query
-            nl_query = generate_random_query_with_openai(schema_info) if os.environ.get("OPENAI_API_KEY") \
-                       else generate_random_query_with_anthropic(schema_info)
-
-            # Convert natural language query to SQL
-            request = QueryRequest(query=nl_query, llm_provider="openai")
-            sql_query = generate_sql(request, schema_info)
-
-            # Execute the SQL query to validate it returns results
-            result = execute_sql_safely(sql_query)
-
-            # Check if we got an error during execution
-            if result.get('error'):
-                # Skip this query and try again
-                continue
-
-            # Check if the query returned at least one row
-            if result.get('results') and len(result['results']) > 0:
+            candidate = generate_random_query_candidate(schema_info, db_path)
+            if candidate is not None:
                 # Success! Return the validated natural language query
-                return nl_query
+                return candidate['query']
 
-            # Query executed successfully but returned no results, try again
+            # Query failed or returned no results, try again
 
         except Exception as e:
             # Log the error and continue to next attempt
@@ -313,10 +414,11 @@ def generate_validated_random_query(schema_info: Dict[str, Any], max_attempts: i
         "Please verify that the database tables contain data."
     )
 
-def generate_random_query(schema_info: Dict[str, Any]) -> str:
+def generate_random_query(schema_info: Dict[str, Any], db_path: Optional[str] = None) -> str:
     """
     Route to appropriate LLM provider for random query generation with validation.
-    Ensures the generated query returns at least one row of data.
+    Ensures the generated query returns at least one row of data in db_path
+    (default database if None), the database schema_info describes.
     Priority: 1) OpenAI API key exists, 2) Anthropic API key exists
     """
     openai_key = os.environ.get("OPENAI_API_KEY")
@@ -327,24 +429,27 @@ def generate_random_query(schema_info: Dict[str, Any]) -> str:
         raise ValueError("No LLM API key found. Please set either OPENAI_API_KEY or ANTHROPIC_API_KEY")
 
     # Generate and validate random query
-    return generate_validated_random_query(schema_info)
+    return generate_validated_random_query(schema_info, db_path=db_path)
 
-def generate_sql(request: QueryRequest, schema_info: Dict[str, Any]) -> str:
+def resolve_llm_provider(request: QueryRequest) -> str:
     """
-    Route to appropriate LLM provider based on API key availability and request preference.
+    Pick the LLM provider based on API key availability and request preference.
     Priority: 1) OpenAI API key exists, 2) Anthropic API key exists, 3) request.llm_provider
     """
-    openai_key = os.environ.get("OPENAI_API_KEY")
-    anthropic_key = os.environ.get("ANTHROPIC_API_KEY")
-
     # Check API key availability first (OpenAI priority)
-    if openai_key:
-        return generate_sql_with_openai(request.query, schema_info)
-    elif anthropic_key:
-        return generate_sql_with_anthropic(request.query, schema_info)
+    if os.environ.get("OPENAI_API_KEY"):
+        return "openai"
+    elif os.environ.get("ANTHROPIC_API_KEY"):
+        return "anthropic"
 
-    # Fall back to request preference if both keys available or neither available
-    if request.llm_provider == "openai":
+    # Fall back to request preference if neither key is available
+    return request.llm_provider
+
+def generate_sql(request: QueryRequest, schema_info: Dict[str, Any]) -> str:
+    """
+    Route to appropriate LLM provider (see resolve_llm_provider).
+    """
+    if resolve_llm_provider(request) == "openai":
         return generate_sql_with_openai(request.query, schema_info)
     else:
         return generate_sql_with_anthropic(request.query, schema_info)
@@ -359,7 +464,7 @@ def generate_synthetic_data_with_openai(table_name: str, schema_info: Dict[str,
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
 
-        client = OpenAI(api_key=api_key)
+        client = _openai_client(api_key)
 
         # Format schema for prompt
         schema_lines = []
@@ -408,14 +513,16 @@ Example output format:
 ]"""
 
         # Call OpenAI API
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a data generation expert. Generate realistic synthetic data that matches patterns in sample data."},
-                {"role": "user", "content": prompt}
-            ],
-            max_completion_tokens=2000
-        )
+        with timed("llm"):
+            response = client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": "You are a data generation expert. Generate realistic synthetic data that matches patterns in sample data."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_completion_tokens=2000
+            )
+        _record_usage(response)
 
         result = response.choices[0].message.content.strip()
 
@@ -469,7 +576,7 @@ def generate_synthetic_data_with_anthropic(table_name: str, schema_info: Dict[st
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable not set")
 
-        client = Anthropic(api_key=api_key)
+        client = _anthropic_client(api_key)
 
         # Format schema for prompt
         schema_lines = []
@@ -518,14 +625,16 @@ Example output format:
 ]"""
 
         # Call Anthropic API
-        response = client.messages.create(
-            model="claude-sonnet-4-0",
-            max_tokens=2000,
-            temperature=0.8,
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
-        )
+        with timed("llm"):
+            response = client.messages.create(
+                model="claude-sonnet-4-0",
+                max_tokens=2000,
+                temperature=0.8,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ]
+            )
+        _record_usage(response)
 
         result = response.content[0].text.strip()
 
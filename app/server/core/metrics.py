@@ -0,0 +1,318 @@
+"""
+In-process request and phase metrics in the Prometheus text format.
+
+Request latency is recorded per route template (not per raw path, which would
+explode label cardinality) by the timing middleware in server.py. Work inside
+a request (schema scan, prompt building, LLM call, SQL validation and
+execution, response serialization) is timed with the timed() context manager,
+which also feeds the per-request breakdown in core.tracing. Cache hit/miss counts are read from
+the caches when /api/metrics is rendered, so the hot paths pay nothing extra.
+
+All timings use time.perf_counter(). Values are recorded per process. In
+multi-worker mode (see core.shared_cache) each worker publishes a snapshot to
+the shared store at most once per METRICS_PUBLISH_INTERVAL, and /api/metrics
+renders the sum over all workers.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .shared_cache import get_store
+from .tracing import record_phase
+
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Minimum seconds between publishing this worker's snapshot to the shared store
+METRICS_PUBLISH_INTERVAL = 1.0
+
+# Identifies this process's snapshot; pids alone are reused across restarts
+WORKER_ID = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """A monotonically increasing counter with optional labels."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        with self._lock:
+            return self._values.get(labelvalues, 0)
+
+    def snapshot(self) -> List[Tuple[List[str], float]]:
+        with self._lock:
+            return [(list(labels), value) for labels, value in self._values.items()]
+
+    def merge(self, snapshot: List[Tuple[List[str], float]]) -> None:
+        with self._lock:
+            for labels, value in snapshot:
+                key = tuple(labels)
+                self._values[key] = self._values.get(key, 0) + value
+
+    def empty_copy(self) -> "Counter":
+        return Counter(self.name, self.documentation, self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labelvalues, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """A cumulative-bucket histogram with optional labels."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labelvalues)
+            if entry is None:
+                entry = ([0] * (len(self.buckets) + 1), [0.0])
+                self._values[labelvalues] = entry
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def count(self, *labelvalues: str) -> int:
+        with self._lock:
+            entry = self._values.get(labelvalues)
+            return sum(entry[0]) if entry else 0
+
+    def snapshot(self) -> List[Tuple[List[str], List[int], float]]:
+        with self._lock:
+            return [(list(labels), list(counts), total[0]) for labels, (counts, total) in self._values.items()]
+
+    def merge(self, snapshot: List[Tuple[List[str], List[int], float]]) -> None:
+        with self._lock:
+            for labels, counts, total in snapshot:
+                entry = self._values.setdefault(tuple(labels), ([0] * (len(self.buckets) + 1), [0.0]))
+                for index, count in enumerate(counts):
+                    entry[0][index] += count
+                entry[1][0] += total
+
+    def empty_copy(self) -> "Histogram":
+        return Histogram(self.name, self.documentation, self.labelnames, self.buckets)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, (list(counts), total[0])) for labels, (counts, total) in self._values.items())
+        bucket_names = self.labelnames + ("le",)
+        for labelvalues, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(bucket_names, labelvalues + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template, method and status code.",
+    ("method", "route", "status")
+)
+PHASE_DURATION = Histogram(
+    "phase_duration_seconds",
+    "Time spent in request phases (schema, prompt_build, llm, validate, sql, serialize, ...).",
+    ("phase",)
+)
+ERRORS = Counter(
+    "errors_total",
+    "Errors by source: failed phases, handled endpoint errors and HTTP status >= 400.",
+    ("source",)
+)
+
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "LLM tokens used, by kind (prompt or completion).",
+    ("kind",)
+)
+
+_METRICS = [REQUEST_DURATION, PHASE_DURATION, ERRORS, LLM_TOKENS]
+
+# Callables returning (cache name, hits, misses), read at render time
+_cache_collectors: List[Callable[[], Tuple[str, int, int]]] = []
+
+
+def register_cache_collector(collector: Callable[[], Tuple[str, int, int]]) -> None:
+    """Report a cache's hit/miss counts on /api/metrics."""
+    _cache_collectors.append(collector)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """
+    Record the duration of the block in phase_duration_seconds and in the
+    active request trace, if any; count failures.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        ERRORS.inc(f"phase:{phase}")
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        PHASE_DURATION.observe(elapsed, phase)
+        record_phase(phase, elapsed * 1000)
+
+
+def record_error(source: str) -> None:
+    """Count an error that was handled without an HTTP error status."""
+    ERRORS.inc(source)
+
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    """Record one HTTP request; responses with status >= 400 also count as errors."""
+    REQUEST_DURATION.observe(seconds, method, route, str(status))
+    if status >= 400:
+        ERRORS.inc(f"http:{status}")
+
+
+def snapshot_metrics() -> Dict[str, Any]:
+    """Return this process's metric values and cache counts as JSON-serializable data."""
+    return {
+        "metrics": {metric.name: metric.snapshot() for metric in _METRICS},
+        "caches": [list(collector()) for collector in _cache_collectors],
+    }
+
+
+_last_publish = 0.0
+_publish_lock = threading.Lock()
+
+
+def publish_metrics(force: bool = False) -> None:
+    """
+    Write this worker's snapshot to the shared store, at most once per
+    METRICS_PUBLISH_INTERVAL unless forced. Does nothing with a process-local store.
+    """
+    global _last_publish
+    store = get_store()
+    if not store.shared:
+        return
+    now = time.monotonic()
+    with _publish_lock:
+        if not force and now - _last_publish < METRICS_PUBLISH_INTERVAL:
+            return
+        _last_publish = now
+    try:
+        store.put_worker_snapshot(WORKER_ID, snapshot_metrics())
+    except sqlite3.Error:
+        # Retried on the next request; publishing must never fail one
+        with _publish_lock:
+            _last_publish = 0.0
+
+
+def render_metrics(snapshots: Optional[List[Dict[str, Any]]] = None) -> str:
+    """
+    Render all metrics in the Prometheus text exposition format.
+
+    With `snapshots` (one per worker, from snapshot_metrics()) the rendered
+    values are their sums; otherwise this process's values are rendered.
+    """
+    if snapshots is None:
+        metrics = _METRICS
+        caches = [collector() for collector in _cache_collectors]
+    else:
+        metrics = [metric.empty_copy() for metric in _METRICS]
+        totals: Dict[str, List[int]] = {}
+        for snapshot in snapshots:
+            for metric in metrics:
+                metric.merge(snapshot["metrics"].get(metric.name, []))
+            for name, hits, misses in snapshot["caches"]:
+                total = totals.setdefault(name, [0, 0])
+                total[0] += hits
+                total[1] += misses
+        caches = [(name, hits, misses) for name, (hits, misses) in totals.items()]
+
+    lines: List[str] = []
+    for metric in metrics:
+        lines.extend(metric.render())
+
+    if caches:
+        cache_lines = {"hits": [], "misses": []}
+        for name, hits, misses in caches:
+            cache_lines["hits"].append(f'cache_hits_total{{cache="{name}"}} {hits}')
+            cache_lines["misses"].append(f'cache_misses_total{{cache="{name}"}} {misses}')
+        for kind in ("hits", "misses"):
+            lines.append(f"# HELP cache_{kind}_total Cache {kind} by cache name.")
+            lines.append(f"# TYPE cache_{kind}_total counter")
+            lines.extend(cache_lines[kind])
+
+    return "\n".join(lines) + "\n"
+
+
+def render_deployment_metrics() -> str:
+    """Render metrics summed over all workers in multi-worker mode, else this process's."""
+    store = get_store()
+    if not store.shared:
+        return render_metrics()
+    publish_metrics(force=True)
+    return render_metrics(store.worker_snapshots())
+
+
+def reset_metrics() -> None:
+    """Clear recorded values (used in tests)."""
+    for metric in _METRICS:
+        metric.reset()
@@ -0,0 +1,87 @@
+"""
+In-memory cache of query results.
+
+Entries are keyed by database path and SQL text and tagged with the
+database's PRAGMA data_version at execution time. A lookup only hits when the
+data_version is unchanged, so any committed write (from this process or
+another) makes older entries unreachable. Write paths in this process also
+call invalidate() to free them immediately.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Maximum number of cached result sets
+RESULT_CACHE_SIZE = 128
+
+# Result sets larger than this are not cached
+RESULT_CACHE_MAX_ROWS = 10_000
+
+
+class ResultCache:
+    """LRU cache of query results validated against PRAGMA data_version."""
+
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE, max_rows: int = RESULT_CACHE_MAX_ROWS):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, db_path: str, sql_query: str, data_version: Any) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result, or None if missing or stale."""
+        key = (db_path, sql_query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != data_version:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            result = entry[1]
+
+        # Copy the lists so callers can't mutate the cached entry
+        return {
+            'results': list(result['results']),
+            'columns': list(result['columns']),
+            'error': None
+        }
+
+    def put(self, db_path: str, sql_query: str, data_version: Any, result: Dict[str, Any]) -> None:
+        """Cache a successful result unless it is too large."""
+        if result.get('error') or len(result['results']) > self.max_rows:
+            return
+        key = (db_path, sql_query)
+        with self._lock:
+            self._entries[key] = (data_version, {
+                'results': list(result['results']),
+                'columns': list(result['columns']),
+            })
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, db_path: Optional[str] = None) -> None:
+        """Drop cached results for one database, or for all databases."""
+        with self._lock:
+            if db_path is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == db_path]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+result_cache = ResultCache()
+
+
+def invalidate_result_cache(db_path: Optional[str] = None) -> None:
+    """Drop cached query results after this process writes to a database."""
+    result_cache.invalidate(db_path)
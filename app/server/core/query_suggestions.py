@@ -0,0 +1,160 @@
+"""
+Pools of pre-validated suggestions for /api/generate-random-query.
+
+A suggestion is a random question together with its SQL and row count. To
+get one, the LLM writes a question, then writes its SQL, and the SQL is run
+to check that it returns rows. A background thread does this for each
+database and keeps its pool topped up to SUGGESTION_POOL_SIZE, so the
+endpoint only pops a ready suggestion. The SQL is also put in the NL→SQL
+cache, so running a suggestion skips the LLM as well.
+
+Each pool belongs to one schema fingerprint (see core.shared_cache). When
+the schema changes, the pool is emptied and refilled for the new schema. The
+first refill runs when someone next asks the endpoint for a suggestion, or
+when the schema is next read by /api/schema. Only databases that have
+already been asked for a suggestion get a pool, so nobody pays for LLM calls
+they never asked for.
+
+Pools are kept in process memory. With several workers, each one fills its
+own.
+"""
+
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Optional
+
+from . import llm_processor
+from .data_models import QueryRequest
+from .shared_cache import nl_sql_cache, nl_sql_key, schema_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Suggestions kept ready per database
+SUGGESTION_POOL_SIZE = 5
+
+# Failed attempts in a row (SQL errors, no rows, repeats) before a refill gives up
+SUGGESTION_MAX_FAILURES = 5
+
+Generator = Callable[[Dict[str, Any], str], Optional[Dict[str, Any]]]
+
+
+@dataclass
+class _Pool:
+    fingerprint: str
+    suggestions: Deque[Dict[str, Any]] = field(default_factory=deque)
+    filler: Optional[threading.Thread] = None
+
+
+class SuggestionPool:
+    """Per-database suggestion pools, each refilled by a background thread."""
+
+    def __init__(self, size: int = SUGGESTION_POOL_SIZE, generate: Optional[Generator] = None):
+        self.size = size
+        # Resolved at call time by default, so tests can patch the LLM helper
+        self._generate = generate
+        self._pools: Dict[str, _Pool] = {}
+        self._lock = threading.Lock()
+
+    def pop(self, db_path: str, schema_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Take a suggestion for db_path's current schema and start a refill.
+
+        Returns:
+            Dict with 'query', 'sql' and 'row_count', or None if the pool is
+            empty (the first request for a schema, or right after a burst)
+        """
+        fingerprint = schema_fingerprint(schema_info)
+        with self._lock:
+            pool = self._current_pool(db_path, fingerprint)
+            suggestion = pool.suggestions.popleft() if pool.suggestions else None
+            self._start_fill(db_path, pool, schema_info)
+        return suggestion
+
+    def schema_changed(self, db_path: str, schema_info: Dict[str, Any]) -> None:
+        """Refill db_path's pool if its schema changed. Databases never asked for suggestions are skipped."""
+        fingerprint = schema_fingerprint(schema_info)
+        with self._lock:
+            if db_path not in self._pools:
+                return
+            pool = self._current_pool(db_path, fingerprint)
+            self._start_fill(db_path, pool, schema_info)
+
+    def available(self, db_path: str) -> int:
+        """Number of suggestions ready for db_path."""
+        with self._lock:
+            pool = self._pools.get(db_path)
+            return len(pool.suggestions) if pool else 0
+
+    def wait(self, db_path: str, timeout: Optional[float] = None) -> None:
+        """Wait for db_path's refill to finish; used in tests and benchmarks."""
+        with self._lock:
+            pool = self._pools.get(db_path)
+            filler = pool.filler if pool else None
+        if filler is not None:
+            filler.join(timeout)
+
+    def clear(self) -> None:
+        """Forget every pool. Running refills stop at their next check."""
+        with self._lock:
+            self._pools.clear()
+
+    def _current_pool(self, db_path: str, fingerprint: str) -> _Pool:
+        # Called with the lock held
+        pool = self._pools.get(db_path)
+        if pool is None or pool.fingerprint != fingerprint:
+            pool = _Pool(fingerprint)
+            self._pools[db_path] = pool
+        return pool
+
+    def _start_fill(self, db_path: str, pool: _Pool, schema_info: Dict[str, Any]) -> None:
+        # Called with the lock held
+        if pool.filler is not None or len(pool.suggestions) >= self.size:
+            return
+        pool.filler = threading.Thread(
+            target=self._fill, args=(db_path, pool, schema_info), name="suggestion-pool", daemon=True
+        )
+        pool.filler.start()
+
+    def _is_current(self, db_path: str, pool: _Pool) -> bool:
+        return self._pools.get(db_path) is pool
+
+    def _fill(self, db_path: str, pool: _Pool, schema_info: Dict[str, Any]) -> None:
+        generate = self._generate or llm_processor.generate_random_query_candidate
+        failures = 0
+        try:
+            while failures < SUGGESTION_MAX_FAILURES:
+                with self._lock:
+                    if not self._is_current(db_path, pool) or len(pool.suggestions) >= self.size:
+                        return
+                try:
+                    suggestion = generate(schema_info, db_path)
+                except ValueError as e:
+                    # No API key; retrying will not help
+                    logger.warning(f"[WARNING] Suggestion pool refill stopped: {str(e)}")
+                    return
+                except Exception as e:
+                    logger.warning(f"[WARNING] Suggestion generation failed: {str(e)}")
+                    suggestion = None
+                with self._lock:
+                    if not self._is_current(db_path, pool):
+                        return
+                    if suggestion is None or any(
+                        queued['query'] == suggestion['query'] for queued in pool.suggestions
+                    ):
+                        failures += 1
+                        continue
+                    pool.suggestions.append(suggestion)
+                failures = 0
+                # Running the suggestion as a query then skips SQL generation
+                provider = llm_processor.resolve_llm_provider(QueryRequest(query=suggestion['query']))
+                nl_sql_cache.put(nl_sql_key(provider, suggestion['query']), pool.fingerprint, suggestion['sql'])
+            logger.warning(f"[WARNING] Suggestion pool refill gave up after {failures} failed attempts")
+        finally:
+            with self._lock:
+                pool.filler = None
+
+
+# The server's pools
+suggestion_pool = SuggestionPool()
@@ -0,0 +1,179 @@
+"""
+Random row sampling without ORDER BY RANDOM().
+
+`ORDER BY RANDOM() LIMIT k` assigns a random key to every row and sorts the
+whole table, so its cost grows with the table. sample_rows() instead draws
+random rowids between MIN(rowid) and MAX(rowid) and probes the rowid B-tree
+for the first row at or after each one, costing O(k log n) regardless of table
+size. Tables that are small relative to k, tables whose rowids are too sparse
+for probing to find k distinct rows, and WITHOUT ROWID tables are sampled
+with a single reservoir-sampling scan instead.
+
+A probe is a separate query and costs about as much as scanning
+PROBE_COST_ROWS rows. Probing is only chosen when k is a small fraction of
+the table, and the number of probes is capped so that a sample which falls
+back to a scan has spent at most about one scan's worth of probes first.
+Large samples (the statistical generator asks for 50,000 rows) of
+moderately sized tables are therefore scanned.
+
+Probing is slightly biased towards rows that follow gaps in the rowid
+sequence (e.g. after large deletes); that is fine for prompts, insights and
+synthetic-data seeding, which only need a representative handful of rows.
+"""
+
+import random
+import sqlite3
+from typing import Any, Iterable, List, Optional, Tuple
+
+from .sql_security import execute_query_safely
+
+# Rows a full scan reads in the time of one rowid probe plus fetching its row
+# (about 4.5 for the probe alone, measured on a 1M-row table)
+PROBE_COST_ROWS = 8
+
+# Probe when the rowid span is at least this many times the sample size;
+# otherwise a full scan is cheap enough and exactly uniform
+PROBE_MIN_SPAN_FACTOR = 2 * PROBE_COST_ROWS
+
+# Probes attempted per requested row before giving up on finding new rows
+MAX_PROBES_PER_ROW = 4
+
+# Rowids fetched per "rowid IN (...)" query, well under SQLite's variable limit
+FETCH_CHUNK_SIZE = 500
+
+
+def reservoir_sample(items: Iterable[Any], k: int, rng: Optional[random.Random] = None) -> List[Any]:
+    """
+    Uniformly sample up to k items from an iterable in one pass (Algorithm R).
+
+    Args:
+        items: Items to sample from; consumed once
+        k: Number of items wanted
+        rng: Optional random number generator (for reproducible samples)
+
+    Returns:
+        Up to k items in the order they were first kept
+    """
+    rng = rng or random.Random()
+    reservoir: List[Any] = []
+    if k <= 0:
+        return reservoir
+    for index, item in enumerate(items):
+        if index < k:
+            reservoir.append(item)
+        else:
+            slot = rng.randint(0, index)
+            if slot < k:
+                reservoir[slot] = item
+    return reservoir
+
+
+def _scan_sample(
+    conn: sqlite3.Connection,
+    table_name: str,
+    k: int,
+    rng: random.Random
+) -> Tuple[List[str], List[Tuple[Any, ...]]]:
+    cursor = execute_query_safely(
+        conn,
+        "SELECT * FROM {table}",
+        identifier_params={'table': table_name}
+    )
+    columns = [description[0] for description in cursor.description]
+    return columns, reservoir_sample(cursor, k, rng)
+
+
+def sample_rows(
+    conn: sqlite3.Connection,
+    table_name: str,
+    k: int,
+    seed: Optional[int] = None
+) -> Tuple[List[str], List[Tuple[Any, ...]]]:
+    """
+    Return up to k distinct random rows from a table.
+
+    Args:
+        conn: SQLite connection
+        table_name: Table to sample (validated as an identifier)
+        k: Number of rows wanted
+        seed: Optional seed for reproducible samples
+
+    Returns:
+        Tuple of (column names, row tuples)
+    """
+    rng = random.Random(seed)
+
+    try:
+        # Separate queries: SQLite only answers a lone MIN() or MAX() from the B-tree
+        low = execute_query_safely(
+            conn,
+            "SELECT MIN(rowid) FROM {table}",
+            identifier_params={'table': table_name}
+        ).fetchone()[0]
+        high = execute_query_safely(
+            conn,
+            "SELECT MAX(rowid) FROM {table}",
+            identifier_params={'table': table_name}
+        ).fetchone()[0]
+    except sqlite3.OperationalError:
+        # WITHOUT ROWID tables have no rowid to probe
+        return _scan_sample(conn, table_name, k, rng)
+
+    if low is None or k <= 0:
+        columns_cursor = execute_query_safely(
+            conn,
+            "SELECT * FROM {table} LIMIT 0",
+            identifier_params={'table': table_name}
+        )
+        return [description[0] for description in columns_cursor.description], []
+
+    span = high - low + 1
+    if span <= k * PROBE_MIN_SPAN_FACTOR:
+        return _scan_sample(conn, table_name, k, rng)
+
+    # Never spend more on probes than a scan of the span would cost
+    max_probes = min(k * MAX_PROBES_PER_ROW, span // PROBE_COST_ROWS)
+    rowids = set()
+    for _ in range(max_probes):
+        probe = execute_query_safely(
+            conn,
+            "SELECT rowid FROM {table} WHERE rowid >= ? ORDER BY rowid LIMIT 1",
+            params=(rng.randint(low, high),),
+            identifier_params={'table': table_name}
+        ).fetchone()
+        if probe is not None:
+            rowids.add(probe[0])
+            if len(rowids) >= k:
+                break
+
+    if len(rowids) < k:
+        # Sparse rowids (or fewer than k rows): probes keep landing on the same
+        # rows after large gaps, so fall back to an exact scan
+        return _scan_sample(conn, table_name, k, rng)
+
+    sampled = sorted(rowids)
+    rows: List[Tuple[Any, ...]] = []
+    for start in range(0, len(sampled), FETCH_CHUNK_SIZE):
+        chunk = sampled[start:start + FETCH_CHUNK_SIZE]
+        placeholders = ", ".join("?" for _ in chunk)
+        cursor = execute_query_safely(
+            conn,
+            f"SELECT * FROM {{table}} WHERE rowid IN ({placeholders})",
+            params=tuple(chunk),
+            identifier_params={'table': table_name}
+        )
+        rows.extend(cursor.fetchall())
+    columns = [description[0] for description in cursor.description]
+    rng.shuffle(rows)
+    return columns, rows
+
+
+def sample_dicts(
+    conn: sqlite3.Connection,
+    table_name: str,
+    k: int,
+    seed: Optional[int] = None
+) -> List[dict]:
+    """Return up to k random rows from a table as dictionaries."""
+    columns, rows = sample_rows(conn, table_name, k, seed)
+    return [dict(zip(columns, row)) for row in rows]
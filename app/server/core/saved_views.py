@@ -0,0 +1,212 @@
+"""
+Saved views: named queries whose results are materialized for dashboards.
+
+Each view's result is stored in an internal table (VIEW_TABLE_PREFIX plus
+the view name), alongside the version of every table its query reads (see
+core.table_metadata). Reading a view compares those versions with the
+current ones and re-runs the query only if a source table has been written
+since the last refresh. An unchanged view costs a metadata lookup and a
+scan of its precomputed rows.
+
+Per-table versions are used rather than the database file version, which
+changes on any write, including to tables a view does not read.
+"""
+
+import json
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+from .full_text import full_text_owners
+from .sql_security import quote_identifier, referenced_tables, validate_identifier, validate_sql_query
+from .table_metadata import INTERNAL_TABLE_PREFIX, ensure_metadata_table, is_internal_table, table_version
+
+VIEWS_TABLE = f'{INTERNAL_TABLE_PREFIX}saved_views'
+VIEW_TABLE_PREFIX = f'{INTERNAL_TABLE_PREFIX}view__'
+
+
+def _view_table(name: str) -> str:
+    return f"{VIEW_TABLE_PREFIX}{name}"
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    # Autocommit, so refreshes can take the write lock up front with BEGIN IMMEDIATE
+    return sqlite3.connect(db_path, isolation_level=None, timeout=30.0)
+
+
+def _views_exist(conn: sqlite3.Connection) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (VIEWS_TABLE,)
+    ).fetchone()
+    return row is not None
+
+
+def _get_view(conn: sqlite3.Connection, name: str) -> Optional[Dict[str, Any]]:
+    if not _views_exist(conn):
+        return None
+    row = conn.execute(
+        f"SELECT name, question, sql, source_versions, row_count, refreshed_at, refresh_ms "
+        f"FROM {VIEWS_TABLE} WHERE name = ?",
+        (name,)
+    ).fetchone()
+    if row is None:
+        return None
+    versions = json.loads(row[3])
+    return {
+        'name': row[0],
+        'query': row[1],
+        'sql': row[2],
+        'source_versions': versions,
+        'source_tables': sorted(versions),
+        'row_count': row[4],
+        'refreshed_at': row[5],
+        'refresh_ms': row[6]
+    }
+
+
+def _is_stale(conn: sqlite3.Connection, view: Dict[str, Any]) -> bool:
+    return any(table_version(conn, table) != version for table, version in view['source_versions'].items())
+
+
+def _materialize(conn: sqlite3.Connection, name: str, sql: str, question: Optional[str]) -> Dict[str, Any]:
+    """Run sql into the view's table and record the source versions. Runs in the caller's transaction."""
+    start = time.perf_counter()
+    # A search of t_fts reads the index and its shadow tables; writes are versioned on t
+    owners = full_text_owners(conn)
+    sources = {owners.get(table, table) for table in referenced_tables(conn, sql)}
+    internal = sorted(table for table in sources if is_internal_table(table))
+    if internal:
+        raise ValueError(f"Views cannot read internal tables: {', '.join(internal)}")
+
+    view_table = _view_table(name)
+    staging_table = f"{view_table}__staging"
+    conn.execute(f"DROP TABLE IF EXISTS {quote_identifier(staging_table)}")
+    conn.execute(f"CREATE TABLE {quote_identifier(staging_table)} AS {sql}")
+    conn.execute(f"DROP TABLE IF EXISTS {quote_identifier(view_table)}")
+    conn.execute(f"ALTER TABLE {quote_identifier(staging_table)} RENAME TO {quote_identifier(view_table)}")
+    row_count = conn.execute(f"SELECT COUNT(*) FROM {quote_identifier(view_table)}").fetchone()[0]
+
+    versions = {table: table_version(conn, table) for table in sorted(sources)}
+    refresh_ms = (time.perf_counter() - start) * 1000
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {VIEWS_TABLE} ("
+        "name TEXT PRIMARY KEY, question TEXT, sql TEXT NOT NULL, source_versions TEXT NOT NULL, "
+        "row_count INTEGER NOT NULL, refreshed_at TEXT NOT NULL, refresh_ms REAL NOT NULL)"
+    )
+    conn.execute(
+        f"INSERT OR REPLACE INTO {VIEWS_TABLE} "
+        "(name, question, sql, source_versions, row_count, refreshed_at, refresh_ms) "
+        "VALUES (?, ?, ?, ?, ?, datetime('now'), ?)",
+        (name, question, sql, json.dumps(versions), row_count, refresh_ms)
+    )
+    return _get_view(conn, name)
+
+
+def save_view(db_path: str, name: str, sql: str, question: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Save (or overwrite) a view and materialize its result.
+
+    Args:
+        db_path: Path to SQLite database
+        name: View name, validated like a table name
+        sql: A read-only query, validated like any user query
+        question: The natural language question the SQL answers, if any
+
+    Returns:
+        Dict describing the view: name, query, sql, source_tables, row_count,
+        refreshed_at and refresh_ms
+
+    Raises:
+        SQLSecurityError: If the name or SQL fails validation
+        ValueError: If the SQL reads internal tables
+        sqlite3.Error: If the SQL cannot be run
+    """
+    validate_identifier(name, "view")
+    sql = sql.strip().rstrip(';')
+    validate_sql_query(sql)
+
+    conn = _connect(db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Source tables need versions from now on
+            ensure_metadata_table(conn)
+            view = _materialize(conn, name, sql, question)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return view
+    finally:
+        conn.close()
+
+
+def list_views(db_path: str) -> List[Dict[str, Any]]:
+    """Describe every saved view, with 'stale' set if its next read will refresh it."""
+    conn = _connect(db_path)
+    try:
+        if not _views_exist(conn):
+            return []
+        names = [row[0] for row in conn.execute(f"SELECT name FROM {VIEWS_TABLE} ORDER BY name")]
+        views = []
+        for name in names:
+            view = _get_view(conn, name)
+            view['stale'] = _is_stale(conn, view)
+            views.append(view)
+        return views
+    finally:
+        conn.close()
+
+
+def read_view(db_path: str, name: str) -> Optional[Dict[str, Any]]:
+    """
+    Return a view's rows, refreshing them first if a source table has changed.
+
+    Returns:
+        None if there is no such view, else a dict with 'view' (as from
+        save_view), 'columns', 'results' and 'refreshed' (True if the query
+        was re-run for this read)
+
+    Raises:
+        sqlite3.Error: If a refresh fails, e.g. because a source table was deleted
+    """
+    conn = _connect(db_path)
+    try:
+        view = _get_view(conn, name)
+        if view is None:
+            return None
+        refreshed = False
+        if _is_stale(conn, view):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Another request may have refreshed the view while this one waited for the lock
+                view = _get_view(conn, name)
+                if _is_stale(conn, view):
+                    view = _materialize(conn, name, view['sql'], view['query'])
+                    refreshed = True
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        cursor = conn.execute(f"SELECT * FROM {quote_identifier(_view_table(name))}")
+        columns = [column[0] for column in cursor.description]
+        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        return {'view': view, 'columns': columns, 'results': results, 'refreshed': refreshed}
+    finally:
+        conn.close()
+
+
+def delete_view(db_path: str, name: str) -> bool:
+    """Delete a view and its materialized rows. Returns False if there is no such view."""
+    conn = _connect(db_path)
+    try:
+        if _get_view(conn, name) is None:
+            return False
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(f"DROP TABLE IF EXISTS {quote_identifier(_view_table(name))}")
+        conn.execute(f"DELETE FROM {VIEWS_TABLE} WHERE name = ?", (name,))
+        conn.execute("COMMIT")
+        return True
+    finally:
+        conn.close()
@@ -0,0 +1,267 @@
+"""
+Caches shared between server workers.
+
+The schema catalog and the NL→SQL cache are read through SharedCache objects
+backed by a store. A single-process server uses an in-memory store. When
+SHARED_CACHE_PATH is set, as `python server.py` does when WEB_CONCURRENCY > 1,
+every worker uses the same SQLite side-car file instead. An entry cached by
+one worker is then served to all of them, and core.metrics publishes each
+worker's counters there so /api/metrics can report totals for the whole
+deployment.
+
+Entries carry a version string chosen by the caller (a database file version,
+a schema fingerprint) and only hit while it matches. Values are stored as
+JSON in both modes, so a cached value never aliases a caller's object.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Environment variable naming the side-car file; unset means in-memory caches
+SHARED_CACHE_PATH_ENV = "SHARED_CACHE_PATH"
+
+# Side-car file used by `python server.py` in multi-worker mode
+DEFAULT_SHARED_CACHE_PATH = "db/shared_cache.db"
+
+# Entries kept by the in-memory store (all namespaces together)
+MEMORY_STORE_SIZE = 1024
+
+# Entries kept per namespace in the side-car file
+SHARED_STORE_MAX_ENTRIES = 10_000
+
+# Side-car writes between pruning expired and excess entries
+PRUNE_INTERVAL = 256
+
+# Worker metric snapshots not updated for this long (seconds) are dropped
+WORKER_SNAPSHOT_TTL = 24 * 3600
+
+# How long generated SQL is reused for the same question and schema (seconds)
+NL_SQL_CACHE_TTL = 3600
+
+
+class MemoryStore:
+    """Process-local LRU store used when no side-car file is configured."""
+
+    shared = False
+
+    def __init__(self, max_entries: int = MEMORY_STORE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, str, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[str, str]]:
+        """Return (version, JSON value), or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                return None
+            version, value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[(namespace, key)]
+                return None
+            self._entries.move_to_end((namespace, key))
+            return version, value
+
+    def put(self, namespace: str, key: str, version: str, value: str, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[(namespace, key)] = (version, value, expires_at)
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        self.clear()
+
+
+class SQLiteStore:
+    """
+    Cache entries and worker metric snapshots in a SQLite side-car file.
+
+    The file is opened in WAL mode so readers in other workers never block
+    on a writer. Every operation is a single short statement, so one
+    connection per process, guarded by a lock, is enough.
+    """
+
+    shared = True
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0, isolation_level=None)
+        self._lock = threading.Lock()
+        self._puts = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    expires_at REAL,
+                    PRIMARY KEY (namespace, key)
+                ) WITHOUT ROWID
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS worker_metrics (
+                    worker_id TEXT PRIMARY KEY,
+                    snapshot TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[str, str]]:
+        """Return (version, JSON value), or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, value FROM cache_entries "
+                "WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, key, time.time())
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put(self, namespace: str, key: str, version: str, value: str, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, key, version, value, now, now + ttl if ttl is not None else None)
+            )
+            self._puts += 1
+            if self._puts % PRUNE_INTERVAL == 0:
+                self._prune(namespace, now)
+
+    def _prune(self, namespace: str, now: float) -> None:
+        self._conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+        self._conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+            "SELECT key FROM cache_entries WHERE namespace = ? ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (namespace, namespace, SHARED_STORE_MAX_ENTRIES)
+        )
+
+    def put_worker_snapshot(self, worker_id: str, snapshot: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO worker_metrics VALUES (?, ?, ?)",
+                (worker_id, json.dumps(snapshot), time.time())
+            )
+
+    def worker_snapshots(self) -> List[Dict[str, Any]]:
+        """Return the latest metric snapshot of every live or recent worker."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM worker_metrics WHERE updated_at < ?", (time.time() - WORKER_SNAPSHOT_TTL,)
+            )
+            rows = self._conn.execute("SELECT snapshot FROM worker_metrics").fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries")
+            self._conn.execute("DELETE FROM worker_metrics")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return the process's cache store, creating it from SHARED_CACHE_PATH on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            path = os.environ.get(SHARED_CACHE_PATH_ENV)
+            _store = SQLiteStore(path) if path else MemoryStore()
+        return _store
+
+
+def configure_store(path: Optional[str] = None) -> None:
+    """Switch to a side-car file (or back to memory with None); used in tests and benchmarks."""
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+        _store = SQLiteStore(path) if path else MemoryStore()
+
+
+def reset_store() -> None:
+    """Close the current store; the next get_store() reads SHARED_CACHE_PATH again."""
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+        _store = None
+
+
+class SharedCache:
+    """A versioned cache namespace in the process's store."""
+
+    def __init__(self, namespace: str, ttl: Optional[float] = None):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, version: str) -> Optional[Any]:
+        """Return the cached value if it was stored under the same version."""
+        try:
+            entry = get_store().get(self.namespace, key)
+        except sqlite3.Error as e:
+            # A busy or broken side-car degrades to a cache miss, never a failed request
+            logger.warning(f"[WARNING] Shared cache read failed: {str(e)}")
+            entry = None
+        if entry is None or entry[0] != version:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(entry[1])
+
+    def put(self, key: str, version: str, value: Any) -> None:
+        # default=str keeps BLOB sample values and dates serializable
+        try:
+            get_store().put(self.namespace, key, version, json.dumps(value, default=str), self.ttl)
+        except sqlite3.Error as e:
+            logger.warning(f"[WARNING] Shared cache write failed: {str(e)}")
+
+
+# Database schema (columns, row counts, sample rows) keyed by database path
+schema_catalog = SharedCache("schema_catalog")
+
+# Generated SQL keyed by provider and question, versioned by schema fingerprint
+nl_sql_cache = SharedCache("nl_sql", ttl=NL_SQL_CACHE_TTL)
+
+
+def schema_fingerprint(schema_info: Dict[str, Any]) -> str:
+    """Hash table and column names and types and full-text indexes, ignoring row counts and samples."""
+    structure = sorted(
+        (table_name, sorted(table.get('columns', {}).items()), table.get('full_text_index'))
+        for table_name, table in schema_info.get('tables', {}).items()
+    )
+    return hashlib.blake2b(json.dumps(structure).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def nl_sql_key(provider: str, question: str) -> str:
+    """Cache key for a question; whitespace differences don't matter."""
+    return f"{provider}:{' '.join(question.split())}"
@@ -1,49 +1,76 @@
 import sqlite3
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from .sql_security import (
     execute_query_safely, 
     validate_sql_query, 
+    read_only_access,
     SQLSecurityError
 )
+from .database import DEFAULT_DB_PATH, file_version, get_connection_pool
+from .query_cache import result_cache
+from .shared_cache import schema_catalog
+from .sampling import sample_dicts
+from .metrics import timed
+from .full_text import full_text_tables
+from .table_metadata import is_internal_table
 
-def execute_sql_safely(sql_query: str) -> Dict[str, Any]:
+# Random example rows included per table for prompt construction
+PROMPT_SAMPLE_ROWS = 3
+
+def execute_sql_safely(sql_query: str, use_cache: bool = True, db_path: Optional[str] = None) -> Dict[str, Any]:
     """
-    Execute SQL query with safety checks
+    Execute SQL query with safety checks against db_path (default database if None)
+
+    Queries run on a pooled connection with a warm prepared-statement cache.
+    Results are served from the result cache while the database's
+    data_version is unchanged. Validation and execution are recorded as the
+    "validate" and "sql" phases of the active request trace.
     """
+    db_path = db_path or DEFAULT_DB_PATH
     try:
         # Validate the SQL query for dangerous operations
-        validate_sql_query(sql_query)
-        
-        # Connect to database
-        conn = sqlite3.connect("db/database.db")
-        conn.row_factory = sqlite3.Row  # Enable column access by name
+        with timed("validate"):
+            validate_sql_query(sql_query)
         
-        # Execute query safely
-        # Note: Since this is a user-provided complete SQL query,
-        # we can't use parameterization. The validate_sql_query
-        # function provides protection against dangerous operations.
-        cursor = conn.cursor()
-        cursor.execute(sql_query)
+        with timed("sql"):
+            pool = get_connection_pool(db_path)
+            data_version = pool.data_version()
+            if use_cache:
+                cached = result_cache.get(db_path, sql_query, data_version)
+                if cached is not None:
+                    return cached
         
-        # Get results
-        rows = cursor.fetchall()
+            with pool.connection() as conn:
+                # Execute query safely
+                # Note: Since this is a user-provided complete SQL query,
+                # we can't use parameterization. The validate_sql_query
+                # function rejects dangerous SQL up front and the read-only
+                # authorizer enforces it when the statement is compiled.
+                cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row  # Enable column access by name
+                with read_only_access(conn):
+                    cursor.execute(sql_query)
+            
+                # Get results
+                rows = cursor.fetchall()
         
-        # Convert rows to dictionaries
-        results = []
-        columns = []
+            # Convert rows to dictionaries
+            results = []
+            columns = []
         
-        if rows:
-            columns = list(rows[0].keys())
-            for row in rows:
-                results.append(dict(row))
+            if rows:
+                columns = list(rows[0].keys())
+                for row in rows:
+                    results.append(dict(row))
         
-        conn.close()
-        
-        return {
-            'results': results,
-            'columns': columns,
-            'error': None
-        }
+            result = {
+                'results': results,
+                'columns': columns,
+                'error': None
+            }
+            if use_cache:
+                result_cache.put(db_path, sql_query, data_version, result)
+        return result
     
     except SQLSecurityError as e:
         return {
@@ -58,25 +85,66 @@ def execute_sql_safely(sql_query: str) -> Dict[str, Any]:
             'error': str(e)
         }
 
-def get_database_schema() -> Dict[str, Any]:
+def open_sql_cursor(sql_query: str, db_path: Optional[str] = None) -> sqlite3.Cursor:
     """
-    Get complete database schema information
+    Validate and execute a SQL query, returning the open cursor for streaming.
+
+    The connection is opened with check_same_thread=False so rows can be
+    fetched from the worker threads that drive a streaming response. The
+    caller owns the cursor and must close cursor.connection when done.
+
+    Raises:
+        SQLSecurityError: If the query fails validation
+        sqlite3.Error: If the query cannot be executed
     """
+    validate_sql_query(sql_query)
+
+    conn = sqlite3.connect(db_path or DEFAULT_DB_PATH, check_same_thread=False)
+    try:
+        cursor = conn.cursor()
+        with read_only_access(conn):
+            cursor.execute(sql_query)
+        return cursor
+    except Exception:
+        conn.close()
+        raise
+
+def get_database_schema(db_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Get complete database schema information for db_path (default database if None)
+
+    The catalog is cached under the database's file version, so it is only
+    rebuilt after a write. In multi-worker mode the cache is shared, and one
+    worker's scan serves the others.
+    """
+    db_path = db_path or DEFAULT_DB_PATH
+    version = file_version(db_path)
+    schema = schema_catalog.get(db_path, version)
+    if schema is None:
+        schema = _scan_database_schema(db_path)
+        if 'error' not in schema:
+            schema_catalog.put(db_path, version, schema)
+    return schema
+
+def _scan_database_schema(db_path: str) -> Dict[str, Any]:
     try:
-        conn = sqlite3.connect("db/database.db")
+        conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
         
         # Get all tables safely
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
         tables = cursor.fetchall()
+
+        # Full-text indexes are described with the table they index
+        full_text_indexes, full_text_hidden = full_text_tables(conn)
         
         schema = {'tables': {}}
         
         for table in tables:
             table_name = table[0]
             
-            # Skip system tables
-            if table_name.startswith('sqlite_'):
+            # Skip system and internal tables
+            if table_name.startswith('sqlite_') or is_internal_table(table_name) or table_name in full_text_hidden:
                 continue
             
             try:
@@ -102,8 +170,11 @@ def get_database_schema() -> Dict[str, Any]:
                 
                 schema['tables'][table_name] = {
                     'columns': columns,
-                    'row_count': row_count
+                    'row_count': row_count,
+                    'sample_rows': sample_dicts(conn, table_name, PROMPT_SAMPLE_ROWS)
                 }
+                if table_name in full_text_indexes:
+                    schema['tables'][table_name]['full_text_index'] = full_text_indexes[table_name]
                 
             except SQLSecurityError:
                 # Skip tables with invalid names
@@ -6,7 +6,121 @@ and proper escaping mechanisms.
 
 import re
 import sqlite3
-from typing import Any, List, Tuple, Optional, Union
+from functools import lru_cache
+from contextlib import contextmanager
+from typing import Any, Iterator, List, NamedTuple, Set, Tuple, Optional, Union
+
+from .table_metadata import is_internal_table
+
+# Maximum number of distinct query texts whose validation outcome is memoized
+VALIDATION_CACHE_SIZE = 1024
+
+_IDENTIFIER_PATTERN = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_\s]*$")
+
+# SQL keywords that should not be used as identifiers
+_RESERVED_IDENTIFIERS = frozenset({
+    "SELECT",
+    "FROM",
+    "WHERE",
+    "INSERT",
+    "UPDATE",
+    "DELETE",
+    "DROP",
+    "CREATE",
+    "ALTER",
+    "TABLE",
+    "DATABASE",
+    "UNION",
+    "AND",
+    "OR",
+    "EXEC",
+    "EXECUTE",
+    "SCRIPT",
+    "GRANT",
+    "REVOKE",
+})
+
+_DDL_PREFIXES = ("DROP", "CREATE", "ALTER", "TRUNCATE")
+
+# Single-pass SQL lexer. Each alternative consumes its token without
+# backtracking into earlier text, so lexing is linear in the query length.
+# Unterminated strings, quoted identifiers and block comments run to the end
+# of the query and are reported by the validator.
+_LEXER_PATTERN = re.compile(
+    r"""
+    (?P<string>'(?:[^']|'')*(?:'|\Z))
+  | (?P<identifier>"(?:[^"]|"")*(?:"|\Z)|`(?:[^`]|``)*(?:`|\Z)|\[[^\]]*(?:\]|\Z))
+  | (?P<comment>--[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<number>\d+(?:\.\d*)?(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)
+  | (?P<word>\w+)
+  | (?P<space>\s+)
+  | (?P<parameter>[?:@$]\w*)
+  | (?P<operator>==|!=|<>|<=|>=|\|\||<<|>>|.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_CLOSING_QUOTES = {"'": "'", '"': '"', "`": "`", "[": "]"}
+
+# Statements that may start a query passed to validate_sql_query
+_READ_ONLY_STATEMENTS = frozenset({"SELECT", "WITH", "VALUES"})
+
+# Bare keywords that only appear in statements that write or change the
+# database (or in other dialects' equivalents); rejected anywhere outside
+# string literals and quoted identifiers
+_WRITE_KEYWORDS = frozenset({
+    "INSERT",
+    "UPDATE",
+    "DELETE",
+    "DROP",
+    "CREATE",
+    "ALTER",
+    "TRUNCATE",
+    "ATTACH",
+    "DETACH",
+    "PRAGMA",
+    "VACUUM",
+    "REINDEX",
+    "GRANT",
+    "REVOKE",
+    "EXEC",
+    "EXECUTE",
+})
+
+_LITERAL_KINDS = ("string", "number", "identifier")
+_EQUALITY_OPERATORS = ("=", "==")
+
+_COMMENT_ERROR = "Query contains SQL comments which are not allowed"
+_INJECTION_ERROR = "Query contains potential SQL injection pattern"
+
+# Authorizer actions permitted for read-only queries
+_READ_ONLY_ACTIONS = frozenset({
+    sqlite3.SQLITE_SELECT,
+    sqlite3.SQLITE_READ,
+    sqlite3.SQLITE_FUNCTION,
+    sqlite3.SQLITE_RECURSIVE,
+})
+
+# Authorized internally when a connection first opens an FTS5 index (see
+# core.full_text): SQLite re-parses the index's schema entry, reported as
+# updates of sqlite_master, and FTS5 checks PRAGMA data_version. SQLite
+# itself refuses sqlite_master writes from statements while
+# writable_schema is off, and that PRAGMA is denied.
+_FTS5_CONNECT_ACTIONS = frozenset({
+    (sqlite3.SQLITE_UPDATE, "sqlite_master"),
+    (sqlite3.SQLITE_PRAGMA, "data_version"),
+})
+
+# SQL functions that can reach outside the database even in a SELECT
+_DENIED_FUNCTIONS = frozenset({"load_extension"})
+
+
+class SQLToken(NamedTuple):
+    """A lexical token produced by tokenize_sql."""
+
+    kind: str  # string, identifier, comment, number, word, space, parameter, operator
+    value: str
+    start: int
 
 
 class SQLSecurityError(Exception):
@@ -34,36 +148,14 @@ def validate_identifier(identifier: str, identifier_type: str = "identifier") ->
 
     # Allow alphanumeric, underscores, and spaces (for column aliases)
     # First character must be letter or underscore
-    if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_\s]*$", identifier):
+    if not _IDENTIFIER_PATTERN.match(identifier):
         raise SQLSecurityError(
             f"Invalid {identifier_type} name: '{identifier}'. "
             f"Only alphanumeric characters, underscores, and spaces are allowed."
         )
 
     # Check for SQL keywords that should not be used as identifiers
-    sql_keywords = {
-        "SELECT",
-        "FROM",
-        "WHERE",
-        "INSERT",
-        "UPDATE",
-        "DELETE",
-        "DROP",
-        "CREATE",
-        "ALTER",
-        "TABLE",
-        "DATABASE",
-        "UNION",
-        "AND",
-        "OR",
-        "EXEC",
-        "EXECUTE",
-        "SCRIPT",
-        "GRANT",
-        "REVOKE",
-    }
-
-    if identifier.upper() in sql_keywords:
+    if identifier.upper() in _RESERVED_IDENTIFIERS:
         raise SQLSecurityError(
             f"SQL keyword '{identifier}' cannot be used as {identifier_type} name"
         )
@@ -91,6 +183,16 @@ def escape_identifier(identifier: str) -> str:
     return f"[{escaped}]"
 
 
+def quote_identifier(identifier: str) -> str:
+    """
+    Quote any identifier, such as an uploaded column name, with SQL double quotes.
+
+    Unlike escape_identifier this does not validate: embedded quotes are
+    doubled, so the result is always a single identifier.
+    """
+    return '"' + identifier.replace('"', '""') + '"'
+
+
 def execute_query_safely(
     conn: sqlite3.Connection,
     query: str,
@@ -131,10 +233,7 @@ def execute_query_safely(
     if not allow_ddl:
         # Check for DDL operations
         query_upper = query.upper().strip()
-        if any(
-            query_upper.startswith(ddl)
-            for ddl in ["DROP", "CREATE", "ALTER", "TRUNCATE"]
-        ):
+        if query_upper.startswith(_DDL_PREFIXES):
             raise SQLSecurityError(
                 "DDL operations are not allowed without explicit permission. "
                 "Use allow_ddl=True if this is intentional."
@@ -150,10 +249,62 @@ def execute_query_safely(
     return cursor
 
 
+def tokenize_sql(query: str) -> List[SQLToken]:
+    """
+    Split a SQL query into tokens in a single pass.
+
+    String literals, quoted identifiers and comments are returned as single
+    tokens, so their contents are never mistaken for SQL keywords.
+
+    Args:
+        query: The SQL text to tokenize
+
+    Returns:
+        List[SQLToken]: Tokens in source order, including whitespace
+    """
+    return [
+        SQLToken(match.lastgroup, match.group(), match.start())
+        for match in _LEXER_PATTERN.finditer(query)
+    ]
+
+
+def _is_terminated(token: SQLToken) -> bool:
+    """Check that a string, quoted identifier or block comment is closed."""
+    if token.kind == "comment":
+        return not token.value.startswith("/*") or (len(token.value) >= 4 and token.value.endswith("*/"))
+    opening = token.value[0]
+    closing = _CLOSING_QUOTES[opening]
+    if len(token.value) < 2 or not token.value.endswith(closing):
+        return False
+    if opening == "[":
+        return True
+    # A trailing doubled quote is an escaped quote, not a terminator
+    body = token.value[1:-1]
+    return (len(body) - len(body.rstrip(closing))) % 2 == 0
+
+
+def _literal_value(token: SQLToken) -> str:
+    """Return the unquoted text of a literal or quoted identifier token."""
+    if token.kind == "number":
+        return token.value
+    closing = _CLOSING_QUOTES[token.value[0]]
+    return token.value[1:-1].replace(closing * 2, closing)
+
+
 def validate_sql_query(query: str) -> bool:
     """
     Validate a SQL query to ensure it doesn't contain dangerous operations.
 
+    The query must be a single read-only statement (SELECT, WITH or VALUES)
+    without comments, write keywords or constant tautologies such as
+    OR '1'='1'. The check runs on the tokens from tokenize_sql, so string
+    literals and quoted identifiers never cause false positives. Read-only
+    access is additionally enforced at statement-compile time by
+    read_only_access().
+
+    The outcome is memoized per query text, so repeated queries (e.g. dashboard
+    refreshes) skip the scan entirely.
+
     Args:
         query: The SQL query to validate
 
@@ -163,48 +314,156 @@ def validate_sql_query(query: str) -> bool:
     Raises:
         SQLSecurityError: If the query contains dangerous operations
     """
-    # Normalize query for checking
-    normalized_query = query.upper().strip()
-
-    # List of dangerous operations
-    dangerous_patterns = [
-        r"\bDROP\s+(?:TABLE|DATABASE|INDEX|VIEW)\b",
-        r"\bDELETE\s+FROM\b",
-        r"\bTRUNCATE\s+TABLE\b",
-        r"\bEXEC(?:UTE)?\s*\(",
-        r"\bCREATE\s+(?:TABLE|DATABASE|INDEX|VIEW)\b",
-        r"\bALTER\s+TABLE\b",
-        r"\bGRANT\b",
-        r"\bREVOKE\b",
-        r"\bINSERT\s+INTO\b.*\bSELECT\b",  # Prevent INSERT...SELECT
-        r"\bUPDATE\b.*\bSET\b",
-        r";\s*(?:SELECT|DROP|DELETE|UPDATE|INSERT)",  # Multiple statements
-    ]
+    error = _find_sql_violation(query)
+    if error:
+        raise SQLSecurityError(error)
+    return True
 
-    for pattern in dangerous_patterns:
-        if re.search(pattern, normalized_query):
-            raise SQLSecurityError(
-                f"Query contains potentially dangerous operation: {pattern}"
-            )
 
-    # Check for comment injection attempts
-    if "--" in query or "/*" in query or "*/" in query:
-        raise SQLSecurityError("Query contains SQL comments which are not allowed")
-
-    # Check for common injection patterns
-    injection_patterns = [
-        r"'\s*OR\s*'?1'?\s*=\s*'?1",  # 'OR 1=1
-        r'"\s*OR\s*"?1"?\s*=\s*"?1',  # "OR 1=1
-        # r"\bUNION\s+(?:ALL\s+)?SELECT\b",  # UNION SELECT - example injection pattern an llm might unintentionally try
-        r"'[^']*\s*;\s*(?:SELECT|DROP|DELETE|UPDATE|INSERT|CREATE|ALTER|EXEC)",  # SQL injection after quote and semicolon
-        r'"[^"]*\s*;\s*(?:SELECT|DROP|DELETE|UPDATE|INSERT|CREATE|ALTER|EXEC)',  # SQL injection after quote and semicolon
-    ]
+def validation_cache_info():
+    """Return hit/miss statistics for the validate_sql_query memo."""
+    return _find_sql_violation.cache_info()
 
-    for pattern in injection_patterns:
-        if re.search(pattern, normalized_query, re.IGNORECASE):
-            raise SQLSecurityError("Query contains potential SQL injection pattern")
 
-    return True
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _find_sql_violation(query: str) -> Optional[str]:
+    """
+    Scan a query's tokens once and return the first violation message, or
+    None if safe.
+
+    Dangerous operations take precedence over comments, which take precedence
+    over injection patterns.
+    """
+    has_comment = False
+    has_injection = False
+    statement_ended = False
+    # The last three significant tokens, most recent last
+    previous: List[SQLToken] = []
+
+    for match in _LEXER_PATTERN.finditer(query):
+        kind = match.lastgroup
+        if kind == "space":
+            continue
+        token = SQLToken(kind, match.group(), match.start())
+
+        if kind == "comment":
+            has_comment = True
+            if not _is_terminated(token):
+                return "Query contains an unterminated comment"
+            continue
+        if kind in ("string", "identifier") and not _is_terminated(token):
+            return "Query contains an unterminated string or quoted identifier"
+
+        if statement_ended:
+            return "Query contains potentially dangerous operation: multiple statements"
+
+        if kind == "word":
+            keyword = token.value.upper()
+            if not previous and keyword not in _READ_ONLY_STATEMENTS:
+                return f"Query contains potentially dangerous operation: {keyword}"
+            if keyword in _WRITE_KEYWORDS:
+                return f"Query contains potentially dangerous operation: {keyword}"
+        elif token.value == ";":
+            statement_ended = True
+            continue
+        elif not previous:
+            return "Query must start with SELECT, WITH or VALUES"
+
+        # Constant tautology: OR <literal> = <same literal>
+        if (
+            kind in _LITERAL_KINDS
+            and len(previous) == 3
+            and previous[2].value in _EQUALITY_OPERATORS
+            and previous[1].kind in _LITERAL_KINDS
+            and previous[0].kind == "word"
+            and previous[0].value.upper() == "OR"
+            and _literal_value(previous[1]) == _literal_value(token)
+        ):
+            has_injection = True
+
+        previous.append(token)
+        if len(previous) > 3:
+            del previous[0]
+
+    if has_comment:
+        return _COMMENT_ERROR
+    if has_injection:
+        return _INJECTION_ERROR
+    return None
+
+
+def _read_only_authorizer(
+    action: int,
+    arg1: Optional[str],
+    arg2: Optional[str],
+    db_name: Optional[str],
+    trigger: Optional[str],
+) -> int:
+    """SQLite authorizer callback that only permits reading."""
+    if (action, arg1) in _FTS5_CONNECT_ACTIONS:
+        return sqlite3.SQLITE_OK
+    if action not in _READ_ONLY_ACTIONS:
+        return sqlite3.SQLITE_DENY
+    if action == sqlite3.SQLITE_FUNCTION and arg2 and arg2.lower() in _DENIED_FUNCTIONS:
+        return sqlite3.SQLITE_DENY
+    return sqlite3.SQLITE_OK
+
+
+@contextmanager
+def read_only_access(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    Enforce read-only access on a connection while statements are compiled.
+
+    Installs a SQLite authorizer that denies every action other than reading
+    tables and calling functions, so writes, schema changes, ATTACH and PRAGMA
+    are rejected when the statement is prepared, regardless of how the SQL
+    text is written. Authorizer denials are re-raised as SQLSecurityError.
+    The authorizer is removed on exit; already-prepared statements can still
+    be stepped (e.g. by a streaming cursor).
+
+    Example:
+        with read_only_access(conn):
+            cursor = conn.execute(sql_query)
+    """
+    conn.set_authorizer(_read_only_authorizer)
+    try:
+        yield conn
+    except sqlite3.DatabaseError as e:
+        if "not authorized" in str(e):
+            raise SQLSecurityError(f"Query is not read-only: {str(e)}") from e
+        raise
+    finally:
+        conn.set_authorizer(None)
+
+
+def referenced_tables(conn: sqlite3.Connection, query: str) -> Set[str]:
+    """
+    Return the tables a read-only query reads, without running it.
+
+    The query is compiled (as EXPLAIN) under the read-only authorizer, which
+    also records every table SQLite reports reading. Reads through a view
+    report the view's underlying tables.
+
+    Raises:
+        SQLSecurityError: If the query is not read-only
+    """
+    tables: Set[str] = set()
+
+    def authorizer(action, arg1, arg2, db_name, trigger):
+        if action == sqlite3.SQLITE_READ and arg1 and not arg1.startswith('sqlite_'):
+            tables.add(arg1)
+        return _read_only_authorizer(action, arg1, arg2, db_name, trigger)
+
+    conn.set_authorizer(authorizer)
+    try:
+        conn.execute(f"EXPLAIN {query}").fetchall()
+    except sqlite3.DatabaseError as e:
+        if "not authorized" in str(e):
+            raise SQLSecurityError(f"Query is not read-only: {str(e)}") from e
+        raise
+    finally:
+        conn.set_authorizer(None)
+    return tables
 
 
 def sanitize_value_for_like(value: str) -> str:
@@ -255,7 +514,7 @@ def build_safe_in_clause(column: str, values: List[Any]) -> Tuple[str, List[Any]
 
 def get_safe_table_list(conn: sqlite3.Connection) -> List[str]:
     """
-    Get a list of all tables in the database safely.
+    Get a list of all user tables in the database safely (system and internal tables excluded).
 
     Args:
         conn: SQLite connection object
@@ -267,7 +526,7 @@ def get_safe_table_list(conn: sqlite3.Connection) -> List[str]:
     cursor.execute(
         "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
     )
-    return [row[0] for row in cursor.fetchall()]
+    return [row[0] for row in cursor.fetchall() if not is_internal_table(row[0])]
 
 
 def check_table_exists(conn: sqlite3.Connection, table_name: str) -> bool:
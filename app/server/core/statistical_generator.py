@@ -0,0 +1,323 @@
+"""
+Local statistical synthetic data generation.
+
+Fits a per-column profile from the rows already in a table (null rate,
+categorical frequencies, numeric histograms, date ranges, email and
+digit-pattern formats, integer ID sequences) and samples new rows column-wise
+with NumPy. No LLM is involved, so millions of rows can be generated for load
+testing and written straight to SQLite.
+"""
+
+import re
+import sqlite3
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .data_generation import insert_rows
+from .sampling import sample_rows
+from .sql_security import execute_query_safely
+
+# Random rows sampled from the table to fit the column profiles
+FIT_SAMPLE_SIZE = 50_000
+
+# Columns with at most this many distinct values (and a low distinct ratio)
+# are sampled from their observed frequencies
+CATEGORICAL_MAX_DISTINCT = 50
+CATEGORICAL_MAX_RATIO = 0.5
+
+# Maximum number of histogram bins for numeric columns
+HISTOGRAM_BINS = 50
+
+# Share of values that digit patterns must cover to be used for a text column
+PATTERN_COVERAGE = 0.8
+MAX_PATTERNS = 20
+
+# Rows generated per chunk; bounds memory for very large requests
+GENERATION_CHUNK_SIZE = 50_000
+
+_DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_DATETIME_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}([T ])\d{2}:\d{2}:\d{2}$')
+_EMAIL_PATTERN = re.compile(r'^([^@\s]+)@([^@\s]+\.[^@\s]+)$')
+_DIGIT_RUN = re.compile(r'\d+')
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_id_column(column_name: str) -> bool:
+    name = column_name.lower()
+    return name == 'id' or name.endswith('_id')
+
+
+def _decimal_places(values: List[float]) -> int:
+    """Return the largest number of decimal places used by the values (capped at 6)."""
+    places = 0
+    for value in values[:1000]:
+        text = repr(float(value))
+        if 'e' in text:
+            return 6
+        places = max(places, len(text.split('.')[1].rstrip('0')))
+    return min(places, 6)
+
+
+def _frequencies(values: List[Any]) -> Tuple[List[Any], np.ndarray]:
+    counts = Counter(values)
+    choices = list(counts.keys())
+    weights = np.array([counts[v] for v in choices], dtype=float)
+    return choices, weights / weights.sum()
+
+
+def _digit_shape(value: str) -> str:
+    return _DIGIT_RUN.sub(lambda m: '#' * len(m.group()), value)
+
+
+def fit_column_profile(column_name: str, values: List[Any]) -> Dict[str, Any]:
+    """
+    Fit a sampling profile for one column from its observed values.
+
+    Args:
+        column_name: Column name (used to recognise ID columns)
+        values: Observed values, including None for NULLs
+
+    Returns:
+        Profile dictionary with a 'kind' and a 'null_rate'
+    """
+    non_null = [v for v in values if v is not None]
+    null_rate = 1 - len(non_null) / len(values) if values else 1.0
+    if not non_null:
+        return {'kind': 'null', 'null_rate': 1.0}
+
+    distinct_count = len(set(non_null))
+    few_distinct = (
+        distinct_count <= CATEGORICAL_MAX_DISTINCT
+        and distinct_count <= CATEGORICAL_MAX_RATIO * len(non_null)
+    )
+
+    if all(_is_number(v) for v in non_null):
+        is_int = all(isinstance(v, int) for v in non_null)
+
+        # Unique integer IDs continue as a sequence so generated rows stay unique
+        if is_int and distinct_count == len(non_null) and (
+            _is_id_column(column_name) or len(non_null) > CATEGORICAL_MAX_DISTINCT
+        ):
+            return {'kind': 'sequence', 'null_rate': 0.0, 'start': max(non_null) + 1}
+
+        if few_distinct:
+            choices, probabilities = _frequencies(non_null)
+            return {'kind': 'categorical', 'null_rate': null_rate,
+                    'choices': choices, 'probabilities': probabilities}
+
+        observed = np.asarray(non_null, dtype=float)
+        counts, edges = np.histogram(observed, bins=min(HISTOGRAM_BINS, distinct_count))
+        return {
+            'kind': 'histogram',
+            'null_rate': null_rate,
+            'probabilities': counts / counts.sum(),
+            'edges': edges,
+            'integer': is_int,
+            'decimals': 0 if is_int else _decimal_places(non_null),
+        }
+
+    if all(isinstance(v, str) for v in non_null) and not few_distinct:
+        if all(_DATE_PATTERN.match(v) for v in non_null):
+            days = np.array(non_null, dtype='datetime64[D]').astype(np.int64)
+            return {'kind': 'date', 'null_rate': null_rate,
+                    'low': int(days.min()), 'high': int(days.max())}
+
+        matches = [_DATETIME_PATTERN.match(v) for v in non_null]
+        if all(matches):
+            seconds = np.array([v.replace(' ', 'T') for v in non_null],
+                               dtype='datetime64[s]').astype(np.int64)
+            return {'kind': 'datetime', 'null_rate': null_rate,
+                    'low': int(seconds.min()), 'high': int(seconds.max()),
+                    'separator': Counter(m.group(1) for m in matches).most_common(1)[0][0]}
+
+        emails = [_EMAIL_PATTERN.match(v) for v in non_null]
+        if all(emails):
+            stems, stem_probabilities = _frequencies(
+                [_DIGIT_RUN.sub('', m.group(1)) or 'user' for m in emails]
+            )
+            domains, domain_probabilities = _frequencies([m.group(2) for m in emails])
+            return {'kind': 'email', 'null_rate': null_rate,
+                    'stems': stems, 'stem_probabilities': stem_probabilities,
+                    'domains': domains, 'domain_probabilities': domain_probabilities}
+
+        shapes = Counter(_digit_shape(v) for v in non_null).most_common(MAX_PATTERNS)
+        covered = sum(count for shape, count in shapes if '#' in shape)
+        if covered >= PATTERN_COVERAGE * len(non_null):
+            patterns = [(shape, count) for shape, count in shapes if '#' in shape]
+            weights = np.array([count for _, count in patterns], dtype=float)
+            return {'kind': 'pattern', 'null_rate': null_rate,
+                    'patterns': [shape for shape, _ in patterns],
+                    'probabilities': weights / weights.sum()}
+
+    # Anything else is resampled from the observed values
+    choices, probabilities = _frequencies(non_null)
+    return {'kind': 'categorical', 'null_rate': null_rate,
+            'choices': choices, 'probabilities': probabilities}
+
+
+def _fill_pattern(pattern: str, size: int, rng: np.random.Generator) -> np.ndarray:
+    """Fill each '#' in a pattern with a random digit."""
+    # Build a (size, len) matrix of code points and view each row as one string
+    template = np.frombuffer(pattern.encode('utf-32-le'), dtype=np.uint32)
+    codes = np.tile(template, (size, 1))
+    digit_positions = np.flatnonzero(template == ord('#'))
+    codes[:, digit_positions] = rng.integers(
+        ord('0'), ord('9') + 1, size=(size, len(digit_positions)), dtype=np.uint32
+    )
+    return codes.view(f'<U{len(template)}').ravel()
+
+
+def sample_column(profile: Dict[str, Any], size: int, rng: np.random.Generator) -> List[Any]:
+    """
+    Draw `size` values for a column from its fitted profile.
+
+    Returns:
+        Python values (None for NULLs) ready for sqlite3
+    """
+    kind = profile['kind']
+
+    if kind == 'null':
+        return [None] * size
+
+    if kind == 'sequence':
+        start = profile['start']
+        profile['start'] = start + size
+        return np.arange(start, start + size, dtype=np.int64).tolist()
+
+    if kind == 'categorical':
+        choices = np.empty(len(profile['choices']), dtype=object)
+        choices[:] = profile['choices']
+        values = choices[rng.choice(len(choices), size=size, p=profile['probabilities'])]
+
+    elif kind == 'histogram':
+        edges = profile['edges']
+        bins = rng.choice(len(profile['probabilities']), size=size, p=profile['probabilities'])
+        values = rng.uniform(edges[bins], edges[bins + 1])
+        if profile['integer']:
+            values = np.rint(values).astype(np.int64)
+        else:
+            values = np.round(values, profile['decimals'])
+
+    elif kind == 'date':
+        days = rng.integers(profile['low'], profile['high'] + 1, size=size)
+        values = np.datetime_as_string(days.astype('datetime64[D]'), unit='D')
+
+    elif kind == 'datetime':
+        seconds = rng.integers(profile['low'], profile['high'] + 1, size=size)
+        values = np.datetime_as_string(seconds.astype('datetime64[s]'), unit='s')
+        if profile['separator'] != 'T':
+            values = np.char.replace(values, 'T', profile['separator'])
+
+    elif kind == 'email':
+        stems = np.array(profile['stems'], dtype=str)
+        domains = np.array(profile['domains'], dtype=str)
+        numbers = rng.integers(0, 10_000, size=size).astype(str)
+        values = np.char.add(
+            np.char.add(
+                stems[rng.choice(len(stems), size=size, p=profile['stem_probabilities'])],
+                numbers
+            ),
+            np.char.add('@', domains[rng.choice(len(domains), size=size, p=profile['domain_probabilities'])])
+        )
+
+    elif kind == 'pattern':
+        choice = rng.choice(len(profile['patterns']), size=size, p=profile['probabilities'])
+        values = np.empty(size, dtype=object)
+        for index, pattern in enumerate(profile['patterns']):
+            positions = np.flatnonzero(choice == index)
+            if len(positions):
+                values[positions] = _fill_pattern(pattern, len(positions), rng)
+
+    else:
+        raise ValueError(f"Unknown column profile kind: {kind}")
+
+    values = values.tolist()
+    if profile['null_rate'] > 0:
+        for position in np.flatnonzero(rng.random(size) < profile['null_rate']):
+            values[position] = None
+    return values
+
+
+def fit_table_profiles(
+    conn: sqlite3.Connection,
+    table_name: str,
+    seed: Optional[int] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fit a profile for every column of a table.
+
+    The table name must already be a validated identifier.
+
+    Returns:
+        Mapping of column name to profile, in table column order
+    """
+    columns, rows = sample_rows(conn, table_name, FIT_SAMPLE_SIZE, seed)
+    if not rows:
+        raise ValueError(f"Table '{table_name}' has no rows to fit a distribution from")
+
+    profiles = {}
+    for index, column in enumerate(columns):
+        profile = fit_column_profile(column, [row[index] for row in rows])
+        if profile['kind'] == 'sequence':
+            # The fitted rows are a sample; continue after the table-wide maximum
+            max_cursor = execute_query_safely(
+                conn,
+                "SELECT MAX({column}) FROM {table}",
+                identifier_params={'column': column, 'table': table_name}
+            )
+            profile['start'] = max(profile['start'], (max_cursor.fetchone()[0] or 0) + 1)
+        profiles[column] = profile
+    return profiles
+
+
+def _iter_generated_rows(
+    profiles: Dict[str, Dict[str, Any]],
+    rows: int,
+    rng: np.random.Generator
+) -> Iterator[Tuple[Any, ...]]:
+    remaining = rows
+    while remaining > 0:
+        size = min(GENERATION_CHUNK_SIZE, remaining)
+        columns = [sample_column(profile, size, rng) for profile in profiles.values()]
+        yield from zip(*columns)
+        remaining -= size
+
+
+def generate_statistical_rows(
+    db_path: str,
+    table_name: str,
+    rows: int,
+    seed: Optional[int] = None
+) -> int:
+    """
+    Generate rows from fitted column distributions and insert them.
+
+    Rows are produced in chunks of GENERATION_CHUNK_SIZE and inserted with one
+    executemany in a single transaction.
+
+    Args:
+        db_path: Path to the SQLite database
+        table_name: Validated name of an existing, non-empty table
+        rows: Number of rows to generate
+        seed: Optional seed for reproducible output
+
+    Returns:
+        int: Number of rows inserted
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        profiles = fit_table_profiles(conn, table_name, seed)
+        rng = np.random.default_rng(seed)
+        return insert_rows(
+            conn,
+            table_name,
+            list(profiles.keys()),
+            _iter_generated_rows(profiles, rows, rng)
+        )
+    finally:
+        conn.close()
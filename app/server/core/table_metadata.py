@@ -0,0 +1,176 @@
+"""
+Per-table metadata kept in an internal table of each database.
+
+Every single-file upload records a BLAKE2b hash of the raw file it loaded,
+plus one hash per HASH_BLOCK_BYTES block. Re-uploading an identical file
+is then a lookup instead of a parse and rewrite, and for a changed file
+the block hashes show how much of it changed.
+
+Each table also has a version, bumped by every write made through the
+API, so derived data can tell when a table has changed. Writes that do not
+come from a recorded upload (bulk uploads, generated rows, deletes) clear
+the stored hash, so the next upload of the same file is loaded again.
+
+Internal tables share the INTERNAL_TABLE_PREFIX and are hidden from the
+schema shown to users and the LLM.
+"""
+
+import hashlib
+import sqlite3
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable, Optional
+
+INTERNAL_TABLE_PREFIX = '_nlsql_'
+METADATA_TABLE = f'{INTERNAL_TABLE_PREFIX}table_metadata'
+
+# Size of the blocks hashed separately to locate changes in a re-upload
+HASH_BLOCK_BYTES = 1 << 20
+
+# BLAKE2b digest size in bytes, for the whole file and for each block
+DIGEST_SIZE = 16
+
+
+@dataclass
+class UploadDigest:
+    """Hashes of a raw upload: the whole file and each block, concatenated."""
+    content_hash: str
+    block_hashes: bytes
+    size: int
+
+    @property
+    def block_count(self) -> int:
+        return len(self.block_hashes) // DIGEST_SIZE
+
+
+@dataclass
+class UploadRecord:
+    """The last upload recorded for a table."""
+    digest: UploadDigest
+    mode: str
+    array_tables: bool
+
+
+def is_internal_table(table_name: str) -> bool:
+    return table_name.startswith(INTERNAL_TABLE_PREFIX)
+
+
+def hash_upload(source: BinaryIO) -> UploadDigest:
+    """Hash a seekable upload from the start, one block at a time, and rewind it."""
+    whole = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    blocks = bytearray()
+    size = 0
+    source.seek(0)
+    while True:
+        block = source.read(HASH_BLOCK_BYTES)
+        if not block:
+            break
+        whole.update(block)
+        blocks += hashlib.blake2b(block, digest_size=DIGEST_SIZE).digest()
+        size += len(block)
+    source.seek(0)
+    return UploadDigest(whole.hexdigest(), bytes(blocks), size)
+
+
+def is_repeat_upload(previous: UploadRecord, digest: UploadDigest, mode: str, array_tables: bool) -> bool:
+    """
+    True if loading the upload with digest would not change the table last loaded by previous.
+
+    Appending or upserting a file whose rows are already in the table only
+    duplicates them. A replace reproduces the table only if it was last
+    loaded by a replace, not appended to.
+    """
+    if previous.digest.content_hash != digest.content_hash or previous.array_tables != array_tables:
+        return False
+    return mode != 'replace' or previous.mode == 'replace'
+
+
+def changed_blocks(previous: UploadDigest, current: UploadDigest) -> int:
+    """Number of blocks of current that differ from (or are missing in) previous."""
+    common = min(previous.block_count, current.block_count)
+    changed = sum(
+        previous.block_hashes[i:i + DIGEST_SIZE] != current.block_hashes[i:i + DIGEST_SIZE]
+        for i in range(0, common * DIGEST_SIZE, DIGEST_SIZE)
+    )
+    return changed + max(0, current.block_count - common)
+
+
+def ensure_metadata_table(conn: sqlite3.Connection) -> None:
+    """Create the metadata table, after which writes through the API bump table versions."""
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {METADATA_TABLE} ("
+        "table_name TEXT PRIMARY KEY, "
+        "version INTEGER NOT NULL DEFAULT 0, "
+        "content_hash TEXT, "
+        "block_hashes BLOB, "
+        "source_bytes INTEGER, "
+        "load_mode TEXT, "
+        "array_tables INTEGER, "
+        "updated_at TEXT)"
+    )
+
+
+def _metadata_exists(conn: sqlite3.Connection) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (METADATA_TABLE,)
+    ).fetchone()
+    return row is not None
+
+
+def get_upload_record(conn: sqlite3.Connection, table_name: str) -> Optional[UploadRecord]:
+    """Return the last recorded upload of table_name, or None if it has none."""
+    if not _metadata_exists(conn):
+        return None
+    row = conn.execute(
+        f"SELECT content_hash, block_hashes, source_bytes, load_mode, array_tables "
+        f"FROM {METADATA_TABLE} WHERE table_name = ? AND content_hash IS NOT NULL",
+        (table_name,)
+    ).fetchone()
+    if row is None:
+        return None
+    return UploadRecord(UploadDigest(row[0], row[1], row[2]), row[3], bool(row[4]))
+
+
+def table_version(conn: sqlite3.Connection, table_name: str) -> int:
+    """Return table_name's write version (0 if it has never been written through the API)."""
+    if not _metadata_exists(conn):
+        return 0
+    row = conn.execute(f"SELECT version FROM {METADATA_TABLE} WHERE table_name = ?", (table_name,)).fetchone()
+    return row[0] if row else 0
+
+
+def record_upload(
+    conn: sqlite3.Connection,
+    table_name: str,
+    digest: UploadDigest,
+    mode: str,
+    array_tables: bool = False
+) -> None:
+    """Record the upload just loaded into table_name and bump its version. The caller commits."""
+    ensure_metadata_table(conn)
+    conn.execute(
+        f"INSERT INTO {METADATA_TABLE} "
+        "(table_name, version, content_hash, block_hashes, source_bytes, load_mode, array_tables, updated_at) "
+        "VALUES (?, 1, ?, ?, ?, ?, ?, datetime('now')) "
+        "ON CONFLICT (table_name) DO UPDATE SET version = version + 1, content_hash = excluded.content_hash, "
+        "block_hashes = excluded.block_hashes, source_bytes = excluded.source_bytes, "
+        "load_mode = excluded.load_mode, array_tables = excluded.array_tables, updated_at = excluded.updated_at",
+        (table_name, digest.content_hash, digest.block_hashes, digest.size, mode, int(array_tables))
+    )
+
+
+def mark_tables_modified(conn: sqlite3.Connection, table_names: Iterable[str]) -> None:
+    """
+    Bump the version of tables written other than by a recorded upload, and clear their hashes.
+
+    Does nothing in a database without metadata, where no table has a hash
+    or version to invalidate. The caller commits.
+    """
+    if not _metadata_exists(conn):
+        return
+    conn.executemany(
+        f"INSERT INTO {METADATA_TABLE} (table_name, version, updated_at) VALUES (?, 1, datetime('now')) "
+        "ON CONFLICT (table_name) DO UPDATE SET version = version + 1, content_hash = NULL, "
+        "block_hashes = NULL, source_bytes = NULL, load_mode = NULL, array_tables = NULL, "
+        "updated_at = excluded.updated_at",
+        [(name,) for name in table_names]
+    )
@@ -0,0 +1,68 @@
+"""
+Lightweight per-request tracing.
+
+A RequestTrace is bound to the current context with start_trace(). Code
+deeper in the call stack (generate_sql, execute_sql_safely, the LLM clients)
+adds phase durations and LLM token counts to it through module functions,
+without the trace being passed as an argument. contextvars keeps concurrent
+requests apart, including across awaits. When no trace is active, the
+recording functions do nothing.
+
+Phase timings are normally recorded through core.metrics.timed(), which also
+feeds the Prometheus phase histogram.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+
+class RequestTrace:
+    """Phase durations (ms) and counters collected for one request."""
+
+    def __init__(self):
+        self.phases_ms: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+
+    def add_phase(self, phase: str, elapsed_ms: float) -> None:
+        """Add time to a phase; repeated phases (e.g. LLM retries) accumulate."""
+        self.phases_ms[phase] = self.phases_ms.get(phase, 0.0) + elapsed_ms
+
+    def add_count(self, name: str, value: int) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+
+
+@contextmanager
+def start_trace() -> Iterator[RequestTrace]:
+    """Collect phase timings for the enclosed block into a new RequestTrace."""
+    trace = RequestTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    """Return the active trace, or None outside start_trace()."""
+    return _current_trace.get()
+
+
+def record_phase(phase: str, elapsed_ms: float) -> None:
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add_phase(phase, elapsed_ms)
+
+
+def record_llm_usage(prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+    """Add LLM token usage to the active trace (None values are ignored)."""
+    trace = _current_trace.get()
+    if trace is None:
+        return
+    if isinstance(prompt_tokens, int):
+        trace.add_count("prompt_tokens", prompt_tokens)
+    if isinstance(completion_tokens, int):
+        trace.add_count("completion_tokens", completion_tokens)
@@ -0,0 +1,133 @@
+"""
+Column type inference for uploads.
+
+Left to itself, pandas picks SQLite column types per DataFrame. An integer
+column with one missing value becomes REAL, a boolean column with a
+missing value becomes TEXT, and dates are always TEXT. infer_column_types()
+instead examines a sample from the first chunk of an upload and declares
+one type per column:
+
+    INTEGER    whole numbers, NULLs allowed
+    REAL       other numbers
+    BOOLEAN    true/false, yes/no and t/f values, stored as 0/1
+    DATE       ISO dates (YYYY-MM-DD), stored as ISO text
+    TIMESTAMP  ISO date-times, stored as ISO text
+    TEXT       everything else, including low-cardinality categoricals
+
+convert_chunk() converts every chunk of the upload to those types as it
+streams past. A value that doesn't fit (a stray "n/a" in an INTEGER column)
+is stored unchanged, which SQLite's dynamic typing allows, rather than
+failing the upload.
+"""
+
+import re
+from typing import Any, Dict
+
+# Rows of the first chunk examined per column
+INFERENCE_SAMPLE_ROWS = 10_000
+
+# Text accepted as a BOOLEAN value, and the 0/1 it is stored as
+BOOLEAN_VALUES = {'true': 1, 'false': 0, 't': 1, 'f': 0, 'yes': 1, 'no': 0}
+_DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_TIMESTAMP_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?$')
+
+# Numbers written with leading zeros (zip codes, account numbers) stay text
+_LEADING_ZERO = re.compile(r'^[+-]?0\d')
+
+# Whole numbers outside this range don't fit a SQLite INTEGER
+_MAX_INTEGER = 2 ** 63
+
+
+def _is_whole(numbers: Any) -> Any:
+    return (numbers % 1 == 0) & (numbers.abs() < _MAX_INTEGER)
+
+
+def _infer_type(values: Any) -> str:
+    import pandas as pd
+
+    dtype = values.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'BOOLEAN'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'TIMESTAMP'
+
+    non_null = values.dropna()
+    if isinstance(dtype, pd.CategoricalDtype):
+        non_null = non_null.astype(object)
+    if non_null.empty:
+        return 'TEXT'
+    if pd.api.types.is_numeric_dtype(non_null.dtype):
+        return 'INTEGER' if _is_whole(non_null).all() else 'REAL'
+
+    if all(isinstance(value, bool) for value in non_null):
+        return 'BOOLEAN'
+    if not all(isinstance(value, str) for value in non_null):
+        # Mixed Python numbers (JSON) are typed like a numeric column
+        if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in non_null):
+            return 'INTEGER' if _is_whole(pd.to_numeric(non_null)).all() else 'REAL'
+        return 'TEXT'
+
+    text = non_null.astype(str).str.strip()
+    if text.str.lower().isin(BOOLEAN_VALUES.keys()).all():
+        return 'BOOLEAN'
+    if not text.str.match(_LEADING_ZERO).any():
+        numbers = pd.to_numeric(text, errors='coerce')
+        if numbers.notna().all():
+            return 'INTEGER' if _is_whole(numbers).all() else 'REAL'
+    if text.str.match(_DATE_PATTERN).all():
+        if pd.to_datetime(text, format='%Y-%m-%d', errors='coerce').notna().all():
+            return 'DATE'
+    if text.str.match(_TIMESTAMP_PATTERN).all():
+        return 'TIMESTAMP'
+    return 'TEXT'
+
+
+def infer_column_types(df: Any) -> Dict[str, str]:
+    """Return the declared SQLite type for each column, judged from the first INFERENCE_SAMPLE_ROWS rows."""
+    sample = df.head(INFERENCE_SAMPLE_ROWS)
+    return {column: _infer_type(sample[column]) for column in sample.columns}
+
+
+def _with_unconverted(converted: Any, original: Any) -> Any:
+    # Keep values the conversion rejected; NULLs become None for the sqlite3 driver
+    merged = converted.astype(object).where(converted.notna(), original.astype(object))
+    return merged.where(original.notna(), None)
+
+
+def _convert_values(values: Any, declared_type: str) -> Any:
+    import pandas as pd
+
+    if declared_type in ('INTEGER', 'REAL'):
+        if pd.api.types.is_bool_dtype(values.dtype):
+            values = values.astype(int)
+        numbers = pd.to_numeric(values, errors='coerce')
+        if declared_type == 'INTEGER':
+            whole = numbers.notna() & _is_whole(numbers.fillna(0))
+            numbers = numbers.where(whole).astype('Int64')
+        if numbers.notna().sum() == values.notna().sum():
+            return numbers
+        return _with_unconverted(numbers, values)
+
+    if declared_type == 'BOOLEAN':
+        if pd.api.types.is_bool_dtype(values.dtype):
+            return values.astype('Int64')
+        flags = values.map(
+            lambda value: int(value) if isinstance(value, bool)
+            else BOOLEAN_VALUES.get(value.strip().lower()) if isinstance(value, str)
+            else None
+        ).astype('Int64')
+        if flags.notna().sum() == values.notna().sum():
+            return flags
+        return _with_unconverted(flags, values)
+
+    return values
+
+
+def convert_chunk(df: Any, column_types: Dict[str, str]) -> Any:
+    """Convert a chunk's values to the inferred column types; columns not in column_types are left alone."""
+    import pandas as pd
+
+    return pd.DataFrame({
+        column: _convert_values(df[column], column_types[column]) if column in column_types else df[column]
+        for column in df.columns
+    })
@@ -0,0 +1,89 @@
+"""
+Per-workspace SQLite databases.
+
+Requests name a workspace in the X-Workspace header. Each workspace gets its
+own database file, so tenants never share a write lock, a result cache
+entry or a schema catalog. Requests without the header use the default
+database (DATABASE_PATH, db/database.db unless set).
+
+Files are created under WORKSPACES_DIR on first use. WORKSPACE_DB_PATHS
+pins individual workspaces elsewhere, e.g. to move a heavy tenant onto its
+own disk:
+
+    WORKSPACE_DB_PATHS="acme=/mnt/fast/acme.db,globex=/mnt/b/globex.db"
+
+Connection handles are opened on demand and closed least-recently-used
+first by the pool registry in core.database.
+"""
+
+import os
+import re
+import threading
+from typing import Dict, Optional
+
+from .database import DEFAULT_DB_PATH
+
+WORKSPACE_HEADER = "X-Workspace"
+
+# Directory for workspace databases without an explicit path
+WORKSPACES_DIR = os.environ.get("WORKSPACES_DIR", "db/workspaces")
+
+# Workspace names become file names, so only a safe subset is accepted
+_WORKSPACE_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+
+
+def _parse_path_overrides(value: str) -> Dict[str, str]:
+    overrides = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        workspace, _, path = item.partition("=")
+        if not path:
+            raise ValueError(f"Invalid WORKSPACE_DB_PATHS entry: {item!r} (expected name=path)")
+        overrides[validate_workspace(workspace.strip())] = path.strip()
+    return overrides
+
+
+def validate_workspace(workspace: str) -> str:
+    """Return the workspace name, or raise ValueError if it is not a safe file name."""
+    if not _WORKSPACE_PATTERN.match(workspace):
+        raise ValueError(
+            "Invalid workspace name: use 1-64 letters, digits, '_' or '-', starting with a letter or digit"
+        )
+    return workspace
+
+
+class DatabaseRegistry:
+    """Maps workspace names to database file paths."""
+
+    def __init__(self, workspaces_dir: str = WORKSPACES_DIR, overrides: Optional[Dict[str, str]] = None):
+        self.workspaces_dir = workspaces_dir
+        self._overrides = dict(overrides or {})
+        self._lock = threading.Lock()
+
+    def assign(self, workspace: str, db_path: str) -> None:
+        """Store a workspace's database at a specific path (a separate disk, say)."""
+        with self._lock:
+            self._overrides[validate_workspace(workspace)] = db_path
+
+    def path_for(self, workspace: Optional[str] = None) -> str:
+        """
+        Return the database path for a workspace, creating its directory.
+
+        Raises:
+            ValueError: If the workspace name is invalid
+        """
+        if not workspace:
+            return DEFAULT_DB_PATH
+        validate_workspace(workspace)
+        with self._lock:
+            db_path = self._overrides.get(workspace)
+        if db_path is None:
+            db_path = os.path.join(self.workspaces_dir, f"{workspace}.db")
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return db_path
+
+
+database_registry = DatabaseRegistry(overrides=_parse_path_overrides(os.environ.get("WORKSPACE_DB_PATHS", "")))
@@ -1,18 +1,24 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import Depends, FastAPI, File, Form, Header, UploadFile, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from datetime import datetime
+import asyncio
 import os
+import time
 import sqlite3
 import traceback
 from dotenv import load_dotenv
 import logging
 import sys
+from typing import Any, Dict, List, Optional
 
 from core.data_models import (
     FileUploadResponse,
+    BulkUploadResponse,
+    BulkUploadFileResult,
     QueryRequest,
     QueryResponse,
+    QueryTimings,
     DatabaseSchemaResponse,
     InsightsRequest,
     InsightsResponse,
@@ -23,19 +29,66 @@ from core.data_models import (
     ExportRequest,
     QueryExportRequest,
     GenerateDataRequest,
-    GenerateDataResponse
+    GenerateDataResponse,
+    SaveViewRequest,
+    SavedViewInfo,
+    SavedViewListResponse,
+    SavedViewResponse,
+    SavedViewResultResponse,
+    FullTextIndexRequest,
+    FullTextIndexResponse
 )
-from core.file_processor import convert_csv_to_sqlite, convert_json_to_sqlite, convert_jsonl_to_sqlite, convert_parquet_to_sqlite
-from core.llm_processor import generate_sql, generate_random_query, generate_synthetic_data
-from core.sql_processor import execute_sql_safely, get_database_schema
+from core.bulk_upload import bulk_convert
+from core.file_processor import convert_file_to_sqlite, is_supported_upload
+from core.full_text import create_full_text_index, drop_full_text_index, full_text_tables
+from core.ingest import parse_ingest_mode
+from core.saved_views import delete_view, list_views, read_view, save_view
+from core.query_suggestions import suggestion_pool
+from core.table_metadata import is_internal_table, mark_tables_modified
+from core.llm_processor import generate_sql, generate_random_query, resolve_llm_provider
+from core.data_generation import MAX_LLM_ROWS, generate_synthetic_rows, insert_rows
+from core.sql_processor import execute_sql_safely, get_database_schema, open_sql_cursor
 from core.insights import generate_insights
+from core.sampling import sample_dicts
+from core.database import DEFAULT_DB_PATH
+from core.query_cache import invalidate_result_cache, result_cache
+from core.workspaces import WORKSPACE_HEADER, database_registry
+from core.shared_cache import (
+    DEFAULT_SHARED_CACHE_PATH,
+    SHARED_CACHE_PATH_ENV,
+    nl_sql_cache,
+    nl_sql_key,
+    schema_catalog,
+    schema_fingerprint
+)
+from core.tracing import RequestTrace, start_trace
+from core.metrics import (
+    timed,
+    record_error,
+    observe_request,
+    publish_metrics,
+    render_deployment_metrics,
+    register_cache_collector
+)
 from core.sql_security import (
+    validation_cache_info,
     execute_query_safely,
     validate_identifier,
     check_table_exists,
-    SQLSecurityError
+    SQLSecurityError,
+    read_only_access
+)
+from core.export_utils import (
+    ARROW_EXPORT_FORMATS,
+    generate_csv_from_data,
+    open_table_cursor,
+    scan_storage_classes,
+    stream_export_from_cursor,
+    table_export_sql,
+    validate_export_options,
+    get_export_media_type,
+    get_export_filename
 )
-from core.export_utils import generate_csv_from_data, generate_csv_from_table
 
 # Load .env file from server directory
 load_dotenv()
@@ -68,45 +121,97 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_timing(request: Request, call_next):
+    """Record request latency per route template for /api/metrics"""
+    start_time = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Streaming responses are timed until their headers are sent
+        route = request.scope.get("route")
+        route_path = route.path if route is not None else "unmatched"
+        observe_request(request.method, route_path, status, time.perf_counter() - start_time)
+        publish_metrics()
+
+register_cache_collector(lambda: ("query_results", result_cache.hits, result_cache.misses))
+register_cache_collector(lambda: ("schema_catalog", schema_catalog.hits, schema_catalog.misses))
+register_cache_collector(lambda: ("nl_sql", nl_sql_cache.hits, nl_sql_cache.misses))
+register_cache_collector(
+    lambda: ("sql_validation", validation_cache_info().hits, validation_cache_info().misses)
+)
+
 # Global app state
 app_start_time = datetime.now()
 
 # Ensure database directory exists
-os.makedirs("db", exist_ok=True)
+os.makedirs(os.path.dirname(DEFAULT_DB_PATH) or ".", exist_ok=True)
+
+def workspace_db_path(x_workspace: Optional[str] = Header(None, alias=WORKSPACE_HEADER)) -> str:
+    """Database file for the request's workspace; the default database without the header"""
+    try:
+        return database_registry.path_for(x_workspace)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
 
 @app.post("/api/upload", response_model=FileUploadResponse)
-async def upload_file(file: UploadFile = File(...)) -> FileUploadResponse:
-    """Upload and convert .csv, .json, .jsonl, or .parquet file to SQLite table"""
+async def upload_file(
+    file: UploadFile = File(...),
+    mode: str = Form("replace"),
+    key_columns: Optional[str] = Form(None),
+    array_tables: bool = Form(False),
+    full_text: bool = Form(False),
+    db_path: str = Depends(workspace_db_path)
+) -> FileUploadResponse:
+    """
+    Upload and convert .csv, .json, .jsonl, or .parquet file (optionally .gz/.zst/.bz2) to SQLite table.
+
+    mode 'replace' (default) rewrites the table; 'append' adds the rows and
+    'upsert' merges them on key_columns (comma-separated). array_tables
+    loads a .jsonl file's arrays into child tables. A file identical to the
+    table's last upload is not loaded again (see core.table_metadata).
+    full_text builds an FTS5 index over the table's text columns.
+    """
     try:
         # Validate file type
-        if not file.filename.endswith(('.csv', '.json', '.jsonl', '.parquet')):
+        if not is_supported_upload(file.filename):
             raise HTTPException(400, "Only .csv, .json, .jsonl, and .parquet files are supported")
+        mode, keys = parse_ingest_mode(mode, key_columns)
 
-        # Generate table name from filename
-        table_name = file.filename.rsplit('.', 1)[0].lower().replace(' ', '_')
-
-        # Read file content
-        content = await file.read()
-
-        # Convert to SQLite based on file type
-        if file.filename.endswith('.csv'):
-            result = convert_csv_to_sqlite(content, table_name)
-        elif file.filename.endswith('.jsonl'):
-            result = convert_jsonl_to_sqlite(content, table_name)
-        elif file.filename.endswith('.parquet'):
-            result = convert_parquet_to_sqlite(content, table_name)
-        else:
-            result = convert_json_to_sqlite(content, table_name)
+        # Convert straight from the spooled upload file (on disk past 1 MB),
+        # off the event loop, without reading it into memory
+        with timed("upload_conversion"):
+            result = await asyncio.to_thread(
+                convert_file_to_sqlite, file.filename, file.file, db_path, mode, keys, array_tables, skip_unchanged=True
+            )
+        full_text_index = None
+        if full_text:
+            with timed("full_text_index"):
+                full_text_index = (await asyncio.to_thread(_build_full_text_index, db_path, result['table_name']))['table']
+        invalidate_result_cache(db_path)
         
         response = FileUploadResponse(
             table_name=result['table_name'],
             table_schema=result['schema'],
             row_count=result['row_count'],
-            sample_data=result['sample_data']
+            rows_loaded=result['rows_loaded'],
+            sample_data=result['sample_data'],
+            child_tables=result.get('child_tables', []),
+            content_hash=result['content_hash'],
+            unchanged=result['unchanged'],
+            changed_blocks=result['changed_blocks'],
+            full_text_index=full_text_index
         )
-        logger.info(f"[SUCCESS] File upload: {response}")
+        if response.unchanged:
+            logger.info(f"[SUCCESS] File upload: {file.filename} unchanged, kept table {response.table_name}")
+        else:
+            logger.info(f"[SUCCESS] File upload: {response}")
         return response
     except Exception as e:
+        record_error("upload")
         logger.error(f"[ERROR] File upload failed: {str(e)}")
         logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
         return FileUploadResponse(
@@ -117,50 +222,140 @@ async def upload_file(file: UploadFile = File(...)) -> FileUploadResponse:
             error=str(e)
         )
 
-@app.post("/api/query", response_model=QueryResponse)
-async def process_natural_language_query(request: QueryRequest) -> QueryResponse:
-    """Process natural language query and return SQL results"""
+@app.post("/api/upload/bulk", response_model=BulkUploadResponse)
+async def upload_files_bulk(
+    files: List[UploadFile] = File(...),
+    mode: str = Form("replace"),
+    key_columns: Optional[str] = Form(None),
+    db_path: str = Depends(workspace_db_path)
+) -> BulkUploadResponse:
+    """Upload many files and/or .zip/.tar archives, converted in parallel into one table per file"""
     try:
-        # Get database schema
-        schema_info = get_database_schema()
-        
-        # Generate SQL using routing logic
-        sql = generate_sql(request, schema_info)
-        
-        # Execute SQL query
-        start_time = datetime.now()
-        result = execute_sql_safely(sql)
-        execution_time = (datetime.now() - start_time).total_seconds() * 1000
-        
-        if result['error']:
-            raise Exception(result['error'])
-        
-        response = QueryResponse(
-            sql=sql,
-            results=result['results'],
-            columns=result['columns'],
-            row_count=len(result['results']),
-            execution_time_ms=execution_time
+        mode, keys = parse_ingest_mode(mode, key_columns)
+        uploads = [(file.filename, await file.read()) for file in files]
+
+        # Conversion runs on a worker pool off the event loop
+        with timed("bulk_upload_conversion"):
+            result = await asyncio.to_thread(bulk_convert, uploads, db_path, mode=mode, key_columns=keys)
+        invalidate_result_cache(db_path)
+
+        file_results = [BulkUploadFileResult(**entry) for entry in result['files']]
+        elapsed = result['elapsed_seconds']
+        response = BulkUploadResponse(
+            files=file_results,
+            tables_created=sum(1 for entry in file_results if entry.error is None),
+            total_rows=result['total_rows'],
+            total_bytes=result['total_bytes'],
+            elapsed_seconds=elapsed,
+            rows_per_second=result['total_rows'] / elapsed if elapsed > 0 else 0.0,
+            megabytes_per_second=result['total_bytes'] / 1_000_000 / elapsed if elapsed > 0 else 0.0
+        )
+        failed = len(file_results) - response.tables_created
+        if failed:
+            record_error("bulk_upload_file")
+        logger.info(
+            f"[SUCCESS] Bulk upload: {response.tables_created} tables, {failed} failed, "
+            f"{response.total_rows} rows in {elapsed:.2f}s ({response.rows_per_second:.0f} rows/sec)"
         )
-        logger.info(f"[SUCCESS] Query processed: SQL={sql}, rows={len(result['results'])}, time={execution_time}ms")
         return response
     except Exception as e:
-        logger.error(f"[ERROR] Query processing failed: {str(e)}")
+        record_error("bulk_upload")
+        logger.error(f"[ERROR] Bulk upload failed: {str(e)}")
         logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
-        return QueryResponse(
-            sql="",
-            results=[],
-            columns=[],
-            row_count=0,
-            execution_time_ms=0,
+        return BulkUploadResponse(
+            files=[],
+            tables_created=0,
+            total_rows=0,
+            total_bytes=0,
+            elapsed_seconds=0.0,
+            rows_per_second=0.0,
+            megabytes_per_second=0.0,
             error=str(e)
         )
 
+def _query_timings(trace: RequestTrace, start_time: float, rows: int) -> QueryTimings:
+    """Build the per-phase breakdown for a query from its request trace"""
+    phases = trace.phases_ms
+    return QueryTimings(
+        schema_ms=phases.get("schema", 0.0),
+        prompt_build_ms=phases.get("prompt_build", 0.0),
+        llm_ms=phases.get("llm", 0.0),
+        validate_ms=phases.get("validate", 0.0),
+        sql_ms=phases.get("sql", 0.0),
+        serialize_ms=phases.get("serialize", 0.0),
+        total_ms=(time.perf_counter() - start_time) * 1000,
+        rows=rows,
+        prompt_tokens=trace.counters.get("prompt_tokens"),
+        completion_tokens=trace.counters.get("completion_tokens")
+    )
+
+@app.post("/api/query", response_model=QueryResponse)
+async def process_natural_language_query(
+    request: QueryRequest,
+    db_path: str = Depends(workspace_db_path)
+) -> QueryResponse:
+    """Process natural language query and return SQL results"""
+    request_start = time.perf_counter()
+    with start_trace() as trace:
+        try:
+            # Get database schema
+            with timed("schema"):
+                schema_info = get_database_schema(db_path)
+            
+            # Reuse SQL generated earlier (by any worker) for the same question and schema
+            cache_key = nl_sql_key(resolve_llm_provider(request), request.query)
+            fingerprint = schema_fingerprint(schema_info)
+            sql = nl_sql_cache.get(cache_key, fingerprint)
+            generated = sql is None
+            if generated:
+                # Generate SQL using routing logic (records prompt_build and llm phases)
+                sql = generate_sql(request, schema_info)
+            
+            # Execute SQL query (records validate and sql phases)
+            start_time = time.perf_counter()
+            result = execute_sql_safely(sql, db_path=db_path)
+            execution_time = (time.perf_counter() - start_time) * 1000
+            
+            if result['error']:
+                raise Exception(result['error'])
+            if generated:
+                # Only SQL that ran successfully is worth reusing
+                nl_sql_cache.put(cache_key, fingerprint, sql)
+            
+            with timed("serialize"):
+                response = QueryResponse(
+                    sql=sql,
+                    results=result['results'],
+                    columns=result['columns'],
+                    row_count=len(result['results']),
+                    execution_time_ms=execution_time
+                )
+            if request.include_timings:
+                response.timings = _query_timings(trace, request_start, response.row_count)
+            logger.info(f"[SUCCESS] Query processed: SQL={sql}, rows={len(result['results'])}, time={execution_time}ms")
+            return response
+        except Exception as e:
+            record_error("query")
+            logger.error(f"[ERROR] Query processing failed: {str(e)}")
+            logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
+            return QueryResponse(
+                sql="",
+                results=[],
+                columns=[],
+                row_count=0,
+                execution_time_ms=0,
+                timings=_query_timings(trace, request_start, 0) if request.include_timings else None,
+                error=str(e)
+            )
+
 @app.get("/api/schema", response_model=DatabaseSchemaResponse)
-async def get_database_schema_endpoint() -> DatabaseSchemaResponse:
+async def get_database_schema_endpoint(db_path: str = Depends(workspace_db_path)) -> DatabaseSchemaResponse:
     """Get current database schema and table information"""
     try:
-        schema = get_database_schema()
+        with timed("schema"):
+            schema = get_database_schema(db_path)
+        # Refill random query suggestions if the schema changed since they were made
+        suggestion_pool.schema_changed(db_path, schema)
         tables = []
         
         for table_name, table_info in schema['tables'].items():
@@ -177,7 +372,8 @@ async def get_database_schema_endpoint() -> DatabaseSchemaResponse:
                 name=table_name,
                 columns=columns,
                 row_count=table_info.get('row_count', 0),
-                created_at=datetime.now()  # Simplified for v1
+                created_at=datetime.now(),  # Simplified for v1
+                full_text_columns=table_info.get('full_text_index', {}).get('columns', [])
             ))
         
         response = DatabaseSchemaResponse(
@@ -187,6 +383,7 @@ async def get_database_schema_endpoint() -> DatabaseSchemaResponse:
         logger.info(f"[SUCCESS] Schema retrieved: {len(tables)} tables")
         return response
     except Exception as e:
+        record_error("schema")
         logger.error(f"[ERROR] Schema retrieval failed: {str(e)}")
         logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
         return DatabaseSchemaResponse(
@@ -196,10 +393,14 @@ async def get_database_schema_endpoint() -> DatabaseSchemaResponse:
         )
 
 @app.post("/api/insights", response_model=InsightsResponse)
-async def generate_insights_endpoint(request: InsightsRequest) -> InsightsResponse:
+async def generate_insights_endpoint(
+    request: InsightsRequest,
+    db_path: str = Depends(workspace_db_path)
+) -> InsightsResponse:
     """Generate statistical insights for table columns"""
     try:
-        insights = generate_insights(request.table_name, request.column_names)
+        with timed("insights"):
+            insights = generate_insights(request.table_name, request.column_names, db_path)
         response = InsightsResponse(
             table_name=request.table_name,
             insights=insights,
@@ -208,6 +409,7 @@ async def generate_insights_endpoint(request: InsightsRequest) -> InsightsRespon
         logger.info(f"[SUCCESS] Insights generated for table: {request.table_name}, insights count: {len(insights)}")
         return response
     except Exception as e:
+        record_error("insights")
         logger.error(f"[ERROR] Insights generation failed: {str(e)}")
         logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
         return InsightsResponse(
@@ -218,11 +420,12 @@ async def generate_insights_endpoint(request: InsightsRequest) -> InsightsRespon
         )
 
 @app.get("/api/generate-random-query", response_model=RandomQueryResponse)
-async def generate_random_query_endpoint() -> RandomQueryResponse:
+async def generate_random_query_endpoint(db_path: str = Depends(workspace_db_path)) -> RandomQueryResponse:
     """Generate a random natural language query based on database schema"""
     try:
         # Get database schema
-        schema_info = get_database_schema()
+        with timed("schema"):
+            schema_info = get_database_schema(db_path)
         
         # Check if there are any tables
         if not schema_info.get('tables'):
@@ -231,13 +434,26 @@ async def generate_random_query_endpoint() -> RandomQueryResponse:
                 error="No tables found in database"
             )
         
-        # Generate random query using LLM
-        random_query = generate_random_query(schema_info)
+        # Serve a pre-validated suggestion; the pool refills in the background
+        suggestion = suggestion_pool.pop(db_path, schema_info)
+        if suggestion is not None:
+            logger.info(f"[SUCCESS] Random query served from pool: {suggestion['query']}")
+            return RandomQueryResponse(
+                query=suggestion['query'],
+                sql=suggestion['sql'],
+                row_count=suggestion['row_count'],
+                pooled=True
+            )
+
+        # Empty pool (first request for this schema): generate one now using LLM
+        with timed("random_query_generation"):
+            random_query = await asyncio.to_thread(generate_random_query, schema_info, db_path)
         
         response = RandomQueryResponse(query=random_query)
         logger.info(f"[SUCCESS] Random query generated: {random_query}")
         return response
     except Exception as e:
+        record_error("random_query")
         logger.error(f"[ERROR] Random query generation failed: {str(e)}")
         logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
         return RandomQueryResponse(
@@ -246,14 +462,15 @@ async def generate_random_query_endpoint() -> RandomQueryResponse:
         )
 
 @app.get("/api/health", response_model=HealthCheckResponse)
-async def health_check() -> HealthCheckResponse:
+async def health_check(db_path: str = Depends(workspace_db_path)) -> HealthCheckResponse:
     """Health check endpoint with database status"""
     try:
         # Check database connection
-        conn = sqlite3.connect("db/database.db")
+        conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = cursor.fetchall()
+        full_text_hidden = full_text_tables(conn)[1]
+        tables = [row for row in cursor.fetchall() if not is_internal_table(row[0]) and row[0] not in full_text_hidden]
         conn.close()
         
         uptime = (datetime.now() - app_start_time).total_seconds()
@@ -267,6 +484,7 @@ async def health_check() -> HealthCheckResponse:
         logger.info(f"[SUCCESS] Health check: OK, {len(tables)} tables, uptime: {uptime}s")
         return response
     except Exception as e:
+        record_error("health")
         logger.error(f"[ERROR] Health check failed: {str(e)}")
         logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
         return HealthCheckResponse(
@@ -276,8 +494,17 @@ async def health_check() -> HealthCheckResponse:
             uptime_seconds=0
         )
 
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint() -> PlainTextResponse:
+    """Request latency, phase timings, cache and error counters in Prometheus text format"""
+    return PlainTextResponse(render_deployment_metrics(), media_type="text/plain; version=0.0.4")
+
+def _is_hidden_table(conn: sqlite3.Connection, table_name: str) -> bool:
+    """Internal tables and full-text index/shadow tables are not served as user tables."""
+    return is_internal_table(table_name) or table_name in full_text_tables(conn)[1]
+
 @app.delete("/api/table/{table_name}")
-async def delete_table(table_name: str):
+async def delete_table(table_name: str, db_path: str = Depends(workspace_db_path)):
     """Delete a table from the database"""
     try:
         # Validate table name using security module
@@ -286,10 +513,10 @@ async def delete_table(table_name: str):
         except SQLSecurityError as e:
             raise HTTPException(400, str(e))
         
-        conn = sqlite3.connect("db/database.db")
+        conn = sqlite3.connect(db_path)
         
-        # Check if table exists using secure method
-        if not check_table_exists(conn, table_name):
+        # Check if table exists using secure method (internal and full-text index tables are hidden)
+        if _is_hidden_table(conn, table_name) or not check_table_exists(conn, table_name):
             conn.close()
             raise HTTPException(404, f"Table '{table_name}' not found")
         
@@ -300,8 +527,11 @@ async def delete_table(table_name: str):
             identifier_params={'table': table_name},
             allow_ddl=True
         )
+        drop_full_text_index(conn, table_name)
+        mark_tables_modified(conn, [table_name])
         conn.commit()
         conn.close()
+        invalidate_result_cache(db_path)
         
         response = {"message": f"Table '{table_name}' deleted successfully"}
         logger.info(f"[SUCCESS] Table deleted: {table_name}")
@@ -309,13 +539,75 @@ async def delete_table(table_name: str):
     except HTTPException:
         raise
     except Exception as e:
+        record_error("delete_table")
         logger.error(f"[ERROR] Table deletion failed: {str(e)}")
         logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
         raise HTTPException(500, f"Error deleting table: {str(e)}")
 
+def _build_full_text_index(db_path: str, table_name: str, columns: Optional[List[str]] = None) -> Dict[str, Any]:
+    conn = sqlite3.connect(db_path)
+    try:
+        index = create_full_text_index(conn, table_name, columns)
+        conn.commit()
+        return index
+    finally:
+        conn.close()
+
+@app.post("/api/table/{table_name}/full-text-index", response_model=FullTextIndexResponse)
+async def create_full_text_index_endpoint(
+    table_name: str,
+    request: Optional[FullTextIndexRequest] = None,
+    db_path: str = Depends(workspace_db_path)
+) -> FullTextIndexResponse:
+    """Build (or rebuild) an FTS5 index over a table's text columns, kept in sync by triggers"""
+    start_time = time.perf_counter()
+    try:
+        validate_identifier(table_name, "table")
+        columns = request.columns if request else None
+        with timed("full_text_index"):
+            index = await asyncio.to_thread(_build_full_text_index, db_path, table_name, columns)
+        invalidate_result_cache(db_path)
+
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        logger.info(f"[SUCCESS] Full-text index {index['table']}: {index['rows']} rows in {elapsed_ms:.0f}ms")
+        return FullTextIndexResponse(
+            table_name=table_name,
+            index_table=index['table'],
+            columns=index['columns'],
+            rows_indexed=index['rows'],
+            elapsed_ms=elapsed_ms
+        )
+    except Exception as e:
+        record_error("full_text_index")
+        logger.error(f"[ERROR] Full-text index failed: {str(e)}")
+        logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
+        return FullTextIndexResponse(table_name=table_name, error=str(e))
+
+@app.delete("/api/table/{table_name}/full-text-index")
+async def delete_full_text_index_endpoint(table_name: str, db_path: str = Depends(workspace_db_path)):
+    """Drop a table's full-text index"""
+    try:
+        validate_identifier(table_name, "table")
+    except SQLSecurityError as e:
+        raise HTTPException(400, str(e))
+    conn = sqlite3.connect(db_path)
+    try:
+        dropped = drop_full_text_index(conn, table_name)
+        conn.commit()
+    finally:
+        conn.close()
+    if not dropped:
+        raise HTTPException(404, f"Table '{table_name}' has no full-text index")
+    invalidate_result_cache(db_path)
+    logger.info(f"[SUCCESS] Full-text index dropped: {table_name}")
+    return {"message": f"Full-text index on '{table_name}' deleted successfully"}
+
 @app.post("/api/generate-data", response_model=GenerateDataResponse)
-async def generate_data_endpoint(request: GenerateDataRequest) -> GenerateDataResponse:
-    """Generate synthetic data for a table using LLM"""
+async def generate_data_endpoint(
+    request: GenerateDataRequest,
+    db_path: str = Depends(workspace_db_path)
+) -> GenerateDataResponse:
+    """Generate synthetic data for a table with batched LLM calls or local statistical sampling"""
     try:
         table_name = request.table_name
 
@@ -331,12 +623,12 @@ async def generate_data_endpoint(request: GenerateDataRequest) -> GenerateDataRe
             )
 
         # Connect to database
-        conn = sqlite3.connect("db/database.db")
+        conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
 
         try:
-            # Check if table exists
-            if not check_table_exists(conn, table_name):
+            # Check if table exists (internal and full-text index tables are hidden)
+            if _is_hidden_table(conn, table_name) or not check_table_exists(conn, table_name):
                 return GenerateDataResponse(
                     rows_added=0,
                     new_row_count=0,
@@ -357,66 +649,83 @@ async def generate_data_endpoint(request: GenerateDataRequest) -> GenerateDataRe
                     error="Cannot generate data for empty table. Please add at least one row first."
                 )
 
-            # Sample up to 10 random rows
-            sample_limit = min(10, initial_row_count)
-            cursor.execute(f"SELECT * FROM \"{table_name}\" ORDER BY RANDOM() LIMIT {sample_limit}")
-            rows = cursor.fetchall()
-
-            # Get column names
-            column_names = [description[0] for description in cursor.description]
-
-            # Convert rows to list of dicts
-            sample_rows = []
-            for row in rows:
-                sample_rows.append(dict(zip(column_names, row)))
-
-            # Get table schema from database
-            cursor.execute(f"PRAGMA table_info(\"{table_name}\")")
-            schema_rows = cursor.fetchall()
-
-            # Build schema_info dict: column_name -> type
-            schema_info = {}
-            for schema_row in schema_rows:
-                col_name = schema_row[1]
-                col_type = schema_row[2]
-                schema_info[col_name] = col_type
-
-            # Generate synthetic data using LLM
-            generated_rows = generate_synthetic_data(table_name, schema_info, sample_rows)
-
-            # Insert generated rows using parameterized queries
-            rows_added = 0
-            for row_data in generated_rows:
-                # Build INSERT statement with placeholders
-                columns = list(row_data.keys())
-                placeholders = ", ".join(["?" for _ in columns])
-                column_names_str = ", ".join([f'"{col}"' for col in columns])
-
-                insert_sql = f'INSERT INTO "{table_name}" ({column_names_str}) VALUES ({placeholders})'
-                values = [row_data[col] for col in columns]
-
-                cursor.execute(insert_sql, values)
-                rows_added += 1
-
-            # Commit all insertions
+            start_time = time.perf_counter()
+            if request.provider == "statistical":
+                # Sample fitted column distributions locally (no LLM calls);
+                # imported here so NumPy only loads when this provider is used
+                from core.statistical_generator import generate_statistical_rows
+
+                with timed("statistical_generation"):
+                    rows_added = await asyncio.to_thread(
+                        generate_statistical_rows,
+                        db_path,
+                        table_name,
+                        request.rows
+                    )
+            else:
+                if request.rows > MAX_LLM_ROWS:
+                    return GenerateDataResponse(
+                        rows_added=0,
+                        new_row_count=initial_row_count,
+                        table_name=table_name,
+                        error=f"LLM generation is limited to {MAX_LLM_ROWS} rows; use the statistical provider for more"
+                    )
+
+                # Sample up to 10 random rows (rowid probes, not ORDER BY RANDOM())
+                sample_rows = sample_dicts(conn, table_name, 10)
+
+                # Get table schema from database
+                cursor.execute(f"PRAGMA table_info(\"{table_name}\")")
+                schema_rows = cursor.fetchall()
+
+                # Build schema_info dict: column_name -> type
+                schema_info = {}
+                for schema_row in schema_rows:
+                    col_name = schema_row[1]
+                    col_type = schema_row[2]
+                    schema_info[col_name] = col_type
+
+                # Generate synthetic data using concurrent batched LLM calls
+                # (off the event loop, since each LLM request blocks)
+                with timed("synthetic_generation"):
+                    generated_rows = await asyncio.to_thread(
+                        generate_synthetic_rows,
+                        table_name,
+                        schema_info,
+                        sample_rows,
+                        request.rows
+                    )
+
+                # Insert all generated rows with one executemany in one transaction
+                rows_added = insert_rows(conn, table_name, list(schema_info.keys()), generated_rows)
+
+            elapsed_seconds = time.perf_counter() - start_time
+            mark_tables_modified(conn, [table_name])
             conn.commit()
+            invalidate_result_cache(db_path)
 
             # Get new row count
             cursor.execute(f"SELECT COUNT(*) FROM \"{table_name}\"")
             new_row_count = cursor.fetchone()[0]
 
+            rows_per_second = rows_added / elapsed_seconds if elapsed_seconds > 0 else 0.0
             response = GenerateDataResponse(
                 rows_added=rows_added,
                 new_row_count=new_row_count,
-                table_name=table_name
+                table_name=table_name,
+                rows_per_second=rows_per_second
+            )
+            logger.info(
+                f"[SUCCESS] Generated {rows_added} rows for table '{table_name}' "
+                f"({rows_per_second:.1f} rows/sec). New total: {new_row_count}"
             )
-            logger.info(f"[SUCCESS] Generated {rows_added} rows for table '{table_name}'. New total: {new_row_count}")
             return response
 
         finally:
             conn.close()
 
     except Exception as e:
+        record_error("generate_data")
         logger.error(f"[ERROR] Data generation failed: {str(e)}")
         logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
         return GenerateDataResponse(
@@ -427,30 +736,47 @@ async def generate_data_endpoint(request: GenerateDataRequest) -> GenerateDataRe
         )
 
 @app.post("/api/export/table")
-async def export_table(request: ExportRequest) -> Response:
-    """Export a table as CSV file"""
+async def export_table(
+    request: ExportRequest,
+    db_path: str = Depends(workspace_db_path)
+) -> StreamingResponse:
+    """Export a table as CSV, Parquet, Arrow or NDJSON, streamed directly from SQLite"""
     try:
-        # Validate table name
+        # Validate table name and export options
         validate_identifier(request.table_name, "table")
+        try:
+            validate_export_options(request.format, request.compression)
+        except ValueError as e:
+            raise HTTPException(400, str(e))
         
-        # Connect to database
-        conn = sqlite3.connect("db/database.db")
+        # Connect to database (rows are fetched from the response worker threads)
+        conn = sqlite3.connect(db_path, check_same_thread=False)
         
-        # Check if table exists
-        if not check_table_exists(conn, request.table_name):
+        # Check if table exists (internal and full-text index tables are hidden)
+        if _is_hidden_table(conn, request.table_name) or not check_table_exists(conn, request.table_name):
             conn.close()
             raise HTTPException(404, f"Table '{request.table_name}' not found")
         
-        # Generate CSV
-        csv_data = generate_csv_from_table(conn, request.table_name)
-        conn.close()
+        cursor = open_table_cursor(conn, request.table_name)
+        storage_classes = None
+        if request.format in ARROW_EXPORT_FORMATS:
+            # Column types must be known before the first row is written
+            storage_classes = scan_storage_classes(cursor, table_export_sql(request.table_name))
         
-        # Return CSV response
-        return Response(
-            content=csv_data,
-            media_type="text/csv",
+        # Stream the export; the generator closes the connection when finished
+        export_stream = stream_export_from_cursor(
+            cursor,
+            request.format,
+            request.compression,
+            storage_classes=storage_classes
+        )
+        filename = get_export_filename(f"{request.table_name}_export", request.format, request.compression)
+        
+        return StreamingResponse(
+            export_stream,
+            media_type=get_export_media_type(request.format, request.compression),
             headers={
-                "Content-Disposition": f'attachment; filename="{request.table_name}_export.csv"'
+                "Content-Disposition": f'attachment; filename="{filename}"'
             }
         )
     except HTTPException:
@@ -461,25 +787,159 @@ async def export_table(request: ExportRequest) -> Response:
         raise HTTPException(500, f"Error exporting table: {str(e)}")
 
 @app.post("/api/export/query")
-async def export_query_results(request: QueryExportRequest) -> Response:
-    """Export query results as CSV file"""
+async def export_query_results(
+    request: QueryExportRequest,
+    db_path: str = Depends(workspace_db_path)
+) -> Response:
+    """Export query results as CSV, Parquet, Arrow or NDJSON by re-executing the SQL server-side"""
     try:
-        # Generate CSV from query results
+        try:
+            validate_export_options(request.format, request.compression)
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+        
+        filename = get_export_filename("query_results", request.format, request.compression)
+        headers = {
+            "Content-Disposition": f'attachment; filename="{filename}"'
+        }
+        
+        if request.sql:
+            # Re-execute the query and stream rows straight from the cursor
+            try:
+                cursor = open_sql_cursor(request.sql, db_path)
+            except SQLSecurityError as e:
+                raise HTTPException(400, f"Security error: {str(e)}")
+            except sqlite3.Error as e:
+                raise HTTPException(400, f"Invalid query: {str(e)}")
+            
+            storage_classes = None
+            if request.format in ARROW_EXPORT_FORMATS:
+                # Column types must be known before the first row is written
+                try:
+                    with read_only_access(cursor.connection):
+                        storage_classes = scan_storage_classes(cursor, request.sql)
+                except (SQLSecurityError, sqlite3.Error) as e:
+                    cursor.connection.close()
+                    raise HTTPException(400, f"Invalid query: {str(e)}")
+            
+            logger.info(f"[SUCCESS] Streaming query export ({request.format}): SQL={request.sql}")
+            return StreamingResponse(
+                stream_export_from_cursor(cursor, request.format, request.compression, storage_classes=storage_classes),
+                media_type=get_export_media_type(request.format, request.compression),
+                headers=headers
+            )
+        
+        if request.data is None:
+            raise HTTPException(400, "Either 'sql' or 'data' must be provided")
+        if request.format != "csv" or request.compression:
+            raise HTTPException(400, "Exports from posted data only support uncompressed CSV; provide 'sql' instead")
+        
+        # Legacy path: generate CSV from posted query results
         csv_data = generate_csv_from_data(request.data, request.columns)
         
         # Return CSV response
         return Response(
             content=csv_data,
             media_type="text/csv",
-            headers={
-                "Content-Disposition": 'attachment; filename="query_results.csv"'
-            }
+            headers=headers
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"[ERROR] Query export failed: {str(e)}")
         logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
         raise HTTPException(500, f"Error exporting query results: {str(e)}")
 
+@app.post("/api/views", response_model=SavedViewResponse)
+async def save_view_endpoint(
+    request: SaveViewRequest,
+    db_path: str = Depends(workspace_db_path)
+) -> SavedViewResponse:
+    """Save a query as a named view and materialize its result (SQL is generated from query if not given)"""
+    try:
+        sql = request.sql
+        if not sql:
+            if not request.query:
+                raise ValueError("Either 'sql' or 'query' must be provided")
+            with timed("schema"):
+                schema_info = get_database_schema(db_path)
+            sql = generate_sql(QueryRequest(query=request.query, llm_provider=request.llm_provider), schema_info)
+
+        with timed("view_refresh"):
+            view = await asyncio.to_thread(save_view, db_path, request.name, sql, request.query)
+        invalidate_result_cache(db_path)
+
+        logger.info(f"[SUCCESS] View saved: {view['name']}, {view['row_count']} rows in {view['refresh_ms']:.1f}ms")
+        return SavedViewResponse(view=SavedViewInfo(**view))
+    except Exception as e:
+        record_error("save_view")
+        logger.error(f"[ERROR] Saving view failed: {str(e)}")
+        logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
+        return SavedViewResponse(error=str(e))
+
+@app.get("/api/views", response_model=SavedViewListResponse)
+async def list_views_endpoint(db_path: str = Depends(workspace_db_path)) -> SavedViewListResponse:
+    """List saved views and whether each will be refreshed on its next read"""
+    try:
+        return SavedViewListResponse(views=[SavedViewInfo(**view) for view in list_views(db_path)])
+    except Exception as e:
+        record_error("list_views")
+        logger.error(f"[ERROR] Listing views failed: {str(e)}")
+        return SavedViewListResponse(views=[], error=str(e))
+
+@app.get("/api/views/{name}", response_model=SavedViewResultResponse)
+async def read_view_endpoint(name: str, db_path: str = Depends(workspace_db_path)) -> SavedViewResultResponse:
+    """Return a view's materialized rows, re-running its query only if a source table changed"""
+    start_time = time.perf_counter()
+    try:
+        with timed("view_read"):
+            result = await asyncio.to_thread(read_view, db_path, name)
+    except Exception as e:
+        record_error("read_view")
+        logger.error(f"[ERROR] Reading view failed: {str(e)}")
+        logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
+        return SavedViewResultResponse(columns=[], results=[], row_count=0, execution_time_ms=0, error=str(e))
+    if result is None:
+        raise HTTPException(404, f"View '{name}' not found")
+    if result['refreshed']:
+        invalidate_result_cache(db_path)
+
+    execution_time = (time.perf_counter() - start_time) * 1000
+    logger.info(
+        f"[SUCCESS] View read: {name}, {len(result['results'])} rows in {execution_time:.1f}ms"
+        f"{' (refreshed)' if result['refreshed'] else ''}"
+    )
+    return SavedViewResultResponse(
+        view=SavedViewInfo(**result['view']),
+        columns=result['columns'],
+        results=result['results'],
+        row_count=len(result['results']),
+        refreshed=result['refreshed'],
+        execution_time_ms=execution_time
+    )
+
+@app.delete("/api/views/{name}")
+async def delete_view_endpoint(name: str, db_path: str = Depends(workspace_db_path)):
+    """Delete a saved view and its materialized rows"""
+    try:
+        deleted = delete_view(db_path, name)
+    except Exception as e:
+        record_error("delete_view")
+        logger.error(f"[ERROR] View deletion failed: {str(e)}")
+        raise HTTPException(500, f"Error deleting view: {str(e)}")
+    if not deleted:
+        raise HTTPException(404, f"View '{name}' not found")
+    invalidate_result_cache(db_path)
+    logger.info(f"[SUCCESS] View deleted: {name}")
+    return {"message": f"View '{name}' deleted successfully"}
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("server:app", host="0.0.0.0", port=int(os.environ.get("BACKEND_PORT", "8000")), reload=True)
\ No newline at end of file
+    port = int(os.environ.get("BACKEND_PORT", "8000"))
+    workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+    if workers > 1:
+        # Workers share the schema catalog, NL->SQL cache and metrics through a side-car file
+        os.environ.setdefault(SHARED_CACHE_PATH_ENV, DEFAULT_SHARED_CACHE_PATH)
+        uvicorn.run("server:app", host="0.0.0.0", port=port, workers=workers)
+    else:
+        uvicorn.run("server:app", host="0.0.0.0", port=port, reload=True)
\ No newline at end of file
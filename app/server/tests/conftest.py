@@ -0,0 +1,16 @@
+import pytest
+from core.database import close_all_pools
+from core.query_cache import invalidate_result_cache
+from core.shared_cache import reset_store
+
+
+@pytest.fixture(autouse=True)
+def reset_connection_state():
+    """Give every test fresh pooled connections and empty caches"""
+    close_all_pools()
+    invalidate_result_cache()
+    reset_store()
+    yield
+    close_all_pools()
+    invalidate_result_cache()
+    reset_store()
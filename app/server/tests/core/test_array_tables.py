@@ -0,0 +1,99 @@
+import json
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.file_processor import convert_file_to_sqlite, convert_jsonl_to_sqlite, split_json_arrays
+
+ORDERS = b"".join(json.dumps(record).encode() + b"\n" for record in [
+    {"id": 1, "customer": {"name": "a", "tags": ["vip", "new"]},
+     "items": [{"sku": "x", "qty": 2}, {"sku": "y", "qty": 1, "options": ["red", "xl"]}]},
+    {"id": 2, "customer": {"name": "b"}, "items": []},
+    {"id": 3, "customer": {"name": "c", "tags": ["new"]}, "items": [{"sku": "x", "qty": 5}]},
+])
+
+
+def query(db_path, sql):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+def test_split_json_arrays():
+    flattened, arrays = split_json_arrays({"a": {"b": 1, "c": [1, 2]}, "d": [], "e": [{"f": 1}]})
+    assert flattened == {"a__b": 1}
+    assert arrays == {"a__c": [1, 2], "e": [{"f": 1}]}
+
+
+class TestArrayTables:
+    def test_parent_rows_stay_narrow(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        result = convert_jsonl_to_sqlite(ORDERS, "orders", db_path, array_tables=True)
+
+        assert result['schema'] == {'_row_id': 'INTEGER', 'customer__name': 'TEXT', 'id': 'INTEGER'}
+        assert result['row_count'] == 3
+        assert result['child_tables'] == ['orders__customer__tags', 'orders__items']
+
+        assert query(db_path, "SELECT _parent_id, _index, sku, qty, options_0 FROM orders__items") == [
+            (1, 0, 'x', 2, None), (1, 1, 'y', 1, 'red'), (3, 0, 'x', 5, None)
+        ]
+        assert query(db_path, "SELECT _parent_id, value FROM orders__customer__tags ORDER BY _parent_id, _index") == [
+            (1, 'vip'), (1, 'new'), (3, 'new')
+        ]
+        assert query(
+            db_path, "SELECT o.id, SUM(i.qty) FROM orders o JOIN orders__items i ON i._parent_id = o._row_id GROUP BY o.id"
+        ) == [(1, 3), (3, 5)]
+
+    def test_foreign_key_and_indexes(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        convert_jsonl_to_sqlite(ORDERS, "orders", db_path, array_tables=True)
+
+        assert query(db_path, "PRAGMA foreign_key_list(orders__items)")[0][2:5] == ('orders', '_parent_id', '_row_id')
+        indexes = {row[0] for row in query(db_path, "SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert indexes == {'idx_orders__row_id', 'idx_orders__items__parent_id', 'idx_orders__customer__tags__parent_id'}
+        assert query(db_path, "PRAGMA foreign_key_check") == []
+
+    def test_append_continues_row_ids(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        convert_jsonl_to_sqlite(ORDERS, "orders", db_path, array_tables=True)
+        result = convert_jsonl_to_sqlite(b'{"id": 4, "items": [{"sku": "z", "qty": 1}]}\n', "orders", db_path,
+                                         mode="append", array_tables=True)
+
+        assert result['rows_loaded'] == 1
+        assert query(db_path, "SELECT _row_id FROM orders WHERE id = 4") == [(4,)]
+        assert query(db_path, "SELECT _parent_id FROM orders__items WHERE sku = 'z'") == [(4,)]
+
+    def test_upsert_and_other_formats_rejected(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        with pytest.raises(Exception, match="not upsert"):
+            convert_jsonl_to_sqlite(ORDERS, "orders", db_path, mode="upsert", key_columns=["id"], array_tables=True)
+        with pytest.raises(ValueError, match="only supported for .jsonl"):
+            convert_file_to_sqlite("orders.csv", b"id\n1\n", db_path, array_tables=True)
+
+    def test_wide_arrays_become_rows(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        record = {"id": 1, "readings": list(range(3000))}
+        result = convert_jsonl_to_sqlite(json.dumps(record).encode(), "sensor", db_path, array_tables=True)
+
+        assert len(result['schema']) == 2
+        assert query(db_path, "SELECT COUNT(*), SUM(value) FROM sensor__readings") == [(3000, sum(range(3000)))]
+
+
+def test_upload_endpoint_array_tables(tmp_path, monkeypatch):
+    # Endpoints use the relative db/database.db path
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "db").mkdir()
+    from server import app
+    client = TestClient(app)
+
+    body = client.post(
+        "/api/upload", files={"file": ("orders.jsonl", ORDERS, "application/x-ndjson")}, data={"array_tables": "true"}
+    ).json()
+
+    assert body['error'] is None
+    assert body['child_tables'] == ['orders__customer__tags', 'orders__items']
+    tables = {table['name'] for table in client.get("/api/schema").json()['tables']}
+    assert tables == {'orders', 'orders__customer__tags', 'orders__items'}
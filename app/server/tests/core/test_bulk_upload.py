@@ -0,0 +1,146 @@
+import io
+import json
+import sqlite3
+import tarfile
+import zipfile
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.bulk_upload import bulk_convert, copy_table, expand_uploads, table_name_for_file
+
+CSV = b"id,name,score\n1,a,1.5\n2,b,2.5\n"
+JSONL = b'{"id": 1, "tag": "x"}\n{"id": 2, "tag": "y"}\n{"id": 3, "tag": "z"}\n'
+
+
+def make_zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+def make_tar_gz(members):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, content in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+class TestExpandUploads:
+    def test_zip_members_expanded_and_junk_skipped(self):
+        archive = make_zip({
+            "data/users.csv": CSV,
+            "data/events.jsonl": JSONL,
+            "README.md": b"notes",
+            "__MACOSX/data/._users.csv": b"junk",
+            ".hidden.csv": CSV,
+        })
+        files = expand_uploads([("bundle.zip", archive)])
+
+        assert [name for name, _ in files] == ["bundle.zip/data/users.csv", "bundle.zip/data/events.jsonl"]
+
+    def test_tar_gz_expanded(self):
+        files = expand_uploads([("bundle.tar.gz", make_tar_gz({"a.csv": CSV})), ("b.csv", CSV)])
+        assert [name for name, _ in files] == ["bundle.tar.gz/a.csv", "b.csv"]
+
+    def test_archive_size_limit(self):
+        with patch('core.bulk_upload.MAX_ARCHIVE_BYTES', 10):
+            with pytest.raises(ValueError, match="expands to more than"):
+                expand_uploads([("bundle.zip", make_zip({"a.csv": CSV}))])
+
+    def test_corrupt_archive(self):
+        with pytest.raises(ValueError, match="Could not read archive"):
+            expand_uploads([("bundle.zip", b"not a zip")])
+
+    def test_table_name_uses_member_basename(self):
+        assert table_name_for_file("bundle.zip/nested/My Data.csv") == "my_data"
+
+
+class TestBulkConvert:
+    def test_files_converted_into_target_database(self, tmp_path):
+        db_path = str(tmp_path / "target.db")
+        result = bulk_convert(
+            [("users.csv", CSV), ("events.jsonl", JSONL), ("bad.json", b"{not json"), ("notes.txt", b"x")],
+            db_path,
+            workers=3
+        )
+
+        by_name = {entry['filename']: entry for entry in result['files']}
+        assert by_name["users.csv"]['row_count'] == 2
+        assert by_name["users.csv"]['table_schema'] == {'id': 'INTEGER', 'name': 'TEXT', 'score': 'REAL'}
+        assert by_name["events.jsonl"]['row_count'] == 3
+        assert by_name["bad.json"]['error']
+        assert by_name["notes.txt"]['error']
+        assert result['total_rows'] == 5
+
+        conn = sqlite3.connect(db_path)
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        assert tables == {"users", "events"}
+        assert conn.execute("SELECT SUM(score) FROM users").fetchone()[0] == 4.0
+        conn.close()
+
+    def test_duplicate_table_names_load_first_only(self, tmp_path):
+        db_path = str(tmp_path / "target.db")
+        archive = make_zip({"a/users.csv": CSV, "b/users.csv": b"id\n9\n"})
+        result = bulk_convert([("bundle.zip", archive)], db_path)
+
+        assert result['files'][0]['error'] is None
+        assert "already loaded" in result['files'][1]['error']
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 2
+        conn.close()
+
+    def test_copy_table_replaces_and_keeps_indexes(self, tmp_path):
+        source = str(tmp_path / "source.db")
+        conn = sqlite3.connect(source)
+        conn.execute("CREATE TABLE t (id INTEGER, created TIMESTAMP)")
+        conn.execute("CREATE INDEX idx_t_id ON t (id)")
+        conn.execute("INSERT INTO t VALUES (1, '2024-01-01')")
+        conn.commit()
+        conn.close()
+
+        target = sqlite3.connect(str(tmp_path / "target.db"), isolation_level=None)
+        target.execute("CREATE TABLE t (old TEXT)")
+        copy_table(target, source, "t")
+
+        assert target.execute("PRAGMA table_info(t)").fetchall()[1][2] == "TIMESTAMP"
+        assert target.execute("SELECT * FROM t").fetchall() == [(1, '2024-01-01')]
+        assert target.execute("SELECT name FROM sqlite_master WHERE type='index'").fetchall() == [('idx_t_id',)]
+        target.close()
+
+
+class TestBulkUploadEndpoint:
+    @pytest.fixture
+    def client(self, tmp_path, monkeypatch):
+        # Endpoints use the relative db/database.db path
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "db").mkdir()
+        from server import app
+        return TestClient(app)
+
+    def test_multiple_files_and_archive(self, client):
+        files = [
+            ("files", ("users.csv", CSV, "text/csv")),
+            ("files", ("bundle.zip", make_zip({"events.jsonl": JSONL, "orders.json": json.dumps(
+                [{"id": 1}, {"id": 2}]).encode()}), "application/zip")),
+        ]
+        body = client.post("/api/upload/bulk", files=files).json()
+
+        assert body['error'] is None
+        assert body['tables_created'] == 3
+        assert body['total_rows'] == 7
+        assert body['rows_per_second'] > 0
+        tables = {t['name'] for t in client.get("/api/schema").json()['tables']}
+        assert tables == {"users", "events", "orders"}
+
+    def test_bad_archive_reported(self, client):
+        files = [("files", ("bundle.zip", b"garbage", "application/zip"))]
+        body = client.post("/api/upload/bulk", files=files).json()
+
+        assert "Could not read archive" in body['error']
@@ -0,0 +1,102 @@
+import bz2
+import gzip
+import io
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+import zstandard
+from fastapi.testclient import TestClient
+
+from core.compression import open_decompressed, split_compression
+from core.file_processor import convert_file_to_sqlite, is_supported_upload, table_name_for_file
+
+CSV = b"id,name,score\n" + b"".join(f"{i},user {i},{i * 0.5}\n".encode() for i in range(1, 251))
+JSONL = b"".join(f'{{"id": {i}, "meta": {{"tag": "t{i % 3}"}}}}\n'.encode() for i in range(1, 101))
+
+COMPRESSORS = {
+    "gz": gzip.compress,
+    "bz2": bz2.compress,
+    "zst": lambda data: zstandard.ZstdCompressor().compress(data),
+}
+
+
+class TestSplitCompression:
+    def test_compressed_names(self):
+        assert split_compression("orders.csv.gz") == ("orders.csv", "gzip")
+        assert split_compression("Orders.JSONL.ZST") == ("Orders.JSONL", "zstd")
+        assert split_compression("orders.parquet") == ("orders.parquet", None)
+
+    def test_supported_uploads_and_table_names(self):
+        assert is_supported_upload("orders.csv.bz2")
+        assert not is_supported_upload("notes.txt.gz")
+        assert table_name_for_file("bundle.zip/nested/My Orders.csv.gz") == "my_orders"
+
+
+class TestOpenDecompressed:
+    @pytest.mark.parametrize("suffix", sorted(COMPRESSORS))
+    def test_round_trip_by_line(self, suffix):
+        codec = split_compression(f"a.csv.{suffix}")[1]
+        reader = open_decompressed(io.BytesIO(COMPRESSORS[suffix](CSV)), codec)
+        assert b"".join(reader) == CSV
+
+    def test_size_limit(self):
+        with patch('core.compression.MAX_DECOMPRESSED_BYTES', 100):
+            reader = open_decompressed(io.BytesIO(gzip.compress(CSV)), "gzip")
+            with pytest.raises(ValueError, match="exceeds 100 bytes"):
+                reader.read()
+
+
+class TestCompressedConversion:
+    @pytest.mark.parametrize("suffix", sorted(COMPRESSORS))
+    def test_csv_loaded_in_chunks(self, tmp_path, suffix):
+        db_path = str(tmp_path / "test.db")
+        with patch('core.file_processor.UPLOAD_CHUNK_ROWS', 64):
+            result = convert_file_to_sqlite(f"users.csv.{suffix}", COMPRESSORS[suffix](CSV), db_path)
+
+        assert result['table_name'] == "users"
+        assert result['row_count'] == 250
+        assert result['schema'] == {'id': 'INTEGER', 'name': 'TEXT', 'score': 'REAL'}
+
+    def test_jsonl_loaded_in_chunks(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        with patch('core.file_processor.UPLOAD_CHUNK_ROWS', 30):
+            result = convert_file_to_sqlite("events.jsonl.gz", gzip.compress(JSONL), db_path)
+
+        assert result['row_count'] == 100
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT COUNT(*) FROM events WHERE meta__tag = 't0'").fetchone()[0] == 33
+        conn.close()
+
+    def test_failed_load_keeps_previous_table(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        convert_file_to_sqlite("users.csv", b"id\n1\n", db_path)
+
+        with pytest.raises(Exception, match="Error converting CSV to SQLite"):
+            convert_file_to_sqlite("users.csv.gz", gzip.compress(CSV)[:200], db_path)
+
+        conn = sqlite3.connect(db_path)
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+        assert tables == ["users"]
+        assert conn.execute("SELECT * FROM users").fetchall() == [(1,)]
+        conn.close()
+
+    def test_compressed_json_array(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        result = convert_file_to_sqlite("items.json.bz2", bz2.compress(b'[{"a": 1}, {"a": 2}]'), db_path)
+        assert result['row_count'] == 2
+
+
+def test_upload_endpoint_accepts_gzip(tmp_path, monkeypatch):
+    # Endpoints use the relative db/database.db path
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "db").mkdir()
+    from server import app
+    client = TestClient(app)
+
+    files = {"file": ("users.csv.gz", gzip.compress(CSV), "application/gzip")}
+    body = client.post("/api/upload", files=files).json()
+
+    assert body['error'] is None
+    assert body['table_name'] == "users"
+    assert body['row_count'] == 250
@@ -0,0 +1,209 @@
+import pytest
+import sqlite3
+from unittest.mock import patch
+from core.database import ConnectionPool, get_connection_pool, close_all_pools, STATEMENT_CACHE_SIZE
+from core.query_cache import ResultCache, result_cache
+from core.sql_processor import execute_sql_safely
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Create a file-backed database so separate connections see each other's writes"""
+    path = str(tmp_path / "pool_test.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, age INTEGER)")
+    conn.executemany("INSERT INTO users (name, age) VALUES (?, ?)", [('John', 25), ('Jane', 30)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def pooled_db(db_path):
+    """Point execute_sql_safely at the test database"""
+    with patch('core.sql_processor.DEFAULT_DB_PATH', db_path):
+        yield db_path
+
+
+class TestConnectionPool:
+
+    def test_connection_reused(self, db_path):
+        pool = ConnectionPool(db_path)
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+
+        assert first is second
+        pool.close()
+
+    def test_concurrent_borrows_get_distinct_connections(self, db_path):
+        pool = ConnectionPool(db_path)
+        with pool.connection() as first:
+            with pool.connection() as second:
+                assert first is not second
+        pool.close()
+
+    def test_overflow_connections_closed(self, db_path):
+        pool = ConnectionPool(db_path, size=1)
+        with pool.connection() as first:
+            with pool.connection() as second:
+                pass
+
+        # The inner connection is returned first and fills the pool
+        second.execute("SELECT 1")
+        with pytest.raises(sqlite3.ProgrammingError):
+            first.execute("SELECT 1")
+        pool.close()
+
+    def test_connections_use_statement_cache_size(self, db_path):
+        with patch('core.database.sqlite3.connect', wraps=sqlite3.connect) as mock_connect:
+            pool = ConnectionPool(db_path)
+            with pool.connection():
+                pass
+
+        assert mock_connect.call_args.kwargs['cached_statements'] == STATEMENT_CACHE_SIZE
+        pool.close()
+
+    def test_data_version_changes_after_external_write(self, db_path):
+        pool = ConnectionPool(db_path)
+        before = pool.data_version()
+        assert pool.data_version() == before
+
+        writer = sqlite3.connect(db_path)
+        writer.execute("INSERT INTO users (name, age) VALUES ('Bob', 35)")
+        writer.commit()
+        writer.close()
+
+        assert pool.data_version() != before
+        pool.close()
+
+    def test_get_connection_pool_shared_per_path(self, db_path):
+        assert get_connection_pool(db_path) is get_connection_pool(db_path)
+        close_all_pools()
+
+    def test_least_recently_used_pool_closed(self, tmp_path):
+        paths = [str(tmp_path / f"db{i}.db") for i in range(3)]
+        with patch('core.database.MAX_OPEN_DATABASES', 2):
+            first = get_connection_pool(paths[0])
+            get_connection_pool(paths[1])
+            get_connection_pool(paths[0])
+            get_connection_pool(paths[2])
+
+            # paths[1] was least recently used
+            assert get_connection_pool(paths[0]) is first
+            with first.connection() as conn:
+                conn.execute("SELECT 1")
+            assert first._idle.qsize() == 1
+        close_all_pools()
+
+    def test_reopened_pool_versions_differ(self, db_path):
+        """A new probe restarts data_version, so its versions must not match the old probe's"""
+        pool = ConnectionPool(db_path)
+        before = pool.data_version()
+        pool.close()
+
+        reopened = ConnectionPool(db_path)
+        assert reopened.data_version() != before
+        reopened.close()
+
+    def test_connection_returned_to_closed_pool_is_closed(self, db_path):
+        pool = ConnectionPool(db_path)
+        with pool.connection() as conn:
+            pool.close()
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+
+class TestResultCache:
+
+    def test_hit_requires_same_data_version(self):
+        cache = ResultCache()
+        result = {'results': [{'a': 1}], 'columns': ['a'], 'error': None}
+        cache.put('db', 'SELECT 1', 7, result)
+
+        assert cache.get('db', 'SELECT 1', 7)['results'] == [{'a': 1}]
+        assert cache.get('db', 'SELECT 1', 8) is None
+        # Stale entry is dropped
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        cache = ResultCache(max_entries=2)
+        for i in range(3):
+            cache.put('db', f'SELECT {i}', 1, {'results': [], 'columns': [], 'error': None})
+
+        assert cache.get('db', 'SELECT 0', 1) is None
+        assert cache.get('db', 'SELECT 2', 1) is not None
+
+    def test_large_and_failed_results_not_cached(self):
+        cache = ResultCache(max_rows=1)
+        cache.put('db', 'SELECT big', 1, {'results': [{}, {}], 'columns': [], 'error': None})
+        cache.put('db', 'SELECT bad', 1, {'results': [], 'columns': [], 'error': 'boom'})
+
+        assert len(cache) == 0
+
+    def test_returned_result_is_a_copy(self):
+        cache = ResultCache()
+        cache.put('db', 'SELECT 1', 1, {'results': [{'a': 1}], 'columns': ['a'], 'error': None})
+        cache.get('db', 'SELECT 1', 1)['results'].clear()
+
+        assert cache.get('db', 'SELECT 1', 1)['results'] == [{'a': 1}]
+
+    def test_invalidate_by_path(self):
+        cache = ResultCache()
+        cache.put('a.db', 'SELECT 1', 1, {'results': [], 'columns': [], 'error': None})
+        cache.put('b.db', 'SELECT 1', 1, {'results': [], 'columns': [], 'error': None})
+        cache.invalidate('a.db')
+
+        assert cache.get('a.db', 'SELECT 1', 1) is None
+        assert cache.get('b.db', 'SELECT 1', 1) is not None
+
+
+class TestExecuteSqlSafelyCaching:
+
+    def test_repeat_query_served_from_cache(self, pooled_db):
+        first = execute_sql_safely("SELECT name FROM users ORDER BY id")
+        hits_before = result_cache.hits
+        second = execute_sql_safely("SELECT name FROM users ORDER BY id")
+
+        assert second == first
+        assert result_cache.hits == hits_before + 1
+
+    def test_write_invalidates_cached_result(self, pooled_db):
+        assert execute_sql_safely("SELECT COUNT(*) AS n FROM users")['results'][0]['n'] == 2
+
+        writer = sqlite3.connect(pooled_db)
+        writer.execute("INSERT INTO users (name, age) VALUES ('Bob', 35)")
+        writer.commit()
+        writer.close()
+
+        assert execute_sql_safely("SELECT COUNT(*) AS n FROM users")['results'][0]['n'] == 3
+
+    def test_write_after_pool_eviction_not_served_stale(self, pooled_db, tmp_path):
+        assert execute_sql_safely("SELECT COUNT(*) AS n FROM users")['results'][0]['n'] == 2
+
+        writer = sqlite3.connect(pooled_db)
+        writer.execute("INSERT INTO users (name, age) VALUES ('Bob', 35)")
+        writer.commit()
+        writer.close()
+        # Opening more databases than MAX_OPEN_DATABASES evicts this one's pool and probe
+        with patch('core.database.MAX_OPEN_DATABASES', 2):
+            for i in range(2):
+                get_connection_pool(str(tmp_path / f"other{i}.db"))
+
+        assert execute_sql_safely("SELECT COUNT(*) AS n FROM users")['results'][0]['n'] == 3
+        close_all_pools()
+
+    def test_cache_can_be_bypassed(self, pooled_db):
+        execute_sql_safely("SELECT * FROM users")
+        hits_before = result_cache.hits
+        execute_sql_safely("SELECT * FROM users", use_cache=False)
+
+        assert result_cache.hits == hits_before
+
+    def test_errors_not_cached(self, pooled_db):
+        result = execute_sql_safely("SELECT * FROM missing_table")
+
+        assert result['error'] is not None
+        assert len(result_cache) == 0
@@ -206,7 +206,17 @@ class TestFileProcessor:
         assert flatten_json_object(42) == {"": 42}
         assert flatten_json_object(True) == {"": True}
         assert flatten_json_object(None) == {"": None}
-    
+
+    def test_flatten_json_object_empty_containers_and_deep_nesting(self):
+        """Test empty containers produce no keys and deep nesting doesn't hit the recursion limit"""
+        obj = {"a": {"b": [1, {"c": 2}], "d": {}}, "e": [], "f": 3}
+        assert flatten_json_object(obj) == {"a__b_0": 1, "a__b_1__c": 2, "f": 3}
+
+        deep = 0
+        for _ in range(5000):
+            deep = {"x": deep}
+        assert flatten_json_object(deep) == {"__".join(["x"] * 5000): 0}
+
     def test_discover_jsonl_fields_basic(self):
         """Test field discovery with basic JSONL content"""
         jsonl_content = b'{"name": "John", "age": 30}\n{"name": "Jane", "age": 25, "city": "NYC"}'
@@ -0,0 +1,142 @@
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.bulk_upload import bulk_convert
+from core.file_processor import convert_file_to_sqlite
+from core.full_text import create_full_text_index, full_text_tables
+from core.llm_processor import format_schema_for_prompt
+from core.sql_processor import execute_sql_safely, get_database_schema
+
+REVIEWS = b"""id,title,body,posted
+1,Great kettle,Boils water quickly and quietly,2024-01-02
+2,Broken lid,The lid snapped after a week,2024-01-03
+3,Quiet fan,Runs quietly all night,2024-01-04
+"""
+SEARCH = (
+    "SELECT reviews.id FROM reviews JOIN reviews_fts ON reviews_fts.rowid = reviews.rowid "
+    "WHERE reviews_fts MATCH '{term}' ORDER BY reviews.id"
+)
+
+
+def search(db_path, term):
+    result = execute_sql_safely(SEARCH.format(term=term), use_cache=False, db_path=db_path)
+    assert result['error'] is None
+    return [row['id'] for row in result['results']]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "test.db")
+    convert_file_to_sqlite("reviews.csv", REVIEWS, path)
+    conn = sqlite3.connect(path)
+    create_full_text_index(conn, "reviews")
+    conn.commit()
+    conn.close()
+    return path
+
+
+class TestFullTextIndex:
+    def test_index_covers_text_columns(self, db_path):
+        conn = sqlite3.connect(db_path)
+        indexes, hidden = full_text_tables(conn)
+        conn.close()
+
+        assert indexes == {'reviews': {'table': 'reviews_fts', 'columns': ['title', 'body']}}
+        assert {'reviews_fts', 'reviews_fts_data', 'reviews_fts_idx'} <= hidden
+        assert search(db_path, 'quietly') == [1, 3]
+        assert search(db_path, 'lid AND snapped') == [2]
+
+    def test_schema_and_prompt(self, db_path):
+        schema = get_database_schema(db_path)
+        assert list(schema['tables']) == ['reviews']
+        assert schema['tables']['reviews']['full_text_index']['table'] == 'reviews_fts'
+
+        prompt = format_schema_for_prompt(schema)
+        assert "Full-text index: reviews_fts (columns: title, body)" in prompt
+        assert "WHERE reviews_fts MATCH 'word'" in prompt
+
+    def test_appends_and_upserts_are_indexed(self, db_path):
+        convert_file_to_sqlite("reviews.csv", b"id,title,body\n4,Loud fan,Not quiet at all\n", db_path, 'append')
+        assert search(db_path, 'fan') == [3, 4]
+
+        convert_file_to_sqlite("reviews.csv", b"id,title,body\n3,Noisy fan,Rattles\n", db_path, 'upsert', ['id'])
+        assert search(db_path, 'rattles') == [3]
+        assert search(db_path, 'night') == []
+
+    def test_replace_rebuilds_index(self, db_path):
+        convert_file_to_sqlite("reviews.csv", b"id,title\n7,Sturdy kettle\n", db_path)
+        assert search(db_path, 'kettle') == [7]
+        assert search(db_path, 'quietly') == []
+
+        bulk_convert([("reviews.csv", b"id,title\n8,Kettle again\n")], db_path)
+        assert search(db_path, 'kettle') == [8]
+
+    def test_only_real_shadow_tables_hidden(self, db_path):
+        conn = sqlite3.connect(db_path)
+        # An external-content index has no _content shadow table, so this name is a user table
+        conn.execute("CREATE TABLE reviews_fts_content (id INTEGER)")
+        # A foreign FTS5 table is a user table too; only its shadow tables are hidden
+        conn.execute("CREATE VIRTUAL TABLE docs USING fts5(body)")
+        conn.execute("CREATE TABLE notes_data (id INTEGER)")
+        conn.commit()
+        indexes, hidden = full_text_tables(conn)
+        conn.close()
+
+        assert list(indexes) == ['reviews']
+        assert {'docs_data', 'docs_content', 'reviews_fts_data'} <= hidden
+        assert not {'docs', 'reviews_fts_content', 'notes_data'} & hidden
+
+    def test_uploads_refuse_index_table_names(self, db_path):
+        for filename in ("reviews_fts.csv", "reviews_fts_data.csv.gz"):
+            with pytest.raises(ValueError, match="reserved for a full-text index"):
+                convert_file_to_sqlite(filename, b"id\n1\n", db_path)
+        result = bulk_convert([("reviews_fts_config.csv", b"id\n1\n"), ("notes.csv", b"id\n1\n")], db_path)
+        assert "reserved for a full-text index" in result['files'][0]['error']
+        assert result['files'][1]['error'] is None
+        assert search(db_path, 'quietly') == [1, 3]
+
+    def test_rejects_tables_without_text(self, tmp_path):
+        path = str(tmp_path / "test.db")
+        convert_file_to_sqlite("numbers.csv", b"a,b\n1,2\n", path)
+        conn = sqlite3.connect(path)
+        with pytest.raises(ValueError, match="no text columns"):
+            create_full_text_index(conn, "numbers")
+        with pytest.raises(ValueError, match="not found"):
+            create_full_text_index(conn, "missing")
+        conn.close()
+
+
+def test_full_text_endpoints(tmp_path, monkeypatch):
+    # Endpoints use the relative db/database.db path
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "db").mkdir()
+    from server import app
+    client = TestClient(app)
+
+    body = client.post(
+        "/api/upload", files={"file": ("reviews.csv", REVIEWS, "text/csv")}, data={"full_text": "true"}
+    ).json()
+    assert body['full_text_index'] == 'reviews_fts'
+    tables = client.get("/api/schema").json()['tables']
+    assert [(table['name'], table['full_text_columns']) for table in tables] == [('reviews', ['title', 'body'])]
+    assert client.get("/api/health").json()['tables_count'] == 1
+
+    index = client.post("/api/table/reviews/full-text-index", json={"columns": ["body"]}).json()
+    assert (index['index_table'], index['columns'], index['rows_indexed']) == ('reviews_fts', ['body'], 3)
+    assert client.post("/api/table/reviews/full-text-index", json={"columns": ["posted"]}).json()['error']
+
+    for hidden in ('reviews_fts', 'reviews_fts_data', 'reviews_fts_config'):
+        assert client.delete(f"/api/table/{hidden}").status_code == 404
+        assert client.post("/api/export/table", json={"table_name": hidden}).status_code == 404
+        generated = client.post("/api/generate-data", json={"table_name": hidden}).json()
+        assert generated['error'] == f"Table '{hidden}' not found"
+    upload = client.post("/api/upload", files={"file": ("reviews_fts.csv", b"id\n1\n", "text/csv")}).json()
+    assert upload['error'] == "Table name 'reviews_fts' is reserved for a full-text index"
+    # The index and its triggers are intact, so writes to the table still work
+    convert_file_to_sqlite("reviews.csv", b"id,title,body\n4,Loud fan,Rattles\n", "db/database.db", 'append')
+    assert search("db/database.db", 'rattles') == [4]
+
+    assert client.delete("/api/table/reviews/full-text-index").status_code == 200
+    assert client.delete("/api/table/reviews/full-text-index").status_code == 404
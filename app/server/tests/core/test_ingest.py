@@ -0,0 +1,120 @@
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.bulk_upload import bulk_convert
+from core.file_processor import convert_csv_to_sqlite
+from core.ingest import parse_ingest_mode
+
+
+def rows(db_path, sql):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+class TestParseIngestMode:
+    def test_defaults_and_key_cleaning(self):
+        assert parse_ingest_mode("replace") == ("replace", [])
+        assert parse_ingest_mode("UPSERT", "Order ID, sku") == ("upsert", ["order_id", "sku"])
+
+    def test_invalid(self):
+        with pytest.raises(ValueError, match="Invalid ingest mode"):
+            parse_ingest_mode("merge")
+        with pytest.raises(ValueError, match="requires key_columns"):
+            parse_ingest_mode("upsert", " , ")
+
+
+class TestIngestModes:
+    def test_append_keeps_indexes_and_adds_columns(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        convert_csv_to_sqlite(b"id,name\n1,a\n2,b\n", "users", db_path)
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE INDEX idx_users_id ON users (id)")
+        conn.commit()
+        conn.close()
+
+        result = convert_csv_to_sqlite(b"id,email\n3,c@x\n", "users", db_path, mode="append")
+
+        assert result['rows_loaded'] == 1
+        assert result['row_count'] == 3
+        assert result['schema'] == {'id': 'INTEGER', 'name': 'TEXT', 'email': 'TEXT'}
+        assert rows(db_path, "SELECT id, name, email FROM users ORDER BY id") == [
+            (1, 'a', None), (2, 'b', None), (3, None, 'c@x')
+        ]
+        assert rows(db_path, "SELECT name FROM sqlite_master WHERE type = 'index'") == [('idx_users_id',)]
+        assert rows(db_path, "SELECT name FROM sqlite_master WHERE name LIKE '%upload%'") == []
+
+    def test_append_creates_missing_table(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        result = convert_csv_to_sqlite(b"id\n1\n", "events", db_path, mode="append")
+        assert result['row_count'] == 1
+
+    def test_upsert_updates_and_inserts(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        first = convert_csv_to_sqlite(b"id,qty\n1,10\n2,20\n2,25\n", "stock", db_path, mode="upsert", key_columns=["id"])
+        assert first['row_count'] == 2
+
+        result = convert_csv_to_sqlite(b"id,qty\n2,30\n3,40\n", "stock", db_path, mode="upsert", key_columns=["id"])
+
+        assert result['rows_loaded'] == 2
+        assert rows(db_path, "SELECT id, qty FROM stock ORDER BY id") == [(1, 10), (2, 30), (3, 40)]
+
+    def test_upsert_refreshes_existing_statistics(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        convert_csv_to_sqlite(b"id,qty\n1,10\n2,20\n", "stock", db_path, mode="upsert", key_columns=["id"])
+        conn = sqlite3.connect(db_path)
+        conn.execute("ANALYZE")
+        conn.commit()
+        conn.close()
+
+        convert_csv_to_sqlite(b"id,qty\n3,30\n4,40\n", "stock", db_path, mode="upsert", key_columns=["id"])
+
+        assert rows(db_path, "SELECT stat FROM sqlite_stat1 WHERE tbl = 'stock'") == [('4 1',)]
+
+    def test_upsert_on_table_with_duplicate_keys_fails_cleanly(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        convert_csv_to_sqlite(b"id,qty\n1,10\n1,11\n", "stock", db_path)
+
+        with pytest.raises(Exception, match="not unique on id"):
+            convert_csv_to_sqlite(b"id,qty\n1,12\n", "stock", db_path, mode="upsert", key_columns=["id"])
+
+        assert rows(db_path, "SELECT qty FROM stock ORDER BY qty") == [(10,), (11,)]
+
+    def test_upsert_key_missing_from_upload(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        with pytest.raises(Exception, match="Key columns not found in upload: sku"):
+            convert_csv_to_sqlite(b"id\n1\n", "stock", db_path, mode="upsert", key_columns=["sku"])
+
+    def test_bulk_upsert(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        bulk_convert([("stock.csv", b"id,qty\n1,10\n2,20\n")], db_path, mode="upsert", key_columns=["id"])
+        result = bulk_convert([("stock.csv", b"id,qty\n2,21\n3,30\n")], db_path, mode="upsert", key_columns=["id"])
+
+        assert result['files'][0]['error'] is None
+        assert rows(db_path, "SELECT id, qty FROM stock ORDER BY id") == [(1, 10), (2, 21), (3, 30)]
+
+
+def test_upload_endpoint_append(tmp_path, monkeypatch):
+    # Endpoints use the relative db/database.db path
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "db").mkdir()
+    from server import app
+    client = TestClient(app)
+
+    client.post("/api/upload", files={"file": ("sales.csv", b"day,total\n1,5\n", "text/csv")})
+    body = client.post(
+        "/api/upload", files={"file": ("sales.csv", b"day,total\n2,7\n", "text/csv")}, data={"mode": "append"}
+    ).json()
+
+    assert body['error'] is None
+    assert body['rows_loaded'] == 1
+    assert body['row_count'] == 2
+
+    body = client.post(
+        "/api/upload", files={"file": ("sales.csv", b"day\n3\n", "text/csv")}, data={"mode": "upsert"}
+    ).json()
+    assert "requires key_columns" in body['error']
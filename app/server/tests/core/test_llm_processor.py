@@ -193,6 +193,25 @@ class TestLLMProcessor:
         assert "Row count: 100" in result
         assert "Row count: 50" in result
     
+    def test_format_schema_for_prompt_sample_rows(self):
+        # Sampled rows are rendered as compact JSON with long values truncated
+        schema_info = {
+            'tables': {
+                'users': {
+                    'columns': {'id': 'INTEGER', 'bio': 'TEXT'},
+                    'row_count': 2,
+                    'sample_rows': [{'id': 1, 'bio': 'x' * 200}]
+                }
+            }
+        }
+        
+        result = format_schema_for_prompt(schema_info)
+        
+        assert "Sample rows:" in result
+        assert '"id": 1' in result
+        assert 'x' * 50 + '..."' in result
+        assert 'x' * 51 not in result
+    
     def test_format_schema_for_prompt_empty(self):
         # Test with empty schema
         schema_info = {'tables': {}}
@@ -0,0 +1,137 @@
+import itertools
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.file_processor import convert_file_to_sqlite
+from core.llm_processor import generate_random_query_candidate
+from core.query_suggestions import SUGGESTION_MAX_FAILURES, SuggestionPool, suggestion_pool
+from core.sql_processor import get_database_schema
+
+ORDERS = b"region,amount\neast,10\nwest,5\neast,7\n"
+
+
+class FakeGenerator:
+    """Returns numbered suggestions and records the database each was validated against."""
+
+    def __init__(self):
+        self.counter = itertools.count(1)
+        self.db_paths = []
+
+    def __call__(self, schema_info, db_path):
+        self.db_paths.append(db_path)
+        n = next(self.counter)
+        return {'query': f"Question {n}", 'sql': f"SELECT {n}", 'row_count': n}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "test.db")
+    convert_file_to_sqlite("orders.csv", ORDERS, path)
+    return path
+
+
+class TestSuggestionPool:
+    def test_cold_pool_fills_then_pops(self, db_path):
+        generate = FakeGenerator()
+        pool = SuggestionPool(size=3, generate=generate)
+        schema = get_database_schema(db_path)
+
+        assert pool.pop(db_path, schema) is None
+        pool.wait(db_path)
+        assert pool.available(db_path) == 3
+        assert generate.db_paths == [db_path] * 3
+
+        assert pool.pop(db_path, schema)['query'] == "Question 1"
+        pool.wait(db_path)
+        assert pool.available(db_path) == 3
+        assert [pool.pop(db_path, schema)['row_count'] for _ in range(3)] == [2, 3, 4]
+
+    def test_schema_change_replaces_pool(self, db_path):
+        pool = SuggestionPool(size=2, generate=FakeGenerator())
+        schema = get_database_schema(db_path)
+
+        # Never asked for suggestions: nothing is generated
+        pool.schema_changed(db_path, schema)
+        assert pool.available(db_path) == 0
+
+        pool.pop(db_path, schema)
+        pool.wait(db_path)
+        convert_file_to_sqlite("users.csv", b"id\n1\n", db_path)
+        new_schema = get_database_schema(db_path)
+        pool.schema_changed(db_path, new_schema)
+        pool.wait(db_path)
+        assert pool.pop(db_path, new_schema)['query'] == "Question 3"
+
+    def test_refill_gives_up(self, db_path):
+        schema = get_database_schema(db_path)
+        calls = []
+
+        def no_rows(schema_info, path):
+            calls.append(path)
+            return None
+        pool = SuggestionPool(size=2, generate=no_rows)
+        pool.pop(db_path, schema)
+        pool.wait(db_path)
+        assert len(calls) == SUGGESTION_MAX_FAILURES
+        assert pool.available(db_path) == 0
+
+        def no_key(schema_info, path):
+            calls.append(path)
+            raise ValueError("No LLM API key found")
+        calls.clear()
+        pool = SuggestionPool(size=2, generate=no_key)
+        pool.pop(db_path, schema)
+        pool.wait(db_path)
+        assert len(calls) == 1
+
+
+def test_candidate_validates_against_db_path(db_path):
+    schema = get_database_schema(db_path)
+    with patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'}), \
+            patch('core.llm_processor.generate_random_query_with_openai', return_value="Total by region"), \
+            patch('core.llm_processor.generate_sql') as generate_sql:
+        generate_sql.return_value = "SELECT region, SUM(amount) FROM orders GROUP BY region"
+        assert generate_random_query_candidate(schema, db_path) == {
+            'query': "Total by region", 'sql': generate_sql.return_value, 'row_count': 2
+        }
+        generate_sql.return_value = "SELECT * FROM orders WHERE amount > 100"
+        assert generate_random_query_candidate(schema, db_path) is None
+
+
+@pytest.fixture
+def server_pool():
+    suggestion_pool.clear()
+    yield suggestion_pool
+    suggestion_pool.clear()
+
+
+def test_random_query_endpoint(tmp_path, monkeypatch, server_pool):
+    # Endpoints use the relative db/database.db path
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "db").mkdir()
+    from server import app
+    client = TestClient(app)
+    client.post("/api/upload", files={"file": ("orders.csv", ORDERS, "text/csv")})
+
+    def generate(schema_info, db_path):
+        return {'query': "Total sales by region", 'sql': "SELECT region, SUM(amount) FROM orders GROUP BY region",
+                'row_count': 2}
+
+    with patch('core.llm_processor.generate_random_query_candidate', side_effect=generate), \
+            patch('server.generate_random_query', return_value="Cold question"):
+        first = client.get("/api/generate-random-query").json()
+        assert (first['query'], first['pooled']) == ("Cold question", False)
+        server_pool.wait("db/database.db")
+
+        pooled = client.get("/api/generate-random-query").json()
+        assert (pooled['query'], pooled['row_count'], pooled['pooled']) == ("Total sales by region", 2, True)
+        server_pool.wait("db/database.db")
+
+    # The suggestion's SQL was cached, so running it skips the LLM
+    with patch('server.generate_sql') as generate_sql:
+        result = client.post("/api/query", json={"query": "Total sales by region"}).json()
+    generate_sql.assert_not_called()
+    assert result['sql'] == "SELECT region, SUM(amount) FROM orders GROUP BY region"
+    assert result['row_count'] == 2
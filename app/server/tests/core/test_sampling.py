@@ -0,0 +1,123 @@
+import random
+import sqlite3
+from collections import Counter
+
+import pytest
+
+from core.sampling import PROBE_COST_ROWS, reservoir_sample, sample_rows, sample_dicts
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE items (id INTEGER, name TEXT)')
+    conn.executemany('INSERT INTO items VALUES (?, ?)', [(i, f"item {i}") for i in range(1000)])
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+class TestReservoirSample:
+    def test_returns_all_items_when_fewer_than_k(self):
+        assert reservoir_sample(range(3), 10) == [0, 1, 2]
+
+    def test_sample_size_and_membership(self):
+        sample = reservoir_sample(range(1000), 10, random.Random(0))
+        assert len(sample) == 10
+        assert len(set(sample)) == 10
+        assert all(0 <= item < 1000 for item in sample)
+
+    def test_roughly_uniform(self):
+        rng = random.Random(1)
+        counts = Counter()
+        for _ in range(2000):
+            counts.update(reservoir_sample(range(10), 2, rng))
+        # Each item is expected 400 times
+        assert all(300 < counts[item] < 500 for item in range(10))
+
+    def test_zero_k(self):
+        assert reservoir_sample(range(10), 0) == []
+
+
+class TestSampleRows:
+    def test_probe_returns_distinct_rows(self, conn):
+        columns, rows = sample_rows(conn, 'items', 10, seed=0)
+        assert columns == ['id', 'name']
+        assert len(rows) == 10
+        assert len(set(rows)) == 10
+        assert all(name == f"item {row_id}" for row_id, name in rows)
+
+    def test_seed_is_reproducible(self, conn):
+        assert sample_rows(conn, 'items', 5, seed=3) == sample_rows(conn, 'items', 5, seed=3)
+
+    def test_samples_spread_across_table(self, conn):
+        seen = set()
+        for seed in range(50):
+            _, rows = sample_rows(conn, 'items', 10, seed=seed)
+            seen.update(row[0] for row in rows)
+        assert min(seen) < 100
+        assert max(seen) > 900
+
+    def test_small_table_scanned(self, conn):
+        conn.execute('CREATE TABLE few (id INTEGER)')
+        conn.executemany('INSERT INTO few VALUES (?)', [(1,), (2,), (3,)])
+
+        _, rows = sample_rows(conn, 'few', 10)
+        assert sorted(rows) == [(1,), (2,), (3,)]
+
+    def test_handles_rowid_gaps(self, conn):
+        conn.execute('DELETE FROM items WHERE id BETWEEN 10 AND 989')
+
+        _, rows = sample_rows(conn, 'items', 10, seed=0)
+        assert len(rows) == 10
+        assert all(row[0] < 10 or row[0] > 989 for row in rows)
+
+    def test_empty_table(self, conn):
+        conn.execute('CREATE TABLE empty (a INTEGER, b TEXT)')
+        assert sample_rows(conn, 'empty', 5) == (['a', 'b'], [])
+
+    def test_without_rowid_table(self, conn):
+        conn.execute('CREATE TABLE keyed (k TEXT PRIMARY KEY, v INTEGER) WITHOUT ROWID')
+        conn.executemany('INSERT INTO keyed VALUES (?, ?)', [(f"k{i}", i) for i in range(100)])
+
+        columns, rows = sample_rows(conn, 'keyed', 5, seed=0)
+        assert columns == ['k', 'v']
+        assert len(set(rows)) == 5
+
+    def test_large_sample_fetched_in_chunks(self):
+        conn = sqlite3.connect(':memory:')
+        conn.execute('CREATE TABLE big (id INTEGER)')
+        conn.executemany('INSERT INTO big VALUES (?)', ((i,) for i in range(50_000)))
+
+        _, rows = sample_rows(conn, 'big', 2000, seed=0)
+        assert len(rows) == len(set(rows))
+        assert len(rows) >= 1900
+        conn.close()
+
+    def test_large_fraction_scanned_not_probed(self):
+        conn = sqlite3.connect(':memory:')
+        conn.execute('CREATE TABLE big (id INTEGER)')
+        conn.executemany('INSERT INTO big VALUES (?)', ((i,) for i in range(50_000)))
+        statements = []
+        conn.set_trace_callback(statements.append)
+
+        _, rows = sample_rows(conn, 'big', 5000, seed=0)
+        assert len(set(rows)) == 5000
+        assert not any('rowid >=' in sql for sql in statements)
+        conn.close()
+
+    def test_probes_capped_by_span(self, conn):
+        # 20 rows left across a span of 1000, so probing cannot find 50 rows
+        conn.execute('DELETE FROM items WHERE id BETWEEN 10 AND 989')
+        statements = []
+        conn.set_trace_callback(statements.append)
+
+        _, rows = sample_rows(conn, 'items', 50, seed=0)
+        assert len(rows) == 20
+        # Capped at one scan's worth of probes (not 50 * MAX_PROBES_PER_ROW) before scanning
+        assert sum('rowid >=' in sql for sql in statements) == 1000 // PROBE_COST_ROWS
+
+    def test_sample_dicts(self, conn):
+        rows = sample_dicts(conn, 'items', 3, seed=0)
+        assert len(rows) == 3
+        assert all(set(row) == {'id', 'name'} for row in rows)
@@ -0,0 +1,121 @@
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.file_processor import convert_file_to_sqlite
+from core.full_text import create_full_text_index
+from core.saved_views import delete_view, list_views, read_view, save_view
+from core.sql_processor import get_database_schema
+from core.sql_security import SQLSecurityError, referenced_tables
+
+ORDERS = b"region,amount\neast,10\nwest,5\neast,7\n"
+TOTALS_SQL = "SELECT region, SUM(amount) AS total FROM orders GROUP BY region ORDER BY region"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "test.db")
+    convert_file_to_sqlite("orders.csv", ORDERS, path, skip_unchanged=True)
+    convert_file_to_sqlite("users.csv", b"id\n1\n", path, skip_unchanged=True)
+    return path
+
+
+def test_referenced_tables(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        assert referenced_tables(conn, "SELECT o.region FROM orders o JOIN users u ON u.id = o.amount") == {
+            'orders', 'users'
+        }
+        assert referenced_tables(conn, "WITH t AS (SELECT 1 AS x) SELECT x FROM t") == set()
+        with pytest.raises(SQLSecurityError):
+            referenced_tables(conn, "DELETE FROM orders")
+    finally:
+        conn.close()
+
+
+class TestSavedViews:
+    def test_save_and_read(self, db_path):
+        view = save_view(db_path, "region_totals", TOTALS_SQL, "Total by region")
+        assert view['source_tables'] == ['orders']
+        assert view['row_count'] == 2
+
+        result = read_view(db_path, "region_totals")
+        assert result['refreshed'] is False
+        assert result['columns'] == ['region', 'total']
+        assert result['results'] == [{'region': 'east', 'total': 17}, {'region': 'west', 'total': 5}]
+        assert set(get_database_schema(db_path)['tables']) == {'orders', 'users'}
+
+    def test_refreshed_only_when_a_source_table_changes(self, db_path):
+        save_view(db_path, "region_totals", TOTALS_SQL)
+
+        convert_file_to_sqlite("users.csv", b"id\n1\n2\n", db_path, skip_unchanged=True)
+        assert read_view(db_path, "region_totals")['refreshed'] is False
+
+        convert_file_to_sqlite("orders.csv", b"region,amount\nwest,100\n", db_path, 'append', skip_unchanged=True)
+        assert [view['stale'] for view in list_views(db_path)] == [True]
+        result = read_view(db_path, "region_totals")
+        assert result['refreshed'] is True
+        assert result['results'][1] == {'region': 'west', 'total': 105}
+        assert read_view(db_path, "region_totals")['refreshed'] is False
+
+    def test_full_text_view_tracks_content_table(self, db_path):
+        convert_file_to_sqlite("docs.csv", b"id,body\n1,hello world\n2,goodbye\n", db_path, skip_unchanged=True)
+        conn = sqlite3.connect(db_path)
+        create_full_text_index(conn, "docs")
+        conn.commit()
+        conn.close()
+
+        view = save_view(db_path, "hits", "SELECT rowid FROM docs_fts WHERE docs_fts MATCH 'hello'")
+        assert view['source_tables'] == ['docs']
+        assert view['row_count'] == 1
+
+        convert_file_to_sqlite(
+            "docs.csv", b"id,body\n1,hello\n2,hello again\n3,hello there\n", db_path, skip_unchanged=True
+        )
+        result = read_view(db_path, "hits")
+        assert result['refreshed'] is True
+        assert len(result['results']) == 3
+
+    def test_rejected_queries(self, db_path):
+        with pytest.raises(SQLSecurityError):
+            save_view(db_path, "bad", "DELETE FROM orders")
+        with pytest.raises(SQLSecurityError):
+            save_view(db_path, "select", TOTALS_SQL)
+        with pytest.raises(ValueError, match="internal"):
+            save_view(db_path, "meta", "SELECT * FROM _nlsql_table_metadata")
+        assert list_views(db_path) == []
+
+    def test_delete(self, db_path):
+        save_view(db_path, "region_totals", TOTALS_SQL)
+        assert delete_view(db_path, "region_totals") is True
+        assert delete_view(db_path, "region_totals") is False
+        assert read_view(db_path, "region_totals") is None
+        conn = sqlite3.connect(db_path)
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        conn.close()
+        assert not any(name.startswith('_nlsql_view__') for name in tables)
+
+
+def test_view_endpoints(tmp_path, monkeypatch):
+    # Endpoints use the relative db/database.db path
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "db").mkdir()
+    from server import app
+    client = TestClient(app)
+    client.post("/api/upload", files={"file": ("orders.csv", ORDERS, "text/csv")})
+
+    with patch('server.generate_sql', return_value=TOTALS_SQL) as generate:
+        saved = client.post("/api/views", json={"name": "region_totals", "query": "Total sales by region"}).json()
+    assert saved['error'] is None
+    assert saved['view']['sql'] == TOTALS_SQL
+    assert generate.call_args[0][0].query == "Total sales by region"
+
+    result = client.get("/api/views/region_totals").json()
+    assert result['row_count'] == 2 and result['refreshed'] is False
+    assert [view['name'] for view in client.get("/api/views").json()['views']] == ['region_totals']
+
+    assert client.post("/api/views", json={"name": "bad"}).json()['error'] is not None
+    assert client.delete("/api/views/region_totals").status_code == 200
+    assert client.get("/api/views/region_totals").status_code == 404
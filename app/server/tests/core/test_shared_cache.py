@@ -0,0 +1,193 @@
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.database import file_version
+from core.metrics import Counter, Histogram, snapshot_metrics, render_metrics, reset_metrics, timed
+from core.shared_cache import (
+    MemoryStore,
+    SQLiteStore,
+    SharedCache,
+    configure_store,
+    get_store,
+    reset_store,
+    nl_sql_key,
+    schema_fingerprint
+)
+from core import sql_processor
+from core.sql_processor import get_database_schema
+
+
+class TestStores:
+    @pytest.mark.parametrize("make_store", [
+        lambda tmp_path: MemoryStore(),
+        lambda tmp_path: SQLiteStore(str(tmp_path / "shared.db")),
+    ])
+    def test_get_put_and_ttl(self, tmp_path, make_store):
+        store = make_store(tmp_path)
+        store.put("ns", "a", "v1", '"value"')
+        store.put("ns", "b", "v1", '"gone"', ttl=-1)
+
+        assert store.get("ns", "a") == ("v1", '"value"')
+        assert store.get("other", "a") is None
+        assert store.get("ns", "b") is None
+        store.close()
+
+    def test_memory_store_evicts_least_recently_used(self):
+        store = MemoryStore(max_entries=2)
+        store.put("ns", "a", "v", "1")
+        store.put("ns", "b", "v", "2")
+        store.get("ns", "a")
+        store.put("ns", "c", "v", "3")
+
+        assert store.get("ns", "b") is None
+        assert store.get("ns", "a") is not None
+
+    def test_side_car_shared_between_processes(self, tmp_path):
+        # Two stores on one file stand in for two workers
+        path = str(tmp_path / "shared.db")
+        worker_a, worker_b = SQLiteStore(path), SQLiteStore(path)
+        worker_a.put("nl_sql", "openai:q", "fp", '"SELECT 1"')
+
+        assert worker_b.get("nl_sql", "openai:q") == ("fp", '"SELECT 1"')
+        worker_a.close()
+        worker_b.close()
+
+
+class TestSharedCache:
+    def test_version_mismatch_misses(self):
+        cache = SharedCache("test")
+        cache.put("key", "v1", {"rows": [1, 2]})
+
+        assert cache.get("key", "v1") == {"rows": [1, 2]}
+        assert cache.get("key", "v2") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_get_store_uses_env_path(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("SHARED_CACHE_PATH", str(tmp_path / "side.db"))
+        reset_store()
+
+        assert get_store().shared
+        assert (tmp_path / "side.db").exists()
+
+    def test_schema_fingerprint_ignores_data(self):
+        schema = {'tables': {'users': {'columns': {'id': 'INTEGER'}, 'row_count': 1, 'sample_rows': [{'id': 1}]}}}
+        changed_data = {'tables': {'users': {'columns': {'id': 'INTEGER'}, 'row_count': 9, 'sample_rows': []}}}
+        changed_columns = {'tables': {'users': {'columns': {'id': 'TEXT'}}}}
+
+        assert schema_fingerprint(schema) == schema_fingerprint(changed_data)
+        assert schema_fingerprint(schema) != schema_fingerprint(changed_columns)
+
+    def test_nl_sql_key_normalizes_whitespace(self):
+        assert nl_sql_key("openai", "  top  users\n") == nl_sql_key("openai", "top users")
+        assert nl_sql_key("openai", "q") != nl_sql_key("anthropic", "q")
+
+
+class TestSchemaCatalog:
+    def test_file_version_changes_on_commit(self, tmp_path):
+        db_path = str(tmp_path / "v.db")
+        assert file_version(db_path) == "missing"
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE t (x)")
+        conn.commit()
+        before = file_version(db_path)
+        conn.execute("INSERT INTO t VALUES (1)")
+        conn.commit()
+        conn.close()
+
+        assert file_version(db_path) != before
+
+    def test_schema_rescanned_only_after_write(self, tmp_path):
+        db_path = str(tmp_path / "catalog.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE users (id INTEGER)")
+        conn.commit()
+
+        scan_schema = sql_processor._scan_database_schema
+        with patch('core.sql_processor.DEFAULT_DB_PATH', db_path), \
+                patch('core.sql_processor._scan_database_schema', wraps=scan_schema) as scan:
+            first = get_database_schema()
+            second = get_database_schema()
+            assert scan.call_count == 1
+            assert first == second
+
+            conn.execute("CREATE TABLE orders (id INTEGER)")
+            conn.commit()
+            third = get_database_schema()
+
+        conn.close()
+        assert scan.call_count == 2
+        assert set(third['tables']) == {'users', 'orders'}
+
+
+class TestSharedMetrics:
+    @pytest.fixture(autouse=True)
+    def clean_metrics(self):
+        reset_metrics()
+        yield
+        reset_metrics()
+
+    def test_merge_sums_worker_snapshots(self):
+        counter = Counter("c_total", "Test.", ("kind",))
+        histogram = Histogram("h_seconds", "Test.", (), buckets=(1.0,))
+        counter.inc("a")
+        histogram.observe(0.5)
+
+        merged_counter = counter.empty_copy()
+        merged_histogram = histogram.empty_copy()
+        for _ in range(2):
+            merged_counter.merge(counter.snapshot())
+            merged_histogram.merge(histogram.snapshot())
+
+        assert merged_counter.value("a") == 2
+        assert merged_histogram.count() == 2
+
+    def test_render_from_snapshots(self):
+        with timed("sql"):
+            pass
+        snapshot = snapshot_metrics()
+        body = render_metrics([snapshot, snapshot])
+
+        assert 'phase_duration_seconds_count{phase="sql"} 2' in body
+
+
+class TestMultiWorkerQuery:
+    @pytest.fixture
+    def client(self, tmp_path, monkeypatch):
+        # Endpoints use the relative db/database.db path
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "db").mkdir()
+        conn = sqlite3.connect("db/database.db")
+        conn.execute('CREATE TABLE users (id INTEGER, name TEXT)')
+        conn.execute("INSERT INTO users VALUES (1, 'a')")
+        conn.commit()
+        conn.close()
+        configure_store(str(tmp_path / "db" / "shared_cache.db"))
+        from server import app
+        return TestClient(app)
+
+    def test_generated_sql_reused_across_workers(self, client, tmp_path):
+        with patch('server.generate_sql', return_value="SELECT * FROM users") as generate:
+            first = client.post("/api/query", json={"query": "all users"}).json()
+            # A fresh store on the same file behaves like another worker
+            configure_store(str(tmp_path / "db" / "shared_cache.db"))
+            second = client.post("/api/query", json={"query": "all  users"}).json()
+
+        assert generate.call_count == 1
+        assert first['results'] == second['results'] == [{'id': 1, 'name': 'a'}]
+
+    def test_failed_sql_not_cached(self, client):
+        with patch('server.generate_sql', return_value="SELECT * FROM missing") as generate:
+            client.post("/api/query", json={"query": "bad"})
+            client.post("/api/query", json={"query": "bad"})
+
+        assert generate.call_count == 2
+
+    def test_metrics_include_shared_caches(self, client):
+        client.get("/api/schema")
+        body = client.get("/api/metrics").text
+
+        assert 'cache_misses_total{cache="schema_catalog"}' in body
+        assert 'http_request_duration_seconds_count{method="GET",route="/api/schema",status="200"}' in body
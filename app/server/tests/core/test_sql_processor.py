@@ -1,7 +1,8 @@
 import pytest
 import sqlite3
 from unittest.mock import patch
-from core.sql_processor import execute_sql_safely, get_database_schema
+from core.sql_processor import execute_sql_safely, get_database_schema, open_sql_cursor
+from core.sql_security import SQLSecurityError
 
 
 @pytest.fixture
@@ -178,4 +179,16 @@ class TestSQLProcessor:
         for keyword, query in dangerous_operations:
             result = execute_sql_safely(query)
             assert result['error'] is not None
-            # Query should be blocked
\ No newline at end of file
+            # Query should be blocked
+
+    def test_open_sql_cursor_streams_rows(self, test_db):
+        cursor = open_sql_cursor("SELECT name FROM users ORDER BY age")
+
+        assert [d[0] for d in cursor.description] == ['name']
+        assert cursor.fetchmany(2) == [('John',), ('Jane',)]
+        assert cursor.fetchmany(2) == [('Bob',)]
+
+    def test_open_sql_cursor_rejects_dangerous_query(self):
+        with pytest.raises(SQLSecurityError):
+            open_sql_cursor("DROP TABLE users")
+
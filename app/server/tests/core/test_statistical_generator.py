@@ -0,0 +1,161 @@
+import re
+import sqlite3
+import time
+
+import numpy as np
+import pytest
+
+from core.statistical_generator import (
+    fit_column_profile,
+    sample_column,
+    generate_statistical_rows
+)
+
+
+@pytest.fixture
+def people_db(tmp_path):
+    """Database with a table covering each kind of column profile"""
+    db_path = str(tmp_path / "people.db")
+    rng = np.random.default_rng(0)
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        'CREATE TABLE people (id INTEGER, status TEXT, age INTEGER, score REAL, '
+        'signup TEXT, email TEXT, phone TEXT, nickname TEXT)'
+    )
+    rows = []
+    for i in range(1, 201):
+        rows.append((
+            i,
+            ["active", "inactive", "pending"][i % 3],
+            int(rng.integers(18, 80)),
+            round(float(rng.normal(50, 10)), 2),
+            f"2024-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}",
+            f"user{i}@{'example.com' if i % 4 else 'test.org'}",
+            f"({rng.integers(200, 999)}) {rng.integers(100, 999)}-{rng.integers(0, 9999):04d}",
+            None if i % 5 == 0 else f"nick_{i}",
+        ))
+    conn.executemany('INSERT INTO people VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+class TestColumnProfiles:
+    def test_categorical_frequencies(self):
+        profile = fit_column_profile("status", ["a"] * 75 + ["b"] * 25)
+        assert profile['kind'] == 'categorical'
+
+        values = sample_column(profile, 10_000, np.random.default_rng(1))
+        assert set(values) == {"a", "b"}
+        assert 0.7 < values.count("a") / len(values) < 0.8
+
+    def test_numeric_histogram_stays_in_range(self):
+        observed = [float(v) for v in np.random.default_rng(2).normal(100, 5, 500).round(1)]
+        profile = fit_column_profile("amount", observed)
+        assert profile['kind'] == 'histogram'
+
+        values = np.array(sample_column(profile, 10_000, np.random.default_rng(3)))
+        assert values.min() >= min(observed)
+        assert values.max() <= max(observed)
+        assert abs(values.mean() - np.mean(observed)) < 1
+        assert np.allclose(values, values.round(1))
+
+    def test_unique_integer_ids_continue_as_sequence(self):
+        profile = fit_column_profile("id", [3, 1, 2])
+        assert profile['kind'] == 'sequence'
+
+        rng = np.random.default_rng(0)
+        assert sample_column(profile, 3, rng) == [4, 5, 6]
+        assert sample_column(profile, 2, rng) == [7, 8]
+
+    def test_null_rate_preserved(self):
+        profile = fit_column_profile("note", [None] * 30 + [f"note {i}" for i in range(70)])
+        values = sample_column(profile, 10_000, np.random.default_rng(4))
+        assert 0.27 < values.count(None) / len(values) < 0.33
+
+    def test_dates_within_observed_range(self):
+        observed = [f"2023-0{m}-1{d}" for m in range(1, 10) for d in range(10)]
+        profile = fit_column_profile("day", observed)
+        assert profile['kind'] == 'date'
+
+        values = sample_column(profile, 1000, np.random.default_rng(5))
+        assert all(re.match(r'^\d{4}-\d{2}-\d{2}$', v) for v in values)
+        assert min(values) >= "2023-01-10" and max(values) <= "2023-09-19"
+
+    def test_datetimes_keep_separator(self):
+        observed = [f"2023-05-{d:02d} 12:{m:02d}:00" for d in range(1, 29) for m in range(0, 60, 10)]
+        profile = fit_column_profile("created_at", observed)
+        assert profile['kind'] == 'datetime'
+
+        values = sample_column(profile, 100, np.random.default_rng(6))
+        assert all(re.match(r'^2023-05-\d{2} \d{2}:\d{2}:\d{2}$', v) for v in values)
+
+    def test_email_format_and_domains(self):
+        observed = [f"person{i}@{'a.com' if i % 2 else 'b.org'}" for i in range(100)]
+        profile = fit_column_profile("email", observed)
+        assert profile['kind'] == 'email'
+
+        values = sample_column(profile, 1000, np.random.default_rng(7))
+        assert all(re.match(r'^person\d+@(a\.com|b\.org)$', v) for v in values)
+
+    def test_digit_patterns(self):
+        observed = [f"555-{i:04d}" for i in range(100)]
+        profile = fit_column_profile("phone", observed)
+        assert profile['kind'] == 'pattern'
+
+        values = sample_column(profile, 1000, np.random.default_rng(8))
+        assert all(re.match(r'^\d{3}-\d{4}$', v) for v in values)
+
+    def test_long_digit_runs(self):
+        observed = [f"{i:024d}" for i in range(100)]
+        profile = fit_column_profile("account", observed)
+        values = sample_column(profile, 10, np.random.default_rng(9))
+        assert all(re.match(r'^\d{24}$', v) for v in values)
+
+
+class TestGenerateStatisticalRows:
+    def test_inserts_requested_rows(self, people_db):
+        inserted = generate_statistical_rows(people_db, "people", 5000, seed=42)
+        assert inserted == 5000
+
+        conn = sqlite3.connect(people_db)
+        assert conn.execute('SELECT COUNT(*) FROM people').fetchone()[0] == 5200
+        assert conn.execute('SELECT COUNT(DISTINCT id) FROM people').fetchone()[0] == 5200
+        statuses = {r[0] for r in conn.execute('SELECT DISTINCT status FROM people')}
+        assert statuses == {"active", "inactive", "pending"}
+        null_nicknames = conn.execute(
+            'SELECT COUNT(*) FROM people WHERE id > 200 AND nickname IS NULL'
+        ).fetchone()[0]
+        assert 700 < null_nicknames < 1300
+        conn.close()
+
+    def test_seed_is_reproducible(self, tmp_path, people_db):
+        generate_statistical_rows(people_db, "people", 100, seed=1)
+        conn = sqlite3.connect(people_db)
+        first = conn.execute('SELECT status, age, email FROM people WHERE id > 200').fetchall()
+        conn.execute('DELETE FROM people WHERE id > 200')
+        conn.commit()
+        conn.close()
+
+        generate_statistical_rows(people_db, "people", 100, seed=1)
+        conn = sqlite3.connect(people_db)
+        second = conn.execute('SELECT status, age, email FROM people WHERE id > 200').fetchall()
+        conn.close()
+        assert first == second
+
+    def test_empty_table_rejected(self, tmp_path):
+        db_path = str(tmp_path / "empty.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute('CREATE TABLE empty (a INTEGER)')
+        conn.close()
+
+        with pytest.raises(ValueError, match="no rows"):
+            generate_statistical_rows(db_path, "empty", 10)
+
+    def test_throughput(self, people_db):
+        start = time.perf_counter()
+        generate_statistical_rows(people_db, "people", 200_000, seed=0)
+        elapsed = time.perf_counter() - start
+
+        # Generous bound; roughly 1M rows in a few seconds on a laptop
+        assert elapsed < 10
@@ -0,0 +1,152 @@
+import io
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.bulk_upload import bulk_convert
+from core.file_processor import convert_file_to_sqlite
+from core.sql_processor import get_database_schema
+from core.table_metadata import (
+    METADATA_TABLE,
+    changed_blocks,
+    get_upload_record,
+    hash_upload,
+    mark_tables_modified,
+    table_version
+)
+
+CSV = b"id,name\n" + b"".join(f"{i},user {i}\n".encode() for i in range(100))
+
+
+def version(db_path, table_name):
+    conn = sqlite3.connect(db_path)
+    try:
+        return table_version(conn, table_name)
+    finally:
+        conn.close()
+
+
+class TestHashUpload:
+    def test_blocks_locate_changes(self):
+        with patch('core.table_metadata.HASH_BLOCK_BYTES', 100):
+            original = hash_upload(io.BytesIO(CSV))
+            edited = hash_upload(io.BytesIO(CSV.replace(b"user 50", b"USER 50")))
+            grown = hash_upload(io.BytesIO(CSV + b"100,user 100\n"))
+
+        assert original.size == len(CSV)
+        assert original.block_count == -(-len(CSV) // 100)
+        assert edited.content_hash != original.content_hash
+        assert changed_blocks(original, edited) == 1
+        assert changed_blocks(original, grown) == 2  # the partial last block, and one new block
+        assert changed_blocks(original, original) == 0
+
+    def test_source_is_rewound(self):
+        source = io.BytesIO(CSV)
+        source.seek(10)
+        hash_upload(source)
+        assert source.tell() == 0
+
+
+class TestSkipUnchanged:
+    def test_identical_upload_is_not_loaded(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        first = convert_file_to_sqlite("users.csv", CSV, db_path, skip_unchanged=True)
+        assert first['unchanged'] is False and first['changed_blocks'] is None
+
+        with patch('core.file_processor._convert_upload', side_effect=AssertionError("loaded again")):
+            second = convert_file_to_sqlite("users.csv", CSV, db_path, skip_unchanged=True)
+
+        assert second['unchanged'] is True
+        assert second['rows_loaded'] == 0
+        assert second['row_count'] == 100
+        assert second['content_hash'] == first['content_hash']
+        assert version(db_path, "users") == 1
+
+    def test_changed_upload_reports_changed_blocks(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        convert_file_to_sqlite("users.csv", CSV, db_path, skip_unchanged=True)
+        result = convert_file_to_sqlite("users.csv", CSV + b"100,user 100\n", db_path, skip_unchanged=True)
+
+        assert result['unchanged'] is False
+        assert result['changed_blocks'] == 1
+        assert result['row_count'] == 101
+        assert version(db_path, "users") == 2
+
+    def test_repeat_append_skipped_but_replace_after_append_loads(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        convert_file_to_sqlite("users.csv", CSV, db_path, skip_unchanged=True)
+        assert convert_file_to_sqlite("users.csv", CSV, db_path, 'append', skip_unchanged=True)['unchanged'] is True
+
+        convert_file_to_sqlite("users.csv", CSV + b"100,user 100\n", db_path, 'append', skip_unchanged=True)
+        result = convert_file_to_sqlite("users.csv", CSV + b"100,user 100\n", db_path, skip_unchanged=True)
+        assert result['unchanged'] is False
+        assert result['row_count'] == 101
+
+    def test_other_writes_clear_the_hash(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        convert_file_to_sqlite("users.csv", CSV, db_path, skip_unchanged=True)
+        bulk_convert([("users.csv", CSV)], db_path, mode='append')
+
+        conn = sqlite3.connect(db_path)
+        assert get_upload_record(conn, "users") is None
+        conn.close()
+        result = convert_file_to_sqlite("users.csv", CSV, db_path, skip_unchanged=True)
+        assert result['unchanged'] is False
+        assert result['row_count'] == 100
+        assert version(db_path, "users") == 3
+
+    def test_dropped_table_is_reloaded(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        convert_file_to_sqlite("users.csv", CSV, db_path, skip_unchanged=True)
+        conn = sqlite3.connect(db_path)
+        conn.execute("DROP TABLE users")
+        conn.commit()
+        conn.close()
+
+        assert convert_file_to_sqlite("users.csv", CSV, db_path, skip_unchanged=True)['unchanged'] is False
+
+    def test_unchanged_array_upload_lists_child_tables(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        jsonl = b'{"id": 1, "tags": ["a", "b"]}\n'
+        convert_file_to_sqlite("posts.jsonl", jsonl, db_path, array_tables=True, skip_unchanged=True)
+        result = convert_file_to_sqlite("posts.jsonl", jsonl, db_path, array_tables=True, skip_unchanged=True)
+
+        assert result['unchanged'] is True
+        assert result['child_tables'] == ['posts__tags']
+        assert version(db_path, "posts__tags") == 1
+
+
+def test_metadata_table_is_internal(tmp_path):
+    db_path = str(tmp_path / "test.db")
+    convert_file_to_sqlite("users.csv", CSV, db_path, skip_unchanged=True)
+    conn = sqlite3.connect(db_path)
+    mark_tables_modified(conn, ["users"])
+    conn.commit()
+    conn.close()
+
+    assert set(get_database_schema(db_path)['tables']) == {"users"}
+    with pytest.raises(ValueError, match="reserved"):
+        convert_file_to_sqlite(f"{METADATA_TABLE}.csv", CSV, db_path)
+
+
+def test_upload_endpoint_skips_identical_file(tmp_path, monkeypatch):
+    # Endpoints use the relative db/database.db path
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "db").mkdir()
+    from server import app
+    client = TestClient(app)
+
+    def upload():
+        return client.post("/api/upload", files={"file": ("users.csv", CSV, "text/csv")}).json()
+
+    first, second = upload(), upload()
+    assert (first['unchanged'], second['unchanged']) == (False, True)
+    assert second['rows_loaded'] == 0 and second['row_count'] == 100
+    assert client.get("/api/health").json()['tables_count'] == 1
+    assert client.delete(f"/api/table/{METADATA_TABLE}").status_code == 404
+    assert client.post("/api/export/table", json={"table_name": METADATA_TABLE}).status_code == 404
+
+    assert client.delete("/api/table/users").status_code == 200
+    assert upload()['unchanged'] is False
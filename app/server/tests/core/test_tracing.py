@@ -0,0 +1,154 @@
+import asyncio
+import os
+import sqlite3
+from unittest.mock import patch, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.tracing import start_trace, current_trace, record_llm_usage
+from core.metrics import timed
+from core.llm_processor import generate_sql_with_openai, generate_sql_with_anthropic
+from core.sql_processor import execute_sql_safely
+
+
+SCHEMA_INFO = {
+    'tables': {
+        'users': {
+            'columns': {'id': 'INTEGER', 'name': 'TEXT'},
+            'row_count': 2
+        }
+    }
+}
+
+
+class TestRequestTrace:
+    def test_no_trace_outside_context(self):
+        assert current_trace() is None
+        # Recording without a trace is a no-op
+        record_llm_usage(10, 5)
+        with timed("sql"):
+            pass
+
+    def test_phases_accumulate(self):
+        with start_trace() as trace:
+            with timed("llm"):
+                pass
+            with timed("llm"):
+                pass
+            record_llm_usage(100, 20)
+            record_llm_usage(50, None)
+
+        assert set(trace.phases_ms) == {"llm"}
+        assert trace.phases_ms["llm"] >= 0
+        assert trace.counters == {"prompt_tokens": 150, "completion_tokens": 20}
+        assert current_trace() is None
+
+    def test_concurrent_tasks_isolated(self):
+        async def handle(tokens):
+            with start_trace() as trace:
+                await asyncio.sleep(0)
+                record_llm_usage(tokens, tokens)
+                await asyncio.sleep(0)
+                return trace.counters["prompt_tokens"]
+
+        async def main():
+            return await asyncio.gather(*(handle(n) for n in range(1, 6)))
+
+        assert asyncio.run(main()) == [1, 2, 3, 4, 5]
+
+
+class TestTracedCalls:
+    @patch('core.llm_processor.OpenAI')
+    def test_openai_records_prompt_llm_and_tokens(self, mock_openai_class):
+        mock_client = MagicMock()
+        mock_openai_class.return_value = mock_client
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = "SELECT * FROM users"
+        mock_response.usage.prompt_tokens = 120
+        mock_response.usage.completion_tokens = 8
+        mock_client.chat.completions.create.return_value = mock_response
+
+        with patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'}):
+            with start_trace() as trace:
+                generate_sql_with_openai("all users", SCHEMA_INFO)
+
+        assert {"prompt_build", "llm"} <= set(trace.phases_ms)
+        assert trace.counters == {"prompt_tokens": 120, "completion_tokens": 8}
+
+    @patch('core.llm_processor.Anthropic')
+    def test_anthropic_token_names(self, mock_anthropic_class):
+        mock_client = MagicMock()
+        mock_anthropic_class.return_value = mock_client
+        mock_response = MagicMock()
+        mock_response.content[0].text = "SELECT * FROM users"
+        mock_response.usage.input_tokens = 90
+        mock_response.usage.output_tokens = 6
+        mock_client.messages.create.return_value = mock_response
+
+        with patch.dict(os.environ, {'ANTHROPIC_API_KEY': 'test-key'}):
+            with start_trace() as trace:
+                generate_sql_with_anthropic("all users", SCHEMA_INFO)
+
+        assert trace.counters == {"prompt_tokens": 90, "completion_tokens": 6}
+
+    def test_execute_sql_records_validate_and_sql(self, tmp_path):
+        db_path = str(tmp_path / "trace.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute('CREATE TABLE users (id INTEGER, name TEXT)')
+        conn.execute("INSERT INTO users VALUES (1, 'a')")
+        conn.commit()
+        conn.close()
+
+        with patch('core.sql_processor.DEFAULT_DB_PATH', db_path):
+            with start_trace() as trace:
+                result = execute_sql_safely("SELECT * FROM users")
+
+        assert result['error'] is None
+        assert {"validate", "sql"} <= set(trace.phases_ms)
+
+
+class TestQueryTimingsResponse:
+    @pytest.fixture
+    def client(self, tmp_path, monkeypatch):
+        # Endpoints use the relative db/database.db path
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "db").mkdir()
+        conn = sqlite3.connect("db/database.db")
+        conn.execute('CREATE TABLE users (id INTEGER, name TEXT)')
+        conn.executemany("INSERT INTO users VALUES (?, ?)", [(1, 'a'), (2, 'b')])
+        conn.commit()
+        conn.close()
+        from server import app
+        return TestClient(app)
+
+    def test_timings_returned_when_requested(self, client):
+        def fake_generate_sql(request, schema_info):
+            record_llm_usage(200, 12)
+            return "SELECT * FROM users"
+
+        with patch('server.generate_sql', side_effect=fake_generate_sql):
+            body = client.post("/api/query", json={"query": "all users", "include_timings": True}).json()
+
+        assert body['error'] is None
+        timings = body['timings']
+        assert timings['rows'] == 2
+        assert timings['prompt_tokens'] == 200
+        assert timings['completion_tokens'] == 12
+        assert timings['schema_ms'] > 0
+        assert timings['sql_ms'] > 0
+        assert timings['total_ms'] >= timings['schema_ms'] + timings['sql_ms']
+
+    def test_timings_omitted_by_default(self, client):
+        with patch('server.generate_sql', return_value="SELECT * FROM users"):
+            body = client.post("/api/query", json={"query": "all users"}).json()
+
+        assert body['timings'] is None
+
+    def test_timings_returned_on_error(self, client):
+        with patch('server.generate_sql', return_value="DROP TABLE users"):
+            body = client.post("/api/query", json={"query": "x", "include_timings": True}).json()
+
+        assert body['error'] is not None
+        assert body['timings']['rows'] == 0
+        assert body['timings']['validate_ms'] >= 0
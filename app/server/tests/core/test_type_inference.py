@@ -0,0 +1,75 @@
+import io
+import sqlite3
+from unittest.mock import patch
+
+import pandas as pd
+
+from core.data_generation import _coerce_value, _type_affinity
+from core.file_processor import convert_csv_to_sqlite, convert_jsonl_to_sqlite
+from core.type_inference import convert_chunk, infer_column_types
+
+CSV = b"""id,price,active,signup,seen_at,plan,code
+1,9.5,true,2024-01-05,2024-01-05T10:00:00,free,A1
+,12,,2024-02-29,2024-02-29 08:30,pro,B2
+3,,False,,,free,C3
+"""
+
+
+class TestInferColumnTypes:
+    def test_csv_columns(self):
+        df = pd.read_csv(io.BytesIO(CSV))
+        assert infer_column_types(df) == {
+            'id': 'INTEGER', 'price': 'REAL', 'active': 'BOOLEAN', 'signup': 'DATE',
+            'seen_at': 'TIMESTAMP', 'plan': 'TEXT', 'code': 'TEXT'
+        }
+
+    def test_numeric_strings_and_leading_zeros(self):
+        df = pd.DataFrame({'n': ['1', ' 2', None], 'zip': ['02134', '10001', None], 'bad_date': ['2024-02-30', None, None]})
+        assert infer_column_types(df) == {'n': 'INTEGER', 'zip': 'TEXT', 'bad_date': 'TEXT'}
+
+    def test_json_values(self):
+        df = pd.DataFrame({'flag': [True, None, False], 'count': [1, None, 2], 'mixed': [1, 'x', None]})
+        assert infer_column_types(df) == {'flag': 'BOOLEAN', 'count': 'INTEGER', 'mixed': 'TEXT'}
+
+    def test_values_that_do_not_fit_are_kept(self):
+        df = pd.DataFrame({'n': ['1', 'n/a', None], 'flag': ['yes', 'maybe', None]})
+        converted = convert_chunk(df, {'n': 'INTEGER', 'flag': 'BOOLEAN'})
+        assert converted['n'].tolist() == [1, 'n/a', None]
+        assert converted['flag'].tolist() == [1, 'maybe', None]
+
+
+class TestTypedUploads:
+    def test_declared_types_and_stored_values(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        result = convert_csv_to_sqlite(CSV, "users", db_path)
+
+        assert result['schema']['id'] == 'INTEGER'
+        assert result['schema']['active'] == 'BOOLEAN'
+        assert result['schema']['signup'] == 'DATE'
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT typeof(id), typeof(active) FROM users WHERE id = 1").fetchone() == ('integer', 'integer')
+        assert conn.execute("SELECT SUM(active), MAX(signup) FROM users").fetchone() == (1, '2024-02-29')
+        conn.close()
+
+    def test_types_from_first_chunk_apply_to_later_chunks(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        csv = b"n,flag\n" + b"1,yes\n" * 3 + b"2.5,no\n,\n"
+        with patch('core.file_processor.UPLOAD_CHUNK_ROWS', 3):
+            result = convert_csv_to_sqlite(csv, "t", db_path)
+
+        assert result['schema'] == {'n': 'INTEGER', 'flag': 'BOOLEAN'}
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT n, flag FROM t").fetchall() == [(1, 1), (1, 1), (1, 1), (2.5, 0), (None, None)]
+        conn.close()
+
+    def test_jsonl_nullable_integers(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        jsonl = b'{"id": 1, "ok": true}\n{"id": null, "ok": false}\n{"id": 3}\n'
+        result = convert_jsonl_to_sqlite(jsonl, "events", db_path)
+        assert result['schema'] == {'id': 'INTEGER', 'ok': 'BOOLEAN'}
+
+
+def test_generated_values_for_inferred_types():
+    assert _type_affinity('DATE') == 'TEXT'
+    assert _coerce_value('2024-01-01', _type_affinity('TIMESTAMP')) == '2024-01-01'
+    assert _coerce_value('true', _type_affinity('BOOLEAN')) == 1
@@ -0,0 +1,99 @@
+import io
+import json
+import math
+import mmap
+import sqlite3
+from tempfile import SpooledTemporaryFile
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from core.file_processor import _mapped_upload, _parse_json_document, convert_file_to_sqlite
+
+RECORDS = [{"id": i, "name": f"user {i}", "score": i / 2} for i in range(50)]
+
+
+def spooled(content: bytes, max_size: int) -> SpooledTemporaryFile:
+    spool = SpooledTemporaryFile(max_size=max_size)
+    spool.write(content)
+    spool.seek(0)
+    return spool
+
+
+class TestMappedUpload:
+    def test_file_on_disk_is_memory_mapped(self, tmp_path):
+        path = tmp_path / "data.json"
+        path.write_bytes(b"[1, 2]")
+        with open(path, "rb") as f, _mapped_upload(f) as buffer:
+            assert isinstance(buffer, mmap.mmap)
+            assert buffer[:] == b"[1, 2]"
+
+    def test_in_memory_upload_is_not_copied(self):
+        source = io.BytesIO(b"[1, 2]")
+        with _mapped_upload(source) as buffer:
+            assert isinstance(buffer, memoryview)
+        # The view is released, so the upload can still be written to
+        source.write(b" ")
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.json"
+        path.write_bytes(b"")
+        with open(path, "rb") as f, _mapped_upload(f) as buffer:
+            assert buffer == b""
+
+    @pytest.mark.parametrize("orjson_available", [True, False])
+    def test_parse_json_document(self, orjson_available):
+        with patch('core.file_processor.ORJSON_AVAILABLE', orjson_available):
+            assert _parse_json_document(memoryview(b'[{"a": 1}]')) == [{"a": 1}]
+            assert math.isnan(_parse_json_document(b'[{"a": NaN}]')[0]['a'])
+
+
+class TestSpooledConversion:
+    # max_size 1 puts the upload on disk, as for any upload over 1 MB
+    @pytest.mark.parametrize("max_size", [1, 1 << 20])
+    def test_json_array(self, tmp_path, max_size):
+        db_path = str(tmp_path / "test.db")
+        with spooled(json.dumps(RECORDS).encode(), max_size) as upload:
+            result = convert_file_to_sqlite("users.json", upload, db_path)
+        assert result['row_count'] == 50
+        assert result['schema'] == {'id': 'INTEGER', 'name': 'TEXT', 'score': 'REAL'}
+
+    @pytest.mark.parametrize("max_size", [1, 1 << 20])
+    def test_parquet(self, tmp_path, max_size):
+        pytest.importorskip("pyarrow")
+        buffer = io.BytesIO()
+        pd.DataFrame(RECORDS).to_parquet(buffer)
+        db_path = str(tmp_path / "test.db")
+        with spooled(buffer.getvalue(), max_size) as upload:
+            result = convert_file_to_sqlite("users.parquet", upload, db_path)
+        assert result['row_count'] == 50
+
+    def test_csv_and_jsonl_stream_from_disk(self, tmp_path):
+        db_path = str(tmp_path / "test.db")
+        csv = pd.DataFrame(RECORDS).to_csv(index=False).encode()
+        jsonl = b"".join(json.dumps(record).encode() + b"\n" for record in RECORDS)
+        with spooled(csv, 1) as csv_upload, spooled(jsonl, 1) as jsonl_upload:
+            assert convert_file_to_sqlite("a.csv", csv_upload, db_path)['row_count'] == 50
+            assert convert_file_to_sqlite("b.jsonl", jsonl_upload, db_path)['row_count'] == 50
+
+
+def test_upload_endpoint_reads_spooled_file(tmp_path, monkeypatch):
+    # Endpoints use the relative db/database.db path
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "db").mkdir()
+    from server import app
+    client = TestClient(app)
+
+    # Larger than the 1 MB spool threshold, so the upload is on disk
+    records = [{"id": i, "payload": "x" * 100} for i in range(12_000)]
+    body = client.post(
+        "/api/upload", files={"file": ("events.json", json.dumps(records).encode(), "application/json")}
+    ).json()
+
+    assert body['error'] is None
+    assert body['row_count'] == 12_000
+    conn = sqlite3.connect(tmp_path / "db" / "database.db")
+    assert conn.execute("SELECT MAX(id) FROM events").fetchone() == (11_999,)
+    conn.close()
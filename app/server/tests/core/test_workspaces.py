@@ -0,0 +1,96 @@
+import io
+import os
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.query_suggestions import suggestion_pool
+from core.workspaces import DatabaseRegistry, _parse_path_overrides, database_registry, validate_workspace
+
+
+class TestDatabaseRegistry:
+    def test_default_database_without_workspace(self, tmp_path):
+        registry = DatabaseRegistry(str(tmp_path / "workspaces"))
+        assert registry.path_for(None) == "db/database.db"
+        assert registry.path_for("") == "db/database.db"
+
+    def test_workspace_gets_own_file(self, tmp_path):
+        registry = DatabaseRegistry(str(tmp_path / "workspaces"))
+
+        assert registry.path_for("acme") == str(tmp_path / "workspaces" / "acme.db")
+        assert os.path.isdir(tmp_path / "workspaces")
+        assert registry.path_for("acme") != registry.path_for("globex")
+
+    def test_assigned_path_used(self, tmp_path):
+        registry = DatabaseRegistry(str(tmp_path / "workspaces"))
+        registry.assign("heavy", str(tmp_path / "fast_disk" / "heavy.db"))
+
+        assert registry.path_for("heavy") == str(tmp_path / "fast_disk" / "heavy.db")
+        assert os.path.isdir(tmp_path / "fast_disk")
+
+    @pytest.mark.parametrize("name", ["../etc", "a/b", "-lead", "x" * 65, "has space", "semi;colon"])
+    def test_unsafe_names_rejected(self, name):
+        with pytest.raises(ValueError):
+            validate_workspace(name)
+
+    def test_parse_path_overrides(self):
+        assert _parse_path_overrides("a=/mnt/a.db, b=/mnt/b.db") == {"a": "/mnt/a.db", "b": "/mnt/b.db"}
+        assert _parse_path_overrides("") == {}
+        with pytest.raises(ValueError):
+            _parse_path_overrides("missing_path")
+
+
+class TestWorkspaceEndpoints:
+    @pytest.fixture
+    def client(self, tmp_path, monkeypatch):
+        # Endpoints use relative db/ paths
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "db").mkdir()
+        from server import app
+        return TestClient(app)
+
+    def _upload(self, client, name, workspace=None):
+        headers = {"X-Workspace": workspace} if workspace else {}
+        files = {"file": (f"{name}.csv", io.BytesIO(b"id,name\n1,a\n2,b\n"), "text/csv")}
+        return client.post("/api/upload", files=files, headers=headers).json()
+
+    def _tables(self, client, workspace=None):
+        headers = {"X-Workspace": workspace} if workspace else {}
+        return {t['name'] for t in client.get("/api/schema", headers=headers).json()['tables']}
+
+    def test_workspaces_are_isolated(self, client, tmp_path):
+        self._upload(client, "orders", workspace="acme")
+        self._upload(client, "users")
+
+        assert self._tables(client, "acme") == {"orders"}
+        assert self._tables(client, "globex") == set()
+        assert self._tables(client) == {"users"}
+        assert (tmp_path / "db" / "workspaces" / "acme.db").exists()
+
+    def test_delete_only_affects_workspace(self, client):
+        self._upload(client, "orders", workspace="acme")
+        self._upload(client, "orders")
+
+        assert client.delete("/api/table/orders", headers={"X-Workspace": "acme"}).status_code == 200
+        assert self._tables(client, "acme") == set()
+        assert self._tables(client) == {"orders"}
+
+    def test_invalid_workspace_rejected(self, client):
+        response = client.get("/api/schema", headers={"X-Workspace": "../escape"})
+        assert response.status_code == 400
+
+    def test_random_query_validated_in_workspace(self, client):
+        self._upload(client, "widgets", workspace="acme")
+        workspace_db = database_registry.path_for("acme")
+
+        with patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'}), \
+                patch('core.llm_processor.generate_random_query_with_openai', return_value="List the widgets"), \
+                patch('core.llm_processor.generate_sql', return_value="SELECT * FROM widgets"):
+            body = client.get("/api/generate-random-query", headers={"X-Workspace": "acme"}).json()
+            # Let the suggestion pool's background refill finish under the patches
+            suggestion_pool.wait(workspace_db)
+        suggestion_pool.clear()
+
+        assert body['error'] is None
+        assert body['query'] == "List the widgets"
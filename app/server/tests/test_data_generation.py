@@ -1,11 +1,20 @@
 import pytest
 import json
 from unittest.mock import patch, MagicMock
+import itertools
+import sqlite3
+import threading
+import time
 from core.llm_processor import (
     generate_synthetic_data_with_openai,
     generate_synthetic_data_with_anthropic,
     generate_synthetic_data
 )
+from core.data_generation import (
+    generate_synthetic_rows,
+    validate_generated_rows,
+    insert_rows
+)
 
 
 class TestSyntheticDataGeneration:
@@ -287,3 +296,154 @@ class TestSyntheticDataGeneration:
                 assert len(result) == 10
                 null_ages = [row for row in result if row['age'] is None]
                 assert len(null_ages) > 0  # At least some null values should be present
+
+
+class TestBulkDataGeneration:
+    """Tests for batched, concurrent synthetic data generation"""
+
+    schema_info = {"id": "INTEGER", "name": "TEXT", "score": "REAL"}
+    sample_rows = [{"id": 1, "name": "Sample", "score": 1.5}]
+
+    def _unique_batches(self):
+        """Return a fake LLM call producing 10 new rows per call"""
+        counter = itertools.count(100)
+        lock = threading.Lock()
+
+        def fake_generate(table_name, schema_info, sample_rows):
+            with lock:
+                ids = [next(counter) for _ in range(10)]
+            return [{"id": i, "name": f"User {i}", "score": i / 2} for i in ids]
+
+        return fake_generate
+
+    def test_generates_requested_row_count_in_batches(self):
+        """Test that the requested rows are split into 10-row LLM batches"""
+        fake = MagicMock(side_effect=self._unique_batches())
+        with patch('core.data_generation.generate_synthetic_data', fake):
+            rows = generate_synthetic_rows("users", self.schema_info, self.sample_rows, 95)
+
+        assert len(rows) == 95
+        assert fake.call_count == 10
+        assert len(set(rows)) == 95
+
+    def test_concurrency_limit_respected(self):
+        """Test that no more than `concurrency` LLM calls run at once"""
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+        make_rows = self._unique_batches()
+
+        def slow_generate(*args):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+            return make_rows(*args)
+
+        with patch('core.data_generation.generate_synthetic_data', side_effect=slow_generate):
+            rows = generate_synthetic_rows("users", self.schema_info, self.sample_rows, 200, concurrency=3)
+
+        assert len(rows) == 200
+        assert 1 < peak <= 3
+
+    def test_duplicates_dropped_and_topped_up(self):
+        """Test duplicate rows (including copies of sample rows) are removed and replaced"""
+        make_rows = self._unique_batches()
+        calls = itertools.count()
+
+        def duplicate_first_batch(*args):
+            if next(calls) == 0:
+                return [dict(self.sample_rows[0])] + [{"id": 2, "name": "Dup", "score": 0.0}] * 9
+            return make_rows(*args)
+
+        with patch('core.data_generation.generate_synthetic_data', side_effect=duplicate_first_batch):
+            rows = generate_synthetic_rows("users", self.schema_info, self.sample_rows, 10, concurrency=1)
+
+        assert len(rows) == 10
+        assert (1, "Sample", 1.5) not in rows
+        assert rows.count((2, "Dup", 0.0)) == 1
+
+    def test_failed_batches_tolerated(self):
+        """Test a failing batch does not abort the whole generation"""
+        make_rows = self._unique_batches()
+        calls = itertools.count()
+
+        def flaky(*args):
+            if next(calls) % 2 == 0:
+                raise Exception("rate limited")
+            return make_rows(*args)
+
+        with patch('core.data_generation.generate_synthetic_data', side_effect=flaky):
+            rows = generate_synthetic_rows("users", self.schema_info, self.sample_rows, 30, concurrency=1)
+
+        assert len(rows) == 30
+
+    def test_all_batches_failing_raises(self):
+        """Test an error is raised when no batch succeeds"""
+        with patch('core.data_generation.generate_synthetic_data', side_effect=Exception("no key")):
+            with pytest.raises(Exception, match="All synthetic data batches failed"):
+                generate_synthetic_rows("users", self.schema_info, self.sample_rows, 20)
+
+    def test_validate_generated_rows_coerces_and_rejects(self):
+        """Test schema validation coerces compatible values and drops bad rows"""
+        rows = [
+            {"id": "7", "name": 42, "score": "2.5"},
+            {"id": 8.0, "name": "ok", "score": None},
+            {"id": "x", "name": "bad id", "score": 1.0},
+            {"id": 9, "name": "missing score"},
+            {"id": 10, "name": {"nested": True}, "score": 1.0},
+        ]
+
+        valid, rejected = validate_generated_rows(rows, self.schema_info)
+
+        assert valid == [(7, "42", 2.5), (8, "ok", None)]
+        assert rejected == 3
+
+    def test_validate_generated_rows_maps_boolean_text(self):
+        """Test true/false, yes/no and t/f in BOOLEAN columns are stored as 1/0"""
+        schema_info = {"id": "INTEGER", "active": "BOOLEAN"}
+        rows = [
+            {"id": 1, "active": "true"},
+            {"id": 2, "active": "No"},
+            {"id": 3, "active": " t "},
+            {"id": 4, "active": False},
+            {"id": 5, "active": "maybe"},
+        ]
+
+        valid, rejected = validate_generated_rows(rows, schema_info)
+
+        assert valid == [(1, 1), (2, 0), (3, 1), (4, 0)]
+        assert rejected == 1
+
+    def test_insert_rows_counts_generator_rows(self):
+        """Test the count comes from the rows inserted, not cursor.rowcount"""
+        conn = sqlite3.connect(':memory:')
+        conn.execute('CREATE TABLE users (id INTEGER)')
+
+        count = insert_rows(conn, "users", ["id"], ((i,) for i in range(5)))
+
+        assert count == 5
+        assert insert_rows(conn, "users", ["id"], iter([])) == 0
+        conn.close()
+
+    def test_insert_rows_single_transaction(self):
+        """Test rows are inserted with executemany and committed together"""
+        conn = sqlite3.connect(':memory:')
+        conn.execute('CREATE TABLE users (id INTEGER, name TEXT, score REAL)')
+
+        count = insert_rows(conn, "users", ["id", "name", "score"], [(1, "a", 1.0), (2, "b", None)])
+
+        assert count == 2
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 2
+
+        # A failing row rolls back the whole batch
+        conn.execute('CREATE UNIQUE INDEX idx_id ON users(id)')
+        with pytest.raises(sqlite3.IntegrityError):
+            insert_rows(conn, "users", ["id", "name", "score"], [(3, "c", 1.0), (1, "dup", 1.0)])
+        assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 2
+        conn.close()
+
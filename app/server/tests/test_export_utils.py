@@ -1,8 +1,39 @@
 import pytest
 import sqlite3
+import gzip
+import json
 import pandas as pd
-from io import StringIO
-from core.export_utils import generate_csv_from_data, generate_csv_from_table
+import pyarrow as pa
+import pyarrow.parquet as pq
+from io import StringIO, BytesIO
+from core.export_utils import (
+    generate_csv_from_data,
+    generate_csv_from_table,
+    stream_csv_from_cursor,
+    stream_csv_from_table,
+    stream_export_from_cursor,
+    open_table_cursor,
+    scan_storage_classes,
+    validate_export_options,
+    get_export_filename,
+    get_export_media_type,
+    EXPORT_BATCH_SIZE,
+    ZSTD_AVAILABLE
+)
+
+
+@pytest.fixture
+def export_db():
+    """In-memory database with a table spanning several export batches"""
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE items (id INTEGER, name TEXT, price REAL, note TEXT)')
+    conn.executemany(
+        'INSERT INTO items VALUES (?, ?, ?, ?)',
+        [(i, f'Item {i}', i * 0.5, None if i % 3 else f'note {i}') for i in range(25)]
+    )
+    conn.commit()
+    return conn
+
 
 
 class TestExportUtils:
@@ -215,4 +246,231 @@ class TestExportUtils:
         assert len(df) == 1
         assert df.iloc[0]['data'] == 'test data'
         
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+    def test_stream_csv_from_cursor_batches(self):
+        """Test streaming CSV from a cursor yields header plus batched rows"""
+        conn = sqlite3.connect(':memory:')
+        conn.execute('CREATE TABLE items (id INTEGER, name TEXT, value REAL)')
+        conn.executemany(
+            'INSERT INTO items VALUES (?, ?, ?)',
+            [(i, f'Item, {i}', i * 1.5 if i % 2 else None) for i in range(25)]
+        )
+        cursor = conn.execute('SELECT * FROM items ORDER BY id')
+
+        chunks = list(stream_csv_from_cursor(cursor, batch_size=10))
+
+        # Header chunk + 3 row batches (10, 10, 5)
+        assert len(chunks) == 4
+        df = pd.read_csv(StringIO(b''.join(chunks).decode('utf-8')))
+        assert list(df.columns) == ['id', 'name', 'value']
+        assert len(df) == 25
+        assert df.iloc[3]['name'] == 'Item, 3'
+        assert pd.isna(df.iloc[2]['value'])
+
+        # The stream owns the connection and closes it when exhausted
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute('SELECT 1')
+
+    def test_stream_csv_from_cursor_no_rows(self):
+        """Test streaming CSV from an empty result still emits the header"""
+        conn = sqlite3.connect(':memory:')
+        conn.execute('CREATE TABLE items (id INTEGER, name TEXT)')
+        cursor = conn.execute('SELECT * FROM items')
+
+        result = b''.join(stream_csv_from_cursor(cursor))
+
+        assert result == b'id,name\n'
+
+    def test_stream_csv_from_table_matches_generate(self):
+        """Test streamed table export matches the in-memory export"""
+        conn = sqlite3.connect(':memory:')
+        conn.execute('CREATE TABLE test_table (id INTEGER PRIMARY KEY, name TEXT, value REAL)')
+        conn.executemany(
+            'INSERT INTO test_table (name, value) VALUES (?, ?)',
+            [('Item 1', 100.5), ('Quote "test"', None), ('New\nline', 3.25)]
+        )
+        conn.commit()
+
+        expected = pd.read_csv(StringIO(generate_csv_from_table(conn, 'test_table').decode('utf-8')))
+        streamed = b''.join(stream_csv_from_table(conn, 'test_table'))
+        df = pd.read_csv(StringIO(streamed.decode('utf-8')))
+
+        pd.testing.assert_frame_equal(df, expected)
+
+    def test_stream_csv_from_table_nonexistent(self):
+        """Test streaming a non-existent table raises before any output"""
+        conn = sqlite3.connect(':memory:')
+
+        with pytest.raises(ValueError, match="Table 'nonexistent' does not exist"):
+            stream_csv_from_table(conn, 'nonexistent')
+
+        conn.close()
+
+
+class TestExportFormats:
+
+    def test_parquet_export_writes_row_group_per_batch(self, export_db):
+        """Test Parquet export streams one row group per fetched batch"""
+        cursor = open_table_cursor(export_db, 'items')
+        chunks = list(stream_export_from_cursor(cursor, 'parquet', batch_size=10))
+
+        assert len(chunks) > 1
+        parquet_file = pq.ParquetFile(BytesIO(b''.join(chunks)))
+        assert parquet_file.metadata.num_row_groups == 3
+
+        table = parquet_file.read()
+        assert table.num_rows == 25
+        assert table.schema.field('id').type == pa.int64()
+        assert table.schema.field('price').type == pa.float64()
+        assert table.column('name')[4].as_py() == 'Item 4'
+        assert table.column('note')[1].as_py() is None
+
+    def test_arrow_export_round_trip(self, export_db):
+        """Test Arrow IPC stream export can be read back"""
+        cursor = open_table_cursor(export_db, 'items')
+        data = b''.join(stream_export_from_cursor(cursor, 'arrow', batch_size=10))
+
+        table = pa.ipc.open_stream(data).read_all()
+        assert table.num_rows == 25
+        assert table.column_names == ['id', 'name', 'price', 'note']
+
+    def test_arrow_export_mixed_types_across_batches(self):
+        """Test values that don't fit the first batch's type are coerced"""
+        conn = sqlite3.connect(':memory:')
+        conn.execute('CREATE TABLE mixed (label)')
+        conn.executemany('INSERT INTO mixed VALUES (?)', [('a',), ('b',), (3,), (None,)])
+        cursor = conn.execute('SELECT label FROM mixed')
+
+        data = b''.join(stream_export_from_cursor(cursor, 'arrow', batch_size=2))
+
+        table = pa.ipc.open_stream(data).read_all()
+        assert table.column('label').to_pylist() == ['a', 'b', '3', None]
+
+    def test_scanned_types_widen_across_batches(self):
+        """Test column types come from every row, not just the first batch"""
+        conn = sqlite3.connect(':memory:')
+        conn.execute('CREATE TABLE mixed (amount, code, label TEXT)')
+        conn.executemany('INSERT INTO mixed VALUES (?, ?, ?)', [
+            (1, 1, 'a'), (2, 2, 'b'), (2.75, 'abc', 'c'), (3.5, None, 'd')
+        ])
+        sql = 'SELECT amount, code, label FROM mixed'
+        cursor = conn.execute(sql)
+        storage_classes = scan_storage_classes(cursor, sql)
+        assert storage_classes == [{'integer', 'real'}, {'integer', 'text', 'null'}, {'text'}]
+        # Duplicate result column names are scanned by position
+        duplicates = 'SELECT label, amount AS label FROM mixed;'
+        assert scan_storage_classes(conn.execute(duplicates), duplicates) == [{'text'}, {'integer', 'real'}]
+
+        data = b''.join(stream_export_from_cursor(cursor, 'parquet', batch_size=2, storage_classes=storage_classes))
+
+        table = pq.read_table(BytesIO(data))
+        assert table.schema.field('amount').type == pa.float64()
+        assert table.column('amount').to_pylist() == [1, 2, 2.75, 3.5]
+        assert table.column('code').to_pylist() == ['1', '2', 'abc', None]
+
+    def test_unscanned_mismatch_raises(self):
+        """Test a value that doesn't fit the first batch's numeric type is never truncated"""
+        conn = sqlite3.connect(':memory:')
+        conn.execute('CREATE TABLE mixed (amount)')
+        conn.executemany('INSERT INTO mixed VALUES (?)', [(1,), (2,), (2.75,)])
+        cursor = conn.execute('SELECT amount FROM mixed')
+
+        with pytest.raises(ValueError, match="real values"):
+            b''.join(stream_export_from_cursor(cursor, 'parquet', batch_size=2))
+
+    def test_scanned_empty_result_keeps_types(self, export_db):
+        """Test an empty result with scanned types still writes a valid file"""
+        sql = 'SELECT id, name FROM items WHERE id < 0'
+        cursor = export_db.execute(sql)
+        storage_classes = scan_storage_classes(cursor, sql)
+        data = b''.join(stream_export_from_cursor(cursor, 'arrow', storage_classes=storage_classes))
+
+        table = pa.ipc.open_stream(data).read_all()
+        assert table.num_rows == 0
+        assert table.column_names == ['id', 'name']
+
+    def test_parquet_export_empty_result(self, export_db):
+        """Test Parquet export of an empty result is still a valid file"""
+        cursor = export_db.execute('SELECT * FROM items WHERE id < 0')
+        data = b''.join(stream_export_from_cursor(cursor, 'parquet'))
+
+        table = pq.read_table(BytesIO(data))
+        assert table.num_rows == 0
+        assert table.column_names == ['id', 'name', 'price', 'note']
+
+    def test_ndjson_gzip_export(self, export_db):
+        """Test gzip-compressed NDJSON export"""
+        cursor = open_table_cursor(export_db, 'items')
+        data = b''.join(stream_export_from_cursor(cursor, 'ndjson', 'gzip', batch_size=10))
+
+        lines = gzip.decompress(data).decode('utf-8').splitlines()
+        assert len(lines) == 25
+        assert json.loads(lines[3]) == {'id': 3, 'name': 'Item 3', 'price': 1.5, 'note': 'note 3'}
+
+    @pytest.mark.skipif(not ZSTD_AVAILABLE, reason="zstandard not installed")
+    def test_ndjson_zstd_export(self, export_db):
+        """Test zstd-compressed NDJSON export"""
+        import zstandard
+
+        cursor = open_table_cursor(export_db, 'items')
+        data = b''.join(stream_export_from_cursor(cursor, 'ndjson', 'zstd', batch_size=10))
+
+        decompressed = zstandard.ZstdDecompressor().stream_reader(BytesIO(data)).read()
+        assert len(decompressed.decode('utf-8').splitlines()) == 25
+
+    def test_csv_gzip_export(self, export_db):
+        """Test compression also applies to CSV exports"""
+        cursor = open_table_cursor(export_db, 'items')
+        data = b''.join(stream_export_from_cursor(cursor, 'csv', 'gzip'))
+
+        df = pd.read_csv(BytesIO(gzip.decompress(data)))
+        assert len(df) == 25
+
+    def test_validate_export_options(self):
+        """Test invalid format and compression combinations are rejected"""
+        validate_export_options('csv')
+        validate_export_options('ndjson', 'gzip')
+        validate_export_options('parquet')
+
+        with pytest.raises(ValueError, match="Unsupported export format"):
+            validate_export_options('xlsx')
+        with pytest.raises(ValueError, match="Unsupported compression"):
+            validate_export_options('csv', 'brotli')
+        with pytest.raises(ValueError, match="only supported for"):
+            validate_export_options('parquet', 'gzip')
+
+    def test_export_filename_and_media_type(self):
+        """Test filenames and media types follow format and compression"""
+        assert get_export_filename('users_export', 'csv') == 'users_export.csv'
+        assert get_export_filename('query_results', 'ndjson', 'zstd') == 'query_results.ndjson.zst'
+        assert get_export_filename('users_export', 'arrow') == 'users_export.arrows'
+        assert get_export_media_type('parquet') == 'application/vnd.apache.parquet'
+        assert get_export_media_type('ndjson', 'gzip') == 'application/gzip'
+
+
+
+def test_export_endpoints_scan_column_types(tmp_path, monkeypatch):
+    """Test Parquet exports from the endpoints keep values that change type across batches"""
+    from fastapi.testclient import TestClient
+
+    # Endpoints use the relative db/database.db path
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "db").mkdir()
+    conn = sqlite3.connect(tmp_path / "db" / "database.db")
+    conn.execute('CREATE TABLE mixed (amount, code)')
+    # The mismatched values come after the first EXPORT_BATCH_SIZE rows
+    rows = [(i, i) for i in range(EXPORT_BATCH_SIZE)] + [(2.75, 'abc')]
+    conn.executemany('INSERT INTO mixed VALUES (?, ?)', rows)
+    conn.commit()
+    conn.close()
+    from server import app
+    client = TestClient(app)
+
+    table = client.post("/api/export/table", json={"table_name": "mixed", "format": "parquet"})
+    query = client.post("/api/export/query", json={"sql": "SELECT amount, code FROM mixed", "format": "parquet"})
+    for response in (table, query):
+        assert response.status_code == 200
+        exported = pq.read_table(BytesIO(response.content))
+        assert exported.column('amount').to_pylist()[-2:] == [EXPORT_BATCH_SIZE - 1, 2.75]
+        assert exported.column('code').to_pylist()[-2:] == [str(EXPORT_BATCH_SIZE - 1), 'abc']
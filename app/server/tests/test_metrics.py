@@ -0,0 +1,91 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from core.metrics import (
+    Counter,
+    Histogram,
+    PHASE_DURATION,
+    ERRORS,
+    REQUEST_DURATION,
+    timed,
+    record_error,
+    render_metrics,
+    reset_metrics
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    reset_metrics()
+    yield
+    reset_metrics()
+
+
+class TestMetricTypes:
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram("test_seconds", "Test.", ("op",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, "a")
+        histogram.observe(0.5, "a")
+        histogram.observe(5.0, "a")
+
+        lines = histogram.render()
+        assert 'test_seconds_bucket{op="a",le="0.1"} 1' in lines
+        assert 'test_seconds_bucket{op="a",le="1.0"} 2' in lines
+        assert 'test_seconds_bucket{op="a",le="+Inf"} 3' in lines
+        assert 'test_seconds_count{op="a"} 3' in lines
+        assert 'test_seconds_sum{op="a"} 5.55' in lines
+        assert "# TYPE test_seconds histogram" in lines
+
+    def test_counter_labels_escaped(self):
+        counter = Counter("test_total", "Test.", ("source",))
+        counter.inc('say "hi"')
+        counter.inc('say "hi"', amount=2)
+
+        assert counter.value('say "hi"') == 3
+        assert 'test_total{source="say \\"hi\\""} 3' in counter.render()
+
+    def test_timed_records_phase_and_errors(self):
+        with timed("sql"):
+            pass
+        with pytest.raises(ValueError):
+            with timed("sql"):
+                raise ValueError("boom")
+
+        assert PHASE_DURATION.count("sql") == 2
+        assert ERRORS.value("phase:sql") == 1
+
+    def test_record_error(self):
+        record_error("query")
+        assert 'errors_total{source="query"} 1' in render_metrics()
+
+
+class TestMetricsEndpoint:
+    @pytest.fixture
+    def client(self, tmp_path, monkeypatch):
+        # Endpoints use the relative db/database.db path
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "db").mkdir()
+        from server import app
+        return TestClient(app)
+
+    def test_requests_recorded_by_route_template(self, client):
+        client.get("/api/health")
+        client.delete("/api/table/does_not_exist")
+        client.get("/api/no-such-route")
+
+        assert REQUEST_DURATION.count("GET", "/api/health", "200") == 1
+        assert REQUEST_DURATION.count("DELETE", "/api/table/{table_name}", "404") == 1
+        assert REQUEST_DURATION.count("GET", "unmatched", "404") == 1
+        assert ERRORS.value("http:404") == 2
+
+    def test_metrics_endpoint_prometheus_format(self, client):
+        client.get("/api/health")
+        response = client.get("/api/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        assert "# TYPE http_request_duration_seconds histogram" in body
+        assert 'http_request_duration_seconds_count{method="GET",route="/api/health",status="200"} 1' in body
+        assert 'cache_hits_total{cache="query_results"}' in body
+        assert 'cache_misses_total{cache="sql_validation"}' in body
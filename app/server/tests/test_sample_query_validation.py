@@ -251,11 +251,11 @@ class TestSampleQueryValidation:
                 mock_validated.return_value = "Show me all items"
 
                 # Call router function
-                result = generate_random_query(schema_info)
+                result = generate_random_query(schema_info, "db/workspaces/acme.db")
 
                 # Assertions
                 assert result == "Show me all items"
-                mock_validated.assert_called_once_with(schema_info)
+                mock_validated.assert_called_once_with(schema_info, db_path="db/workspaces/acme.db")
 
     def test_generate_random_query_no_api_key(self):
         """Test that generate_random_query raises error when no API key exists"""
@@ -0,0 +1,211 @@
+"""
+Tests for the lexer-based SQL validator and the read-only SQLite authorizer
+"""
+
+import pytest
+import sqlite3
+import tempfile
+import os
+from unittest.mock import patch
+from core.sql_security import (
+    tokenize_sql,
+    validate_sql_query,
+    read_only_access,
+    SQLSecurityError
+)
+from core.sql_processor import execute_sql_safely
+
+
+@pytest.fixture
+def test_db():
+    """Create a test database with sample data"""
+    db_file = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+    db_file.close()
+    
+    conn = sqlite3.connect(db_file.name)
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE users (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            email TEXT,
+            age INTEGER
+        )
+    ''')
+    cursor.executemany(
+        "INSERT INTO users (name, email, age) VALUES (?, ?, ?)",
+        [('Alice', 'alice@example.com', 30), ('Bob', 'bob--admin@example.com', 25)]
+    )
+    conn.commit()
+    conn.close()
+    
+    yield db_file.name
+    
+    os.unlink(db_file.name)
+
+
+# Queries both layers must reject: the validator by inspecting tokens,
+# the authorizer when SQLite compiles the statement
+WRITE_QUERIES = [
+    "DROP TABLE users",
+    "DELETE FROM users",
+    "UPDATE users SET name = 'hacked'",
+    "INSERT INTO users (name) VALUES ('mallory')",
+    "INSERT INTO users SELECT * FROM users",
+    "CREATE TABLE hackers (id INT)",
+    "CREATE VIEW v AS SELECT * FROM users",
+    "ALTER TABLE users ADD COLUMN password TEXT",
+    "PRAGMA writable_schema = 1",
+    "ATTACH DATABASE ':memory:' AS other",
+    "REPLACE INTO users (id, name) VALUES (1, 'x')",
+    "WITH doomed AS (SELECT id FROM users) DELETE FROM users WHERE id IN doomed",
+]
+
+# Read-only queries both layers must accept, with the expected row count
+READ_QUERIES = [
+    ("SELECT * FROM users", 2),
+    ("SELECT name FROM users WHERE age > 26", 1),
+    ("WITH older AS (SELECT * FROM users WHERE age > 26) SELECT name FROM older", 1),
+    ("SELECT COUNT(*), AVG(age) FROM users", 1),
+    ("SELECT upper(name), replace(email, '@', ' at ') FROM users", 2),
+    ("VALUES (1), (2), (3)", 3),
+    ("SELECT * FROM users;", 2),
+]
+
+# Queries the old regex blacklist rejected because of text inside literals
+FORMER_FALSE_POSITIVES = [
+    ("SELECT * FROM users WHERE email = 'bob--admin@example.com'", 1),
+    ("SELECT * FROM users WHERE name = 'update me; set later'", 0),
+    ("SELECT 'a /* not a comment */ b' AS text", 1),
+    ("SELECT * FROM users WHERE name = 'x; DROP TABLE users'", 0),
+    ('SELECT name AS "insert into notes select" FROM users', 2),
+]
+
+
+def _execute_with_authorizer_only(db_path, query):
+    """Execute a query with the authorizer but without the text validator"""
+    conn = sqlite3.connect(db_path)
+    try:
+        with read_only_access(conn):
+            cursor = conn.execute(query)
+        return cursor.fetchall()
+    finally:
+        conn.close()
+
+
+def _user_count(db_path):
+    conn = sqlite3.connect(db_path)
+    count = conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+    conn.close()
+    return count
+
+
+class TestSQLLexer:
+    """Test the single-pass SQL tokenizer"""
+    
+    def test_tokenize_keeps_literals_whole(self):
+        tokens = [t for t in tokenize_sql("SELECT 'a -- b' FROM \"my table\"") if t.kind != 'space']
+        assert [(t.kind, t.value) for t in tokens] == [
+            ('word', 'SELECT'),
+            ('string', "'a -- b'"),
+            ('word', 'FROM'),
+            ('identifier', '"my table"'),
+        ]
+    
+    def test_tokenize_escaped_quotes_and_comments(self):
+        tokens = [t for t in tokenize_sql("SELECT 'it''s' -- note\n/* block */ 1.5e3") if t.kind != 'space']
+        assert [t.kind for t in tokens] == ['word', 'string', 'comment', 'comment', 'number']
+        assert tokens[1].value == "'it''s'"
+    
+    def test_tokenize_positions(self):
+        tokens = tokenize_sql("SELECT [a b] FROM t")
+        assert all("SELECT [a b] FROM t"[t.start:].startswith(t.value) for t in tokens)
+    
+    def test_unterminated_literals_rejected(self):
+        for query in ["SELECT 'abc", "SELECT 'it''", 'SELECT "col', "SELECT 1 /* open"]:
+            with pytest.raises(SQLSecurityError, match="unterminated"):
+                validate_sql_query(query)
+
+
+class TestValidatorAuthorizerEquivalence:
+    """The text validator and the authorizer must agree on the corpus"""
+    
+    @pytest.mark.parametrize("query", WRITE_QUERIES)
+    def test_write_queries_rejected_by_validator(self, query):
+        with pytest.raises(SQLSecurityError):
+            validate_sql_query(query)
+    
+    @pytest.mark.parametrize("query", WRITE_QUERIES)
+    def test_write_queries_rejected_by_authorizer(self, test_db, query):
+        with pytest.raises(SQLSecurityError, match="not read-only"):
+            _execute_with_authorizer_only(test_db, query)
+        assert _user_count(test_db) == 2
+    
+    @pytest.mark.parametrize("query,expected_rows", READ_QUERIES)
+    def test_read_queries_accepted_by_both(self, test_db, query, expected_rows):
+        assert validate_sql_query(query)
+        assert len(_execute_with_authorizer_only(test_db, query)) == expected_rows
+    
+    @pytest.mark.parametrize("query,expected_rows", FORMER_FALSE_POSITIVES)
+    def test_literals_no_longer_rejected(self, test_db, query, expected_rows):
+        assert validate_sql_query(query)
+        assert len(_execute_with_authorizer_only(test_db, query)) == expected_rows
+    
+    def test_load_extension_denied(self, test_db):
+        with pytest.raises((SQLSecurityError, sqlite3.OperationalError)):
+            _execute_with_authorizer_only(test_db, "SELECT load_extension('evil.so')")
+    
+    def test_authorizer_removed_after_use(self, test_db):
+        conn = sqlite3.connect(test_db)
+        with read_only_access(conn):
+            conn.execute("SELECT 1")
+        conn.execute("CREATE TABLE allowed_later (id INTEGER)")
+        conn.close()
+
+
+class TestInjectionStillBlocked:
+    """Injection patterns are still rejected outside literals"""
+    
+    @pytest.mark.parametrize("query", [
+        "SELECT * FROM users WHERE name = '' OR '1'='1'",
+        "SELECT * FROM users WHERE name = 'x' OR 1=1",
+        'SELECT * FROM users WHERE name = "" OR "a"="a"',
+        "SELECT * FROM users WHERE id = 1 or 'z' == 'z'",
+    ])
+    def test_tautologies_rejected(self, query):
+        with pytest.raises(SQLSecurityError, match="injection"):
+            validate_sql_query(query)
+    
+    def test_comparison_between_different_literals_allowed(self):
+        assert validate_sql_query("SELECT * FROM users WHERE age = 1 OR 2 = 3")
+    
+    @pytest.mark.parametrize("query", [
+        "SELECT * FROM users; DROP TABLE users",
+        "SELECT * FROM users; SELECT * FROM users",
+        "SELECT 'a'; PRAGMA table_info(users)",
+    ])
+    def test_stacked_statements_rejected(self, query):
+        with pytest.raises(SQLSecurityError, match="multiple statements|dangerous"):
+            validate_sql_query(query)
+
+
+class TestExecuteSqlSafelyAuthorizer:
+    """execute_sql_safely enforces read-only access at compile time"""
+    
+    def test_authorizer_denial_reported_as_security_error(self, test_db):
+        real_connect = sqlite3.connect
+        with patch('core.sql_processor.validate_sql_query', return_value=True), \
+             patch('core.sql_processor.sqlite3.connect', side_effect=lambda *a, **k: real_connect(test_db)):
+            result = execute_sql_safely("DELETE FROM users")
+        
+        assert result['error'] is not None
+        assert "Security error" in result['error']
+        assert _user_count(test_db) == 2
+    
+    def test_literal_with_comment_marker_executes(self, test_db):
+        real_connect = sqlite3.connect
+        with patch('core.sql_processor.sqlite3.connect', side_effect=lambda *a, **k: real_connect(test_db)):
+            result = execute_sql_safely("SELECT name FROM users WHERE email = 'bob--admin@example.com'")
+        
+        assert result['error'] is None
+        assert result['results'] == [{'name': 'Bob'}]
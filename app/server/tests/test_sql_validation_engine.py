@@ -0,0 +1,118 @@
+"""
+Tests for the single-pass, memoized SQL validation engine
+"""
+
+import time
+import pytest
+from core.sql_security import (
+    validate_sql_query,
+    validate_identifier,
+    _find_sql_violation,
+    SQLSecurityError
+)
+
+
+SAFE_QUERIES = [
+    "SELECT * FROM users",
+    "SELECT name, email FROM users WHERE age > 18",
+    "SELECT u.name, COUNT(o.id) FROM users u JOIN orders o ON o.user_id = u.id GROUP BY u.name",
+    "SELECT * FROM users WHERE last_update > date('now', '-7 days')",
+    "SELECT category, AVG(price) FROM products GROUP BY category ORDER BY 2 DESC LIMIT 5",
+    "SELECT * FROM users UNION SELECT * FROM admins",
+    "SELECT * FROM settings WHERE updated_by = 'x'",
+    "SELECT * FROM users WHERE name = 'O''Brien'",
+]
+
+REJECTED_QUERIES = [
+    "DROP TABLE users",
+    "drop table users",
+    "DELETE FROM users WHERE id = 1",
+    "TRUNCATE TABLE users",
+    "EXEC('xp_cmdshell')",
+    "EXECUTE (something)",
+    "CREATE INDEX idx ON users(name)",
+    "ALTER TABLE users ADD COLUMN password",
+    "GRANT ALL ON users TO bob",
+    "REVOKE ALL ON users FROM bob",
+    "INSERT INTO users SELECT * FROM admins",
+    "UPDATE users SET name = 'hacked'",
+    "SELECT * FROM users; DROP TABLE users",
+    "SELECT * FROM users;SELECT * FROM admins",
+    "SELECT * FROM users -- comment",
+    "SELECT * FROM users /* comment */",
+    "SELECT * FROM users WHERE name = '' OR '1'='1'",
+    'SELECT * FROM users WHERE name = "" OR "1"="1"',
+    "SELECT * FROM users WHERE name = 'a'; CREATE VIEW v AS SELECT 1",
+]
+
+
+class TestValidationEngine:
+
+    @pytest.mark.parametrize("query", SAFE_QUERIES)
+    def test_safe_queries_accepted(self, query):
+        assert validate_sql_query(query)
+
+    @pytest.mark.parametrize("query", REJECTED_QUERIES)
+    def test_dangerous_queries_rejected(self, query):
+        with pytest.raises(SQLSecurityError):
+            validate_sql_query(query)
+
+    def test_dangerous_operation_takes_precedence_over_comment(self):
+        with pytest.raises(SQLSecurityError, match="dangerous operation"):
+            validate_sql_query("DROP TABLE users -- bye")
+
+    def test_comment_takes_precedence_over_injection(self):
+        with pytest.raises(SQLSecurityError, match="comments"):
+            validate_sql_query("SELECT * FROM users WHERE name = '' OR '1'='1' --")
+
+    def test_update_set_spanning_lines_rejected(self):
+        with pytest.raises(SQLSecurityError):
+            validate_sql_query("UPDATE users\nSET name = 'x'")
+
+    def test_validation_is_memoized(self):
+        _find_sql_violation.cache_clear()
+        query = "SELECT id FROM memo_test WHERE id = 42"
+
+        validate_sql_query(query)
+        validate_sql_query(query)
+
+        info = _find_sql_violation.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+    def test_memoized_rejection_still_raises(self):
+        _find_sql_violation.cache_clear()
+        for _ in range(2):
+            with pytest.raises(SQLSecurityError):
+                validate_sql_query("DELETE FROM memo_test")
+
+    def test_validate_identifier_keywords(self):
+        assert validate_identifier("users")
+        with pytest.raises(SQLSecurityError, match="cannot be used"):
+            validate_identifier("select")
+
+
+def _best_time(query: str, repeats: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        _find_sql_violation.__wrapped__(query)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class TestValidationScaling:
+    """Validation time must grow linearly with query length, including adversarial inputs"""
+
+    @pytest.mark.parametrize("build", [
+        lambda n: "SELECT " + "UPDATE " * (n // 7),
+        lambda n: "SELECT " + "INSERT INTO t " * (n // 14),
+        lambda n: "SELECT * FROM t WHERE name = '" + " " * n + "x'",
+        lambda n: "SELECT a FROM t WHERE " + " AND ".join(f"c{i} = 'v{i}'" for i in range(n // 16)),
+    ])
+    def test_linear_time(self, build):
+        small = _best_time(build(2_000))
+        large = _best_time(build(32_000))
+
+        # 16x the input: linear is ~16x, quadratic would be ~256x
+        assert large < max(small, 1e-4) * 64
@@ -0,0 +1,36 @@
+import json
+import os
+import subprocess
+import sys
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFERRED_MODULES = ("pandas", "pyarrow", "numpy", "openai", "anthropic", "zstandard")
+
+
+def _import_server_in_subprocess(code: str, cwd) -> dict:
+    env = dict(os.environ, PYTHONPATH=SERVER_DIR)
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=cwd, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_server_import_defers_heavy_dependencies(tmp_path):
+    code = (
+        "import sys, json\n"
+        "import server\n"
+        f"print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))\n"
+    )
+    assert _import_server_in_subprocess(code, tmp_path) == []
+
+
+def test_llm_client_imported_on_first_use(tmp_path):
+    code = (
+        "import sys, json\n"
+        "from core import llm_processor\n"
+        "before = 'openai' in sys.modules\n"
+        "llm_processor._openai_client('test-key')\n"
+        "print(json.dumps({'before': before, 'after': 'openai' in sys.modules}))\n"
+    )
+    assert _import_server_in_subprocess(code, tmp_path) == {"before": False, "after": True}